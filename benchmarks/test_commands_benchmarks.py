@@ -0,0 +1,67 @@
+"""Benchmarks for running commands, using fake commands rather than the real tools.
+"""
+import io
+from functools import partial
+
+import pytest
+import sh
+
+from ploigos_step_runner.utils.commands import run_command, run_concurrently
+from ploigos_step_runner.utils.io import ShOutputTee
+from tests.helpers.fake_commands import FakeCommands
+
+COMMAND_SECONDS = 0.2
+LINE = 'INFO: building module with some typical build tool output\n'
+NUM_LINES = 20000
+
+@pytest.fixture(name='fake_commands')
+def fixture_fake_commands():
+    """
+    Returns
+    -------
+    FakeCommands
+        Fake `clone` and `login` commands that each take COMMAND_SECONDS, like the independent
+        commands run at the start of a deploy, and a fake `build` command writing NUM_LINES lines.
+    """
+    with FakeCommands() as fake_commands:
+        fake_commands.add('clone', seconds=COMMAND_SECONDS)
+        fake_commands.add('login', seconds=COMMAND_SECONDS)
+        fake_commands.add('build', stdout=LINE * NUM_LINES)
+        yield fake_commands
+
+@pytest.mark.benchmark(group='run-independent-commands')
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_run_independent_commands(benchmark, fake_commands, concurrent):
+    def run_commands():
+        if concurrent:
+            return run_concurrently(partial(run_command, 'clone'), partial(run_command, 'login'))
+        return [run_command('clone'), run_command('login')]
+
+    results = benchmark.pedantic(run_commands, rounds=5)
+
+    assert results == [0, 0]
+    assert len(fake_commands.get_calls('clone')) == 5
+
+@pytest.mark.benchmark(group='run-command-output')
+@pytest.mark.parametrize('runner', ['sh', 'run-command'])
+def test_run_command_output(benchmark, fake_commands, runner): # pylint: disable=unused-argument
+    def run_build():
+        out_stream = io.StringIO()
+        results_stream = io.StringIO()
+        if runner == 'sh':
+            with ShOutputTee(
+                out_streams=[out_stream, results_stream],
+                err_streams=[results_stream]
+            ) as output_tee:
+                sh.build(_out=output_tee.out_fd, _err=output_tee.err_fd) # pylint: disable=no-member
+        else:
+            run_command(
+                'build',
+                out_streams=[out_stream, results_stream],
+                err_streams=[results_stream]
+            )
+        return out_stream
+
+    out_stream = benchmark.pedantic(run_build, rounds=5)
+
+    assert out_stream.getvalue() == LINE * NUM_LINES
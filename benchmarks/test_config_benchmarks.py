@@ -0,0 +1,193 @@
+"""Benchmarks for loading configuration and converting it to ConfigValues.
+"""
+import copy
+import os
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from ploigos_step_runner.config import Config, ConfigSnapshotCache
+from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.utils.file import parse_yaml_or_json_file
+
+NUM_CONFIG_FILES = 200
+NUM_CONFIG_FILE_KEYS = 20
+TREE_DEPTH = 6
+TREE_WIDTH = 5
+NETWORK_READ_LATENCY_SECONDS = 0.005
+NUM_MEMORY_CONFIG_STEPS = 50
+MEMORY_TREE_DEPTH = 3
+
+def write_config_dir(config_dir_path):
+    """Writes a configuration directory of NUM_CONFIG_FILES files, each configuring one step.
+    """
+    os.makedirs(config_dir_path, exist_ok=True)
+    for file_index in range(NUM_CONFIG_FILES):
+        config = {
+            Config.CONFIG_KEY: {
+                f'step-{file_index}': [
+                    {
+                        'implementer': 'FooStepImplementer',
+                        'config': {
+                            f'step-config-{key_index}': f'value-{key_index}'
+                            for key_index in range(NUM_CONFIG_FILE_KEYS)
+                        },
+                        'environment-config': {
+                            'DEV': {
+                                f'step-env-config-{key_index}': [f'value-{key_index}'] * 3
+                                for key_index in range(NUM_CONFIG_FILE_KEYS)
+                            }
+                        }
+                    }
+                ]
+            }
+        }
+        with open(
+            os.path.join(config_dir_path, f'config-{file_index:03}.yml'),
+            'w',
+            encoding='utf-8'
+        ) as config_file:
+            yaml.safe_dump(config, config_file)
+
+def create_tree(depth):
+    """
+    Returns
+    -------
+    dict
+        Tree of nested dictionaries and lists the given number of levels deep.
+    """
+    if depth == 0:
+        return 'leaf-value'
+
+    tree = {f'key-{index}': create_tree(depth - 1) for index in range(TREE_WIDTH)}
+    tree['list'] = [f'item-{index}' for index in range(TREE_WIDTH)]
+    return tree
+
+def create_memory_config():
+    """
+    Returns
+    -------
+    dict
+        Configuration of NUM_MEMORY_CONFIG_STEPS steps, each configured with a tree
+        MEMORY_TREE_DEPTH levels deep.
+    """
+    return {
+        Config.CONFIG_KEY: {
+            f'step-{step_index}': {
+                'implementer': 'FooStepImplementer',
+                'config': create_tree(MEMORY_TREE_DEPTH)
+            }
+            for step_index in range(NUM_MEMORY_CONFIG_STEPS)
+        }
+    }
+
+def get_allocated_memory(function, *args, **kwargs):
+    """
+    Returns
+    -------
+    tuple of obj and int
+        Result of calling the given function, and the bytes of memory it allocated
+        that are still in use.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        allocated_memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, allocated_memory
+
+@pytest.mark.benchmark(group='config-load')
+def test_load_config_dir(benchmark, tmp_path):
+    config_dir_path = str(tmp_path / 'config')
+    write_config_dir(config_dir_path)
+
+    config = benchmark(Config, config_dir_path)
+
+    assert len(config.step_configs) == NUM_CONFIG_FILES
+
+@pytest.mark.benchmark(group='config-load')
+def test_load_config_dir_snapshot(benchmark, tmp_path):
+    config_dir_path = str(tmp_path / 'config')
+    write_config_dir(config_dir_path)
+    config_snapshot_cache = ConfigSnapshotCache(str(tmp_path / 'config-cache'))
+    config_snapshot_cache.load([config_dir_path])
+
+    config = benchmark(config_snapshot_cache.load, [config_dir_path])
+
+    assert len(config.step_configs) == NUM_CONFIG_FILES
+
+@pytest.mark.benchmark(group='config-load-network-volume')
+@pytest.mark.parametrize('max_workers', [1, Config.CONFIG_FILES_PARSE_MAX_WORKERS])
+def test_load_config_dir_network_volume(benchmark, tmp_path, max_workers):
+    config_dir_path = str(tmp_path / 'config')
+    write_config_dir(config_dir_path)
+
+    def parse_yaml_or_json_file_with_latency(yaml_or_json_file):
+        # NOTE: sleeping releases the GIL, the same as waiting on a read from a network volume
+        time.sleep(NETWORK_READ_LATENCY_SECONDS)
+        return parse_yaml_or_json_file(yaml_or_json_file)
+
+    with patch.object(Config, 'CONFIG_FILES_PARSE_MAX_WORKERS', max_workers), patch(
+        'ploigos_step_runner.config.config.parse_yaml_or_json_file',
+        side_effect=parse_yaml_or_json_file_with_latency
+    ):
+        config = benchmark.pedantic(Config, args=(config_dir_path,), rounds=3)
+
+    assert len(config.step_configs) == NUM_CONFIG_FILES
+
+@pytest.mark.benchmark(group='config-value-convert-leaves')
+def test_convert_leaves_to_config_values(benchmark):
+    tree = create_tree(TREE_DEPTH)
+
+    # NOTE: the leaves are converted in place so convert a fresh copy each round
+    benchmark.pedantic(
+        ConfigValue.convert_leaves_to_config_values,
+        setup=lambda: ((copy.deepcopy(tree),), {'parent_source': 'benchmark'}),
+        rounds=20
+    )
+
+@pytest.mark.benchmark(group='config-value-convert-leaves')
+def test_convert_leaves_to_values(benchmark):
+    tree = ConfigValue.convert_leaves_to_config_values(create_tree(TREE_DEPTH))
+
+    result = benchmark(ConfigValue.convert_leaves_to_values, tree)
+
+    assert result == create_tree(TREE_DEPTH)
+
+@pytest.mark.benchmark(group='config-memory')
+@pytest.mark.parametrize('parent_source', ['dict', 'file'])
+def test_config_memory(benchmark, tmp_path, parent_source):
+    if parent_source == 'dict':
+        config_source = create_memory_config()
+    else:
+        config_source = str(tmp_path / 'config.yml')
+        with open(config_source, 'w', encoding='utf-8') as config_file:
+            yaml.safe_dump(create_memory_config(), config_file)
+
+    config, allocated_memory = get_allocated_memory(Config, config_source)
+    benchmark.extra_info['memory-kib'] = allocated_memory // 1024
+    benchmark.pedantic(Config, args=(config_source,), rounds=5)
+
+    assert len(config.step_configs) == NUM_MEMORY_CONFIG_STEPS
+
+@pytest.mark.benchmark(group='config-memory')
+def test_convert_leaves_to_config_values_memory(benchmark):
+    tree = create_tree(TREE_DEPTH)
+    parent_source = create_tree(MEMORY_TREE_DEPTH)
+
+    _, allocated_memory = get_allocated_memory(
+        ConfigValue.convert_leaves_to_config_values,
+        copy.deepcopy(tree),
+        parent_source=parent_source
+    )
+    benchmark.extra_info['memory-kib'] = allocated_memory // 1024
+    benchmark.pedantic(
+        ConfigValue.convert_leaves_to_config_values,
+        setup=lambda: ((copy.deepcopy(tree),), {'parent_source': parent_source}),
+        rounds=5
+    )
@@ -0,0 +1,49 @@
+"""Benchmarks for the dictionary utilities.
+"""
+import copy
+
+import pytest
+
+from ploigos_step_runner.utils.dict import deep_merge
+
+NUM_KEYS = 20
+DEPTH = 3
+
+def create_dict(prefix, depth):
+    """
+    Returns
+    -------
+    dict
+        Nested dictionary, the given number of levels deep, of NUM_KEYS keys per level
+        of which half start with the given prefix.
+    """
+    if depth == 0:
+        return f'{prefix}-value'
+
+    return {
+        (f'{prefix}-key-{index}' if index % 2 else f'key-{index}'): create_dict(prefix, depth - 1)
+        for index in range(NUM_KEYS)
+    }
+
+@pytest.mark.benchmark(group='deep-merge')
+def test_deep_merge_overwrite(benchmark):
+    dest = create_dict('dest', DEPTH)
+    source = create_dict('source', DEPTH)
+
+    # NOTE: deep_merge merges in to dest so merge in to a fresh copy each round
+    benchmark.pedantic(
+        deep_merge,
+        setup=lambda: ((copy.deepcopy(dest), source), {'overwrite_duplicate_keys': True}),
+        rounds=20
+    )
+
+@pytest.mark.benchmark(group='deep-merge')
+def test_deep_merge_disjoint(benchmark):
+    dest = {f'dest-{key}': value for key, value in create_dict('dest', DEPTH).items()}
+    source = {f'source-{key}': value for key, value in create_dict('source', DEPTH).items()}
+
+    benchmark.pedantic(
+        deep_merge,
+        setup=lambda: ((copy.deepcopy(dest), source), {}),
+        rounds=20
+    )
@@ -0,0 +1,174 @@
+"""Benchmarks for parsing YAML and JSON files with each backend, on configuration files and
+manifests of Kubernetes resources of typical sizes.
+"""
+import json
+
+import pytest
+import yaml
+
+from ploigos_step_runner.config import Config
+from ploigos_step_runner.utils.file import (parse_yaml_or_json_documents_file,
+                                            parse_yaml_or_json_file)
+
+NUM_CONFIG_STEPS = 20
+NUM_CONFIG_STEP_KEYS = 20
+NUM_MANIFEST_RESOURCES = 30
+
+YAML_BACKENDS = {
+    'yaml-python': yaml.SafeLoader,
+    'yaml-libyaml': getattr(yaml, 'CSafeLoader', None)
+}
+
+def create_config():
+    """
+    Returns
+    -------
+    dict
+        Configuration of NUM_CONFIG_STEPS steps, about the size of a typical configuration file.
+    """
+    return {
+        Config.CONFIG_KEY: {
+            'global-defaults': {
+                'organization': 'ploigos',
+                'application-name': 'fruit',
+                'service-name': 'fruit'
+            },
+            **{
+                f'step-{step_index}': [
+                    {
+                        'implementer': 'FooStepImplementer',
+                        'config': {
+                            f'step-config-{key_index}': f'value-{key_index}'
+                            for key_index in range(NUM_CONFIG_STEP_KEYS)
+                        },
+                        'environment-config': {
+                            'DEV': {'kube-app-domain': 'dev.apps.ploigos.xyz'},
+                            'PROD': {'kube-app-domain': 'prod.apps.ploigos.xyz'}
+                        }
+                    }
+                ]
+                for step_index in range(NUM_CONFIG_STEPS)
+            }
+        }
+    }
+
+def create_manifest_resources():
+    """
+    Returns
+    -------
+    list of dict
+        NUM_MANIFEST_RESOURCES Kubernetes resources, with the managed fields and last applied
+        configuration annotations ArgoCD manifests have.
+    """
+    resources = []
+    for index in range(NUM_MANIFEST_RESOURCES):
+        resource = {
+            'apiVersion': 'route.openshift.io/v1',
+            'kind': 'Route',
+            'metadata': {
+                'name': f'fruit-{index}',
+                'namespace': 'fruit-dev',
+                'labels': {'app.kubernetes.io/instance': 'fruit-dev'},
+                'managedFields': [
+                    {
+                        'apiVersion': 'route.openshift.io/v1',
+                        'fieldsType': 'FieldsV1',
+                        'fieldsV1': {
+                            f'f:field-{field_index}': {} for field_index in range(20)
+                        },
+                        'manager': 'argocd-application-controller',
+                        'operation': 'Update',
+                        'time': '2020-12-16T22:14:46Z'
+                    }
+                ]
+            },
+            'spec': {
+                'host': f'fruit-{index}.apps.ploigos.xyz',
+                'path': '/',
+                'port': {'targetPort': 'http'},
+                'to': {'kind': 'Service', 'name': 'fruit', 'weight': 100}
+            }
+        }
+        resource['metadata']['annotations'] = {
+            'kubectl.kubernetes.io/last-applied-configuration': json.dumps(resource)
+        }
+        resources.append(resource)
+
+    return resources
+
+@pytest.fixture(name='config_file_paths')
+def fixture_config_file_paths(tmp_path):
+    """
+    Returns
+    -------
+    dict
+        Paths of the configuration written as YAML, and as JSON, by file format.
+    """
+    config = create_config()
+    config_file_paths = {
+        'yaml': str(tmp_path / 'config.yml'),
+        'json': str(tmp_path / 'config.json')
+    }
+    with open(config_file_paths['yaml'], 'w', encoding='utf-8') as config_file:
+        yaml.safe_dump(config, config_file)
+    with open(config_file_paths['json'], 'w', encoding='utf-8') as config_file:
+        json.dump(config, config_file)
+
+    return config_file_paths
+
+@pytest.fixture(name='manifest_path')
+def fixture_manifest_path(tmp_path):
+    """
+    Returns
+    -------
+    str
+        Path of the manifest of Kubernetes resources, written as YAML documents.
+    """
+    manifest_path = str(tmp_path / 'manifest.yaml')
+    with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+        yaml.safe_dump_all(create_manifest_resources(), manifest_file)
+
+    return manifest_path
+
+@pytest.mark.benchmark(group='parse-config-file')
+@pytest.mark.parametrize('backend', ['yaml-python', 'yaml-libyaml', 'json'])
+def test_parse_config_file_backend(benchmark, config_file_paths, backend):
+    if backend == 'json':
+        with open(config_file_paths['json'], encoding='utf-8') as config_file:
+            contents = config_file.read()
+        parsed_config = benchmark(json.loads, contents)
+    else:
+        if YAML_BACKENDS[backend] is None:
+            pytest.skip('PyYAML was built without libyaml')
+        with open(config_file_paths['yaml'], encoding='utf-8') as config_file:
+            contents = config_file.read()
+        parsed_config = benchmark(yaml.load, contents, Loader=YAML_BACKENDS[backend])
+
+    assert parsed_config == create_config()
+
+@pytest.mark.benchmark(group='parse-config-file')
+@pytest.mark.parametrize('file_format', ['yaml', 'json'])
+def test_parse_yaml_or_json_file(benchmark, config_file_paths, file_format):
+    parsed_config = benchmark(parse_yaml_or_json_file, config_file_paths[file_format])
+
+    assert parsed_config == create_config()
+
+@pytest.mark.benchmark(group='parse-manifest')
+@pytest.mark.parametrize('backend', ['yaml-python', 'yaml-libyaml'])
+def test_parse_manifest_backend(benchmark, manifest_path, backend):
+    if YAML_BACKENDS[backend] is None:
+        pytest.skip('PyYAML was built without libyaml')
+    with open(manifest_path, encoding='utf-8') as manifest_file:
+        contents = manifest_file.read()
+
+    resources = benchmark(
+        lambda: list(yaml.load_all(contents, Loader=YAML_BACKENDS[backend]))
+    )
+
+    assert len(resources) == NUM_MANIFEST_RESOURCES
+
+@pytest.mark.benchmark(group='parse-manifest')
+def test_parse_yaml_or_json_documents_file(benchmark, manifest_path):
+    resources = benchmark(parse_yaml_or_json_documents_file, manifest_path)
+
+    assert resources == create_manifest_resources()
@@ -0,0 +1,258 @@
+"""Benchmarks for the IO utilities.
+"""
+import io
+import os
+import random
+import string
+import sys
+
+import pytest
+import sh
+from testfixtures import TempDirectory
+
+from ploigos_step_runner.utils.compressed_log import (TextIOCompressedLog,
+                                                      get_log_segment_paths,
+                                                      get_log_tail_path)
+from ploigos_step_runner.utils.io import (ShOutputTee, TextIOSelectiveObfuscator,
+                                          create_sh_redirect_to_multiple_streams_fn_callback)
+
+NUM_SECRETS = [1, 10, 100, 1000]
+# numbers of secrets, and of lines in each write, around where searching each secret with its own
+# pattern becomes slower than searching all of the secrets with one combined pattern, see
+# TextIOSelectiveObfuscator.DEFAULT_COMBINED_PATTERN_MIN_TARGETS and
+# TextIOSelectiveObfuscator.PER_TARGET_PATTERN_MIN_TEXT_LENGTH
+CROSSOVER_NUM_SECRETS = [10, 100, 250, 1000]
+CROSSOVER_LINES_PER_WRITE = [1, 4, 32, 1000]
+OUTPUT_SIZE = 1024 * 1024
+LINE = 'INFO: building module with some typical build tool output\n'
+
+def create_secrets(num_secrets):
+    """
+    Returns
+    -------
+    list of str
+        The given number of random secrets, the same each time.
+    """
+    secrets_random = random.Random(42)
+    return [
+        ''.join(
+            secrets_random.choice(string.ascii_letters + string.digits)
+            for _ in range(secrets_random.randint(8, 40))
+        )
+        for _ in range(num_secrets)
+    ]
+
+def create_output(secrets):
+    """
+    Returns
+    -------
+    list of str
+        OUTPUT_SIZE characters of output lines, some of which contain the given secrets.
+    """
+    lines = []
+    size = 0
+    index = 0
+    while size < OUTPUT_SIZE:
+        line = LINE
+        if index % 50 == 0:
+            line = f'INFO: logging in with password {secrets[index % len(secrets)]}\n'
+        lines.append(line)
+        size += len(line)
+        index += 1
+
+    return lines
+
+def create_obfuscator(secrets, buffered=False, combined_pattern_min_targets=None):
+    """
+    Returns
+    -------
+    TextIOSelectiveObfuscator
+        Obfuscator of the given secrets writing to a StringIO.
+    """
+    if combined_pattern_min_targets is None:
+        combined_pattern_min_targets = \
+            TextIOSelectiveObfuscator.DEFAULT_COMBINED_PATTERN_MIN_TARGETS
+
+    obfuscator = TextIOSelectiveObfuscator(
+        io.StringIO(),
+        randomize_replacment_length=False,
+        buffered=buffered,
+        combined_pattern_min_targets=combined_pattern_min_targets
+    )
+    obfuscator.add_obfuscation_targets(secrets)
+    return obfuscator
+
+def add_throughput(benchmark):
+    """Adds the MB/s written to the benchmark results.
+    """
+    if benchmark.stats:
+        benchmark.extra_info['mb-per-second'] = round(
+            OUTPUT_SIZE / (1024 * 1024) / benchmark.stats.stats.mean,
+            3
+        )
+
+@pytest.mark.benchmark(group='text-io-selective-obfuscator-write-lines')
+@pytest.mark.parametrize('num_secrets', NUM_SECRETS)
+def test_obfuscator_write_lines(benchmark, num_secrets):
+    secrets = create_secrets(num_secrets)
+    lines = create_output(secrets)
+
+    def write_lines():
+        obfuscator = create_obfuscator(secrets)
+        for line in lines:
+            obfuscator.write(line)
+        return obfuscator
+
+    obfuscator = benchmark.pedantic(write_lines, rounds=5)
+    add_throughput(benchmark)
+
+    output = obfuscator.parent_stream.getvalue()
+    assert output.count('password *') == output.count('password ')
+
+@pytest.mark.benchmark(group='text-io-selective-obfuscator-write-chunks')
+@pytest.mark.parametrize('num_secrets', NUM_SECRETS)
+def test_obfuscator_write_chunks(benchmark, num_secrets):
+    secrets = create_secrets(num_secrets)
+    lines = create_output(secrets)
+    lines_per_chunk = 1000
+    chunks = [
+        ''.join(lines[index:index + lines_per_chunk])
+        for index in range(0, len(lines), lines_per_chunk)
+    ]
+
+    def write_chunks():
+        obfuscator = create_obfuscator(secrets)
+        for chunk in chunks:
+            obfuscator.write(chunk)
+        return obfuscator
+
+    obfuscator = benchmark.pedantic(write_chunks, rounds=5)
+    add_throughput(benchmark)
+
+    output = obfuscator.parent_stream.getvalue()
+    assert output.count('password *') == output.count('password ')
+
+@pytest.mark.benchmark(group='text-io-selective-obfuscator-patterns-crossover')
+@pytest.mark.parametrize('num_secrets', CROSSOVER_NUM_SECRETS)
+@pytest.mark.parametrize('lines_per_write', CROSSOVER_LINES_PER_WRITE)
+@pytest.mark.parametrize('patterns', ['per-target', 'combined', 'default'])
+def test_obfuscator_patterns_crossover( # pylint: disable=too-many-arguments
+    benchmark,
+    monkeypatch,
+    patterns,
+    lines_per_write,
+    num_secrets
+):
+    secrets = create_secrets(num_secrets)
+    lines = create_output(secrets)
+    writes = [
+        ''.join(lines[index:index + lines_per_write])
+        for index in range(0, len(lines), lines_per_write)
+    ]
+
+    combined_pattern_min_targets = None
+    if patterns == 'per-target':
+        combined_pattern_min_targets = num_secrets + 1
+        monkeypatch.setattr(TextIOSelectiveObfuscator, 'PER_TARGET_PATTERN_MIN_TEXT_LENGTH', 0)
+    elif patterns == 'combined':
+        combined_pattern_min_targets = 0
+
+    def write_lines():
+        obfuscator = create_obfuscator(
+            secrets,
+            combined_pattern_min_targets=combined_pattern_min_targets
+        )
+        for write in writes:
+            obfuscator.write(write)
+        return obfuscator
+
+    obfuscator = benchmark.pedantic(write_lines, rounds=5)
+    add_throughput(benchmark)
+
+    output = obfuscator.parent_stream.getvalue()
+    assert output.count('password *') == output.count('password ')
+
+@pytest.mark.benchmark(group='text-io-selective-obfuscator-write-small-chunks')
+@pytest.mark.parametrize('chunk_size', [8, 100])
+@pytest.mark.parametrize('buffered', [False, True])
+def test_obfuscator_write_small_chunks(benchmark, buffered, chunk_size):
+    secrets = create_secrets(100)
+    output = ''.join(create_output(secrets))
+
+    def write_small_chunks():
+        obfuscator = create_obfuscator(secrets, buffered=buffered)
+        for index in range(0, len(output), chunk_size):
+            obfuscator.write(output[index:index + chunk_size])
+        obfuscator.flush()
+        return obfuscator
+
+    obfuscator = benchmark.pedantic(write_small_chunks, rounds=5)
+    add_throughput(benchmark)
+
+    # only buffered obfuscation obfuscates secrets split across chunks
+    if buffered:
+        output = obfuscator.parent_stream.getvalue()
+        assert output.count('password *') == output.count('password ')
+
+@pytest.mark.benchmark(group='sh-output-redirect')
+@pytest.mark.parametrize('redirect', ['callback', 'tee'])
+def test_sh_output_redirect(benchmark, redirect):
+    num_lines = 100000
+    python = sh.Command(sys.executable)
+    command_args = ['-c', f'for _ in range({num_lines}): print({LINE.strip()!r})']
+
+    def run_command():
+        out_stream = io.StringIO()
+        results_stream = io.StringIO()
+        if redirect == 'callback':
+            python(
+                *command_args,
+                _out=create_sh_redirect_to_multiple_streams_fn_callback(
+                    [out_stream, results_stream]
+                ),
+                _err=create_sh_redirect_to_multiple_streams_fn_callback([results_stream])
+            )
+        else:
+            with ShOutputTee(
+                out_streams=[out_stream, results_stream],
+                err_streams=[results_stream]
+            ) as output_tee:
+                python(*command_args, _out=output_tee.out_fd, _err=output_tee.err_fd)
+        return out_stream, results_stream
+
+    out_stream, results_stream = benchmark.pedantic(run_command, rounds=5)
+
+    assert out_stream.getvalue() == LINE * num_lines
+    assert results_stream.getvalue() == LINE * num_lines
+
+@pytest.mark.benchmark(group='output-log')
+@pytest.mark.parametrize('log', ['file', 'compressed'])
+def test_output_log(benchmark, log):
+    num_lines = 200000
+
+    def write_log(log_path):
+        if log == 'file':
+            log_stream = open(log_path, 'w', encoding='utf-8') # pylint: disable=consider-using-with
+        else:
+            log_stream = TextIOCompressedLog(log_path)
+        with log_stream:
+            for _ in range(num_lines):
+                log_stream.write(LINE)
+
+        if log == 'file':
+            return os.path.getsize(log_path)
+        return sum(
+            os.path.getsize(path)
+            for path in [get_log_tail_path(log_path)] + get_log_segment_paths(log_path)
+        )
+
+    with TempDirectory() as temp_dir:
+        log_size = benchmark.pedantic(
+            write_log,
+            args=(os.path.join(temp_dir.path, 'mvn_test_output.txt'),),
+            rounds=5
+        )
+
+    benchmark.extra_info['log-size'] = log_size
+    if log == 'compressed':
+        assert log_size < len(LINE) * num_lines / 10
@@ -0,0 +1,84 @@
+"""Benchmarks for SubStepConfig runtime step configuration resolution.
+"""
+import copy
+
+import pytest
+
+from ploigos_step_runner.config import Config
+
+NUM_KEYS = 50
+
+def create_sub_step_config():
+    return Config({
+        Config.CONFIG_KEY: {
+            'global-defaults': {
+                f'global-default-{i}': f'value-{i}' for i in range(NUM_KEYS)
+            },
+            'global-environment-defaults' : {
+                'DEV': {
+                    f'global-env-default-{i}': f'value-{i}' for i in range(NUM_KEYS)
+                }
+            },
+            'step-foo': [
+                {
+                    'implementer': 'foo1',
+                    'config': {
+                        f'step-config-{i}': f'value-{i}' for i in range(NUM_KEYS)
+                    },
+                    'environment-config': {
+                        'DEV': {
+                            f'step-env-config-{i}': f'value-{i}' for i in range(NUM_KEYS)
+                        }
+                    }
+                }
+            ]
+        }
+    }).get_step_config('step-foo').get_sub_step('foo1')
+
+DEFAULTS = {f'default-{i}': f'value-{i}' for i in range(NUM_KEYS)}
+KEYS = ['step-env-config-1', 'global-default-2', 'default-3', 'does-not-exist']
+
+@pytest.mark.benchmark(group='sub-step-config-get-config-value')
+def test_get_config_value_uncached(benchmark):
+    sub_step = create_sub_step_config()
+
+    def get_config_values():
+        for key in KEYS:
+            # simulate the previous behavior of merging the runtime config on every call
+            sub_step.clear_runtime_step_config_cache()
+            sub_step.get_config_value(key, 'DEV', DEFAULTS)
+
+    benchmark(get_config_values)
+
+@pytest.mark.benchmark(group='sub-step-config-get-config-value')
+def test_get_config_value_cached(benchmark):
+    sub_step = create_sub_step_config()
+
+    def get_config_values():
+        for key in KEYS:
+            sub_step.get_config_value(key, 'DEV', DEFAULTS)
+
+    benchmark(get_config_values)
+
+@pytest.mark.benchmark(group='sub-step-config-views')
+@pytest.mark.parametrize('copied', [True, False])
+def test_read_config_views(benchmark, copied):
+    sub_step = create_sub_step_config()
+    config_value = sub_step.sub_step_config['step-config-1']
+
+    def read_config_views():
+        views = [
+            sub_step.global_defaults,
+            sub_step.get_global_environment_defaults('DEV'),
+            sub_step.sub_step_config,
+            sub_step.sub_step_env_config,
+            config_value.parent_source,
+            config_value.path_parts
+        ]
+        if copied:
+            # simulate the previous behavior of deep copying every view read
+            views = copy.deepcopy(views)
+        return views
+
+    benchmark(read_config_views)
+
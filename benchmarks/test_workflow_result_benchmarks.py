@@ -0,0 +1,138 @@
+"""Benchmarks for writing and reading WorkflowResults and getting values from them.
+"""
+import os
+
+import pytest
+
+from ploigos_step_runner import StepImplementer, StepResult
+from ploigos_step_runner.config import Config
+from ploigos_step_runner.utils.file import parse_yaml_or_json_file
+from ploigos_step_runner.workflow_result import WorkflowResult
+
+NUM_STEP_RESULTS = 500
+NUM_ARTIFACTS = 10
+ENVIRONMENTS = [None, 'DEV', 'TEST', 'PROD']
+
+class BenchmarkStepImplementer(StepImplementer):
+    """StepImplementer to get values with.
+    """
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {'default-key': 'default-value'}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        return StepResult.from_step_implementer(self)
+
+def create_workflow_result():
+    """
+    Returns
+    -------
+    WorkflowResult
+        WorkflowResult of NUM_STEP_RESULTS StepResults spread across the ENVIRONMENTS.
+    """
+    workflow_result = WorkflowResult()
+    for index in range(NUM_STEP_RESULTS):
+        step_result = StepResult(
+            step_name=f'step-{index // len(ENVIRONMENTS)}',
+            sub_step_name='sub-step',
+            sub_step_implementer_name='SubStepImplementer',
+            environment=ENVIRONMENTS[index % len(ENVIRONMENTS)]
+        )
+        for artifact_index in range(NUM_ARTIFACTS):
+            step_result.add_artifact(
+                name=f'artifact-{index}-{artifact_index}',
+                value=f'value-{index}-{artifact_index}',
+                description='benchmark artifact'
+            )
+        workflow_result.add_step_result(step_result)
+
+    return workflow_result
+
+@pytest.mark.benchmark(group='workflow-result-round-trip')
+def test_pickle_round_trip(benchmark, tmp_path):
+    workflow_result = create_workflow_result()
+    pickle_file_path = str(tmp_path / 'step-runner-results.pkl')
+
+    def round_trip():
+        workflow_result.write_to_pickle_file(pickle_file_path)
+        return WorkflowResult.load_from_pickle_file(pickle_file_path)
+
+    loaded_workflow_result = benchmark(round_trip)
+
+    assert len(loaded_workflow_result.workflow_list) == NUM_STEP_RESULTS
+
+@pytest.mark.benchmark(group='workflow-result-round-trip')
+def test_journal_round_trip(benchmark, tmp_path):
+    journal_file_path = str(tmp_path / 'step-runner-results.journal')
+    copy_journal_file_path = str(tmp_path / 'step-runner-results-copy.journal')
+    create_workflow_result().write_to_journal_file(journal_file_path)
+
+    def round_trip():
+        # NOTE: writing to a journal the WorkflowResult was not loaded from writes all of
+        #       the StepResults rather than only appending new ones
+        if os.path.exists(copy_journal_file_path):
+            os.remove(copy_journal_file_path)
+        WorkflowResult.load_from_journal_file(journal_file_path).write_to_journal_file(
+            copy_journal_file_path
+        )
+        return WorkflowResult.load_from_journal_file(copy_journal_file_path)
+
+    loaded_workflow_result = benchmark(round_trip)
+
+    assert len(loaded_workflow_result.workflow_list) == NUM_STEP_RESULTS
+
+@pytest.mark.benchmark(group='workflow-result-round-trip')
+def test_yaml_round_trip(benchmark, tmp_path):
+    workflow_result = create_workflow_result()
+    yml_file_path = str(tmp_path / 'step-runner-results.yml')
+
+    def round_trip():
+        workflow_result.write_results_to_yml_file(yml_file_path)
+        return parse_yaml_or_json_file(yml_file_path)
+
+    results = benchmark(round_trip)
+
+    assert len(results['step-runner-results']) == NUM_STEP_RESULTS / len(ENVIRONMENTS) + 3
+
+@pytest.mark.benchmark(group='step-implementer-get-value')
+def test_get_value(benchmark, tmp_path):
+    config = Config({
+        Config.CONFIG_KEY: {
+            'global-defaults': {'global-key': 'global-value'},
+            'benchmark': {
+                'implementer': 'BenchmarkStepImplementer',
+                'config': {f'config-key-{index}': f'value-{index}' for index in range(50)}
+            }
+        }
+    })
+    step_implementer = BenchmarkStepImplementer(
+        results_dir_path=str(tmp_path / 'step-runner-results'),
+        results_file_name='step-runner-results.yml',
+        work_dir_path=str(tmp_path / 'step-runner-working'),
+        config=config.get_sub_step_configs('benchmark')[0],
+        environment='PROD',
+        workflow_result=create_workflow_result()
+    )
+    keys = [
+        'config-key-25',
+        'global-key',
+        'default-key',
+        f'artifact-{NUM_STEP_RESULTS - 1}-0',
+        'artifact-0-0',
+        'does-not-exist'
+    ]
+
+    def get_values():
+        for _ in range(100):
+            for key in keys:
+                step_implementer.get_value(key)
+
+    benchmark(get_values)
+
+    assert step_implementer.get_value('config-key-25') == 'value-25'
+    assert step_implementer.get_value(f'artifact-{NUM_STEP_RESULTS - 1}-0') == \
+        f'value-{NUM_STEP_RESULTS - 1}-0'
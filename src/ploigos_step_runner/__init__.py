@@ -10,18 +10,106 @@ Command-Line Options
     -s STEP, --step STEP
         Ploigos workflow step to run
 
+    -w WORKFLOW, --workflow WORKFLOW
+        Ploigos workflow file, in yml or json, declaring the steps to run and the steps each
+        depends on. Steps that do not depend on each other are run concurrently.
+        Either --step or --workflow must be given.
+
     -e ENVIRONMENT, --environment  ENVIRONMENT
         The environment to run this step against.
 
     -c CONFIG [CONFIG ...], --config CONFIG [CONFIG ...]
         Ploigos workflow configuration files, or directories containing files, in yml or json
 
+    --config-cache-dir CONFIG_CACHE_DIR
+        Directory to cache the parsed configuration in, so that it is only parsed again
+        when the -c/--config files change. The cached configuration is unpickled, so it is
+        only used if the directory is owned by the current user and others can not write to it.
+        The directory is created so that only its owner can access it.
+        Default: the configuration is not cached.
+
     -r RESULTS_DIR, --results-dir RESULTS_DIR
         Ploigos workflow results file in yml or json
 
+    --results-format {yaml,json,jsonl}
+        Format to write the workflow results file in.
+        jsonl appends only the latest step result as a single line of JSON.
+
+    --config-dump {none,keys,full}
+        How much of the configuration of each step to print before running it,
+        for steps that do not set the config-dump step option.
+        keys prints the configuration keys without reading, or decrypting, their values.
+        Default: full
+
     --step-config STEP_CONFIG_KEY=STEP_CONFIG_VALUE [STEP_CONFIG_KEY=STEP_CONFIG_VALUE ...]
         Override step config provided by the given Ploigos
         config-file with these arguments.
+        Only allowed with --step.
+
+    --workflow-max-workers WORKFLOW_MAX_WORKERS
+        Maximum number of workflow steps to run concurrently.
+        Default: 4
+
+    --cache-dir CACHE_DIR
+        Directory to cache the results of steps that enable the cache step option in.
+        Default: step-runner-cache
+
+    --cache-max-size CACHE_MAX_SIZE
+        Maximum size, in MB, of the cached step results.
+        The least recently used cached step results are removed first.
+        Default: 1024
+
+    --no-cache
+        Always run steps rather than use, or add to, the cached step results.
+
+    --trace-file TRACE_FILE
+        Write the timeline of the steps, sub steps, phases of sub steps, and commands run
+        to this file in the Chrome trace event format, to load into a trace viewer such as
+        chrome://tracing or https://ui.perfetto.dev.
+
+    --daemon-socket DAEMON_SOCKET
+        Run with the psr daemon (psr serve) listening on this Unix domain socket,
+        running without the daemon if it is not listening.
+        Default: value of the PSR_DAEMON_SOCKET environment variable.
+
+Daemon Command-Line Options
+---------------------------
+
+psr serve keeps the configuration and the results of previous steps in memory
+between runs of psr with --daemon-socket so that each run does not have to parse the
+configuration and load the results of previous steps again. Requests are run one at a time.
+
+    --socket SOCKET
+        Unix domain socket to listen on.
+        Default: value of the PSR_DAEMON_SOCKET environment variable.
+
+    --idle-timeout IDLE_TIMEOUT
+        Stop after this many seconds without any requests.
+        Default: never stop.
+
+Step Metrics
+------------
+
+The result of each sub step includes metrics of how long resolving its configuration and
+running it took, the peak resident set size of psr, and for each command it ran with sh the
+wall time, user and system CPU time, and peak resident set size of the command. Only the
+program name and leading sub command words of each command (EG: 'argocd app sync') are
+recorded since the remaining arguments can contain credentials. The CPU time and peak resident
+set size of a command are only recorded when no other sh command ran at the same time, since
+they are measured as the change in the resource usage of the finished child processes of psr.
+How long writing the results took is only included in the one line metrics summary printed
+with the results of the step.
+
+    metrics:
+      resolve-config-seconds: 0.012
+      run-step-seconds: 4.5
+      peak-rss-bytes: 52428800
+      commands:
+      - command: argocd app sync
+        wall-seconds: 3.2
+        user-cpu-seconds: 0.4
+        sys-cpu-seconds: 0.1
+        max-rss-bytes: 62914560
 
 Step Configuration
 ------------------
@@ -71,6 +159,8 @@ From least precedence to highest precedence.
         #    '--any-valid-sops-cmd-arg-here=value',
         #    '--aws-profile=FOO'
         #  ]
+        #  # decrypt each encrypted file once rather than once per encrypted value
+        #  batch_decrypt: true
 
       # Dictionary of configuration options which will be used in step configuration if that
       # step does not have a specific value for that configuration already or one is not
@@ -120,6 +210,32 @@ From least precedence to highest precedence.
           SAMPLE-ENV-2:
             sample-config-option-4: 'value for use in this step in SAMPLE-ENV-1 environment'
 
+      # Sample step config for step named SAMPLE-STEP-2 with options for how to run its sub steps
+      SAMPLE-STEP-2:
+        # Optional. Run the sub steps concurrently rather than one after the other.
+        # The output of each sub step is written, and its results added, in the order
+        # the sub steps are listed regardless of the order they finish in.
+        parallel: true
+        # Optional. Maximum number of sub steps to run concurrently. Default is all of them.
+        max-workers: 2
+        # Optional. If false keep running the remaining sub steps after a sub step fails.
+        fail-fast: false
+        # Optional. Restore the cached result, and working files, of a previous run of a sub step
+        # rather than run it again if its configuration, its implementer, the previous step
+        # results it read, and the contents of the cache-source-paths are all unchanged.
+        cache: true
+        # Optional. Files, or directories of files, the sub steps read, such as the application
+        # source, that must be unchanged to use a cached result.
+        cache-source-paths:
+        - src
+        # Optional. How much of the configuration of the sub steps to print before running them.
+        # none prints nothing, keys prints the configuration keys without reading, or decrypting,
+        # their values, and full prints the configuration. Default is --config-dump.
+        config-dump: keys
+        sub-steps:
+        - implementer: SampleStep2Implementer1
+        - implementer: SampleStep2Implementer2
+
 ### Example Configuration Files
 
 .. Note::
@@ -138,6 +254,8 @@ From least precedence to highest precedence.
         #    '--any-valid-sops-cmd-arg-here=value',
         #    '--aws-profile=FOO'
         #  ]
+        #  # decrypt each encrypted file once rather than once per encrypted value
+        #  batch_decrypt: true
 
       # Optional
       # Dictionary of configuration options which will be used in step configuration if that
@@ -496,6 +614,8 @@ From least precedence to highest precedence.
         #    '--any-valid-sops-cmd-arg-here=value',
         #    '--aws-profile=FOO'
         #  ]
+        #  # decrypt each encrypted file once rather than once per encrypted value
+        #  batch_decrypt: true
 
       # Optional
       # Dictionary of configuration options which will be used in step configuration if that
@@ -789,6 +909,39 @@ Example Running the 'generate-metadata' step
 ...     --results-file=my-app-step-runner-results.yml
 ...     --step=generate-metadata
 
+
+Example Running a workflow
+
+>>> cat my-app-step-runner-workflow.yml
+step-runner-workflow:
+  generate-metadata: []
+  tag-source: [generate-metadata]
+  static-code-analysis: [generate-metadata]
+  unit-test: [generate-metadata]
+  package: [static-code-analysis, unit-test]
+  create-container-image: [package]
+  container-image-static-compliance-scan: [create-container-image]
+  container-image-static-vulnerability-scan: [create-container-image]
+  push-container-image:
+  - container-image-static-compliance-scan
+  - container-image-static-vulnerability-scan
+
+>>> psr
+...     --config=my-app-step-runner-config.yml
+...     --workflow=my-app-step-runner-workflow.yml
+
+
+Example Running steps with the psr daemon
+
+>>> export PSR_DAEMON_SOCKET=/tmp/psr.sock
+>>> psr serve --idle-timeout 600 &
+>>> psr
+...     --config=my-app-step-runner-config.yml
+...     --step=generate-metadata
+>>> psr
+...     --config=my-app-step-runner-config.yml
+...     --step=tag-source
+
 """
 
 import __main__
@@ -9,10 +9,16 @@ Exit Codes
     specified -c/--config must exist and not be empty
 102
     specified -c/--config is invalid configuration
+103
+    specified -w/--workflow is invalid workflow
+104
+    specified --socket for psr serve can not be listened on
+105
+    no logs found for the step given to psr logs
 200
-    step completed with unsuccessful results
+    step, or workflow, completed with unsuccessful results
 300
-    step failed completion because of an exception
+    step, or workflow, failed completion because of an exception
 """
 
 import argparse
@@ -22,9 +28,19 @@ import traceback
 from contextlib import redirect_stderr, redirect_stdout
 
 from ploigos_step_runner.config.config import Config
+from ploigos_step_runner.config.config_snapshot_cache import ConfigSnapshotCache
+from ploigos_step_runner.config.step_config import StepConfig
+from ploigos_step_runner.daemon import (DAEMON_SOCKET_ENV_VAR, StepRunnerDaemon,
+                                        run_in_daemon)
 from ploigos_step_runner.decryption_utils import DecryptionUtils
+from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.step_result_cache import StepResultCache
 from ploigos_step_runner.step_runner import StepRunner
+from ploigos_step_runner.trace import Tracer
+from ploigos_step_runner.utils.compressed_log import (copy_log, decompress_log, find_logs,
+                                                      get_log_tail_path)
 from ploigos_step_runner.utils.io import TextIOSelectiveObfuscator
+from ploigos_step_runner.workflow_result import WorkflowResult
 
 
 def print_error(msg):
@@ -60,16 +76,27 @@ class ParseKeyValueArge(argparse.Action):  # pylint: disable=too-few-public-meth
         setattr(namespace, self.dest, key_value_dict)
 
 
-def main(argv=None):
-    """Main entry point for Ploigos step runner.
+def create_argument_parser():
+    """Creates the parser for the arguments to run a step, or workflow, with.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser for the arguments to run a step, or workflow, with.
     """
     parser = argparse.ArgumentParser(description='Ploigos Step Runner (psr)')
-    parser.add_argument(
+    step_or_workflow_group = parser.add_mutually_exclusive_group(required=True)
+    step_or_workflow_group.add_argument(
         '-s',
         '--step',
-        required=True,
         help='Workflow step to run'
     )
+    step_or_workflow_group.add_argument(
+        '-w',
+        '--workflow',
+        help='Workflow file, in yml or json, declaring the steps to run and the steps each ' \
+            'depends on. Steps that do not depend on each other are run concurrently.'
+    )
     parser.add_argument(
         '-e',
         '--environment',
@@ -83,12 +110,34 @@ def main(argv=None):
         nargs='+',
         help='Workflow configuration files, or directories containing files, in yml or json'
     )
+    parser.add_argument(
+        '--config-cache-dir',
+        help='Directory to cache the parsed configuration in, so that it is only parsed again ' \
+            'when the -c/--config files change. The cached configuration is unpickled, so ' \
+            'it is only used if the directory is owned by the current user and others can ' \
+            'not write to it. Default: the configuration is not cached.'
+    )
     parser.add_argument(
         '-r',
         '--results-dir',
         default='step-runner-results',
         help='Workflow results file in yml or json'
     )
+    parser.add_argument(
+        '--results-format',
+        default=WorkflowResult.RESULTS_FORMAT_YAML,
+        choices=WorkflowResult.RESULTS_FORMATS,
+        help='Format to write the workflow results file in. ' \
+            'jsonl appends only the latest step result as a single line of JSON.'
+    )
+    parser.add_argument(
+        '--config-dump',
+        default=StepConfig.CONFIG_DUMP_FULL,
+        choices=StepConfig.CONFIG_DUMPS,
+        help='How much of the configuration of each step to print before running it, ' \
+            'for steps that do not set the config-dump step option. ' \
+            'keys prints the configuration keys without reading, or decrypting, their values.'
+    )
     parser.add_argument(
         '--step-config',
         metavar='STEP_CONFIG_KEY=STEP_CONFIG_VALUE',
@@ -96,40 +145,392 @@ def main(argv=None):
         help='Override step config provided by the given config-file with these arguments.',
         action=ParseKeyValueArge
     )
+    parser.add_argument(
+        '--workflow-max-workers',
+        type=int,
+        default=StepRunner.DEFAULT_WORKFLOW_MAX_WORKERS,
+        help='Maximum number of workflow steps to run concurrently.'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default='step-runner-cache',
+        help='Directory to cache the results of steps that enable the cache step option in.'
+    )
+    parser.add_argument(
+        '--cache-max-size',
+        type=int,
+        default=StepResultCache.DEFAULT_MAX_SIZE // (1024 * 1024),
+        help='Maximum size, in MB, of the cached step results. ' \
+            'The least recently used cached step results are removed first.'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run steps rather than use, or add to, the cached step results.'
+    )
+    parser.add_argument(
+        '--buffer-output',
+        action='store_true',
+        help='Buffer output until a line ending is written so that decrypted values split ' \
+            'across writes of command output are obfuscated, at the cost of slower writes ' \
+            'of small chunks of output. Default: output is obfuscated as it is written.'
+    )
+    parser.add_argument(
+        '--trace-file',
+        help='Write the timeline of the steps, sub steps, phases of sub steps, and commands ' \
+            'run to this file in the Chrome trace event format, to load into a trace viewer ' \
+            'such as chrome://tracing or https://ui.perfetto.dev.'
+    )
+    parser.add_argument(
+        '--daemon-socket',
+        default=os.environ.get(DAEMON_SOCKET_ENV_VAR),
+        help='Run with the psr daemon (psr serve) listening on this Unix domain socket, ' \
+            'running without the daemon if it is not listening. ' \
+            f'Default: value of the {DAEMON_SOCKET_ENV_VAR} environment variable.'
+    )
+    return parser
+
+
+def parse_args(argv):
+    """Parses and validates the arguments to run a step, or workflow, with.
+
+    Parameters
+    ----------
+    argv : list of str
+        Arguments to parse.
+
+    Returns
+    -------
+    argparse.Namespace
+        Parsed arguments.
+    """
+    parser = create_argument_parser()
     args = parser.parse_args(argv)
 
-    obfuscated_stdout = TextIOSelectiveObfuscator(sys.stdout)
-    obfuscated_stderr = TextIOSelectiveObfuscator(sys.stderr)
+    if args.workflow and args.step_config:
+        parser.error('argument --step-config: not allowed with argument -w/--workflow')
+    if args.workflow_max_workers < 1:
+        parser.error('argument --workflow-max-workers: must be at least 1')
+    if args.cache_max_size < 0:
+        parser.error('argument --cache-max-size: must be at least 0')
+
+    return args
+
+
+def run(argv, config_loader=None, workflow_result_loader=None):
+    """Runs a step, or workflow, as given by the arguments.
+
+    Parameters
+    ----------
+    argv : list of str
+        Arguments to run a step, or workflow, with.
+    config_loader : callable, optional
+        Called with the -c/--config paths to get the Config to run with.
+        Default: ConfigSnapshotCache(--config-cache-dir).load, or Config without
+        --config-cache-dir.
+    workflow_result_loader : callable, optional
+        Called with the working directory path and results file name to get the results
+        of previous steps to run with.
+        Default: the results of previous steps are loaded from the working directory.
+    """
+    args = parse_args(argv)
+
+    obfuscated_stdout = TextIOSelectiveObfuscator(sys.stdout, buffered=args.buffer_output)
+    obfuscated_stderr = TextIOSelectiveObfuscator(sys.stderr, buffered=args.buffer_output)
     DecryptionUtils.register_obfuscation_stream(obfuscated_stdout)
     DecryptionUtils.register_obfuscation_stream(obfuscated_stderr)
 
-    with redirect_stdout(obfuscated_stdout), redirect_stderr(obfuscated_stderr):
-        # validate args
-        for config_file in args.config:
-            if not os.path.exists(config_file) or os.stat(config_file).st_size == 0:
-                print_error('specified -c/--config must exist and not be empty')
-                sys.exit(101)
+    tracer = None
+    if args.trace_file:
+        tracer = Tracer()
+        Tracer.set_active_tracer(tracer)
 
-        try:
-            config = Config(args.config)
-        except (ValueError, AssertionError) as error:
-            print_error(f"specified -c/--config is invalid configuration: {error}")
-            sys.exit(102)
+    try:
+        with redirect_stdout(obfuscated_stdout), redirect_stderr(obfuscated_stderr):
+            run_parsed_args(args, config_loader, workflow_result_loader)
+    finally:
+        obfuscated_stdout.flush()
+        obfuscated_stderr.flush()
+        DecryptionUtils.unregister_obfuscation_stream(obfuscated_stdout)
+        DecryptionUtils.unregister_obfuscation_stream(obfuscated_stderr)
+
+        if tracer is not None:
+            Tracer.set_active_tracer(None)
+            write_trace_file(tracer, args.trace_file)
+
+
+def write_trace_file(tracer, trace_file_path):
+    """Writes the spans recorded by the given Tracer to the given file, printing an error
+    rather than failing the run if the file can not be written.
 
+    Parameters
+    ----------
+    tracer : Tracer
+        Tracer to write the spans of.
+    trace_file_path : str
+        Path to the file to write the spans to.
+    """
+    try:
+        tracer.write_trace_file(trace_file_path)
+    except OSError as error:
+        print_error(f"specified --trace-file could not be written: {error}")
+
+
+def run_parsed_args(args, config_loader, workflow_result_loader): # pylint: disable=too-many-branches
+    """Runs a step, or workflow, as given by the parsed arguments.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments to run a step, or workflow, with.
+    config_loader : callable or None
+        Called with the -c/--config paths to get the Config to run with.
+    workflow_result_loader : callable or None
+        Called with the working directory path and results file name to get the results
+        of previous steps to run with.
+
+    See Also
+    --------
+    run
+    """
+    # validate args
+    for config_file in args.config:
+        if not os.path.exists(config_file) or os.stat(config_file).st_size == 0:
+            print_error('specified -c/--config must exist and not be empty')
+            sys.exit(101)
+
+    if config_loader is None:
+        if args.config_cache_dir:
+            config_loader = ConfigSnapshotCache(args.config_cache_dir).load
+        else:
+            config_loader = Config
+
+    try:
+        config = config_loader(args.config)
+    except (ValueError, AssertionError) as error:
+        print_error(f"specified -c/--config is invalid configuration: {error}")
+        sys.exit(102)
+
+    if args.workflow:
+        try:
+            workflow = StepRunner.parse_workflow(args.workflow)
+        except (OSError, ValueError, AssertionError) as error:
+            print_error(f"specified -w/--workflow is invalid workflow: {error}")
+            sys.exit(103)
+    else:
         config.set_step_config_overrides(args.step, args.step_config)
-        step_runner = StepRunner(config, args.results_dir)
 
+    step_result_cache = None
+    if not args.no_cache:
+        step_result_cache = StepResultCache(
+            cache_dir_path=args.cache_dir,
+            max_size=args.cache_max_size * 1024 * 1024
+        )
+
+    step_runner = StepRunner(
+        config=config,
+        results_dir_path=args.results_dir,
+        results_format=args.results_format,
+        step_result_cache=step_result_cache,
+        config_dump=args.config_dump
+    )
+
+    if args.workflow:
         try:
-            if not step_runner.run_step(args.step, args.environment):
-                print_error(f"Step {args.step} not successful")
+            if not step_runner.run_workflow(
+                workflow=workflow,
+                environment=args.environment,
+                max_workers=args.workflow_max_workers,
+                workflow_result=load_workflow_result(step_runner, workflow_result_loader)
+            ):
+                print_error(f"Workflow {args.workflow} not successful")
                 sys.exit(200)
 
         except Exception as error:  # pylint: disable=broad-except
-            print_error(f"Fatal error calling step ({args.step}): {str(error)}")
+            print_error(f"Fatal error running workflow ({args.workflow}): {str(error)}")
             track = traceback.format_exc()
             print(track)
             sys.exit(300)
 
+        return
+
+    try:
+        if not step_runner.run_step(
+            args.step,
+            args.environment,
+            workflow_result=load_workflow_result(step_runner, workflow_result_loader)
+        ):
+            print_error(f"Step {args.step} not successful")
+            sys.exit(200)
+
+    except Exception as error:  # pylint: disable=broad-except
+        print_error(f"Fatal error calling step ({args.step}): {str(error)}")
+        track = traceback.format_exc()
+        print(track)
+        sys.exit(300)
+
+
+def load_workflow_result(step_runner, workflow_result_loader):
+    """Loads the results of previous steps for the given StepRunner with the given loader.
+
+    Parameters
+    ----------
+    step_runner : StepRunner
+        StepRunner to load the results of previous steps for.
+    workflow_result_loader : callable or None
+        Called with the working directory path and results file name to get the results
+        of previous steps.
+
+    Returns
+    -------
+    WorkflowResult or None
+        Results of previous steps from the given loader, or
+        None if no loader given.
+    """
+    if workflow_result_loader is None:
+        return None
+
+    return workflow_result_loader(step_runner.work_dir_path, step_runner.results_file_name)
+
+
+def serve(argv):
+    """Runs the psr daemon serving requests from psr clients until idle or interrupted.
+
+    Parameters
+    ----------
+    argv : list of str
+        Arguments to run the daemon with.
+    """
+    parser = argparse.ArgumentParser(
+        prog='psr serve',
+        description='Ploigos Step Runner (psr) daemon keeping configuration and the results ' \
+            'of previous steps in memory between runs of psr with --daemon-socket.'
+    )
+    parser.add_argument(
+        '--socket',
+        default=os.environ.get(DAEMON_SOCKET_ENV_VAR),
+        required=DAEMON_SOCKET_ENV_VAR not in os.environ,
+        help='Unix domain socket to listen on. ' \
+            f'Default: value of the {DAEMON_SOCKET_ENV_VAR} environment variable.'
+    )
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        help='Stop after this many seconds without any requests. Default: never stop.'
+    )
+    args = parser.parse_args(argv)
+
+    step_runner_daemon = StepRunnerDaemon(args.socket, run)
+    print(f"psr daemon listening on {args.socket}")
+    sys.stdout.flush()
+    try:
+        step_runner_daemon.serve(idle_timeout=args.idle_timeout)
+    except StepRunnerException as error:
+        print_error(f"specified --socket can not be listened on: {error}")
+        sys.exit(104)
+    except KeyboardInterrupt:
+        pass
+
+
+def logs(argv):
+    """Writes the compressed logs of the output of the tools run by a step, decompressed,
+    to stdout, or with --decompress, to the path of each log.
+
+    Parameters
+    ----------
+    argv : list of str
+        Arguments to get the logs with.
+    """
+    parser = argparse.ArgumentParser(
+        prog='psr logs',
+        description='Ploigos Step Runner (psr) logs of the output of the tools run by a step.'
+    )
+    parser.add_argument(
+        'step',
+        help='Step to write the logs of.'
+    )
+    parser.add_argument(
+        '--work-dir',
+        default='step-runner-working',
+        help='Working directory the step was run with. Default: step-runner-working.'
+    )
+    parser.add_argument(
+        '--log',
+        help='Only write the logs with this file name, EG: mvn_test_output.txt.'
+    )
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument(
+        '--tail',
+        action='store_true',
+        help='Only write the uncompressed end of each log.'
+    )
+    output_group.add_argument(
+        '--decompress',
+        action='store_true',
+        help='Write each log decompressed to its path, the path reported by the step result ' \
+            'artifact of the log, EG: maven-output, rather than to stdout.'
+    )
+    args = parser.parse_args(argv)
+
+    log_paths = [
+        log_path for log_path in find_logs(os.path.join(args.work_dir, args.step))
+        if args.log is None or os.path.basename(log_path) == args.log
+    ]
+    if not log_paths:
+        print_error(f"No logs found for step ({args.step}) in working directory ({args.work_dir})")
+        sys.exit(105)
+
+    if args.decompress:
+        for log_path in log_paths:
+            decompress_log(log_path)
+            print(log_path)
+        return
+
+    sys.stdout.flush()
+    out_stream = sys.stdout.buffer
+    for log_path in log_paths:
+        if len(log_paths) > 1:
+            out_stream.write(f"==> {log_path} <==\n".encode('utf-8'))
+
+        if args.tail:
+            with open(get_log_tail_path(log_path), 'rb') as tail_file:
+                out_stream.write(tail_file.read())
+        else:
+            copy_log(log_path, out_stream)
+    out_stream.flush()
+
+
+def main(argv=None):
+    """Main entry point for Ploigos step runner.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv[:1] == ['serve']:
+        serve(argv[1:])
+        return
+
+    if argv[:1] == ['logs']:
+        logs(argv[1:])
+        return
+
+    args = parse_args(argv)
+
+    if args.daemon_socket:
+        try:
+            exit_code = run_in_daemon(args.daemon_socket, argv)
+        except OSError as error:
+            print_error(
+                f"WARNING: psr daemon not listening on --daemon-socket ({args.daemon_socket}), " \
+                f"running without it: {error}"
+            )
+        else:
+            if exit_code:
+                sys.exit(exit_code)
+            return
+
+    run(argv)
+
 
 def init():
     """
@@ -2,6 +2,7 @@
 """
 
 from ploigos_step_runner.config.config import Config
+from ploigos_step_runner.config.config_snapshot_cache import ConfigSnapshotCache
 from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.config.config_value_decryptor import ConfigValueDecryptor
 from ploigos_step_runner.config.step_config import StepConfig
@@ -4,12 +4,14 @@
 import copy
 import glob
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 
 from ploigos_step_runner.decryption_utils import DecryptionUtils
 from ploigos_step_runner.config.step_config import StepConfig
 from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.utils.file import parse_yaml_or_json_file
 from ploigos_step_runner.utils.dict import deep_merge
+from ploigos_step_runner.utils.immutable import FrozenDict, freeze
 
 class Config:
     """Representation of configuration for Ploigos workflow.
@@ -27,9 +29,11 @@ class Config:
 
     Attributes
     ----------
-    __global_defaults : dict
-    __global_environment_defaults : dict
+    __global_defaults : FrozenDict
+    __global_environment_defaults : FrozenDict
     __step_configs : dict of str (step names) to StepConfig
+    __config_decryptors_definitions : list of dict
+        Decryptor definitions registered with DecryptionUtils while adding configuration.
 
     Raises
     ------
@@ -46,39 +50,48 @@ class Config:
     CONFIG_KEY_SUB_STEP_NAME = 'name'
     CONFIG_KEY_SUB_STEP_CONFIG = 'config'
     CONFIG_KEY_SUB_STEP_ENVIRONMENT_CONFIG = 'environment-config'
+    CONFIG_KEY_SUB_STEPS = 'sub-steps'
     CONFIG_KEY_DECRYPTORS = 'config-decryptors'
     CONFIG_KEY_DECRYPTOR_IMPLEMENTER = 'implementer'
     CONFIG_KEY_DECRYPTOR_CONFIG = 'config'
 
+    # maximum number of files of a config directory to parse at once
+    CONFIG_FILES_PARSE_MAX_WORKERS = 16
+
+    __EMPTY_DEFAULTS = FrozenDict()
+
     def __init__(self, config=None):
-        self.__global_defaults = {}
-        self.__global_environment_defaults = {}
+        self.__global_defaults = Config.__EMPTY_DEFAULTS
+        self.__global_environment_defaults = Config.__EMPTY_DEFAULTS
         self.__step_configs = {}
+        self.__config_decryptors_definitions = []
 
         if config is not None:
             self.add_config(config)
 
     @property
     def global_defaults(self):
-        """Get a deep copy of the global defaults.
+        """Get a read only view of the global defaults.
 
         Returns
         -------
-        dict
-            Deep copy of the global defaults.
+        FrozenDict
+            Read only view of the global defaults, see FrozenDict.to_mutable for a copy
+            that can be changed.
         """
-        return copy.deepcopy(self.__global_defaults)
+        return self.__global_defaults
 
     @property
     def global_environment_defaults(self):
-        """Deep copy of all global environment defaults for all environments.
+        """Read only view of all global environment defaults for all environments.
 
         Returns
         -------
-        dict
-            deep copy of all global environment defaults.
+        FrozenDict
+            Read only view of all global environment defaults, see FrozenDict.to_mutable
+            for a copy that can be changed.
         """
-        return copy.deepcopy(self.__global_environment_defaults)
+        return self.__global_environment_defaults
 
     @property
     def step_configs(self):
@@ -89,8 +102,47 @@ class Config:
         """
         return self.__step_configs
 
+    @property
+    def config_decryptors_definitions(self):
+        """
+        Returns
+        -------
+        list of dict
+            Deep copy of the decryptor definitions registered with DecryptionUtils while adding
+            configuration, to register them again when using this Config in another process.
+        """
+        return copy.deepcopy(self.__config_decryptors_definitions)
+
+    @staticmethod
+    def get_config_files(config_paths):
+        """Gets the config files add_config parses for the given config paths.
+
+        Parameters
+        ----------
+        config_paths : list of str
+            Config files, or directories containing config files.
+
+        Returns
+        -------
+        list of str
+            Config files, sorted within each directory, and the given config paths that
+            are not directories.
+        """
+        config_files = []
+        for config_path in config_paths:
+            if os.path.isdir(config_path):
+                config_files += sorted(
+                    config_dir_file for config_dir_file in
+                    glob.glob(config_path + '/**', recursive=True)
+                    if os.path.isfile(config_dir_file)
+                )
+            else:
+                config_files.append(config_path)
+
+        return config_files
+
     def get_global_environment_defaults_for_environment(self, env):
-        """Get a deep copy of all of the global environment defaults or for a given an environment.
+        """Get a read only view of the global environment defaults for a given an environment.
 
         Parameters
         ----------
@@ -100,17 +152,14 @@ class Config:
 
         Returns
         -------
-        dict
-            Deep copy of the global environment defaults for the given environment
+        FrozenDict
+            Read only view of the global environment defaults for the given environment
             or empty dict if no environment given or environment does not exist in the defaults
         """
-        if env is not None:
-            if env in self.__global_environment_defaults:
-                global_environment_defaults = copy.deepcopy(self.__global_environment_defaults[env])
-            else:
-                global_environment_defaults = {}
+        if env is not None and env in self.__global_environment_defaults:
+            global_environment_defaults = self.__global_environment_defaults[env]
         else:
-            global_environment_defaults = {}
+            global_environment_defaults = Config.__EMPTY_DEFAULTS
 
         return global_environment_defaults
 
@@ -187,19 +236,14 @@ class Config:
             if os.path.isfile(config):
                 self.__add_config_file(config)
             elif os.path.isdir(config):
-                # for each recursively found file in the directory add the config file
-                config_dir_files = glob.glob(config + '/**', recursive=True)
-                found_nested_file = False
-                for config_dir_file in config_dir_files:
-                    if os.path.isfile(config_dir_file):
-                        found_nested_file = True
-                        self.__add_config_file(config_dir_file)
-
-                if not found_nested_file:
+                config_dir_files = Config.get_config_files([config])
+                if not config_dir_files:
                     raise ValueError(
                         f"Given config string ({config}) is a directory" +
                         " with no recursive children files."
                     )
+
+                self.__add_config_files(config_dir_files)
             else:
                 raise ValueError(
                     f"Given config string ({config}) is not a valid path."
@@ -243,27 +287,104 @@ class Config:
         Raises
         ------
         ValueError
-            If can not parse given file as YAML or JSON
+            If can not parse given file as YAML or JSON, or it conflicts with the config
+            already added.
         AssertionError
             If dictionary parsed from given YAML or JSON file is not a valid config.
         """
-        # parse the configuration file
+        self.__add_parsed_config_file(config_file, Config.__parse_config_file(config_file))
+
+    def __add_config_files(self, config_files):
+        """Adds JSON or YAML files as config to this Config.
+
+        Notes
+        -----
+        The files are parsed concurrently, since reading many small files from network backed
+        volumes is bound by the latency of each read, but are added one after the other in the
+        given order so that errors merging them are the same on every run.
+
+        Parameters
+        ----------
+        config_files : list of str (file paths)
+            Paths to existing YAML or JSON files to parse and validate as configurations
+            to add to this Config, in the order to add them.
+
+        Raises
+        ------
+        ValueError
+            If can not parse any of the given files as YAML or JSON, or they conflict
+            with each other or the config already added.
+        AssertionError
+            If dictionary parsed from any of the given YAML or JSON files is not a valid config.
+        """
+        if len(config_files) == 1:
+            self.__add_config_file(config_files[0])
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(config_files), Config.CONFIG_FILES_PARSE_MAX_WORKERS)
+        ) as executor:
+            parsed_config_files = executor.map(Config.__parse_config_file, config_files)
+            for config_file, parsed_config_file in zip(config_files, parsed_config_files):
+                self.__add_parsed_config_file(config_file, parsed_config_file)
+
+    @staticmethod
+    def __parse_config_file(config_file):
+        """Parses a JSON or YAML config file.
+
+        Parameters
+        ----------
+        config_file : str (file path)
+            A string that is a path to an existing YAML or JSON file to parse.
+
+        Returns
+        -------
+        dict
+            Dictionary parsed from given YAML or JSON file.
+
+        Raises
+        ------
+        ValueError
+            If can not parse given file as YAML or JSON
+        """
         try:
-            parsed_config_file = parse_yaml_or_json_file(config_file)
+            return parse_yaml_or_json_file(config_file)
         except ValueError as error:
             raise ValueError(
                 f"Error parsing config file ({config_file}) as json or yaml"
             ) from error
 
-        # add the config parsed from file
+    def __add_parsed_config_file(self, config_file, parsed_config_file):
+        """Adds the config parsed from a JSON or YAML file to this Config.
+
+        Parameters
+        ----------
+        config_file : str (file path)
+            Path to the YAML or JSON file the given config was parsed from.
+        parsed_config_file : dict
+            Dictionary parsed from the given file to validate as a configuration
+            and to add to this Config.
+
+        Raises
+        ------
+        ValueError
+            If given dictionary conflicts with the config already added.
+        AssertionError
+            If given dictionary is not a valid config.
+        """
         try:
             self.__add_config_dict(parsed_config_file, config_file)
         except AssertionError as error:
             raise AssertionError(
                 f"Failed to add parsed configuration file ({config_file}): {error}"
             ) from error
+        except ValueError as error:
+            # NOTE: such as conflicting leaf keys with the files already added
+            raise ValueError(
+                f"Failed to add parsed configuration file ({config_file}): {error}"
+            ) from error
 
-    def __add_config_dict(self, config_dict, source_file_path=None): # pylint: disable=too-many-locals, too-many-branches
+    def __add_config_dict(self, config_dict, source_file_path=None): # pylint: disable=too-many-locals, too-many-branches, too-many-statements
         """Add a configuration dictionary to the list of configuration dictionaries.
 
         Parameters
@@ -296,11 +417,12 @@ class Config:
             f"{config_dict}"
 
         # if file path given use that as the source when creating ConfigValue objects
-        # else use a copy of the given configuration dictionary
+        # else use a read only copy of the given configuration dictionary,
+        # shared by all of the ConfigValue objects created from it
         if source_file_path is not None:
             parent_source = source_file_path
         else:
-            parent_source = copy.deepcopy(config_dict)
+            parent_source = freeze(config_dict)
 
         # convert all the leaves of the configuration dictionary under
         # the Config.CONFIG_KEY to ConfigValue objects
@@ -316,39 +438,53 @@ class Config:
             # else assume step config
             if key == Config.CONFIG_KEY_GLOBAL_DEFAULTS:
                 try:
-                    self.__global_defaults = deep_merge(
-                        copy.deepcopy(self.__global_defaults),
-                        copy.deepcopy(value)
-                    )
+                    self.__global_defaults = freeze(deep_merge(
+                        self.__global_defaults.to_mutable(),
+                        value
+                    ))
                 except ValueError as error:
                     raise ValueError(
                         f"Error merging global defaults: {error}"
                     ) from error
+
+                self.__clear_runtime_step_config_caches()
             elif key == Config.CONFIG_KEY_GLOBAL_ENVIRONMENT_DEFAULTS:
+                global_environment_defaults = dict(self.__global_environment_defaults)
                 for env, env_config in value.items():
-                    if env not in self.__global_environment_defaults:
-                        self.__global_environment_defaults[env] = {
+                    if env in global_environment_defaults:
+                        env_defaults = global_environment_defaults[env].to_mutable()
+                    else:
+                        env_defaults = {
                             Config.CONFIG_KEY_ENVIRONMENT_NAME: env
                         }
 
                     try:
-                        self.__global_environment_defaults[env] = deep_merge(
-                            copy.deepcopy(self.__global_environment_defaults[env]),
-                            copy.deepcopy(env_config)
+                        global_environment_defaults[env] = freeze(
+                            deep_merge(env_defaults, env_config)
                         )
                     except ValueError as error:
                         raise ValueError(
                             f"Error merging global environment ({env}) defaults: {error}"
                         ) from error
+                self.__global_environment_defaults = FrozenDict(global_environment_defaults)
+
+                self.__clear_runtime_step_config_caches()
             elif key == Config.CONFIG_KEY_DECRYPTORS:
                 config_decryptor_definitions = ConfigValue.convert_leaves_to_values(value)
                 Config.parse_and_register_decryptors_definitions(config_decryptor_definitions)
+                self.__config_decryptors_definitions += copy.deepcopy(
+                    config_decryptor_definitions
+                )
             else:
                 step_name = key
                 step_config = value
 
-                # if step_config is dict then assume step with single sub step
-                if isinstance(step_config, dict):
+                # if step_config is dict with sub steps key then assume step with options
+                #   and list of sub steps
+                # else if step_config is dict then assume step with single sub step
+                if isinstance(step_config, dict) and Config.CONFIG_KEY_SUB_STEPS in step_config:
+                    sub_steps = self.__add_step_options(step_name, step_config)
+                elif isinstance(step_config, dict):
                     sub_steps = [step_config]
                 elif isinstance(step_config, list):
                     sub_steps = step_config
@@ -394,6 +530,55 @@ class Config:
                         sub_step_env_config=sub_step_env_config
                     )
 
+    def __add_step_options(self, step_name, step_config):
+        """Adds the options of a step configured as a dictionary of step options and
+        list of sub steps.
+
+        Parameters
+        ----------
+        step_name : str
+            Name of the step to add the options for.
+        step_config : dict
+            Step options and sub steps, under the Config.CONFIG_KEY_SUB_STEPS key,
+            converted to ConfigValue objects.
+
+        Returns
+        -------
+        list
+            Sub steps of the step.
+
+        Raises
+        ------
+        AssertionError
+            If the sub steps are not a list.
+            If any step option is unknown or invalid.
+        ValueError
+            If the step options have duplicative keys to existing step options.
+        """
+        sub_steps = step_config[Config.CONFIG_KEY_SUB_STEPS]
+        assert isinstance(sub_steps, list), \
+            f"Expected step ({step_name}) to have {Config.CONFIG_KEY_SUB_STEPS}" + \
+            f" ({sub_steps}) of type list but got: {type(sub_steps)}"
+
+        step_options = ConfigValue.convert_leaves_to_values({
+            option: option_value for option, option_value in step_config.items()
+            if option != Config.CONFIG_KEY_SUB_STEPS
+        })
+
+        if step_name not in self.step_configs:
+            self.step_configs[step_name] = StepConfig(self, step_name)
+        self.step_configs[step_name].add_step_options(step_options)
+
+        return sub_steps
+
+    def __clear_runtime_step_config_caches(self):
+        """Invalidates the cached runtime step configuration of every sub step since the
+        global defaults or global environment defaults they were merged from have changed.
+        """
+        for step_config in self.step_configs.values():
+            for sub_step_config in step_config.sub_steps:
+                sub_step_config.clear_runtime_step_config_cache()
+
     @staticmethod
     def parse_and_register_decryptors_definitions(decryptors_definitions):
         """Parse decryptor definitions from a list and then register them with the DecryptionUtils.
@@ -0,0 +1,296 @@
+"""Cache of compiled snapshots of Config so that each run of psr does not parse, merge, and
+convert to ConfigValues the same configuration files again.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import stat
+import sys
+import tempfile
+
+from ploigos_step_runner.config.config import Config
+from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.config.step_config import StepConfig
+from ploigos_step_runner.config.sub_step_config import SubStepConfig
+from ploigos_step_runner.utils.immutable import FrozenDict
+
+
+class ConfigSnapshotCache:
+    """Cache of compiled snapshots of Config, one for each set of config paths, that are
+    rebuilt only when any of the config files they were parsed from change.
+
+    Notes
+    -----
+    A snapshot is the pickled Config, with its global defaults, global environment defaults,
+    step configurations, and decryptor definitions, after the header recording the path, size,
+    modification time, and content hash of each config file it was parsed from.
+
+    A snapshot is used if the content hash of each config file is unchanged. The content hash of
+    a file is only computed again if its size or modification time changed, so a fresh checkout
+    of unchanged config files still uses the snapshot.
+
+    Step config overrides are not part of snapshots since they are set after loading the Config.
+
+    Since snapshots are unpickled, which can run arbitrary code, the cache directory is created
+    so that only its owner can access it, and snapshots are neither read from nor written to
+    a cache directory that is not owned by the current user or that others can write to.
+
+    Parameters
+    ----------
+    cache_dir_path : str
+        Path to the directory to store snapshots in.
+
+    Attributes
+    ----------
+    __cache_dir_path : str
+    """
+
+    __SNAPSHOT_FORMAT_VERSION = 1
+    __TEMP_FILE_PREFIX = '.tmp-'
+    __HASH_READ_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir_path):
+        self.__cache_dir_path = cache_dir_path
+
+    @property
+    def cache_dir_path(self):
+        """
+        Returns
+        -------
+        str
+            Path to the directory snapshots are stored in.
+        """
+        return self.__cache_dir_path
+
+    def load(self, config_paths):
+        """Gets the Config for the given config paths from its snapshot, if the config files are
+        unchanged since the snapshot, or else parses the config files and snapshots the Config.
+
+        Parameters
+        ----------
+        config_paths : list of str
+            Config files, or directories containing config files.
+
+        Returns
+        -------
+        Config
+            Config for the given config paths, with its decryptors registered with
+            DecryptionUtils.
+
+        Raises
+        ------
+        ValueError
+            If given config is not valid.
+        AssertionError
+            If given config contains any invalid configurations.
+        """
+        if not self.__is_cache_dir_trusted():
+            return Config(config_paths)
+
+        snapshot_path = self.__get_snapshot_path(config_paths)
+        config_files = Config.get_config_files(config_paths)
+
+        snapshot_files_fingerprint, files_fingerprint, config = \
+            ConfigSnapshotCache.__read_snapshot(snapshot_path, config_files)
+        if config is not None:
+            Config.parse_and_register_decryptors_definitions(config.config_decryptors_definitions)
+
+            # record the new sizes and modification times of unchanged files, such as after a
+            # fresh checkout, so that their content is not hashed again next time
+            if files_fingerprint != snapshot_files_fingerprint:
+                self.__write_snapshot(snapshot_path, files_fingerprint, config)
+
+            return config
+
+        config = Config(config_paths)
+        try:
+            files_fingerprint = ConfigSnapshotCache.__get_files_fingerprint(
+                config_files,
+                snapshot_files_fingerprint or []
+            )
+        except OSError:
+            return config
+
+        self.__write_snapshot(snapshot_path, files_fingerprint, config)
+        return config
+
+    def __is_cache_dir_trusted(self):
+        """
+        Returns
+        -------
+        bool
+            True if the cache directory does not exist yet, or is owned by the current user and
+            can not be written to by others, False otherwise.
+        """
+        try:
+            cache_dir_stat = os.stat(self.__cache_dir_path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+        if hasattr(os, 'getuid') and cache_dir_stat.st_uid != os.getuid():
+            return False
+        return not cache_dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def __get_snapshot_path(self, config_paths):
+        """
+        Returns
+        -------
+        str
+            Path of the snapshot of the Config for the given config paths.
+        """
+        config_paths_key = hashlib.sha256(json.dumps([
+            os.path.abspath(config_path) for config_path in config_paths
+        ]).encode('utf-8')).hexdigest()
+        return os.path.join(self.__cache_dir_path, f'config-{config_paths_key}.pkl')
+
+    @staticmethod
+    def __read_snapshot(snapshot_path, config_files):
+        """Reads the given snapshot, only unpickling the Config if the given config files are
+        unchanged since the snapshot.
+
+        Returns
+        -------
+        tuple
+            Fingerprint of the config files of the snapshot, or None if there is no readable
+            snapshot, fingerprint of the given config files, or None if it was not computed,
+            and the Config of the snapshot, or None if there is no snapshot or it is out of date.
+        """
+        snapshot_files_fingerprint = None
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                header = pickle.load(snapshot_file)
+                if header['version'] != ConfigSnapshotCache.__get_version():
+                    return None, None, None
+
+                snapshot_files_fingerprint = header['files']
+                files_fingerprint = ConfigSnapshotCache.__get_files_fingerprint(
+                    config_files,
+                    snapshot_files_fingerprint
+                )
+                if ConfigSnapshotCache.__get_files_hashes(files_fingerprint) != \
+                        ConfigSnapshotCache.__get_files_hashes(snapshot_files_fingerprint):
+                    return snapshot_files_fingerprint, files_fingerprint, None
+
+                return snapshot_files_fingerprint, files_fingerprint, pickle.load(snapshot_file)
+        except Exception: # pylint: disable=broad-except
+            # NOTE: a missing or unreadable snapshot, such as one written by a different version
+            #       of psr, or a config file that can not be read, is the same as no snapshot,
+            #       the Config is parsed again, raising any errors with the config files
+            return snapshot_files_fingerprint, None, None
+
+    def __write_snapshot(self, snapshot_path, files_fingerprint, config):
+        """Writes the snapshot of the given Config parsed from config files with the given
+        fingerprint, leaving any existing snapshot as is if the new snapshot can not be written.
+        """
+        temp_file_path = None
+        try:
+            header = {
+                'version': ConfigSnapshotCache.__get_version(),
+                'files': files_fingerprint
+            }
+
+            os.makedirs(self.__cache_dir_path, mode=0o700, exist_ok=True)
+            temp_file_descriptor, temp_file_path = tempfile.mkstemp(
+                prefix=ConfigSnapshotCache.__TEMP_FILE_PREFIX,
+                dir=self.__cache_dir_path
+            )
+            with os.fdopen(temp_file_descriptor, 'wb') as temp_file:
+                pickle.dump(header, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(config, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_path, snapshot_path)
+            temp_file_path = None
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            pass
+        finally:
+            if temp_file_path is not None and os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    @staticmethod
+    def __get_version():
+        """
+        Returns
+        -------
+        list
+            Version of snapshots, so that snapshots of Configs pickled by a different
+            implementation of the configuration classes are not used.
+        """
+        return [ConfigSnapshotCache.__SNAPSHOT_FORMAT_VERSION] + [
+            ConfigSnapshotCache.__get_file_stat(sys.modules[config_class.__module__].__file__)
+            for config_class in [Config, ConfigValue, StepConfig, SubStepConfig, FrozenDict]
+        ]
+
+    @staticmethod
+    def __get_files_fingerprint(file_paths, previous_files_fingerprint):
+        """
+        Parameters
+        ----------
+        file_paths : list of str
+            Files to get the fingerprint of.
+        previous_files_fingerprint : list of list
+            Fingerprint of the files of the previous snapshot, to reuse the content hash of
+            the files whose size and modification time are unchanged.
+
+        Returns
+        -------
+        list of list
+            Absolute path, size, modification time, and content hash of each of the given files.
+
+        Raises
+        ------
+        OSError
+            If any of the given files can not be read.
+        """
+        previous_file_hashes = {
+            (file_path, file_size, file_mtime): file_hash
+            for file_path, file_size, file_mtime, file_hash in previous_files_fingerprint
+        }
+
+        files_fingerprint = []
+        for file_path in file_paths:
+            file_path = os.path.abspath(file_path)
+            file_size, file_mtime = ConfigSnapshotCache.__get_file_stat(file_path)
+            file_hash = previous_file_hashes.get((file_path, file_size, file_mtime))
+            if file_hash is None:
+                file_hash = ConfigSnapshotCache.__get_file_hash(file_path)
+            files_fingerprint.append([file_path, file_size, file_mtime, file_hash])
+
+        return files_fingerprint
+
+    @staticmethod
+    def __get_files_hashes(files_fingerprint):
+        """
+        Returns
+        -------
+        list of tuple
+            Path and content hash of each file of the given files fingerprint.
+        """
+        return [(file_path, file_hash) for file_path, _, _, file_hash in files_fingerprint]
+
+    @staticmethod
+    def __get_file_stat(file_path):
+        """
+        Returns
+        -------
+        tuple
+            Size and modification time of the given file.
+        """
+        file_stat = os.stat(file_path)
+        return file_stat.st_size, file_stat.st_mtime_ns
+
+    @staticmethod
+    def __get_file_hash(file_path):
+        """
+        Returns
+        -------
+        str
+            Hex digest of the contents of the given file.
+        """
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(ConfigSnapshotCache.__HASH_READ_SIZE), b''):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
@@ -1,12 +1,17 @@
 """Representation of a configuration value.
 """
 
-import copy
 from ploigos_step_runner.decryption_utils import DecryptionUtils
+from ploigos_step_runner.utils.immutable import FrozenDict, FrozenList, FrozenPath, freeze
 
 class ConfigValue:
     """Representation of a configuration value.
 
+    Notes
+    -----
+    Configuration values can not be changed, so copies of them are the same configuration value,
+    rather than copies of the value and of the source it came from.
+
     Parameters
     ----------
     value : any
@@ -14,27 +19,31 @@ class ConfigValue:
     parent_source : str file path or dict
         Path to the YML or JSON file that this value is found in or
         the dict that this value is found in.
-    path_parts : list
+    path_parts : list or FrozenPath
         List of path to the element that this is the value for.
 
     Attributes
     ----------
     __value : any
-        The value of the config option this is the value for.
-    __parent_source : str file path or dict
+        The value of the config option this is the value for, read only if a dict or list.
+    __parent_source : str file path or FrozenDict
         Path to the YML or JSON file that this value is found in or
-        the dict that this value is found in.
-    __path_parts : list
+        read only view of the dict that this value is found in.
+    __path_parts : FrozenPath
         List of path to the element that this is the value for.
     """
 
-    def __init__(self, value, parent_source=None, path_parts=None):
-        self.__value = value
-        self.__parent_source = parent_source
-        self.__path_parts = path_parts
+    __slots__ = ('__value', '__parent_source', '__path_parts')
 
-        if self.__path_parts is None:
-            self.__path_parts = []
+    def __init__(self, value, parent_source=None, path_parts=None):
+        # NOTE: freezing a parent source that is already frozen does not copy it, so that
+        #       all of the values from the same dict can share one read only copy of it
+        self.__value = freeze(value)
+        self.__parent_source = freeze(parent_source)
+        if isinstance(path_parts, FrozenPath):
+            self.__path_parts = path_parts
+        else:
+            self.__path_parts = FrozenPath(path_parts if path_parts is not None else [])
 
     @property
     def value(self):
@@ -73,36 +82,37 @@ class ConfigValue:
         Returns
         -------
         obj
-            Value of this configuration value as originally given.
+            Value of this configuration value as originally given,
+            as a read only view if a dict or list.
 
         See Also
         --------
         value
         """
-        return copy.deepcopy(self.__value)
+        return self.__value
 
     @property
     def path_parts(self):
-        """Gets copy of the list of path to the element that this is the value for.
+        """Gets read only view of the list of path to the element that this is the value for.
 
         Returns
         -------
-        list
-            Copy of the list of path to the element that this is the value for.
+        FrozenPath
+            Read only view of the list of path to the element that this is the value for.
         """
-        return copy.deepcopy(self.__path_parts)
+        return self.__path_parts
 
     @property
     def parent_source(self):
-        """Get a copy of the source that this configuration value came from.
+        """Get a read only view of the source that this configuration value came from.
 
         Returns
         -------
-        str file path or dict
+        str file path or FrozenDict
             Path to the YML or JSON file that this value is found in or
-            the dict that this value is found in.
+            read only view of the dict that this value is found in.
         """
-        return copy.deepcopy(self.__parent_source)
+        return self.__parent_source
 
     def __eq__(self, other):
         """Equality for this object.
@@ -127,6 +137,12 @@ class ConfigValue:
 
         return equal
 
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __repr__(self):
         """Human readable representation of the object.
 
@@ -166,24 +182,49 @@ class ConfigValue:
         --------
         ConfigValue.convert_leaves_to_config_values
         """
-        if path_parts is None:
-            path_parts = []
+        # NOTE: freeze the parent source, and start the path, once so that all of the leaves
+        #       share the same read only parent source and the paths of their parents
+        return ConfigValue.__convert_leaves_to_config_values(
+            values=values,
+            parent_source=freeze(parent_source),
+            path=FrozenPath(path_parts if path_parts is not None else [])
+        )
+
+    @staticmethod
+    def __convert_leaves_to_config_values(values, parent_source, path):
+        """In place recursively change all of the leaves of the given
+        object to a ConfigValue objects.
+
+        Parameters
+        ----------
+        values : dict, list, tuple, ConfigValue, None, obj
+            Change all the leaves of the given object to ConfigValue objects.
+        parent_source : str file path or FrozenDict
+            Path to the YML or JSON file that this value is found in or
+            read only view of the dict that this value is found in.
+        path : FrozenPath
+            Path to the element that this is the value for.
 
+        Returns
+        -------
+        dict, list, None, or ConfigValue
+            See convert_leaves_to_config_values.
+        """
         if isinstance(values, dict): # pylint: disable=no-else-return
             for child_key in values:
-                values[child_key] = ConfigValue.convert_leaves_to_config_values(
+                values[child_key] = ConfigValue.__convert_leaves_to_config_values(
                     values=values[child_key],
                     parent_source=parent_source,
-                    path_parts=(path_parts + [child_key])
+                    path=path.child(child_key)
                 )
 
             return values
         elif isinstance(values, (list, tuple)):
             for child_key, child_value in enumerate(values):
-                values[child_key] = ConfigValue.convert_leaves_to_config_values(
+                values[child_key] = ConfigValue.__convert_leaves_to_config_values(
                     values=child_value,
                     parent_source=parent_source,
-                    path_parts=(path_parts + [child_key])
+                    path=path.child(child_key)
                 )
 
             return values
@@ -195,7 +236,7 @@ class ConfigValue:
             return ConfigValue(
                 value=values,
                 parent_source=parent_source,
-                path_parts=path_parts
+                path_parts=path
             )
 
     @staticmethod
@@ -204,7 +245,7 @@ class ConfigValue:
 
         Parameters
         ----------
-        values : dict, list, ConfigValue, or obj
+        values : dict, list, FrozenDict, FrozenList, ConfigValue, or obj
             A collection where the leaves contain ConfigValue to transform back to
             ConfigValue.value
 
@@ -215,6 +256,9 @@ class ConfigValue:
                 ConfigValue to ConfigValue.value.
             If given a list returns that dictionary with all leaves transformed from
                 ConfigValue to ConfigValue.value.
+            If given a FrozenDict or FrozenList returns a new dictionary or list, since they
+                can not be changed in place, with all leaves transformed from
+                ConfigValue to ConfigValue.value.
             If given a ConfigValue returns ConfigValue.value
             If any other object returns that object
 
@@ -232,6 +276,13 @@ class ConfigValue:
                 values[child_key] = ConfigValue.convert_leaves_to_values(child_value)
 
             return values
+        elif isinstance(values, FrozenDict):
+            return {
+                child_key: ConfigValue.convert_leaves_to_values(child_value)
+                for child_key, child_value in values.items()
+            }
+        elif isinstance(values, FrozenList):
+            return [ConfigValue.convert_leaves_to_values(child_value) for child_value in values]
         elif isinstance(values, ConfigValue):
             return values.value
         else:
@@ -1,4 +1,9 @@
 """Decryptors for configuration values.
 """
 
-from ploigos_step_runner.config.decryptors.sops import SOPS
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the decryptors, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'SOPS': 'sops'
+})
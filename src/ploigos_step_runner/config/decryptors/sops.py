@@ -5,14 +5,20 @@ Also See
 https://github.com/mozilla/sops
 """
 
+from collections.abc import Mapping
 from io import StringIO
 import json
 import os.path
 import re
 import sys
+import threading
+
 import sh
 
 from ploigos_step_runner.config.config_value_decryptor import ConfigValueDecryptor
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
+from ploigos_step_runner.utils.immutable import to_mutable
+from ploigos_step_runner.utils.io import get_thread_stream
 
 class SOPS(ConfigValueDecryptor):
     """ConfigValueDecryptor that uses SOPS to decyrpt ConfigValues
@@ -21,6 +27,18 @@ class SOPS(ConfigValueDecryptor):
     ----------
     additional_sops_args : list
         Additional arguments to pass to the SOPS command
+    batch_decrypt : bool, optional
+        False to invoke SOPS once per value to decrypt, extracting only that value.
+        True to invoke SOPS once per parent source, decrypting the entire parent source
+        and then serving all values from that parent source from the decrypted copy
+        held in memory by this decryptor.
+
+    Attributes
+    ----------
+    __additional_sops_args : list
+    __batch_decrypt : bool
+    __decrypted_parent_sources : dict
+        Parent source key to decrypted parent source when batch decrypting.
 
     Also See
     --------
@@ -29,14 +47,29 @@ class SOPS(ConfigValueDecryptor):
 
     SOPS_ENCRYPTED_VALUE_REGEX = r'^ENC\[.*\]$'
 
-    def __init__(self, additional_sops_args=None):
+    def __init__(self, additional_sops_args=None, batch_decrypt=False):
         self.__additional_sops_args = additional_sops_args
 
         if not self.__additional_sops_args:
             self.__additional_sops_args = []
 
+        self.__batch_decrypt = batch_decrypt
+        self.__decrypted_parent_sources = {}
+        self.__decrypted_parent_sources_lock = threading.Lock()
+
         super().__init__()
 
+    @property
+    def batch_decrypt(self):
+        """
+        Returns
+        -------
+        bool
+            True if decrypting entire parent sources at once.
+            False if decrypting one value at a time.
+        """
+        return self.__batch_decrypt
+
     def can_decrypt(self, config_value):
         """Determine if a given config value can be decrypted by this decryptor.
 
@@ -74,14 +107,182 @@ class SOPS(ConfigValueDecryptor):
         ------
         RuntimeError
             If error attempting to run 'sops' command
+            If batch decrypting and the value path does not exist in the decrypted parent source
         ValueError
             If given config_value#parent_source is of type string but is not a path to a file
                 that exists
             If config_value#parent_source is not of type dict or str
         """
-        decrypted_value = None
+        if self.batch_decrypt:
+            decrypted_parent_source = self.__get_decrypted_parent_source(config_value)
+            return SOPS.__get_value_from_decrypted_parent_source(
+                config_value,
+                decrypted_parent_source
+            )
+
         sops_path = SOPS.get_sops_value_path(config_value)
+        target_file, stdin, input_type_arg = SOPS.__get_sops_target(config_value)
+
+        try:
+            # use sops to decrypt the value
+            out = StringIO()
+            sh_command_with_metrics(sh.sops)( # pylint: disable=no-member
+                '--decrypt',
+                f'--extract={sops_path}',
+                input_type_arg,
+                target_file,
+                _in=stdin,
+                _out=out,
+                _err=get_thread_stream(sys.stderr),
+                *self.__additional_sops_args
+            )
+            decrypted_value = out.getvalue()
+        except sh.ErrorReturnCode as error:
+            raise RuntimeError(
+                f"Error invoking sops when trying to decrypt config value ({config_value}): {error}"
+            ) from error
+
+        return decrypted_value
+
+    def __get_decrypted_parent_source(self, config_value):
+        """Gets the fully decrypted parent source of the given ConfigValue, invoking SOPS
+        to decrypt the entire parent source only if it has not already been decrypted.
+
+        Parameters
+        ----------
+        config_value : ConfigValue
+            ConfigValue to get the decrypted parent source of.
+
+        Returns
+        -------
+        dict
+            Decrypted parent source of the given ConfigValue.
+
+        Raises
+        ------
+        RuntimeError
+            If error attempting to run 'sops' command
+        ValueError
+            If given config_value#parent_source is of type string but is not a path to a file
+                that exists
+            If config_value#parent_source is not of type dict or str
+        """
+        target_file, stdin, input_type_arg = SOPS.__get_sops_target(config_value)
+
+        # NOTE: include the modification time and size of file parent sources so that
+        #       if the file changes it is decrypted again
+        if stdin is None:
+            target_file_stat = os.stat(target_file)
+            parent_source_key = (
+                os.path.abspath(target_file),
+                target_file_stat.st_mtime_ns,
+                target_file_stat.st_size
+            )
+        else:
+            parent_source_key = stdin
+
+        with self.__decrypted_parent_sources_lock:
+            if parent_source_key in self.__decrypted_parent_sources:
+                return self.__decrypted_parent_sources[parent_source_key]
+
+            try:
+                # use sops to decrypt the entire parent source
+                out = StringIO()
+                sh_command_with_metrics(sh.sops)( # pylint: disable=no-member
+                    '--decrypt',
+                    '--output-type=json',
+                    input_type_arg,
+                    target_file,
+                    _in=stdin,
+                    _out=out,
+                    _err=get_thread_stream(sys.stderr),
+                    *self.__additional_sops_args
+                )
+                decrypted_parent_source = json.loads(out.getvalue())
+            except sh.ErrorReturnCode as error:
+                raise RuntimeError(
+                    "Error invoking sops when trying to decrypt parent source of" +
+                    f" config value ({config_value}): {error}"
+                ) from error
+            except ValueError as error:
+                raise RuntimeError(
+                    "Error parsing sops output when trying to decrypt parent source of" +
+                    f" config value ({config_value}): {error}"
+                ) from error
+
+            # drop any previously decrypted versions of the same file
+            if stdin is None:
+                for stale_parent_source_key in [
+                    key for key in self.__decrypted_parent_sources \
+                        if isinstance(key, tuple) and key[0] == parent_source_key[0]
+                ]:
+                    del self.__decrypted_parent_sources[stale_parent_source_key]
+
+            self.__decrypted_parent_sources[parent_source_key] = decrypted_parent_source
 
+        return decrypted_parent_source
+
+    @staticmethod
+    def __get_value_from_decrypted_parent_source(config_value, decrypted_parent_source):
+        """Walks the path parts of the given ConfigValue through the given decrypted parent
+        source to get the decrypted value.
+
+        Parameters
+        ----------
+        config_value : ConfigValue
+            ConfigValue to get the decrypted value of.
+        decrypted_parent_source : dict
+            Decrypted parent source of the given ConfigValue.
+
+        Returns
+        -------
+        str
+            Decrypted value of the ConfigValue formatted the same as SOPS would when extracting
+            the single value.
+
+        Raises
+        ------
+        RuntimeError
+            If the path parts of the given ConfigValue do not exist in the decrypted
+            parent source.
+        """
+        decrypted_value = decrypted_parent_source
+        try:
+            for path_part in config_value.path_parts:
+                decrypted_value = decrypted_value[path_part]
+        except (KeyError, IndexError, TypeError) as error:
+            raise RuntimeError(
+                f"Error extracting config value ({config_value}) from decrypted parent source:" +
+                f" path ({SOPS.get_sops_value_path(config_value)}) does not exist"
+            ) from error
+
+        if not isinstance(decrypted_value, str):
+            decrypted_value = json.dumps(decrypted_value)
+
+        return decrypted_value
+
+    @staticmethod
+    def __get_sops_target(config_value):
+        """Gets the target file, standard in, and input type argument to invoke SOPS with to
+        decrypt values from the parent source of the given ConfigValue.
+
+        Parameters
+        ----------
+        config_value : ConfigValue
+            ConfigValue to get the SOPS target for.
+
+        Returns
+        -------
+        tuple of (str, str or None, str or None)
+            Target file, standard in, and input type argument to invoke SOPS with.
+
+        Raises
+        ------
+        ValueError
+            If given config_value#parent_source is of type string but is not a path to a file
+                that exists
+            If config_value#parent_source is not of type dict or str
+        """
         # if source is a string assume it is a file path and decrypt from that
         # else if source is a dict then dump to json and decrypt from that
         # else error
@@ -98,9 +299,9 @@ class SOPS(ConfigValueDecryptor):
                     f"Given config value ({config_value}) parent source ({parent_source}) " +
                     "is of type (str) but is not a path to a file that exists"
                 )
-        elif isinstance(parent_source, dict):
+        elif isinstance(parent_source, Mapping):
             target_file = '/dev/stdin'
-            stdin = json.dumps(parent_source)
+            stdin = json.dumps(to_mutable(parent_source))
             input_type_arg = '--input-type=json'
         else:
             raise ValueError(
@@ -108,26 +309,7 @@ class SOPS(ConfigValueDecryptor):
                 f"is expected to be of type dict or str but is of type: {type(parent_source)}"
             )
 
-        try:
-            # use sops to decrypt the value
-            out = StringIO()
-            sh.sops( # pylint: disable=no-member
-                '--decrypt',
-                f'--extract={sops_path}',
-                input_type_arg,
-                target_file,
-                _in=stdin,
-                _out=out,
-                _err=sys.stderr,
-                *self.__additional_sops_args
-            )
-            decrypted_value = out.getvalue()
-        except sh.ErrorReturnCode as error:
-            raise RuntimeError(
-                f"Error invoking sops when trying to decrypt config value ({config_value}): {error}"
-            ) from error
-
-        return decrypted_value
+        return target_file, stdin, input_type_arg
 
     @staticmethod
     def get_sops_value_path(config_value):
@@ -4,6 +4,7 @@
 import copy
 
 from ploigos_step_runner.config.sub_step_config import SubStepConfig
+from ploigos_step_runner.utils.dict import deep_merge
 
 
 class StepConfig:
@@ -22,13 +23,40 @@ class StepConfig:
     __step_name : str
     __sub_steps : list of SubStepConfig
     __sub_step_config_overrides : dict
+    __step_options : dict
+        Options for how to run the sub steps of this step.
     """
 
+    STEP_OPTION_PARALLEL = 'parallel'
+    STEP_OPTION_MAX_WORKERS = 'max-workers'
+    STEP_OPTION_FAIL_FAST = 'fail-fast'
+    STEP_OPTION_CACHE = 'cache'
+    STEP_OPTION_CACHE_SOURCE_PATHS = 'cache-source-paths'
+    STEP_OPTION_CONFIG_DUMP = 'config-dump'
+    STEP_OPTIONS = [
+        STEP_OPTION_PARALLEL,
+        STEP_OPTION_MAX_WORKERS,
+        STEP_OPTION_FAIL_FAST,
+        STEP_OPTION_CACHE,
+        STEP_OPTION_CACHE_SOURCE_PATHS,
+        STEP_OPTION_CONFIG_DUMP
+    ]
+
+    CONFIG_DUMP_NONE = 'none'
+    CONFIG_DUMP_KEYS = 'keys'
+    CONFIG_DUMP_FULL = 'full'
+    CONFIG_DUMPS = [
+        CONFIG_DUMP_NONE,
+        CONFIG_DUMP_KEYS,
+        CONFIG_DUMP_FULL
+    ]
+
     def __init__(self, parent_config, step_name):
         self.__parent_config = parent_config
         self.__step_name = step_name
         self.__sub_steps = []
         self.__step_config_overrides = {}
+        self.__step_options = {}
 
     @property
     def parent_config(self):
@@ -79,6 +107,135 @@ class StepConfig:
 
         return None
 
+    @property
+    def parallel(self):
+        """
+        Returns
+        -------
+        bool
+            True to run the sub steps of this step concurrently.
+            False to run the sub steps of this step one after the other.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_PARALLEL, False)
+
+    @property
+    def max_workers(self):
+        """
+        Returns
+        -------
+        int
+            Maximum number of sub steps of this step to run concurrently if running them
+            in parallel, or None to run all of the sub steps concurrently.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_MAX_WORKERS)
+
+    @property
+    def fail_fast(self):
+        """
+        Returns
+        -------
+        bool
+            True to not start any more sub steps of this step once one is not successful.
+            False to run all of the sub steps of this step even if one is not successful.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_FAIL_FAST, True)
+
+    @property
+    def cache(self):
+        """
+        Returns
+        -------
+        bool
+            True to skip running a sub step of this step if a cached result of running the
+            sub step with the same inputs exists and restore the cached result instead.
+            False to always run the sub steps of this step.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_CACHE, False)
+
+    @property
+    def cache_source_paths(self):
+        """
+        Returns
+        -------
+        list of str
+            Files, or directories of files, whose contents are inputs of the sub steps of
+            this step when deciding if a cached result can be used.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_CACHE_SOURCE_PATHS, [])
+
+    @property
+    def config_dump(self):
+        """
+        Returns
+        -------
+        str or None
+            How much of the configuration of the sub steps of this step to print before running
+            them, one of CONFIG_DUMPS, or None to print as much as given to the StepRunner.
+        """
+        return self.__step_options.get(StepConfig.STEP_OPTION_CONFIG_DUMP)
+
+    def add_step_options(self, step_options):
+        """Adds options for how to run the sub steps of this step.
+
+        Parameters
+        ----------
+        step_options : dict
+            Options for how to run the sub steps of this step.
+            See STEP_OPTIONS.
+
+        Raises
+        ------
+        AssertionError
+            If given step options has an unknown option or an option with an invalid value.
+        ValueError
+            If given step options has duplicative keys to existing step options.
+        """
+        unknown_step_options = set(step_options) - set(StepConfig.STEP_OPTIONS)
+        assert not unknown_step_options, \
+            f"Step ({self.step_name}) has unknown step options" + \
+            f" ({sorted(unknown_step_options)})," + \
+            f" expected any of: {StepConfig.STEP_OPTIONS}"
+
+        for step_option in [
+            StepConfig.STEP_OPTION_PARALLEL,
+            StepConfig.STEP_OPTION_FAIL_FAST,
+            StepConfig.STEP_OPTION_CACHE
+        ]:
+            if step_option in step_options:
+                assert isinstance(step_options[step_option], bool), \
+                    f"Step ({self.step_name}) option ({step_option}) must be a bool" + \
+                    f" but got: {step_options[step_option]}"
+
+        if StepConfig.STEP_OPTION_MAX_WORKERS in step_options:
+            max_workers = step_options[StepConfig.STEP_OPTION_MAX_WORKERS]
+            assert isinstance(max_workers, int) and not isinstance(max_workers, bool) \
+                and max_workers > 0, \
+                f"Step ({self.step_name}) option ({StepConfig.STEP_OPTION_MAX_WORKERS})" + \
+                f" must be a positive int but got: {max_workers}"
+
+        if StepConfig.STEP_OPTION_CACHE_SOURCE_PATHS in step_options:
+            cache_source_paths = step_options[StepConfig.STEP_OPTION_CACHE_SOURCE_PATHS]
+            assert isinstance(cache_source_paths, list) and \
+                all(isinstance(path, str) for path in cache_source_paths), \
+                f"Step ({self.step_name}) option ({StepConfig.STEP_OPTION_CACHE_SOURCE_PATHS})" + \
+                f" must be a list of paths but got: {cache_source_paths}"
+
+        if StepConfig.STEP_OPTION_CONFIG_DUMP in step_options:
+            config_dump = step_options[StepConfig.STEP_OPTION_CONFIG_DUMP]
+            assert config_dump in StepConfig.CONFIG_DUMPS, \
+                f"Step ({self.step_name}) option ({StepConfig.STEP_OPTION_CONFIG_DUMP})" + \
+                f" must be one of {StepConfig.CONFIG_DUMPS} but got: {config_dump}"
+
+        try:
+            self.__step_options = deep_merge(
+                copy.deepcopy(self.__step_options),
+                copy.deepcopy(step_options)
+            )
+        except ValueError as error:
+            raise ValueError(
+                f"Error merging step ({self.step_name}) options: {error}"
+            ) from error
+
     @property
     def step_config_overrides(self):
         """Gets a deep copy of the step configuration overrides.
@@ -101,6 +258,9 @@ class StepConfig:
         """
         self.__step_config_overrides = step_config_overrides if step_config_overrides else {}
 
+        for sub_step in self.sub_steps:
+            sub_step.clear_runtime_step_config_cache()
+
     def add_or_update_sub_step_config(
             self,
             sub_step_name,
@@ -2,9 +2,11 @@
 """
 
 import copy
+from types import MappingProxyType
 
 from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.utils.dict import deep_merge
+from ploigos_step_runner.utils.immutable import FrozenDict, freeze, to_mutable
 
 
 class SubStepConfig:
@@ -28,10 +30,16 @@ class SubStepConfig:
     __parent_step_config : StepConfig
     __sub_step_name : str
     __sub_step_implementer_name : str
-    __sub_step_config_dict : dict
-    __sub_step_env_config : dict
+    __sub_step_config_dict : FrozenDict
+    __sub_step_env_config : FrozenDict
+    __runtime_step_config_cache : list of tuple
+        Previously merged runtime step configurations as
+        (environment, defaults, merged runtime step configuration) tuples.
     """
 
+    __RUNTIME_STEP_CONFIG_CACHE_MAX_SIZE = 8
+    __EMPTY_CONFIG = FrozenDict()
+
     def __init__( # pylint: disable=too-many-arguments
             self,
             parent_step_config,
@@ -46,11 +54,13 @@ class SubStepConfig:
 
         if sub_step_config_dict is None:
             sub_step_config_dict = {}
-        self.__sub_step_config_dict = sub_step_config_dict
+        self.__sub_step_config_dict = freeze(sub_step_config_dict)
 
         if sub_step_env_config is None:
             sub_step_env_config = {}
-        self.__sub_step_env_config = sub_step_env_config
+        self.__sub_step_env_config = freeze(sub_step_env_config)
+
+        self.__runtime_step_config_cache = []
 
     @property
     def parent_config(self):
@@ -116,14 +126,15 @@ class SubStepConfig:
 
     @property
     def sub_step_config(self):
-        """Get a deep copy of the sub step configuration.
+        """Get a read only view of the sub step configuration.
 
         Returns
         -------
-        dict
-            Deep copy of the sub step configuration.
+        FrozenDict
+            Read only view of the sub step configuration, see FrozenDict.to_mutable
+            for a copy that can be changed.
         """
-        return copy.deepcopy(self.__sub_step_config_dict)
+        return self.__sub_step_config_dict
 
     @property
     def global_defaults(self):
@@ -131,8 +142,8 @@ class SubStepConfig:
 
         Returns
         -------
-        dict
-            Deep copy of the global defaults
+        FrozenDict
+            Read only view of the global defaults
         """
         return self.parent_config.global_defaults
 
@@ -142,10 +153,11 @@ class SubStepConfig:
 
         Returns
         -------
-        dict
-            The environment specific configuration for all environments for this sub step.
+        FrozenDict
+            Read only view of the environment specific configuration for all environments
+            for this sub step.
         """
-        return copy.deepcopy(self.__sub_step_env_config)
+        return self.__sub_step_env_config
 
     def get_global_environment_defaults(self, env):
         """Convince function for getting the global environment defaults from the parent config.
@@ -157,8 +169,8 @@ class SubStepConfig:
 
         Returns
         -------
-        dict
-            Deep copy of the global defaults for a given environment
+        FrozenDict
+            Read only view of the global defaults for a given environment
         """
         return self.parent_config.get_global_environment_defaults_for_environment(env)
 
@@ -172,14 +184,14 @@ class SubStepConfig:
 
         Returns
         -------
-        dict
-            Environment specific sub step configuration.
-            Empty dict if no environment specific sub step configuration.
+        FrozenDict
+            Read only view of the environment specific sub step configuration.
+            Empty if no environment specific sub step configuration.
         """
-        if env in self.sub_step_env_config:
-            sub_step_env_config = self.sub_step_env_config[env]
+        if env in self.__sub_step_env_config:
+            sub_step_env_config = self.__sub_step_env_config[env]
         else:
-            sub_step_env_config = {}
+            sub_step_env_config = SubStepConfig.__EMPTY_CONFIG
 
         return sub_step_env_config
 
@@ -199,11 +211,12 @@ class SubStepConfig:
         """
 
         if new_sub_step_config is not None:
+            self.clear_runtime_step_config_cache()
             try:
-                self.__sub_step_config_dict = deep_merge(
-                    self.sub_step_config,
-                    copy.deepcopy(new_sub_step_config)
-                )
+                self.__sub_step_config_dict = freeze(deep_merge(
+                    to_mutable(self.__sub_step_config_dict),
+                    to_mutable(new_sub_step_config)
+                ))
             except ValueError as error:
                 raise ValueError(
                     "Error merging new sub step configuration" +
@@ -229,11 +242,12 @@ class SubStepConfig:
         """
 
         if new_sub_step_env_config is not None:
+            self.clear_runtime_step_config_cache()
             try:
-                self.__sub_step_env_config = deep_merge(
-                    self.__sub_step_env_config,
-                    copy.deepcopy(new_sub_step_env_config)
-                )
+                self.__sub_step_env_config = freeze(deep_merge(
+                    to_mutable(self.__sub_step_env_config),
+                    to_mutable(new_sub_step_env_config)
+                ))
             except ValueError as error:
                 raise ValueError(
                     "Error merging new sub step environment configuration" +
@@ -241,6 +255,16 @@ class SubStepConfig:
                     f" for sub step ({self.sub_step_name}) of step ({self.step_name}): {error}"
                 ) from error
 
+    def clear_runtime_step_config_cache(self):
+        """Invalidates any previously merged runtime step configurations.
+
+        Notes
+        -----
+        Must be called whenever any of the configuration sources merged into the runtime
+        step configuration change.
+        """
+        self.__runtime_step_config_cache = []
+
     def get_config_value(self, key, environment=None, defaults=None):
         """Get the configuration value for a given configuration key from the
         merged set of configuration sources.
@@ -281,7 +305,7 @@ class SubStepConfig:
             if isinstance(runtime_step_config[key], ConfigValue):
                 value = runtime_step_config[key].value
             else:
-                value = copy.deepcopy(runtime_step_config[key])
+                value = to_mutable(runtime_step_config[key])
         else:
             value = None
 
@@ -319,7 +343,7 @@ class SubStepConfig:
         """
         defaults = defaults if defaults else {}
 
-        return copy.deepcopy(self.__merge_runtime_step_config(environment, defaults))
+        return to_mutable(dict(self.__merge_runtime_step_config(environment, defaults)))
 
     def __merge_runtime_step_config(self, environment=None, defaults=None):
         """Take all of the context about this sub step merges together a single dictionary
@@ -336,9 +360,11 @@ class SubStepConfig:
 
         Notes
         -----
-        This is not intended to be accessed outside of this class since it gives direct access
-        to the underlying dictionaries which could in theory be changed, which would not be the
-        intended use.
+        This is not intended to be accessed outside of this class.
+
+        The merged runtime step configuration is cached per environment and defaults until
+        clear_runtime_step_config_cache is called and is returned as a read only view so that
+        the cached configuration can not be changed by callers.
 
         Parameters
         ----------
@@ -350,16 +376,30 @@ class SubStepConfig:
 
         Returns
         -------
-        dict
-            Merged runtime step configuration
+        MappingProxyType
+            Read only view of the merged runtime step configuration
         """
         defaults = defaults if defaults else {}
 
-        return {
+        for cached_environment, cached_defaults, cached_runtime_step_config \
+                in self.__runtime_step_config_cache:
+            if cached_environment == environment and cached_defaults == defaults:
+                return cached_runtime_step_config
+
+        runtime_step_config = MappingProxyType({
             **defaults,
             **self.global_defaults,
             **self.get_global_environment_defaults(environment),
             **self.sub_step_config,
             **self.get_sub_step_env_config(environment),
             **self.step_config_overrides,
-        }
+        })
+
+        runtime_step_config_cache = self.__runtime_step_config_cache
+        runtime_step_config_cache.append(
+            (environment, copy.deepcopy(defaults), runtime_step_config)
+        )
+        if len(runtime_step_config_cache) > SubStepConfig.__RUNTIME_STEP_CONFIG_CACHE_MAX_SIZE:
+            runtime_step_config_cache.pop(0)
+
+        return runtime_step_config
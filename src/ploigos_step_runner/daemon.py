@@ -0,0 +1,637 @@
+"""Persistent step runner daemon that keeps the parsed configuration and the results of
+previous steps in memory between step runs, and the client to run steps with it.
+
+Protocol
+--------
+Clients connect to the daemon over a Unix domain socket and send one request, a single line
+of JSON with the keys:
+
+argv
+    psr command line arguments to run.
+cwd
+    Working directory of the client, relative paths in argv are relative to it.
+env
+    Environment variables of the client.
+
+The daemon responds with lines of JSON until the request completes, each line being one of:
+
+{"stdout": "text"}
+    Text written to stdout while running the request.
+{"stderr": "text"}
+    Text written to stderr while running the request.
+{"exit": code}
+    Exit code of running the request, always the last line.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+from ploigos_step_runner.config.config import Config
+from ploigos_step_runner.decryption_utils import DecryptionUtils
+from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.step_implementer import StepImplementer
+
+DAEMON_SOCKET_ENV_VAR = 'PSR_DAEMON_SOCKET'
+
+RESPONSE_KEY_STDOUT = 'stdout'
+RESPONSE_KEY_STDERR = 'stderr'
+RESPONSE_KEY_EXIT = 'exit'
+
+EXIT_CODE_FATAL_ERROR = 300
+
+
+class DaemonOutputStream(io.TextIOBase):
+    """Text stream that sends everything written to it to a daemon client as responses.
+
+    Parameters
+    ----------
+    response_file : IOBase
+        Binary stream to write the responses to.
+    response_key : str
+        Response key to send text written to this stream with.
+        One of RESPONSE_KEY_STDOUT or RESPONSE_KEY_STDERR.
+    lock : threading.Lock
+        Lock shared by all of the streams writing to the same response_file.
+
+    Attributes
+    ----------
+    __response_file : IOBase
+    __response_key : str
+    __lock : threading.Lock
+    __disconnected : bool
+    """
+
+    def __init__(self, response_file, response_key, lock):
+        self.__response_file = response_file
+        self.__response_key = response_key
+        self.__lock = lock
+        self.__disconnected = False
+        super().__init__()
+
+    @property
+    def disconnected(self):
+        """
+        Returns
+        -------
+        bool
+            True if the client disconnected while writing to this stream.
+        """
+        return self.__disconnected
+
+    def write(self, given):
+        """Sends the given text to the client.
+
+        Notes
+        -----
+        If the client has disconnected the text is dropped rather than failing the
+        step being run so that the results of the step are still recorded.
+
+        Parameters
+        ----------
+        given : str
+            Text to send to the client.
+
+        Returns
+        -------
+        int
+            Length of the given text.
+        """
+        if given and not self.__disconnected:
+            if not send_response(
+                self.__response_file,
+                {self.__response_key: given},
+                self.__lock
+            ):
+                self.__disconnected = True
+
+        return len(given)
+
+    def flush(self):
+        """Flushes the responses sent to the client.
+        """
+        with self.__lock:
+            try:
+                self.__response_file.flush()
+            except (OSError, ValueError):
+                self.__disconnected = True
+
+
+def send_response(response_file, response, lock):
+    """Sends one response to a daemon client.
+
+    Parameters
+    ----------
+    response_file : IOBase
+        Binary stream to write the response to.
+    response : dict
+        Response to send.
+    lock : threading.Lock
+        Lock shared by all of the writers of the given response_file.
+
+    Returns
+    -------
+    bool
+        True if the response was sent.
+        False if the client has disconnected.
+    """
+    with lock:
+        try:
+            response_file.write((json.dumps(response) + '\n').encode('utf-8'))
+            return True
+        except (OSError, ValueError):
+            return False
+
+
+class StepRunnerDaemon: # pylint: disable=too-many-instance-attributes
+    """Serves requests to run psr command lines over a Unix domain socket, keeping the
+    parsed configuration and the results of previous steps in memory between requests.
+
+    Notes
+    -----
+    Requests are run one at a time since each request changes the working directory,
+    the environment variables, and stdout/stderr of the whole process.
+
+    A cached Config is reused as long as none of its files have been added, removed,
+    or modified, and a cached WorkflowResult is reused as long as its files in the working
+    directory have not been modified by anything other than this daemon. Decrypted values are
+    kept warm by DecryptionUtils for as long as requests use the same Config.
+
+    Only the decryptors of the Config used by the last request are registered with
+    DecryptionUtils, so that reloading a changed Config, or switching between Configs,
+    does not keep adding decryptors, or keep the secrets decrypted for other Configs.
+
+    Parameters
+    ----------
+    socket_path : str
+        Path to the Unix domain socket to listen on.
+    run_function : callable
+        Function to run each request with, called with the requested argv and the
+        config_loader and workflow_result_loader keyword arguments.
+        Exits with sys.exit on failure.
+
+    Attributes
+    ----------
+    __socket_path : str
+    __run_function : callable
+    __run_lock : threading.Lock
+        Lock to run one request at a time.
+    __activity_lock : threading.Lock
+        Lock for tracking the requests being run.
+    __shutdown_event : threading.Event
+    __active_requests : int
+    __last_request_time : float
+    __configs : dict
+        Parsed Config keyed by absolute config paths with the fingerprint of its files.
+    __decryptors_config : Config
+        Config whose decryptors are registered with DecryptionUtils, if any.
+    __workflow_results : dict
+        Loaded WorkflowResult keyed by absolute result file paths with the fingerprint
+        of the result files.
+    __request_workflow_result_keys : set
+        Keys of the WorkflowResults loaded by the request being run.
+    """
+
+    POLL_INTERVAL_SECONDS = 0.5
+
+    def __init__(self, socket_path, run_function):
+        self.__socket_path = socket_path
+        self.__run_function = run_function
+        self.__run_lock = threading.Lock()
+        self.__activity_lock = threading.Lock()
+        self.__shutdown_event = threading.Event()
+        self.__active_requests = 0
+        self.__last_request_time = time.monotonic()
+        self.__configs = {}
+        self.__decryptors_config = None
+        self.__workflow_results = {}
+        self.__request_workflow_result_keys = set()
+
+    @property
+    def socket_path(self):
+        """
+        Returns
+        -------
+        str
+            Path to the Unix domain socket this daemon listens on.
+        """
+        return self.__socket_path
+
+    def serve(self, idle_timeout=None, ready_event=None):
+        """Listens on the socket and serves requests until shutdown, or until idle for the
+        given timeout.
+
+        Parameters
+        ----------
+        idle_timeout : float, optional
+            Seconds without any requests after which to stop serving.
+            Default: serve until shutdown.
+        ready_event : threading.Event, optional
+            Event to set once listening on the socket.
+
+        Raises
+        ------
+        StepRunnerException
+            If another daemon is already listening on the socket, or the socket path
+            exists and is not a socket.
+        """
+        self.__remove_stale_socket()
+
+        # NOTE: only the user running the daemon may connect since requests run as that user
+        original_umask = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(
+                self.__socket_path,
+                _StepRunnerDaemonRequestHandler
+            )
+        finally:
+            os.umask(original_umask)
+
+        server.step_runner_daemon = self
+        server.timeout = StepRunnerDaemon.POLL_INTERVAL_SECONDS
+        try:
+            if ready_event is not None:
+                ready_event.set()
+
+            while not self.__shutdown_event.is_set() and not self.__is_idle(idle_timeout):
+                server.handle_request()
+        finally:
+            server.server_close()
+            if os.path.exists(self.__socket_path):
+                os.remove(self.__socket_path)
+
+    def shutdown(self):
+        """Stops serving once the request being run, if any, completes.
+        """
+        self.__shutdown_event.set()
+
+    def run_request(self, argv, cwd, env, stdout, stderr):
+        """Runs the given psr command line as if run by the client in the given working
+        directory with the given environment variables.
+
+        Parameters
+        ----------
+        argv : list of str
+            psr command line arguments to run.
+        cwd : str
+            Working directory to run the command line in.
+        env : dict
+            Environment variables to run the command line with.
+        stdout : IOBase
+            Stream to write stdout to.
+        stderr : IOBase
+            Stream to write stderr to.
+
+        Returns
+        -------
+        int
+            Exit code of running the command line.
+        """
+        with self.__activity_lock:
+            self.__active_requests += 1
+
+        try:
+            with self.__run_lock:
+                self.__request_workflow_result_keys = set()
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    try:
+                        with self.__request_environment(cwd, env):
+                            exit_code = self.__run_argv(argv)
+                    except OSError as error:
+                        print(
+                            f"Error running psr daemon request in directory ({cwd}): {error}",
+                            file=sys.stderr
+                        )
+                        exit_code = EXIT_CODE_FATAL_ERROR
+
+                self.__update_workflow_results(exit_code)
+                return exit_code
+        finally:
+            with self.__activity_lock:
+                self.__active_requests -= 1
+                self.__last_request_time = time.monotonic()
+
+    def load_config(self, config_paths):
+        """Gets the Config for the given config paths, parsing it only if not already parsed
+        or if any of its files changed since it was parsed.
+
+        Parameters
+        ----------
+        config_paths : list of str
+            Config files, or directories containing config files.
+
+        Returns
+        -------
+        Config
+            Config for the given config paths without any step config overrides.
+
+        Raises
+        ------
+        ValueError
+            If given config is not valid.
+        AssertionError
+            If given config contains any invalid configurations.
+        """
+        config_paths = [os.path.abspath(config_path) for config_path in config_paths]
+        config_key = tuple(config_paths)
+        fingerprint = StepRunnerDaemon.__get_files_fingerprint(
+            Config.get_config_files(config_paths)
+        )
+
+        cached_config = self.__configs.get(config_key)
+        if cached_config is not None and cached_config[0] == fingerprint:
+            config = cached_config[1]
+
+            # overrides only apply to the request that gave them
+            for step_name in list(config.step_configs):
+                config.set_step_config_overrides(step_name, None)
+
+            if config is not self.__decryptors_config:
+                DecryptionUtils.reset()
+                self.__decryptors_config = config
+                Config.parse_and_register_decryptors_definitions(
+                    config.config_decryptors_definitions
+                )
+
+            return config
+
+        # NOTE: parsing the config registers its decryptors,
+        #       so first unregister those of the previous config
+        DecryptionUtils.reset()
+        self.__decryptors_config = None
+        config = Config(config_paths)
+        self.__decryptors_config = config
+        self.__configs[config_key] = (fingerprint, config)
+        return config
+
+    def load_workflow_result(self, work_dir_path, results_file_name):
+        """Gets the results of previous steps from the given working directory, loading them
+        only if not already loaded or if the result files changed since they were loaded.
+
+        Parameters
+        ----------
+        work_dir_path : str
+            Path to the working folder the results of previous steps were written to.
+        results_file_name : str
+            Name of the results file the results of previous steps were written to.
+
+        Returns
+        -------
+        WorkflowResult
+            Results of previous steps.
+        """
+        file_paths = tuple(
+            os.path.abspath(file_path) for file_path in
+            StepImplementer.get_workflow_result_file_paths(work_dir_path, results_file_name)
+        )
+        self.__request_workflow_result_keys.add(file_paths)
+
+        cached_workflow_result = self.__workflow_results.get(file_paths)
+        if cached_workflow_result is not None and \
+                cached_workflow_result[0] == StepRunnerDaemon.__get_files_fingerprint(file_paths):
+            return cached_workflow_result[1]
+
+        workflow_result = StepImplementer.load_workflow_result(work_dir_path, results_file_name)
+        self.__workflow_results[file_paths] = (None, workflow_result)
+        return workflow_result
+
+    def __run_argv(self, argv):
+        """Runs the given psr command line.
+
+        Returns
+        -------
+        int
+            Exit code of running the command line.
+        """
+        try:
+            self.__run_function(
+                argv,
+                config_loader=self.load_config,
+                workflow_result_loader=self.load_workflow_result
+            )
+            exit_code = 0
+        except SystemExit as error:
+            exit_code = error.code
+            if exit_code is None:
+                exit_code = 0
+            elif not isinstance(exit_code, int):
+                print(exit_code, file=sys.stderr)
+                exit_code = 1
+        except Exception as error: # pylint: disable=broad-except
+            print(f"Fatal error running psr daemon request ({argv}): {error}", file=sys.stderr)
+            print(traceback.format_exc(), file=sys.stderr)
+            exit_code = EXIT_CODE_FATAL_ERROR
+
+        return exit_code
+
+    def __update_workflow_results(self, exit_code):
+        """Records the fingerprint of the result files of the WorkflowResults used by the
+        request that just ran so they are reused by the next request.
+
+        Parameters
+        ----------
+        exit_code : int
+            Exit code of the request that just ran.
+        """
+        for file_paths in self.__request_workflow_result_keys:
+            # NOTE: a fatal error may have left the results in memory out of sync with
+            #       the result files so load them from the files next time
+            if exit_code == EXIT_CODE_FATAL_ERROR:
+                self.__workflow_results.pop(file_paths, None)
+            elif file_paths in self.__workflow_results:
+                self.__workflow_results[file_paths] = (
+                    StepRunnerDaemon.__get_files_fingerprint(file_paths),
+                    self.__workflow_results[file_paths][1]
+                )
+
+    def __is_idle(self, idle_timeout):
+        """
+        Returns
+        -------
+        bool
+            True if not running any requests and none have been received for the given
+            idle timeout.
+        """
+        if idle_timeout is None:
+            return False
+
+        with self.__activity_lock:
+            return self.__active_requests == 0 and \
+                time.monotonic() - self.__last_request_time >= idle_timeout
+
+    def __remove_stale_socket(self):
+        """Removes the socket left behind by a daemon that is no longer running.
+
+        Raises
+        ------
+        StepRunnerException
+            If another daemon is already listening on the socket, or the socket path
+            exists and is not a socket.
+        """
+        if not os.path.exists(self.__socket_path):
+            return
+
+        if not stat.S_ISSOCK(os.stat(self.__socket_path).st_mode):
+            raise StepRunnerException(
+                f"Daemon socket path ({self.__socket_path}) exists and is not a socket."
+            )
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(self.__socket_path)
+            except OSError:
+                os.remove(self.__socket_path)
+                return
+
+        raise StepRunnerException(
+            f"Daemon socket ({self.__socket_path}) is already in use by a running daemon."
+        )
+
+    @staticmethod
+    @contextmanager
+    def __request_environment(cwd, env):
+        """Context manager to run a request in the given working directory with the given
+        environment variables, restoring the daemon's own afterwards.
+        """
+        original_cwd = os.getcwd()
+        original_env = dict(os.environ)
+        try:
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(env)
+            yield
+        finally:
+            os.chdir(original_cwd)
+            os.environ.clear()
+            os.environ.update(original_env)
+
+    @staticmethod
+    def __get_files_fingerprint(file_paths):
+        """
+        Returns
+        -------
+        tuple
+            Path, modification time, and size of each of the given files,
+            modification time and size are None for files that do not exist.
+        """
+        fingerprint = []
+        for file_path in file_paths:
+            try:
+                file_stat = os.stat(file_path)
+                fingerprint.append((file_path, file_stat.st_mtime_ns, file_stat.st_size))
+            except OSError:
+                fingerprint.append((file_path, None, None))
+
+        return tuple(fingerprint)
+
+
+class _StepRunnerDaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Reads one request from a daemon client, runs it with the StepRunnerDaemon of the
+    server, and streams the output and exit code back to the client.
+    """
+
+    def handle(self):
+        lock = threading.Lock()
+        step_runner_daemon = self.server.step_runner_daemon
+
+        try:
+            request = json.loads(self.rfile.readline())
+            argv = request['argv']
+            cwd = request['cwd']
+            env = request['env']
+        except (ValueError, TypeError, KeyError) as error:
+            send_response(
+                self.wfile,
+                {RESPONSE_KEY_STDERR: f"Invalid psr daemon request: {error}\n"},
+                lock
+            )
+            send_response(self.wfile, {RESPONSE_KEY_EXIT: EXIT_CODE_FATAL_ERROR}, lock)
+            return
+
+        exit_code = step_runner_daemon.run_request(
+            argv=argv,
+            cwd=cwd,
+            env=env,
+            stdout=DaemonOutputStream(self.wfile, RESPONSE_KEY_STDOUT, lock),
+            stderr=DaemonOutputStream(self.wfile, RESPONSE_KEY_STDERR, lock)
+        )
+        send_response(self.wfile, {RESPONSE_KEY_EXIT: exit_code}, lock)
+
+
+def run_in_daemon(socket_path, argv, stdout=None, stderr=None):
+    """Runs the given psr command line with the daemon listening on the given socket,
+    writing the output of the daemon to stdout/stderr as it is received.
+
+    Parameters
+    ----------
+    socket_path : str
+        Path to the Unix domain socket the daemon listens on.
+    argv : list of str
+        psr command line arguments to run.
+    stdout : IOBase, optional
+        Stream to write the stdout of the daemon to.
+        Default: sys.stdout
+    stderr : IOBase, optional
+        Stream to write the stderr of the daemon to.
+        Default: sys.stderr
+
+    Raises
+    ------
+    OSError
+        If can not connect to a daemon on the given socket.
+        Nothing has been run so it is safe to run the command line without the daemon.
+
+    Returns
+    -------
+    int
+        Exit code of running the command line with the daemon.
+    """
+    if stdout is None:
+        stdout = sys.stdout
+    if stderr is None:
+        stderr = sys.stderr
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        raise
+
+    with client:
+        request = {
+            'argv': argv,
+            'cwd': os.getcwd(),
+            'env': dict(os.environ)
+        }
+
+        try:
+            client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+            with client.makefile('r', encoding='utf-8') as responses:
+                for response_line in responses:
+                    response = json.loads(response_line)
+                    if RESPONSE_KEY_EXIT in response:
+                        return response[RESPONSE_KEY_EXIT]
+                    if RESPONSE_KEY_STDOUT in response:
+                        stdout.write(response[RESPONSE_KEY_STDOUT])
+                        stdout.flush()
+                    if RESPONSE_KEY_STDERR in response:
+                        stderr.write(response[RESPONSE_KEY_STDERR])
+                        stderr.flush()
+        except (OSError, ValueError) as error:
+            print(f"Lost connection to psr daemon ({socket_path}): {error}", file=stderr)
+            return EXIT_CODE_FATAL_ERROR
+
+    print(
+        f"psr daemon ({socket_path}) closed connection without an exit code",
+        file=stderr
+    )
+    return EXIT_CODE_FATAL_ERROR
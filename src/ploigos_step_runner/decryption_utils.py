@@ -1,6 +1,10 @@
 """Shared utilities for doing decryption.
 """
 
+import os.path
+import threading
+from collections import OrderedDict
+
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.utils.io import TextIOSelectiveObfuscator
 from ploigos_step_runner.utils.reflection import import_and_get_class
@@ -12,19 +16,38 @@ class DecryptionUtils:
     Any values that are decrypted are added to the given list of TextIOSelectiveObfuscator
     of strings to obfuscate.
 
+    Decrypted values are memoized in a process wide, size bounded, least recently used cache
+    keyed on the parent source of the ConfigValue (file path and modification time or identity
+    of the read only dict shared by all ConfigValues from that dict), the path parts of the
+    ConfigValue, and the raw (encrypted) value so that repeated access to the same encrypted
+    value does not re-invoke the decryptor.
+
     Attributes
     ----------
     __obfuscation_streams : list of TextIOSelectiveObfuscator
         TextIOSelectiveObfuscators to be sure that any decrypted values are obfuscated
         on those streams.
+    __obfuscation_targets : list
+        Decrypted values that have already been added as obfuscation targets to the
+        obfuscation streams.
     __config_value_decryptors : list of ConfigValueDecryptor
         ConfigValueDecryptors that can be used to decrypt given ConfigValue.
+    __decrypted_value_cache : OrderedDict
+        Cache of previously decrypted values, with the parent source they came from,
+        in least recently used order.
+    __decrypted_value_cache_max_size : int
+        Maximum number of decrypted values to keep in the cache.
     """
 
     __DEFAULT_DECRYPTORS_MODULE = 'ploigos_step_runner.config.decryptors'
+    __DEFAULT_DECRYPTED_VALUE_CACHE_MAX_SIZE = 1024
 
     __obfuscation_streams = []
+    __obfuscation_targets = []
     __config_value_decryptors = []
+    __decrypted_value_cache = OrderedDict()
+    __decrypted_value_cache_max_size = __DEFAULT_DECRYPTED_VALUE_CACHE_MAX_SIZE
+    __decrypted_value_cache_lock = threading.RLock()
 
     @staticmethod
     def register_obfuscation_stream(obfuscator_stream):
@@ -43,6 +66,24 @@ class DecryptionUtils:
         assert isinstance(obfuscator_stream, TextIOSelectiveObfuscator)
         DecryptionUtils.__obfuscation_streams.append(obfuscator_stream)
 
+        # be sure any values decrypted before this stream was registered are obfuscated on it
+        for target in DecryptionUtils.__obfuscation_targets:
+            obfuscator_stream.add_obfuscation_targets(target)
+
+    @staticmethod
+    def unregister_obfuscation_stream(obfuscator_stream):
+        """Remove a previously registered TextIOSelectiveObfuscator so that it is no longer
+        given any newly decrypted values to obfuscate.
+
+        Parameters
+        ----------
+        obfuscator_stream : TextIOSelectiveObfuscator
+            TextIOSelectiveObfuscator to stop adding decrypted values to.
+            Ignored if not registered.
+        """
+        if obfuscator_stream in DecryptionUtils.__obfuscation_streams:
+            DecryptionUtils.__obfuscation_streams.remove(obfuscator_stream)
+
     @staticmethod
     def register_config_value_decryptor(config_value_decryptor):
         """Add a ConfigValueDecryptor that can be used to decrypt ConfigValues.
@@ -61,6 +102,60 @@ class DecryptionUtils:
         assert isinstance(config_value_decryptor, ConfigValueDecryptor)
         DecryptionUtils.__config_value_decryptors.append(config_value_decryptor)
 
+        # a new decryptor could decrypt values differently so invalidate any cached values
+        DecryptionUtils.clear_decrypted_value_cache()
+
+    @staticmethod
+    def reset():
+        """Unregisters all of the ConfigValueDecryptors, and forgets all of the previously
+        decrypted values, such as before registering the decryptors of a reloaded configuration
+        in a long running process.
+
+        Notes
+        -----
+        Registered obfuscation streams are left in place, and keep obfuscating the decrypted
+        values already added to them.
+        """
+        with DecryptionUtils.__decrypted_value_cache_lock:
+            DecryptionUtils.__config_value_decryptors = []
+            DecryptionUtils.__obfuscation_targets = []
+            DecryptionUtils.__decrypted_value_cache.clear()
+
+    @staticmethod
+    def clear_decrypted_value_cache():
+        """Invalidates all previously decrypted values so that the next attempt to decrypt
+        any ConfigValue will use the registered ConfigValueDecryptors.
+
+        Notes
+        -----
+        Already registered obfuscation targets are left in place since a value
+        that was once decrypted should never be leaked.
+        """
+        with DecryptionUtils.__decrypted_value_cache_lock:
+            DecryptionUtils.__decrypted_value_cache.clear()
+
+    @staticmethod
+    def set_decrypted_value_cache_max_size(max_size):
+        """Set the maximum number of decrypted values to keep in the cache.
+
+        Parameters
+        ----------
+        max_size : int
+            Maximum number of decrypted values to keep in the cache.
+            0 to disable caching of decrypted values.
+
+        Raises
+        ------
+        AssertionError
+            If given max_size is not a non negative int.
+        """
+        assert isinstance(max_size, int) and max_size >= 0, \
+            f"Decrypted value cache max size ({max_size}) must be a non negative int."
+
+        with DecryptionUtils.__decrypted_value_cache_lock:
+            DecryptionUtils.__decrypted_value_cache_max_size = max_size
+            DecryptionUtils.__evict_decrypted_values()
+
     @staticmethod
     def create_and_register_config_value_decryptor(
         config_value_decryptor_implementer_name,
@@ -123,7 +218,19 @@ class DecryptionUtils:
         decrypted_value = None
         for config_value_decryptor in DecryptionUtils.__config_value_decryptors:
             if config_value_decryptor.can_decrypt(config_value):
+                cache_key = DecryptionUtils.__get_decrypted_value_cache_key(config_value)
+                with DecryptionUtils.__decrypted_value_cache_lock:
+                    if cache_key in DecryptionUtils.__decrypted_value_cache:
+                        DecryptionUtils.__decrypted_value_cache.move_to_end(cache_key)
+                        _, decrypted_value = DecryptionUtils.__decrypted_value_cache[cache_key]
+                        return decrypted_value
+
                 decrypted_value = config_value_decryptor.decrypt(config_value)
+                DecryptionUtils.__cache_decrypted_value(
+                    cache_key,
+                    config_value.parent_source,
+                    decrypted_value
+                )
                 break
 
         DecryptionUtils.__add_obfuscation_targets(decrypted_value)
@@ -133,9 +240,92 @@ class DecryptionUtils:
     @staticmethod
     def __add_obfuscation_targets(targets):
         if targets is not None:
+            with DecryptionUtils.__decrypted_value_cache_lock:
+                if targets in DecryptionUtils.__obfuscation_targets:
+                    return
+                DecryptionUtils.__obfuscation_targets.append(targets)
+
             for obfuscator_stream in DecryptionUtils.__obfuscation_streams:
                 obfuscator_stream.add_obfuscation_targets(targets)
 
+    @staticmethod
+    def __get_decrypted_value_cache_key(config_value):
+        """Gets the key to cache the decrypted value of the given ConfigValue with.
+
+        Parameters
+        ----------
+        config_value : ConfigValue
+            ConfigValue to get the cache key for.
+
+        Returns
+        -------
+        tuple or None
+            Key to cache the decrypted value of the given ConfigValue with or
+            None if the decrypted value of the given ConfigValue can not be cached.
+        """
+        parent_source = config_value.parent_source
+        if isinstance(parent_source, str):
+            # NOTE: include the modification time and size so that if the file changes
+            #       the previously decrypted value is no longer used
+            try:
+                parent_source_stat = os.stat(parent_source)
+            except OSError:
+                return None
+            parent_source_key = (
+                os.path.abspath(parent_source),
+                parent_source_stat.st_mtime_ns,
+                parent_source_stat.st_size
+            )
+        else:
+            # NOTE: key on the identity of the dict rather than its contents so that getting
+            #       the key does not depend on the size of the configuration. The cache entry
+            #       keeps a reference to the dict so its id can not be reused while cached.
+            parent_source_key = id(parent_source)
+
+        cache_key = (
+            parent_source_key,
+            tuple(config_value.path_parts),
+            config_value.raw_value
+        )
+
+        try:
+            hash(cache_key)
+        except TypeError:
+            cache_key = None
+
+        return cache_key
+
+    @staticmethod
+    def __cache_decrypted_value(cache_key, parent_source, decrypted_value):
+        """Adds the given decrypted value to the cache if it can be cached.
+
+        Parameters
+        ----------
+        cache_key : tuple or None
+            Key to cache the decrypted value with.
+        parent_source : str file path or FrozenDict
+            Parent source of the ConfigValue the decrypted value is for,
+            kept with the decrypted value so that its id is not reused while cached.
+        decrypted_value : obj
+            Decrypted value to cache.
+        """
+        if cache_key is None or decrypted_value is None:
+            return
+
+        with DecryptionUtils.__decrypted_value_cache_lock:
+            DecryptionUtils.__decrypted_value_cache[cache_key] = (parent_source, decrypted_value)
+            DecryptionUtils.__decrypted_value_cache.move_to_end(cache_key)
+            DecryptionUtils.__evict_decrypted_values()
+
+    @staticmethod
+    def __evict_decrypted_values():
+        """Evicts the least recently used decrypted values until the cache is within its
+        maximum size.
+        """
+        while len(DecryptionUtils.__decrypted_value_cache) > \
+                DecryptionUtils.__decrypted_value_cache_max_size:
+            DecryptionUtils.__decrypted_value_cache.popitem(last=False)
+
     @staticmethod
     def __get_decryption_class(decryptor_implementer_name):
         """Given a decryptor implementer name dynamically loads the associated Class.
@@ -1,16 +1,25 @@
+# pylint: disable=too-many-lines
 """Abstract class and helper constants for StepImplementer.
 """
 import os
-import pprint
 import sys
 import textwrap
+import time
 from abc import ABC, abstractmethod
-from contextlib import redirect_stderr, redirect_stdout
+from contextlib import contextmanager
 from pathlib import Path
 
 from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.config.step_config import StepConfig
+from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.step_metrics import StepMetrics
 from ploigos_step_runner.step_result import StepResult
-from ploigos_step_runner.utils.io import TextIOIndenter
+from ploigos_step_runner.step_result_cache import StepResultCache
+from ploigos_step_runner.trace import Tracer
+from ploigos_step_runner.utils.compressed_log import TextIOCompressedLog, get_log_tail_path
+from ploigos_step_runner.utils.io import (ShOutputTee, TextIOIndenter, get_thread_stream,
+                                          redirect_stderr_for_thread,
+                                          redirect_stdout_for_thread)
 from ploigos_step_runner.workflow_result import WorkflowResult
 
 class DefaultSteps:  # pylint: disable=too-few-public-methods
@@ -54,10 +63,26 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         Configuration for this step.
     environment : str
         Environment name to execute this step against
+    results_format : str, optional
+        Format to write the results file in, one of WorkflowResult.RESULTS_FORMATS.
+    workflow_result : WorkflowResult, optional
+        Results of previous steps to use and add the result of this step to.
+        If not given the results of previous steps are loaded from the working directory.
+        Useful for sharing one WorkflowResult between steps run in the same process.
+    step_result_cache : StepResultCache, optional
+        Cache of the results of previous runs of steps to use, and add the result of this step
+        to, if the step enables the cache step option.
+    config_dump : str, optional
+        How much of the configuration of this step to print before running it,
+        one of StepConfig.CONFIG_DUMPS, if the step does not set the config-dump step option.
 
     Attributes
     __config : SubStepConfig
     __environment : str
+    __read_result_keys : set of tuple
+        Keys of the previous step result artifacts read while running this step.
+    __phase : tuple or None
+        Name and start time of the current phase of running this step, if being traced.
     """
 
     __TITLE_LENGTH = 80
@@ -68,16 +93,26 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         results_file_name,
         work_dir_path,
         config,
-        environment=None
+        environment=None,
+        results_format=WorkflowResult.RESULTS_FORMAT_YAML,
+        workflow_result=None,
+        step_result_cache=None,
+        config_dump=StepConfig.CONFIG_DUMP_FULL
     ):
         self.__results_dir_path = results_dir_path
         self.__results_file_name = results_file_name
         self.__work_dir_path = work_dir_path
+        self.__results_format = results_format
 
         self.__config = config
         self.__environment = environment
 
-        self.__workflow_result = None
+        self.__workflow_result = workflow_result
+
+        self.__step_result_cache = step_result_cache
+        self.__config_dump = config_dump
+        self.__read_result_keys = set()
+        self.__phase = None
 
         super().__init__()
 
@@ -106,8 +141,8 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         """
         Returns
         -------
-        dict
-            Step configuration.
+        FrozenDict
+            Read only view of the step configuration.
         """
         return self.config.sub_step_config
 
@@ -126,8 +161,8 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         """
         Returns
         -------
-        dict
-            Step configuration specific to the current environment.
+        FrozenDict
+            Read only view of the step configuration specific to the current environment.
         """
         return self.config.get_sub_step_env_config(self.environment)
 
@@ -136,8 +171,8 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         """
         Returns
         -------
-        dict
-            Global configuration defaults affecting this step.
+        FrozenDict
+            Read only view of the global configuration defaults affecting this step.
         """
         return self.config.global_defaults
 
@@ -146,8 +181,9 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         """
         Returns
         -------
-        dict
-            Global configuration defaults affecting this step specific to the current environment.
+        FrozenDict or dict
+            Read only view of the global configuration defaults affecting this step specific
+            to the current environment, or empty dict if there is no current environment.
         """
 
         if self.environment is not None:
@@ -170,6 +206,16 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         """
         return os.path.join(self.results_dir_path, self.__results_file_name)
 
+    @property
+    def results_format(self):
+        """
+        Returns
+        -------
+        str
+            Format the results file is written in, one of WorkflowResult.RESULTS_FORMATS.
+        """
+        return self.__results_format
+
     @property
     def results_dir_path(self):
         """
@@ -261,11 +307,122 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
             from previous steps.
         """
         if not self.__workflow_result:
-            self.__workflow_result = WorkflowResult.load_from_pickle_file(
-                pickle_filename=self.__workflow_result_pickle_file_path
+            self.__workflow_result = StepImplementer.__load_workflow_result_file(
+                journal_file_path=self.__workflow_result_journal_file_path,
+                pickle_file_path=self.__workflow_result_pickle_file_path
             )
         return self.__workflow_result
 
+    @property
+    def step_result_cache(self):
+        """
+        Returns
+        -------
+        StepResultCache or None
+            Cache of the results of previous runs of steps to use if this step enables the cache
+            step option, or None if results are never cached.
+        """
+        return self.__step_result_cache
+
+    @property
+    def config_dump(self):
+        """
+        Returns
+        -------
+        str
+            How much of the configuration of this step to print before running it,
+            one of StepConfig.CONFIG_DUMPS.
+        """
+        step_config = self.config.parent_step_config
+        if step_config is not None and step_config.config_dump is not None:
+            return step_config.config_dump
+
+        return self.__config_dump
+
+    @staticmethod
+    def load_workflow_result(work_dir_path, results_file_name):
+        """Loads the results of previous steps from the given working directory.
+
+        Parameters
+        ----------
+        work_dir_path : str
+            Path to the working folder the results of previous steps were written to.
+        results_file_name : str
+            Name of the results file the results of previous steps were written to.
+
+        Returns
+        -------
+        WorkflowResult
+            Results of previous steps.
+        """
+        journal_file_path, pickle_file_path = StepImplementer.get_workflow_result_file_paths(
+            work_dir_path=work_dir_path,
+            results_file_name=results_file_name
+        )
+        return StepImplementer.__load_workflow_result_file(
+            journal_file_path=journal_file_path,
+            pickle_file_path=pickle_file_path
+        )
+
+    @staticmethod
+    def get_workflow_result_file_paths(work_dir_path, results_file_name):
+        """Gets the OS paths to the files the results of previous steps are written to
+        in the given working directory.
+
+        Parameters
+        ----------
+        work_dir_path : str
+            Path to the working folder the results of previous steps are written to.
+        results_file_name : str
+            Name of the results file the results of previous steps are written to.
+
+        Returns
+        -------
+        tuple of str
+            OS path to the workflow result journal file and
+            OS path to the workflow result pickle file.
+        """
+        return (
+            StepImplementer.__get_workflow_result_file_path(
+                work_dir_path=work_dir_path,
+                results_file_name=results_file_name,
+                extension='.journal'
+            ),
+            StepImplementer.__get_workflow_result_file_path(
+                work_dir_path=work_dir_path,
+                results_file_name=results_file_name,
+                extension='.pkl'
+            )
+        )
+
+    @staticmethod
+    def __load_workflow_result_file(journal_file_path, pickle_file_path):
+        """Loads the results of previous steps from the given journal file if it exists and
+        is valid, else from the given pickle file.
+
+        Notes
+        -----
+        The pickle file is only rewritten when the journal is compacted, so it is only loaded
+        for working directories written before results were journaled, or if the journal is
+        not valid.
+
+        Returns
+        -------
+        WorkflowResult
+            Results of previous steps.
+        """
+        if os.path.isfile(journal_file_path):
+            try:
+                return WorkflowResult.load_from_journal_file(
+                    journal_filename=journal_file_path
+                )
+            except StepRunnerException:
+                pass
+
+        return WorkflowResult.load_from_pickle_file(
+            pickle_filename=pickle_file_path
+        )
+
     @staticmethod
     @abstractmethod
     def step_implementer_config_defaults():
@@ -329,60 +486,63 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
             'Missing required step configuration or previous step result artifact keys: ' + \
             f'{invalid_required_keys}'
 
-    def run_step(self):
+    def run_step(self, save_after=None):
         """Wrapper for running the implemented step.
 
+        Parameters
+        ----------
+        save_after : threading.Event, optional
+            If given, wait for this event to be set before adding the result of this step to the
+            workflow result. Used to add the results of sub steps run concurrently in
+            configuration order.
+
         Returns
         -------
         bool
             True on step run success.
             False on step run failure.
         """
+        with Tracer.trace_span(
+            name=f"{self.step_name} - {self.sub_step_name}",
+            category=Tracer.CATEGORY_SUB_STEP,
+            args={
+                'sub-step-implementer-name': self.sub_step_implementer_name,
+                'environment': self.environment
+            }
+        ):
+            return self.__run_step(save_after)
+
+    def __run_step(self, save_after):
+        """Runs the implemented step.
 
+        See Also
+        --------
+        run_step
+        """
         StepImplementer.__print_section_title(f"Step Start - {self.step_name}")
 
-        # print information about the configuration
-        StepImplementer.__print_section_title(
-            f"Configuration - {self.step_name}",
-            div_char="-",
-            indent=1
-        )
-        StepImplementer.__print_data(
-            "Step Implementer Configuration Defaults",
-            ConfigValue.convert_leaves_to_values(self.step_implementer_config_defaults())
-        )
-        StepImplementer.__print_data(
-            "Global Configuration Defaults",
-            ConfigValue.convert_leaves_to_values(self.global_config_defaults)
-        )
-        StepImplementer.__print_data(
-            "Global Environment Configuration Defaults",
-            ConfigValue.convert_leaves_to_values(self.global_environment_config_defaults)
-        )
-        StepImplementer.__print_data(
-            "Step Configuration",
-            ConfigValue.convert_leaves_to_values(self.step_config)
-        )
-        StepImplementer.__print_data(
-            "Step Environment Configuration",
-            ConfigValue.convert_leaves_to_values(self.step_environment_config)
-        )
-        StepImplementer.__print_data(
-            "Step Configuration Runtime Overrides",
-            ConfigValue.convert_leaves_to_values(self.step_config_overrides)
-        )
-
-        # create the munged runtime step configuration and print
-        copy_of_runtime_step_config = self.get_copy_of_runtime_step_config()
-        StepImplementer.__print_data(
-            "Runtime Step Configuration",
-            ConfigValue.convert_leaves_to_values(copy_of_runtime_step_config)
-        )
+        step_metrics = StepMetrics()
+        with step_metrics.time_phase('resolve-config'):
+            runtime_step_config_values = self.__print_configuration()
 
         step_result = None
+        self.__read_result_keys = set()
         try:
             # validate the runtime step configuration
-            self._validate_required_config_or_previous_step_result_artifact_keys()
+            with step_metrics.time_phase('resolve-config'):
+                self._validate_required_config_or_previous_step_result_artifact_keys()
+
+            # restore the result of a previous run with the same inputs, if cached
+            step_result_cache_inputs_key = self.__get_step_result_cache_inputs_key(
+                runtime_step_config_values
+            )
+            if step_result_cache_inputs_key is not None:
+                with step_metrics.time_phase('step-result-cache'):
+                    step_result = self.step_result_cache.get(
+                        inputs_key=step_result_cache_inputs_key,
+                        get_read_value=self.__get_read_result_value,
+                        work_dir_path=self.work_dir_path_step
+                    )
 
             # run the step
             StepImplementer.__print_section_title(
@@ -392,31 +552,67 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
             )
 
             indented_stdout = TextIOIndenter(
-                parent_stream=sys.stdout,
+                parent_stream=get_thread_stream(sys.stdout),
                 indent_level=2
             )
             indented_stderr = TextIOIndenter(
-                parent_stream=sys.stderr,
+                parent_stream=get_thread_stream(sys.stderr),
                 indent_level=2
             )
 
-            with redirect_stdout(indented_stdout), redirect_stderr(indented_stderr):
-                step_result = self._run_step()
+            with redirect_stdout_for_thread(indented_stdout), \
+                    redirect_stderr_for_thread(indented_stderr):
+                if step_result is not None:
+                    print(
+                        "Inputs unchanged since a previous run,"
+                        f" restored cached result from ({self.step_result_cache.cache_dir_path})"
+                    )
+                else:
+                    with step_metrics.time_phase('run-step'), step_metrics.record_commands():
+                        try:
+                            step_result = self._run_step()
+                        finally:
+                            self.__end_phase()
+
+                    if step_result_cache_inputs_key is not None and step_result.success:
+                        with step_metrics.time_phase('step-result-cache'):
+                            self.step_result_cache.put(
+                                inputs_key=step_result_cache_inputs_key,
+                                read_keys=self.__read_result_keys,
+                                get_read_value=self.__get_read_result_value,
+                                step_result=step_result,
+                                work_dir_path=self.work_dir_path_step
+                            )
         except AssertionError as invalid_error:
             step_result = StepResult.from_step_implementer(self)
             step_result.success = False
             step_result.message = str(invalid_error)
 
+        # NOTE: the metrics are added to the step result before it is written so do not
+        #       include how long writing the results takes, which is only printed
+        step_metrics.record_peak_rss()
+        step_result.metrics = step_metrics.get_metrics_dict()
+
         # save the step results
-        self.workflow_result.add_step_result(
-            step_result=step_result
-        )
-        self.workflow_result.write_to_pickle_file(
-            pickle_filename=self.__workflow_result_pickle_file_path
-        )
-        self.workflow_result.write_results_to_yml_file(
-            yml_filename=self.results_file_path
-        )
+        if save_after is not None:
+            save_after.wait()
+
+        # NOTE: hold the lock so that steps running concurrently in other threads can not
+        #       add their results in between adding and writing the results of this step
+        with self.workflow_result.lock, step_metrics.time_phase('write-results'):
+            self.workflow_result.add_step_result(
+                step_result=step_result
+            )
+            # NOTE: the pickle file is only rewritten when the journal is compacted, for anything
+            #       reading the results that does not read the journal, such as older versions
+            self.workflow_result.write_to_journal_file(
+                journal_filename=self.__workflow_result_journal_file_path,
+                pickle_filename=self.__workflow_result_pickle_file_path
+            )
+            self.workflow_result.write_results_to_file(
+                results_filename=self.results_file_path,
+                results_format=self.results_format
+            )
 
         # print the step run results
         StepImplementer.__print_section_title(
@@ -427,12 +623,77 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
 
         StepImplementer.__print_data('Results File Path', self.results_file_path)
 
+        StepImplementer.__print_data('Metrics', step_metrics.get_summary())
+
         StepImplementer.__print_data('Results', step_result.get_step_result_dict())
 
         StepImplementer.__print_section_title(f'Step End - {self.step_name}')
 
         return step_result.success
 
+    def __print_configuration(self):
+        """Prints the configuration of this step from each configuration source, and the merged
+        runtime step configuration, as much as config_dump says to.
+
+        Notes
+        -----
+        The configuration is only read, and so any encrypted values decrypted, for the views
+        printed, so that a config_dump of keys or none does not decrypt anything.
+
+        Returns
+        -------
+        dict or None
+            The values of the merged runtime step configuration if they were printed, or
+            None if they were not.
+        """
+        config_dump = self.config_dump
+        if config_dump == StepConfig.CONFIG_DUMP_NONE:
+            return None
+
+        # print information about the configuration
+        StepImplementer.__print_section_title(
+            f"Configuration - {self.step_name}",
+            div_char="-",
+            indent=1
+        )
+
+        config_views = [
+            ("Step Implementer Configuration Defaults", self.step_implementer_config_defaults()),
+            ("Global Configuration Defaults", self.global_config_defaults),
+            ("Global Environment Configuration Defaults", self.global_environment_config_defaults),
+            ("Step Configuration", self.step_config),
+            ("Step Environment Configuration", self.step_environment_config),
+            ("Step Configuration Runtime Overrides", self.step_config_overrides)
+        ]
+
+        if config_dump == StepConfig.CONFIG_DUMP_KEYS:
+            runtime_step_config_keys = set()
+            for title, config_view in config_views:
+                StepImplementer.__print_data(title, sorted(config_view))
+                runtime_step_config_keys.update(config_view)
+            StepImplementer.__print_data(
+                "Runtime Step Configuration",
+                sorted(runtime_step_config_keys)
+            )
+            return None
+
+        for title, config_view in config_views:
+            StepImplementer.__print_data(
+                title,
+                ConfigValue.convert_leaves_to_values(config_view)
+            )
+
+        # create the munged runtime step configuration and print
+        runtime_step_config_values = ConfigValue.convert_leaves_to_values(
+            self.get_copy_of_runtime_step_config()
+        )
+        StepImplementer.__print_data(
+            "Runtime Step Configuration",
+            runtime_step_config_values
+        )
+
+        return runtime_step_config_values
+
     def get_value(self, key):
         """Get the value for a given key, either from given configuration or from the result
         of any previous step.
@@ -584,6 +845,10 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         str
            Contents of the value for the specified result artifact_name.
         """
+        # NOTE: record what was read so a cached result of this step is only used if
+        #       the values it read are unchanged
+        self.__read_result_keys.add((artifact_name, step_name, sub_step_name, environment))
+
         return (
             self.workflow_result.get_artifact_value(
                 artifact=artifact_name,
@@ -593,6 +858,107 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
             )
         )
 
+    def _start_phase(self, phase_name):
+        """Starts the named phase of running this step, ending the previous phase, if any.
+
+        Notes
+        -----
+        For step implementers to mark the phases of _run_step, such as cloning a repository
+        or waiting for a deployment, so that how long each phase took can be seen in the trace
+        of the step. The last phase ends when _run_step returns.
+
+        Parameters
+        ----------
+        phase_name : str
+            Name of the phase being started.
+        """
+        self.__end_phase()
+
+        if Tracer.get_active_tracer() is not None:
+            self.__phase = (phase_name, time.time())
+
+    def __end_phase(self):
+        """Ends the current phase of running this step, if any, recording it as a span on the
+        active tracer.
+        """
+        if self.__phase is None:
+            return
+
+        phase_name, phase_start = self.__phase
+        self.__phase = None
+
+        tracer = Tracer.get_active_tracer()
+        if tracer is not None:
+            tracer.add_span(
+                name=phase_name,
+                category=Tracer.CATEGORY_PHASE,
+                start=phase_start,
+                end=time.time()
+            )
+
+    def __get_read_result_value(self, read_result_key):
+        """Gets the current value of a previous step result artifact read while running this
+        step without recording it as read.
+
+        Parameters
+        ----------
+        read_result_key : tuple
+            Artifact name, step name, sub step name, and environment of the artifact to get
+            the value of.
+
+        Returns
+        -------
+        object
+            Current value of the given previous step result artifact.
+        """
+        artifact_name, step_name, sub_step_name, environment = read_result_key
+        return self.workflow_result.get_artifact_value(
+            artifact=artifact_name,
+            step_name=step_name,
+            sub_step_name=sub_step_name,
+            environment=environment
+        )
+
+    def __get_step_result_cache_inputs_key(self, runtime_step_config_values):
+        """Gets the key of the inputs of this step known before running it to cache the result
+        of this step with.
+
+        Parameters
+        ----------
+        runtime_step_config_values : dict or None
+            Values of the runtime configuration of this step, or
+            None to get them if the result of this step should be cached.
+
+        Returns
+        -------
+        str or None
+            Key of the inputs of this step or
+            None if the result of this step should not be cached.
+        """
+        step_config = self.config.parent_step_config
+        if self.step_result_cache is None or step_config is None or not step_config.cache:
+            return None
+
+        if runtime_step_config_values is None:
+            runtime_step_config_values = ConfigValue.convert_leaves_to_values(
+                self.get_copy_of_runtime_step_config()
+            )
+
+        implementer_class = type(self)
+        return StepResultCache.get_key({
+            'implementer': f"{implementer_class.__module__}.{implementer_class.__qualname__}",
+            'implementer-source': StepResultCache.get_paths_key([
+                sys.modules[StepImplementer.__module__].__file__,
+                sys.modules[implementer_class.__module__].__file__
+            ]),
+            'step-name': self.step_name,
+            'sub-step-name': self.sub_step_name,
+            'environment': self.environment,
+            'work-dir-path': self.work_dir_path_step,
+            'runtime-step-config': runtime_step_config_values,
+            'sources': StepResultCache.get_paths_key(step_config.cache_source_paths)
+        })
+
     @property
     def __workflow_result_pickle_file_path(self):
         """
@@ -609,8 +975,49 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         str
            OS path to the workflow pickle (serialized) file.
         """
-        pickle_filename = os.path.splitext(self.__results_file_name)[0] + '.pkl'
-        return os.path.join(self.work_dir_path, pickle_filename)
+        return StepImplementer.__get_workflow_result_file_path(
+            work_dir_path=self.work_dir_path,
+            results_file_name=self.__results_file_name,
+            extension='.pkl'
+        )
+
+    @property
+    def __workflow_result_journal_file_path(self):
+        """
+        Get the OS path to the workflow result journal file.
+        (The journal file contains the appended serialized step results.)
+        The name of the journal file is the basename of the results_file_name.
+        EG:
+        If the name of the results_file_name is step-runner-results.yml,
+        then the name of the journal file is step-runner-results.journal
+        /tmp/tmp9sau_2j5/step-runner-working/step-runner-results.journal
+
+        Returns
+        -------
+        str
+           OS path to the workflow journal file.
+        """
+        return StepImplementer.__get_workflow_result_file_path(
+            work_dir_path=self.work_dir_path,
+            results_file_name=self.__results_file_name,
+            extension='.journal'
+        )
+
+    @staticmethod
+    def __get_workflow_result_file_path(work_dir_path, results_file_name, extension):
+        """
+        Get the OS path to a workflow result file in the given working folder named after the
+        basename of the given results file name with the given extension.
+
+        Returns
+        -------
+        str
+           OS path to the workflow result file.
+        """
+        return os.path.join(
+            work_dir_path,
+            os.path.splitext(results_file_name)[0] + extension
+        )
 
     def create_working_dir_sub_dir(self, sub_dir_relative_path):
         """
@@ -652,6 +1059,128 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
                 file.write(contents)
         return file_path
 
+    def open_output_log(self, log_path, append=False):
+        """
+        Open a compressed log of bounded size to write the output of a tool to, which keeps
+        the end of the output uncompressed for failure messages. The whole log can be read
+        back with `psr logs STEP_NAME`, or written decompressed to the given path with
+        `psr logs STEP_NAME --decompress`.
+
+        Notes
+        -----
+        The size of the log can be configured with the `output-log-max-size` (MB) and
+        `output-log-tail-size` (KB) step configuration keys.
+
+        Parameters
+        ----------
+        log_path : str
+            Path of the log, EG: returned from write_working_file.
+        append : bool, optional
+            True to append to the existing log, if any, False to replace it.
+
+        Returns
+        -------
+        TextIOCompressedLog
+            Log to write output to.
+        """
+        max_size = TextIOCompressedLog.DEFAULT_MAX_SIZE
+        output_log_max_size = self.get_value('output-log-max-size')
+        if output_log_max_size is not None:
+            max_size = int(output_log_max_size) * 1024 * 1024
+
+        tail_size = TextIOCompressedLog.DEFAULT_TAIL_SIZE
+        output_log_tail_size = self.get_value('output-log-tail-size')
+        if output_log_tail_size is not None:
+            tail_size = int(output_log_tail_size) * 1024
+
+        return TextIOCompressedLog(
+            log_path,
+            max_size=max_size,
+            tail_size=tail_size,
+            append=append
+        )
+
+    @contextmanager
+    def output_log_tee( # pylint: disable=too-many-arguments
+        self,
+        step_result,
+        name,
+        log_path,
+        description='',
+        append=False
+    ):
+        """
+        Context manager teeing the output of a tool to stdout and stderr and to a log opened
+        with open_output_log, whose artifacts are added to the given step result, with
+        add_output_log_artifacts, on leaving the context, whether or not the tool failed.
+
+        Parameters
+        ----------
+        step_result : StepResult
+            Step result to add the artifacts of the log to.
+        name : str
+            Name of the artifact for the log.
+        log_path : str
+            Path of the log, EG: returned from write_working_file.
+        description : str, optional
+            Description of the log.
+        append : bool, optional
+            True to append to the existing log, if any, False to replace it.
+
+        Yields
+        ------
+        ShOutputTee
+            Tee to give the out_fd and err_fd of to the tool.
+        """
+        try:
+            with self.open_output_log(log_path, append=append) as output_log, ShOutputTee(
+                out_streams=[sys.stdout, output_log],
+                err_streams=[sys.stderr, output_log]
+            ) as output_tee:
+                yield output_tee
+        finally:
+            self.add_output_log_artifacts(
+                step_result=step_result,
+                name=name,
+                log_path=log_path,
+                description=description
+            )
+
+    @staticmethod
+    def add_output_log_artifacts(step_result, name, log_path, description=''):
+        """
+        Adds a compressed log of the output of a tool, EG: opened with open_output_log, to the
+        given step result as two artifacts: one with the given name whose value is the path of
+        the whole log, and one with the given name suffixed with `-tail` whose value is the
+        path of the end of the log, uncompressed.
+
+        Notes
+        -----
+        The whole log is only written, decompressed, to its path on demand, with
+        `psr logs STEP_NAME --decompress`.
+
+        Parameters
+        ----------
+        step_result : StepResult
+            Step result to add the artifacts to.
+        name : str
+            Name of the artifact for the log.
+        log_path : str
+            Path of the log.
+        description : str, optional
+            Description of the log.
+        """
+        step_result.add_artifact(
+            name=name,
+            value=log_path,
+            description=description
+        )
+        step_result.add_artifact(
+            name=f'{name}-tail',
+            value=get_log_tail_path(log_path),
+            description=f"End of the log '{name}', uncompressed."
+        )
+
     @staticmethod
     def __print_section_title(title, div_char="=", indent=0):
         """
@@ -694,6 +1223,9 @@ class StepImplementer(ABC):  # pylint: disable=too-many-instance-attributes
         indent : int
             Amount to indent the title by and then the content by this +1
         """
+        # NOTE: imported here since it is slow to import and only needed to print data
+        import pprint # pylint: disable=import-outside-toplevel
+
         printer = pprint.PrettyPrinter()
         StepImplementer.__print_indented(
             text=title,
@@ -1,5 +1,9 @@
 """`StepImplementers` for the `container-image-static-vulnerability-scan` step.
 """
 
-from ploigos_step_runner.step_implementers.container_image_static_vulnerability_scan.\
-    openscap import OpenSCAP
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'OpenSCAP': 'openscap'
+})
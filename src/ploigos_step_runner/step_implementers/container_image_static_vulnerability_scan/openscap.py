@@ -39,11 +39,13 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key | Description
---------------------|------------
-`html-report`       | HTML report generated by oscap eval
-`xml-report`        | XML report generated by oscap eval
-`stdout-report`     | stdout report generated by oscap eval
+Result Artifact Key  | Description
+---------------------|------------
+`html-report`        | HTML report generated by oscap eval
+`xml-report`         | XML report generated by oscap eval
+`stdout-report`      | stdout report generated by oscap eval, written on demand by
+                     | `psr logs STEP --decompress`
+`stdout-report-tail` | End of the stdout report generated by oscap eval
 """
 
 from ploigos_step_runner.step_implementers.shared.openscap_generic import OpenSCAPGeneric
@@ -36,7 +36,9 @@ from pathlib import Path
 
 import sh
 from ploigos_step_runner import StepImplementer, StepResult
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 from ploigos_step_runner.utils.containers import container_registries_login
+from ploigos_step_runner.utils.io import get_thread_stream
 
 DEFAULT_CONFIG = {
     # Path to the container registry authentication file to read and write to/from.
@@ -154,7 +156,7 @@ class Buildah(StepImplementer):
             # NOTE: using --storage-driver=vfs so that container does not need escalated privileges
             #       vfs is less efficient then fuse (which would require host mounts),
             #       but such is the price we pay for security.
-            sh.buildah.bud(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.buildah.bud)(  # pylint: disable=no-member
                 '--storage-driver=vfs',
                 '--format=' + self.get_value('format'),
                 '--tls-verify=' + str(tls_verify),
@@ -162,8 +164,8 @@ class Buildah(StepImplementer):
                 '-t', tag,
                 '--authfile', containers_config_auth_file,
                 context,
-                _out=sys.stdout,
-                _err=sys.stderr,
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr),
                 _tee='err'
             )
 
@@ -189,12 +191,12 @@ class Buildah(StepImplementer):
             #       but such is the price we pay for security.
             if os.path.exists(image_tar_path):
                 os.remove(image_tar_path)
-            sh.buildah.push(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.buildah.push)(  # pylint: disable=no-member
                 '--storage-driver=vfs',
                 tag,
                 "docker-archive:" + image_tar_path,
-                _out=sys.stdout,
-                _err=sys.stderr,
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr),
                 _tee='err'
             )
 
@@ -105,12 +105,16 @@ Result Key                 | Description
 import os
 import re
 import sys
+from functools import partial
 
 import sh
-import yaml
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_result import StepResult
+from ploigos_step_runner.utils.commands import (CommandError, run_command, run_concurrently,
+                                                sh_command_with_metrics)
+from ploigos_step_runner.utils.file import parse_yaml_or_json_documents_file
+from ploigos_step_runner.utils.io import get_thread_stream
 
 DEFAULT_CONFIG = {
     'argocd-sync-timeout-seconds': 60,
@@ -224,7 +228,7 @@ class ArgoCD(StepImplementer):
                 f" http/https protical both 'git-username' and 'git-password' must be provided."
             )
 
-    def _run_step(self):  # pylint: disable=too-many-locals
+    def _run_step(self):  # pylint: disable=too-many-locals,too-many-statements
         """Runs the step implemented by this StepImplementer.
 
         Returns
@@ -256,18 +260,31 @@ class ArgoCD(StepImplementer):
                 value=argocd_app_name
             )
 
-            # clone the configuration repository
-            print("Clone the configuration repository")
+            # clone the configuration repository while signing into ArgoCD,
+            # since neither depends on the other
+            self._start_phase('clone-config-repo-and-argocd-sign-in')
+            print("Clone the configuration repository and sign into ArgoCD")
             clone_repo_dir_name = 'deployment-config-repo'
-            deployment_config_repo_dir = ArgoCD.__clone_repo(
-                repo_dir=self.create_working_dir_sub_dir(clone_repo_dir_name),
-                repo_url=deployment_config_repo,
-                repo_branch=deployment_config_repo_branch,
-                user_email=self.get_value('git-email'),
-                user_name=self.get_value('git-name')
+            deployment_config_repo_dir, _ = run_concurrently(
+                partial(
+                    ArgoCD.__clone_repo,
+                    repo_dir=self.create_working_dir_sub_dir(clone_repo_dir_name),
+                    repo_url=deployment_config_repo,
+                    repo_branch=deployment_config_repo_branch,
+                    user_email=self.get_value('git-email'),
+                    user_name=self.get_value('git-name')
+                ),
+                partial(
+                    ArgoCD.__argocd_sign_in,
+                    argocd_api=self.get_value('argocd-api'),
+                    username=self.get_value('argocd-username'),
+                    password=self.get_value('argocd-password'),
+                    insecure=self.get_value('argocd-skip-tls')
+                )
             )
 
             # update values file, commit it, push it, and tag it
+            self._start_phase('update-values-file')
             print("Update the environment values file")
             deployment_config_helm_chart_environment_values_file_path = os.path.join(
                 deployment_config_repo_dir,
@@ -279,6 +296,7 @@ class ArgoCD(StepImplementer):
                 yq_path=deployment_config_helm_chart_values_file_image_tag_yq_path,
                 value=container_image_tag
             )
+            self._start_phase('commit-values-file')
             print("Commit the updated environment values file")
             ArgoCD.__git_commit_file(
                 git_commit_message=f'Updating values for deployment to {self.environment}',
@@ -288,6 +306,7 @@ class ArgoCD(StepImplementer):
                 ),
                 repo_dir=deployment_config_repo_dir
             )
+            self._start_phase('tag-and-push-config-repo')
             print("Tag and push the updated environment values file")
             deployment_config_repo_tag = self.__get_deployment_config_repo_tag()
             self.__git_tag_and_push_deployment_config_repo(
@@ -302,19 +321,14 @@ class ArgoCD(StepImplementer):
             )
 
             # create/update argocd app and sync it
-            print("Sign into ArgoCD")
-            ArgoCD.__argocd_sign_in(
-                argocd_api=self.get_value('argocd-api'),
-                username=self.get_value('argocd-username'),
-                password=self.get_value('argocd-password'),
-                insecure=self.get_value('argocd-skip-tls')
-            )
+            self._start_phase('argocd-add-target-cluster')
             print("Add target cluster to ArgoCD")
             self.__argocd_add_target_cluster(
                 kube_api=deployment_config_destination_cluster_uri,
                 kube_api_token=deployment_config_destination_cluster_token,
                 kube_api_skip_tls=self.get_value('kube-api-skip-tls')
             )
+            self._start_phase('argocd-app-create-or-update')
             print(f"Create or update ArgoCD Application ({argocd_app_name})")
             argocd_values_files = []
             argocd_values_files += deployment_config_helm_chart_additional_value_files
@@ -330,6 +344,7 @@ class ArgoCD(StepImplementer):
             )
 
             # sync and wait for the sync of the ArgoCD app
+            self._start_phase('argocd-app-sync')
             print(f"Sync (and wait for) ArgoCD Application ({argocd_app_name})")
             ArgoCD.__argocd_app_sync(
                 argocd_app_name=argocd_app_name,
@@ -337,6 +352,7 @@ class ArgoCD(StepImplementer):
             )
 
             # get the ArgoCD app manifest that was synced
+            self._start_phase('argocd-get-app-manifest')
             print(f"Get ArgoCD Application ({argocd_app_name}) synced manifest")
             arogcd_app_manifest_file = self.__argocd_get_app_manifest(
                 argocd_app_name=argocd_app_name
@@ -347,6 +363,7 @@ class ArgoCD(StepImplementer):
             )
 
             # determine the deployed host URLs
+            self._start_phase('get-deployed-host-urls')
             print(
                 "Determine the deployed host URLs for the synced"
                 f" ArgoCD Application (({argocd_app_name})"
@@ -428,7 +445,7 @@ class ArgoCD(StepImplementer):
 
         # inplace update the file
         try:
-            sh.yq.write( # pylint: disable=no-member
+            sh_command_with_metrics(sh.yq.write)( # pylint: disable=no-member
                 file,
                 f'--script={yq_script_file}',
                 '--inplace'
@@ -560,32 +577,56 @@ class ArgoCD(StepImplementer):
         * https://docs.openshift.com/container-platform/4.6/rest_api/network_apis/route-route-openshift-io-v1.html
         """ # pylint: disable=line-too-long
         host_urls = []
-        manifest_resources = {}
         # load the manifest
-        with open(manifest_path) as file:
-            manifest_resources = yaml.load_all(file, Loader=yaml.FullLoader)
-
-            # for each resource in the manfest,
-            # determine if its a known type and then attempt to get host and TLS config from it
-            for manifest_resource in manifest_resources:
-                if manifest_resource is None or 'kind' not in manifest_resource:
-                    continue
-
-                kind = manifest_resource['kind']
-                api_version = manifest_resource['apiVersion']
-
-                # if Route resource
-                if kind == 'Route' and api_version == 'route.openshift.io/v1':
+        manifest_resources = parse_yaml_or_json_documents_file(manifest_path)
+
+        # for each resource in the manfest,
+        # determine if its a known type and then attempt to get host and TLS config from it
+        for manifest_resource in manifest_resources:
+            if manifest_resource is None or 'kind' not in manifest_resource:
+                continue
+
+            kind = manifest_resource['kind']
+            api_version = manifest_resource['apiVersion']
+
+            # if Route resource
+            if kind == 'Route' and api_version == 'route.openshift.io/v1':
+                # get host
+                if 'host' in manifest_resource['spec']:
+                    host = manifest_resource['spec']['host']
+
+                    # determine if TLS route
+                    tls = False
+                    if 'tls' in manifest_resource['spec']:
+                        tls_config = manifest_resource['spec']['tls']
+                        if tls_config:
+                            tls = True
+
+                    # determine protocol
+                    protocol = ''
+                    if tls:
+                        protocol = 'https://'
+                    else:
+                        protocol = 'http://'
+
+                    # record the host url
+                    host_urls.append(f"{protocol}{host}")
+
+            # if Ingress resource
+            if kind == 'Ingress' and api_version == 'networking.k8s.io/v1':
+                ingress_rules = manifest_resource['spec']['rules']
+                for rule in ingress_rules:
                     # get host
-                    if 'host' in manifest_resource['spec']:
-                        host = manifest_resource['spec']['host']
+                    if 'host' in rule:
+                        host = rule['host']
 
-                        # determine if TLS route
+                        # determine if TLS ingress
                         tls = False
                         if 'tls' in manifest_resource['spec']:
-                            tls_config = manifest_resource['spec']['tls']
-                            if tls_config:
-                                tls = True
+                            for tls_config in manifest_resource['spec']['tls']:
+                                if ('hosts' in tls_config) and (host in tls_config['hosts']):
+                                    tls = True
+                                    break
 
                         # determine protocol
                         protocol = ''
@@ -597,32 +638,6 @@ class ArgoCD(StepImplementer):
                         # record the host url
                         host_urls.append(f"{protocol}{host}")
 
-                # if Ingress resource
-                if kind == 'Ingress' and api_version == 'networking.k8s.io/v1':
-                    ingress_rules = manifest_resource['spec']['rules']
-                    for rule in ingress_rules:
-                        # get host
-                        if 'host' in rule:
-                            host = rule['host']
-
-                            # determine if TLS ingress
-                            tls = False
-                            if 'tls' in manifest_resource['spec']:
-                                for tls_config in manifest_resource['spec']['tls']:
-                                    if ('hosts' in tls_config) and (host in tls_config['hosts']):
-                                        tls = True
-                                        break
-
-                            # determine protocol
-                            protocol = ''
-                            if tls:
-                                protocol = 'https://'
-                            else:
-                                protocol = 'http://'
-
-                            # record the host url
-                            host_urls.append(f"{protocol}{host}")
-
         return host_urls
 
     @staticmethod
@@ -660,11 +675,11 @@ class ArgoCD(StepImplementer):
         * if error configuring repo user
         """
         try:
-            sh.git.clone( # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.clone)( # pylint: disable=no-member
                 repo_url,
                 repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -675,19 +690,19 @@ class ArgoCD(StepImplementer):
             # no atomic way in git to checkout out new or existing branch,
             # so first try to check out existing, if that doesn't work try new
             try:
-                sh.git.checkout(  # pylint: disable=no-member
+                sh_command_with_metrics(sh.git.checkout)(  # pylint: disable=no-member
                     repo_branch,
                     _cwd=repo_dir,
-                    _out=sys.stdout,
-                    _err=sys.stderr
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr)
                 )
             except sh.ErrorReturnCode:
-                sh.git.checkout(
+                sh_command_with_metrics(sh.git.checkout)(
                     '-b',
                     repo_branch,
                     _cwd=repo_dir,
-                    _out=sys.stdout,
-                    _err=sys.stderr
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr)
                 )
         except sh.ErrorReturnCode as error:
             # NOTE: this should never happen
@@ -697,19 +712,19 @@ class ArgoCD(StepImplementer):
             ) from error
 
         try:
-            sh.git.config( # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.config)( # pylint: disable=no-member
                 'user.email',
                 user_email,
                 _cwd=repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
-            sh.git.config( # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.config)( # pylint: disable=no-member
                 'user.name',
                 user_name,
                 _cwd=repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             # NOTE: this should never happen
@@ -724,7 +739,7 @@ class ArgoCD(StepImplementer):
     @staticmethod
     def __get_repo_branch():
         try:
-            return sh.git( # pylint: disable=no-member,too-many-function-args
+            return sh_command_with_metrics(sh.git)( # pylint: disable=no-member
                 'rev-parse',
                 '--abbrev-ref',
                 'HEAD'
@@ -751,9 +766,9 @@ class ArgoCD(StepImplementer):
 
         # push commits
         try:
-            git_push(
+            sh_command_with_metrics(git_push)(
                 _cwd=repo_dir,
-                _out=sys.stdout
+                _out=get_thread_stream(sys.stdout)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -769,12 +784,12 @@ class ArgoCD(StepImplementer):
             # making this an acceptable work around to the issue since on the off chance
             # actually overwriting a tag with a different comment, the push will fail
             # because the tag will be attached to a different git hash.
-            sh.git.tag(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.tag)(  # pylint: disable=no-member
                 tag,
                 '-f',
                 _cwd=repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -787,11 +802,11 @@ class ArgoCD(StepImplementer):
 
         # push tag
         try:
-            git_push(
+            sh_command_with_metrics(git_push)(
                 '--tag',
                 *git_push_additional_arguments,
                 _cwd=repo_dir,
-                _out=sys.stdout
+                _out=get_thread_stream(sys.stdout)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -802,11 +817,11 @@ class ArgoCD(StepImplementer):
     @staticmethod
     def __git_commit_file(git_commit_message, file_path, repo_dir):
         try:
-            sh.git.add( # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.add)( # pylint: disable=no-member
                 file_path,
                 _cwd=repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             # NOTE: this should never happen
@@ -816,13 +831,13 @@ class ArgoCD(StepImplementer):
             ) from error
 
         try:
-            sh.git.commit( # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.commit)( # pylint: disable=no-member
                 '--allow-empty',
                 '--all',
                 '--message', git_commit_message,
                 _cwd=repo_dir,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             # NOTE: this should never happen
@@ -850,15 +865,15 @@ class ArgoCD(StepImplementer):
             if insecure:
                 insecure_flag = '--insecure'
 
-            sh.argocd.login(  # pylint: disable=no-member
+            run_command(
+                'argocd',
+                'login',
                 argocd_api,
                 f'--username={username}',
                 f'--password={password}',
-                insecure_flag,
-                _out=sys.stdout,
-                _err=sys.stderr
+                insecure_flag
             )
-        except sh.ErrorReturnCode as error:
+        except CommandError as error:
             raise StepRunnerException(f"Error logging in to ArgoCD: {error}") from error
 
     def __argocd_add_target_cluster(
@@ -907,11 +922,11 @@ users:
                 contents=bytes(kubeconfig, 'utf-8')
             )
             try:
-                sh.argocd.cluster.add(  # pylint: disable=no-member
+                sh_command_with_metrics(sh.argocd.cluster.add)(  # pylint: disable=no-member
                     '--kubeconfig', config_argocd_cluster_context_file,
                     context_name,
-                    _out=sys.stdout,
-                    _err=sys.stderr
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr)
                 )
             except sh.ErrorReturnCode as error:
                 raise StepRunnerException(
@@ -947,7 +962,7 @@ users:
                 for value_file in values_files:
                     values_params += [f'--values={value_file}']
 
-            sh.argocd.app.create(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.argocd.app.create)(  # pylint: disable=no-member
                 argocd_app_name,
                 f'--repo={repo}',
                 f'--revision={revision}',
@@ -957,8 +972,8 @@ users:
                 f'--sync-policy={sync_policy}',
                 values_params,
                 '--upsert',
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -971,12 +986,12 @@ users:
         argocd_sync_timeout_seconds
     ):
         try:
-            sh.argocd.app.sync(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.argocd.app.sync)(  # pylint: disable=no-member
                 '--prune',
                 '--timeout', argocd_sync_timeout_seconds,
                 argocd_app_name,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -984,12 +999,12 @@ users:
             ) from error
 
         try:
-            sh.argocd.app.wait(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.argocd.app.wait)(  # pylint: disable=no-member
                 '--timeout', argocd_sync_timeout_seconds,
                 '--health',
                 argocd_app_name,
-                _out=sys.stdout,
-                _err=sys.stderr
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
@@ -1022,11 +1037,11 @@ users:
         """
         arogcd_app_manifest_file = self.write_working_file('deploy_argocd_manifests.yml')
         try:
-            sh.argocd.app.manifests(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.argocd.app.manifests)(  # pylint: disable=no-member
                 f'--source={source}',
                 argocd_app_name,
                 _out=arogcd_app_manifest_file,
-                _err=sys.stderr
+                _err=get_thread_stream(sys.stderr)
             )
         except sh.ErrorReturnCode as error:
             raise StepRunnerException(
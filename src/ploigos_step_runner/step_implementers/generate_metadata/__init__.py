@@ -1,7 +1,12 @@
 """`StepImplementers` for the `generate-metadata` step.
 """
 
-from ploigos_step_runner.step_implementers.generate_metadata.git import Git
-from ploigos_step_runner.step_implementers.generate_metadata.maven import Maven
-from ploigos_step_runner.step_implementers.generate_metadata.npm import Npm
-from ploigos_step_runner.step_implementers.generate_metadata.semantic_version import SemanticVersion
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'Git': 'git',
+    'Maven': 'maven',
+    'Npm': 'npm',
+    'SemanticVersion': 'semantic_version'
+})
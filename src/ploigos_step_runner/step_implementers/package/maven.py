@@ -38,9 +38,12 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key | Description
---------------------|------------
-`package-artifacts` | An array of dictionaries with information on the built artifacts.
+Result Artifact Key       | Description
+--------------------------|------------
+`maven-output`            | Path to Stdout and Stderr from invoking Maven, written on demand by
+                          | `psr logs STEP --decompress`.
+`maven-output-tail`       | Path to the end of Stdout and Stderr from invoking Maven.
+`package-artifacts`       | An array of dictionaries with information on the built artifacts.
 
 
 ## package-artifacts
@@ -90,12 +93,11 @@ Examples
 
 """
 import os
-import sys
 
 import sh
 from ploigos_step_runner import StepResult
 from ploigos_step_runner.step_implementers.shared.maven_generic import MavenGeneric
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 from ploigos_step_runner.utils.xml import get_xml_element
 
 DEFAULT_CONFIG = {
@@ -178,36 +180,26 @@ class Maven(MavenGeneric):
         settings_file = self._generate_maven_settings()
         mvn_output_file_path = self.write_working_file('mvn_test_output.txt')
         try:
-            with open(mvn_output_file_path, 'w') as mvn_output_file:
-                out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stdout,
-                    mvn_output_file
-                ])
-                err_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stderr,
-                    mvn_output_file
-                ])
-
-                sh.mvn(  # pylint: disable=no-member
+            with self.output_log_tee(
+                step_result=step_result,
+                name='maven-output',
+                log_path=mvn_output_file_path,
+                description="Standard out and standard error from 'mvn install'."
+            ) as output_tee:
+                sh_command_with_metrics(sh.mvn)(  # pylint: disable=no-member
                     'clean',
                     'install',
                     '-f', pom_file,
                     '-s', settings_file,
                     *mvn_additional_options,
-                    _out=out_callback,
-                    _err=err_callback
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
                 )
         except sh.ErrorReturnCode as error:
             step_result.success = False
             step_result.message = "Package failures. See 'maven-output' report artifacts " \
                 f"for details: {error}"
             return step_result
-        finally:
-            step_result.add_artifact(
-                description="Standard out and standard error from 'mvn install'.",
-                name='maven-output',
-                value=mvn_output_file_path
-            )
 
         # find the artifacts
         artifact_file_names = []
@@ -27,9 +27,12 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key | Description
---------------------|------------
-`push-artifacts`    | An array of dictionaries with information on the built artifacts.
+Result Artifact Key       | Description
+--------------------------|------------
+`maven-output`            | Path to Stdout and Stderr from invoking Maven, written on demand by
+                          | `psr logs STEP --decompress`.
+`maven-output-tail`       | Path to the end of Stdout and Stderr from invoking Maven.
+`push-artifacts`          | An array of dictionaries with information on the built artifacts.
 
 ## push-artifacts
 Keys in the dictionary elements in the `push-artifacts` array in the step results.
@@ -66,12 +69,11 @@ Examples
       -DrepositoryId=maven-push-artifact-repo-id
       -s settings.xml
 """
-import sys
 
 import sh
 from ploigos_step_runner import StepResult
 from ploigos_step_runner.step_implementers.shared.maven_generic import MavenGeneric
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 
 DEFAULT_CONFIG = {
     'tls-verify': True
@@ -160,16 +162,14 @@ class Maven(MavenGeneric):
                 package_type = package['package-type']
 
                 # push the artifact
-                with open(mvn_output_file_path, 'a') as mvn_output_file:
-                    out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                        sys.stdout,
-                        mvn_output_file
-                    ])
-                    err_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                        sys.stderr,
-                        mvn_output_file
-                    ])
-                    sh.mvn(  # pylint: disable=no-member
+                with self.output_log_tee(
+                    step_result=step_result,
+                    name='maven-output',
+                    log_path=mvn_output_file_path,
+                    description="Standard out and standard error from 'mvn install'.",
+                    append=True
+                ) as output_tee:
+                    sh_command_with_metrics(sh.mvn)(  # pylint: disable=no-member
                         'deploy:deploy-file',
                         '-Dversion=' + version,
                         '-Dfile=' + artifact_path,
@@ -180,8 +180,8 @@ class Maven(MavenGeneric):
                         '-DrepositoryId=' + maven_push_artifact_repo_id,
                         '-s' + settings_file,
                         *mvn_additional_options,
-                        _out=out_callback,
-                        _err=err_callback
+                        _out=output_tee.out_fd,
+                        _err=output_tee.err_fd
                     )
 
                 # record the pushed artifact
@@ -197,11 +197,6 @@ class Maven(MavenGeneric):
             step_result.message = "Push artifacts failures. See 'maven-output' report artifacts " \
                 f"for details: {error}"
 
-        step_result.add_artifact(
-            description="Standard out and standard error from 'mvn install'.",
-            name='maven-output',
-            value=mvn_output_file_path
-        )
         step_result.add_artifact(
             name='push-artifacts',
             value=push_artifacts
@@ -51,7 +51,9 @@ from pathlib import Path
 
 import sh
 from ploigos_step_runner import StepImplementer, StepResult
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 from ploigos_step_runner.utils.containers import container_registries_login
+from ploigos_step_runner.utils.io import get_thread_stream
 
 DEFAULT_CONFIG = {
     'src-tls-verify': 'true',
@@ -143,14 +145,14 @@ class Skopeo(StepImplementer):
             )
 
             # push image
-            sh.skopeo.copy( # pylint: disable=no-member
+            sh_command_with_metrics(sh.skopeo.copy)( # pylint: disable=no-member
                 f"--src-tls-verify={str(self.get_value('src-tls-verify'))}",
                 f"--dest-tls-verify={str(self.get_value('dest-tls-verify'))}",
                 f"--authfile={containers_config_auth_file}",
                 f'docker-archive:{image_tar_file}',
                 f'docker://{image_tag}',
-                _out=sys.stdout,
-                _err=sys.stderr,
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr),
                 _tee='err'
             )
         except sh.ErrorReturnCode as error:
@@ -1,5 +1,10 @@
 """StepImplementer parent classes that are shared accross multiple steps.
 """
 
-from ploigos_step_runner.step_implementers.shared.maven_generic import MavenGeneric
-from ploigos_step_runner.step_implementers.shared.openscap_generic import OpenSCAPGeneric
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'MavenGeneric': 'maven_generic',
+    'OpenSCAPGeneric': 'openscap_generic'
+})
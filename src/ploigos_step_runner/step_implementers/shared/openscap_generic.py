@@ -43,24 +43,31 @@ Results
 
 Results output by this step.
 
-| Result Key      | Description
-|-----------------|------------
-| `html-report`   | HTML report generated by oscap eval
-| `xml-report`    | XML report generated by oscap eval
-| `stdout-report` | stdout report generated by oscap eval
+| Result Key           | Description
+|----------------------|------------
+| `html-report`        | HTML report generated by oscap eval
+| `xml-report`         | XML report generated by oscap eval
+| `stdout-report`      | stdout report generated by oscap eval, written on demand by
+|                      | `psr logs STEP --decompress`
+| `stdout-report-tail` | End of the stdout report generated by oscap eval
 """
 
 import os
 import re
 import sys
 from distutils.util import strtobool
+from functools import partial
 from io import StringIO
 
 import sh
 from ploigos_step_runner import StepResult, StepRunnerException
 from ploigos_step_runner.step_implementer import StepImplementer
+from ploigos_step_runner.utils.commands import (CommandError, run_command, run_concurrently,
+                                                sh_command_with_metrics)
+from ploigos_step_runner.utils.compressed_log import TextIOCompressedLog
 from ploigos_step_runner.utils.file import download_and_decompress_source_to_destination
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.io import (create_sh_redirect_to_multiple_streams_fn_callback,
+                                          get_thread_stream)
 
 DEFAULT_CONFIG = {
     'oscap-fetch-remote-resources': True
@@ -236,19 +243,33 @@ class OpenSCAPGeneric(StepImplementer):
         container_name += f"-{self.step_name}-{self.sub_step_name}"
 
         try:
-            # import image tar file to vfs file system
+            self._start_phase('import-image-and-download-input-definitions')
+            # import image tar file to vfs file system while downloading the open scap input file,
+            # since neither depends on the other
+            oscap_input_definitions_uri = self.get_value('oscap-input-definitions-uri')
             print(f"\nImport image: {image_tar_file}")
-            OpenSCAPGeneric.__buildah_import_image_from_tar(
-                image_tar_file=image_tar_file,
-                container_name=container_name
+            print(f"Download input definitions: {oscap_input_definitions_uri}")
+            _, oscap_input_file = run_concurrently(
+                partial(
+                    OpenSCAPGeneric.__buildah_import_image_from_tar,
+                    image_tar_file=image_tar_file,
+                    container_name=container_name
+                ),
+                partial(
+                    OpenSCAPGeneric.__download_input_definitions,
+                    oscap_input_definitions_uri=oscap_input_definitions_uri,
+                    destination_dir=self.work_dir_path_step
+                )
             )
             print(f"Imported image: {image_tar_file}")
+            print(f"Downloaded input definitions to: {oscap_input_file}")
 
             # baking `buildah unshare` command to wrap other buildah commands with
             # so that container does not need to be running in a privileged mode to be able
             # to function
             buildah_unshare_command = sh.buildah.bake('unshare')  # pylint: disable=no-member
 
+            self._start_phase('mount-container')
             # mount the container filesystem and get mount path
             #
             # NOTE: run in the context of `buildah unshare` so that container does not
@@ -260,20 +281,7 @@ class OpenSCAPGeneric(StepImplementer):
             )
             print(f"Mounted container ({container_name}) with mount path: '{container_mount_path}'")
 
-            try:
-                # download the open scap input file
-                oscap_input_definitions_uri = self.get_value('oscap-input-definitions-uri')
-                print(f"\nDownload input definitions: {oscap_input_definitions_uri}")
-                oscap_input_file = download_and_decompress_source_to_destination(
-                    source_url=oscap_input_definitions_uri,
-                    destination_dir=self.work_dir_path_step
-                )
-                print(f"Downloaded input definitions to: {oscap_input_file}")
-            except (RuntimeError, AssertionError) as error:
-                raise StepRunnerException(
-                    f"Error downloading OpenSCAP input file: {error}"
-                ) from error
-
+            self._start_phase('download-tailoring-file')
             try:
                 # if specified download oscap tailoring file
                 oscap_tailoring_file = None
@@ -290,6 +298,7 @@ class OpenSCAPGeneric(StepImplementer):
                     f"Error downloading OpenSCAP tailoring file: {error}"
                 ) from error
 
+            self._start_phase('determine-eval-type')
             # determine oscap eval type based on document type
             print(f"\nDetermine OpenSCAP document type of input file: {oscap_input_file}")
             oscap_document_type = OpenSCAPGeneric.__get_oscap_document_type(
@@ -311,6 +320,7 @@ class OpenSCAPGeneric(StepImplementer):
                 f" ({oscap_input_file}): {oscap_eval_type}"
             )
 
+            self._start_phase('scan')
             # Execute scan in the context of buildah unshare
             #
             # NOTE: run in the context of `buildah unshare` so that container does not
@@ -348,9 +358,10 @@ class OpenSCAPGeneric(StepImplementer):
                 name='xml-report',
                 value=oscap_xml_results_file_path
             )
-            step_result.add_artifact(
+            self.add_output_log_artifacts(
+                step_result=step_result,
                 name='stdout-report',
-                value=oscap_out_file_path
+                log_path=oscap_out_file_path
             )
         except StepRunnerException as error:
             step_result.success = False
@@ -358,6 +369,37 @@ class OpenSCAPGeneric(StepImplementer):
 
         return step_result
 
+    @staticmethod
+    def __download_input_definitions(oscap_input_definitions_uri, destination_dir):
+        """Download the OpenSCAP input definitions.
+
+        Parameters
+        ----------
+        oscap_input_definitions_uri : str
+            URI of the OpenSCAP input definitions to download.
+        destination_dir : str
+            Path to the directory to download and decompress the input definitions to.
+
+        Returns
+        -------
+        str
+            Path to the downloaded input definitions.
+
+        Raises
+        ------
+        StepRunnerException
+            If error downloading the input definitions.
+        """
+        try:
+            return download_and_decompress_source_to_destination(
+                source_url=oscap_input_definitions_uri,
+                destination_dir=destination_dir
+            )
+        except (RuntimeError, AssertionError) as error:
+            raise StepRunnerException(
+                f"Error downloading OpenSCAP input file: {error}"
+            ) from error
+
     @staticmethod
     def __buildah_import_image_from_tar(image_tar_file, container_name):
         """Import a container image using buildah form a TAR file.
@@ -381,16 +423,14 @@ class OpenSCAPGeneric(StepImplementer):
         """
         # import image tar file to vfs file system
         try:
-            sh.buildah(  # pylint: disable=no-member
+            run_command(
+                'buildah',
                 'from',
                 '--storage-driver', 'vfs',
                 '--name', container_name,
-                f"docker-archive:{image_tar_file}",
-                _out=sys.stdout,
-                _err=sys.stderr,
-                _tee='err'
+                f"docker-archive:{image_tar_file}"
             )
-        except sh.ErrorReturnCode as error:
+        except CommandError as error:
             raise StepRunnerException(
                 f'Error importing the image ({image_tar_file}): {error}'
             ) from error
@@ -427,11 +467,11 @@ class OpenSCAPGeneric(StepImplementer):
                 buildah_mount_out_buff
             ])
             buildah_mount_command = buildah_unshare_command.bake("buildah", "mount")
-            buildah_mount_command(
+            sh_command_with_metrics(buildah_mount_command)(
                 '--storage-driver', 'vfs',
                 container_id,
                 _out=buildah_mount_out_callback,
-                _err=sys.stderr,
+                _err=get_thread_stream(sys.stderr),
                 _tee='err'
             )
             mount_path = buildah_mount_out_buff.getvalue().rstrip()
@@ -468,7 +508,7 @@ class OpenSCAPGeneric(StepImplementer):
         oscap_document_type = None
         try:
             oscap_info_out_buff = StringIO()
-            sh.oscap.info(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.oscap.info)(  # pylint: disable=no-member
                 oscap_input_file,
                 _out=oscap_info_out_buff
             )
@@ -588,7 +628,7 @@ class OpenSCAPGeneric(StepImplementer):
         oscap_eval_fails = None
         try:
             oscap_chroot_command = buildah_unshare_command.bake("oscap-chroot")
-            with open(oscap_out_file_path, 'w') as oscap_out_file:
+            with TextIOCompressedLog(oscap_out_file_path) as oscap_out_file:
                 out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
                     oscap_eval_out_buff,
                     oscap_out_file
@@ -597,7 +637,7 @@ class OpenSCAPGeneric(StepImplementer):
                     oscap_eval_out_buff,
                     oscap_out_file
                 ])
-                oscap_chroot_command(
+                sh_command_with_metrics(oscap_chroot_command)(
                     container_mount_path,
                     oscap_eval_type,
                     'eval',
@@ -1,5 +1,10 @@
 """`StepImplementers` for the `sign-container-image` step.
 """
 
-from ploigos_step_runner.step_implementers.sign_container_image.curl_push import CurlPush
-from ploigos_step_runner.step_implementers.sign_container_image.podman_sign import PodmanSign
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'CurlPush': 'curl_push',
+    'PodmanSign': 'podman_sign'
+})
@@ -51,6 +51,7 @@ import sh
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_result import StepResult
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
 
 DEFAULT_CONFIG = {
@@ -204,7 +205,7 @@ class CurlPush(StepImplementer):
             # -S: Show error
             # -f: Don't print out failure document
             # -v: Verbose
-            sh.curl(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.curl)(  # pylint: disable=no-member
                 '-sSfv',
                 '-X', 'PUT',
                 '--user', f"{signature_server_username}:{signature_server_password}",
@@ -42,7 +42,9 @@ from io import StringIO
 import sh
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.step_result import StepResult
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
+from ploigos_step_runner.utils.io import (create_sh_redirect_to_multiple_streams_fn_callback,
+                                          get_thread_stream)
 from ploigos_step_runner.exceptions import StepRunnerException
 
 DEFAULT_CONFIG = {
@@ -164,7 +166,7 @@ class PodmanSign(StepImplementer):
                 sys.stdout,
                 gpg_import_stdout_result
             ])
-            sh.gpg( # pylint: disable=no-member
+            sh_command_with_metrics(sh.gpg)( # pylint: disable=no-member
                 '--import',
                 '--fingerprint',
                 '--with-colons',
@@ -214,12 +216,12 @@ class PodmanSign(StepImplementer):
         try:
             # NOTE: for some reason the output from podman sign goes to stderr so....
             #       merge the two streams
-            sh.podman.image( # pylint: disable=no-member
+            sh_command_with_metrics(sh.podman.image)( # pylint: disable=no-member
                 "sign",
                 f"--sign-by={pgp_private_key_fingerprint}",
                 f"--directory={image_signatures_directory}",
                 f"docker://{container_image_tag}",
-                _out=sys.stdout,
+                _out=get_thread_stream(sys.stdout),
                 _err_to_out=True,
                 _tee='out'
             )
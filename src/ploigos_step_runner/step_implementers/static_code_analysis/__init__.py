@@ -1,4 +1,9 @@
 """`StepImplementers` for the `static-code-analysis` step.
 """
 
-from ploigos_step_runner.step_implementers.static_code_analysis.sonarqube import SonarQube
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'SonarQube': 'sonarqube'
+})
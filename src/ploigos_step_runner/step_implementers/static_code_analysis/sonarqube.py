@@ -90,6 +90,8 @@ import sh
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_result import StepResult
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
+from ploigos_step_runner.utils.io import get_thread_stream
 
 DEFAULT_CONFIG = {
     'properties': './sonar-project.properties',
@@ -213,7 +215,7 @@ class SonarQube(StepImplementer):
             #    https://amoffat.github.io/sh/sections/faq.html
             working_directory = self.work_dir_path
             if username:
-                sh.sonar_scanner(  # pylint: disable=no-member
+                sh_command_with_metrics(sh.sonar_scanner)(  # pylint: disable=no-member
                     f'-Dproject.settings={properties_file}',
                     f'-Dsonar.host.url={url}',
                     f'-Dsonar.projectVersion={version}',
@@ -222,19 +224,19 @@ class SonarQube(StepImplementer):
                     f'-Dsonar.password={password}',
                     f'-Dsonar.working.directory={working_directory}',
                     f'-Djavax.net.ssl.trustStore={java_truststore}',
-                    _out=sys.stdout,
-                    _err=sys.stderr
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr)
                 )
             else:
-                sh.sonar_scanner(  # pylint: disable=no-member
+                sh_command_with_metrics(sh.sonar_scanner)(  # pylint: disable=no-member
                     f'-Dproject.settings={properties_file}',
                     f'-Dsonar.host.url={url}',
                     f'-Dsonar.projectVersion={version}',
                     f'-Dsonar.projectKey={project_key}',
                     f'-Dsonar.working.directory={working_directory}',
                     f'-Djavax.net.ssl.trustStore={java_truststore}',
-                    _out=sys.stdout,
-                    _err=sys.stderr
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr)
                 )
         except sh.ErrorReturnCode_1 as error: # pylint: disable=no-member
             # Error Code 1: INTERNAL_ERROR
@@ -1,4 +1,9 @@
 """`StepImplementers` for the `tag-source` step.
 """
 
-from ploigos_step_runner.step_implementers.tag_source.git import Git
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'Git': 'git'
+})
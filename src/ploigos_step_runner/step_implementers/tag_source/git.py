@@ -46,6 +46,8 @@ import sh
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_result import StepResult
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
+from ploigos_step_runner.utils.io import get_thread_stream
 
 DEFAULT_CONFIG = {}
 
@@ -194,13 +196,13 @@ class Git(StepImplementer):
         else:
             try:
                 out = StringIO()
-                sh.git.config(
+                sh_command_with_metrics(sh.git.config)(
                     '--get',
                     'remote.origin.url',
                     _encoding='UTF-8',
                     _decode_errors='ignore',
                     _out=out,
-                    _err=sys.stderr,
+                    _err=get_thread_stream(sys.stderr),
                     _tee='err'
                 )
                 git_url = out.getvalue().rstrip()
@@ -231,11 +233,11 @@ class Git(StepImplementer):
             # making this an acceptable work around to the issue since on the off chance
             # actually overwriting a tag with a different comment, the push will fail
             # because the tag will be attached to a different git hash.
-            sh.git.tag(  # pylint: disable=no-member
+            sh_command_with_metrics(sh.git.tag)(  # pylint: disable=no-member
                 git_tag_value,
                 '-f',
-                _out=sys.stdout,
-                _err=sys.stderr,
+                _out=get_thread_stream(sys.stdout),
+                _err=get_thread_stream(sys.stderr),
                 _tee='err'
             )
         except sh.ErrorReturnCode as error:  # pylint: disable=undefined-variable
@@ -247,18 +249,18 @@ class Git(StepImplementer):
     def __git_push(url=None):
         try:
             if url:
-                sh.git.push(
+                sh_command_with_metrics(sh.git.push)(
                     url,
                     '--tag',
-                    _out=sys.stdout,
-                    _err=sys.stderr,
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr),
                     _tee='err'
                 )
             else:
-                sh.git.push(
+                sh_command_with_metrics(sh.git.push)(
                     '--tag',
-                    _out=sys.stdout,
-                    _err=sys.stderr,
+                    _out=get_thread_stream(sys.stdout),
+                    _err=get_thread_stream(sys.stderr),
                     _tee='err'
                 )
         except sh.ErrorReturnCode as error:  # pylint: disable=undefined-variable
@@ -1,4 +1,9 @@
 """`StepImplementers` for the `uat` (User Acceptance Tests) step.
 """
 
-from ploigos_step_runner.step_implementers.uat.maven_selenium_cucumber import MavenSeleniumCucumber
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'MavenSeleniumCucumber': 'maven_selenium_cucumber'
+})
@@ -31,22 +31,23 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key    | Description
------------------------|------------
-`maven-output`         | Path to Stdout and Stderr from invoking Maven.
-`surefire-reports`     | Path to Surefire reports generated by Maven.
-`cucumber-report-html` | Path to Cucumber HTML report generated by Maven.
-`cucumber-report-json` | Path to Cucumber JSON report generated by Maven.
+Result Artifact Key       | Description
+--------------------------|------------
+`maven-output`            | Path to Stdout and Stderr from invoking Maven, written on demand by
+                          | `psr logs STEP --decompress`.
+`maven-output-tail`       | Path to the end of Stdout and Stderr from invoking Maven.
+`surefire-reports`        | Path to Surefire reports generated by Maven.
+`cucumber-report-html`    | Path to Cucumber HTML report generated by Maven.
+`cucumber-report-json`    | Path to Cucumber JSON report generated by Maven.
 """
 import os
-import sys
 
 import sh
 from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_implementers.shared.maven_generic import MavenGeneric
 from ploigos_step_runner.step_result import StepResult
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 
 DEFAULT_CONFIG = {
     'tls-verify': True,
@@ -194,16 +195,13 @@ class MavenSeleniumCucumber(MavenGeneric):
         cucumber_json_report_path = os.path.join(self.work_dir_path, 'cucumber.json')
         mvn_output_file_path = self.write_working_file('mvn_test_output.txt')
         try:
-            with open(mvn_output_file_path, 'w') as mvn_output_file:
-                out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stdout,
-                    mvn_output_file
-                ])
-                err_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stderr,
-                    mvn_output_file
-                ])
-                sh.mvn( # pylint: disable=no-member
+            with self.output_log_tee(
+                step_result=step_result,
+                name='maven-output',
+                log_path=mvn_output_file_path,
+                description=f"Standard out and standard error by 'mvn -P{uat_maven_profile} test'."
+            ) as output_tee:
+                sh_command_with_metrics(sh.mvn)( # pylint: disable=no-member
                     'clean',
                     'test',
                     f'-P{uat_maven_profile}',
@@ -215,8 +213,8 @@ class MavenSeleniumCucumber(MavenGeneric):
                     '-f', pom_file,
                     '-s', settings_file,
                     *mvn_additional_options,
-                    _out=out_callback,
-                    _err=err_callback
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
                 )
 
             if not os.path.isdir(test_results_dir) or len(os.listdir(test_results_dir)) == 0:
@@ -234,11 +232,6 @@ class MavenSeleniumCucumber(MavenGeneric):
                 " report artifacts for details."
             step_result.success = False
 
-        step_result.add_artifact(
-            description=f"Standard out and standard error by 'mvn -P{uat_maven_profile} test'.",
-            name='maven-output',
-            value=mvn_output_file_path
-        )
         step_result.add_artifact(
             description=f"Surefire reports generated by 'mvn -P{uat_maven_profile} test'.",
             name='surefire-reports',
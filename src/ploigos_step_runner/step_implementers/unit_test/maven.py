@@ -20,18 +20,19 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key | Description
---------------------|------------
-`maven-output`      | Path to Stdout and Stderr from invoking Maven.
-`surefile-reports`  | Path to Surefire reports generated from invoking Maven.
+Result Artifact Key       | Description
+--------------------------|------------
+`maven-output`            | Path to Stdout and Stderr from invoking Maven, written on demand by
+                          | `psr logs STEP --decompress`.
+`maven-output-tail`       | Path to the end of Stdout and Stderr from invoking Maven.
+`surefile-reports`        | Path to Surefire reports generated from invoking Maven.
 """
 import os
-import sys
 
 import sh
 from ploigos_step_runner import StepResult
 from ploigos_step_runner.step_implementers.shared.maven_generic import MavenGeneric
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 
 DEFAULT_CONFIG = {
     'tls-verify': True,
@@ -129,24 +130,20 @@ class Maven(MavenGeneric):
         settings_file = self._generate_maven_settings()
         mvn_output_file_path = self.write_working_file('mvn_test_output.txt')
         try:
-            with open(mvn_output_file_path, 'w') as mvn_output_file:
-                out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stdout,
-                    mvn_output_file
-                ])
-                err_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stderr,
-                    mvn_output_file
-                ])
-
-                sh.mvn( # pylint: disable=no-member
+            with self.output_log_tee(
+                step_result=step_result,
+                name='maven-output',
+                log_path=mvn_output_file_path,
+                description="Standard out and standard error from 'mvn test'."
+            ) as output_tee:
+                sh_command_with_metrics(sh.mvn)( # pylint: disable=no-member
                     'clean',
                     'test',
                     '-f', pom_file,
                     '-s', settings_file,
                     *mvn_additional_options,
-                    _out=out_callback,
-                    _err=err_callback
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
                 )
 
             if not os.path.isdir(test_results_dir) or len(os.listdir(test_results_dir)) == 0:
@@ -160,11 +157,6 @@ class Maven(MavenGeneric):
                 f" and 'surefire-reports' report artifacts for details: {error}"
             step_result.success = False
         finally:
-            step_result.add_artifact(
-                description="Standard out and standard error from 'mvn test'.",
-                name='maven-output',
-                value=mvn_output_file_path
-            )
             step_result.add_artifact(
                 description="Surefire reports generated from 'mvn test'.",
                 name='surefire-reports',
@@ -1,6 +1,10 @@
 """`StepImplementers` for the `validate-environment-configuration` step.
 """
-from ploigos_step_runner.step_implementers.validate_environment_configuration.\
-    configlint import Configlint
-from ploigos_step_runner.step_implementers.validate_environment_configuration.\
-    configlint_from_argocd import ConfiglintFromArgocd
+
+from ploigos_step_runner.utils.reflection import import_classes_lazily
+
+# NOTE: import the StepImplementers, and their dependencies, only when used
+__getattr__ = import_classes_lazily(__name__, {
+    'Configlint': 'configlint',
+    'ConfiglintFromArgocd': 'configlint_from_argocd'
+})
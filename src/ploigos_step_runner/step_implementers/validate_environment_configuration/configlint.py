@@ -26,10 +26,12 @@ Result Artifacts
 ----------------
 Results artifacts output by this step.
 
-Result Artifact Key     | Description
-------------------------|------------
-`configlint-yml-file`   | File that was linted
-`configlint-result-set` | Result of configlint in a text file
+Result Artifact Key          | Description
+-----------------------------|------------
+`configlint-yml-file`        | File that was linted
+`configlint-result-set`      | Result of configlint in a text file, written on demand by
+                             | `psr logs STEP --decompress`
+`configlint-result-set-tail` | End of the result of configlint in a text file
 
 
 Examples
@@ -69,12 +71,11 @@ provide the configlint-yml-path.
 """
 
 import os
-import sys
 
 import sh
 from ploigos_step_runner import StepImplementer
 from ploigos_step_runner.step_result import StepResult
-from ploigos_step_runner.utils.io import create_sh_redirect_to_multiple_streams_fn_callback
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
 
 DEFAULT_CONFIG = {
     'rules': './config-lint.rules'
@@ -152,26 +153,20 @@ class Configlint(StepImplementer):
         try:
             # run config-lint writing stdout and stderr to the standard streams
             # as well as to a results file.
-            with open(configlint_results_file_path, 'w') as configlint_results_file:
-                out_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stdout,
-                    configlint_results_file
-                ])
-                err_callback = create_sh_redirect_to_multiple_streams_fn_callback([
-                    sys.stderr,
-                    configlint_results_file
-                ])
-
-                sh.config_lint(  # pylint: disable=no-member
+            with self.output_log_tee(
+                step_result=step_result,
+                name='configlint-result-set',
+                log_path=configlint_results_file_path
+            ) as output_tee:
+                sh_command_with_metrics(sh.config_lint)(  # pylint: disable=no-member
                     "-verbose",
                     "-debug",
                     "-rules",
                     rules_file,
                     configlint_yml_path,
                     _encoding='UTF-8',
-                    _out=out_callback,
-                    _err=err_callback,
-                    _tee='err'
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
                 )
         except sh.ErrorReturnCode_255:  # pylint: disable=no-member
             # NOTE: expected failure condition,
@@ -186,10 +181,6 @@ class Configlint(StepImplementer):
             step_result.success = False
             step_result.message = 'Unexpected Error invoking config-lint.'
 
-        step_result.add_artifact(
-            name='configlint-result-set',
-            value=configlint_results_file_path
-        )
         step_result.add_artifact(
             name='configlint-yml-path',
             value=configlint_yml_path
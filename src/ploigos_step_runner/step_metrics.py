@@ -0,0 +1,338 @@
+"""Performance metrics of running a step, including the sh commands run by the step.
+"""
+
+import os
+import re
+import resource
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager
+
+from ploigos_step_runner.trace import Tracer
+
+_CommandRusage = namedtuple('_CommandRusage', ['ru_utime', 'ru_stime', 'ru_maxrss'])
+
+
+class StepMetrics:
+    """Performance metrics of running a step.
+
+    Notes
+    -----
+    Only the program name and any leading sub command words (EG: 'git push' or
+    'argocd app sync') of each sh command are recorded, never the rest of the arguments,
+    since arguments can contain credentials and the metrics are written to the results file.
+
+    Attributes
+    ----------
+    __phase_seconds : dict
+        Seconds each named phase of running the step took, in the order they were run.
+    __commands : list of dict
+        Metrics of each sh command run by the step, in the order they finished.
+    __peak_rss_bytes : int or None
+        Peak resident set size of the step runner process.
+    __lock : threading.Lock
+        Lock for adding command metrics, which can be added from sh background threads.
+    """
+
+    __current = threading.local()
+    __sh_commands_lock = threading.Lock()
+    __sh_commands_running = weakref.WeakSet()
+    __sh_commands_started = 0
+
+    __COMMAND_WORD_PATTERN = re.compile(r'^[a-z][a-z0-9-]*$')
+    __MAX_COMMAND_WORDS = 3
+
+    def __init__(self):
+        self.__phase_seconds = {}
+        self.__commands = []
+        self.__peak_rss_bytes = None
+        self.__lock = threading.Lock()
+
+    @property
+    def phase_seconds(self):
+        """
+        Returns
+        -------
+        dict
+            Seconds each named phase of running the step took.
+        """
+        return self.__phase_seconds
+
+    @property
+    def commands(self):
+        """
+        Returns
+        -------
+        list of dict
+            Metrics of each sh command run by the step.
+        """
+        return self.__commands
+
+    @property
+    def peak_rss_bytes(self):
+        """
+        Returns
+        -------
+        int or None
+            Peak resident set size of the step runner process, or None if not yet recorded.
+        """
+        return self.__peak_rss_bytes
+
+    @contextmanager
+    def time_phase(self, phase_name):
+        """Context manager adding how long the wrapped code took to the given phase,
+        and recording it as a span on the active tracer, if any.
+
+        Parameters
+        ----------
+        phase_name : str
+            Name of the phase of running the step.
+        """
+        start = time.perf_counter()
+        try:
+            with Tracer.trace_span(phase_name, Tracer.CATEGORY_PHASE):
+                yield
+        finally:
+            self.__phase_seconds[phase_name] = round(
+                self.__phase_seconds.get(phase_name, 0) + time.perf_counter() - start,
+                6
+            )
+
+    @contextmanager
+    def record_commands(self):
+        """Context manager recording the metrics of the sh commands started by the current
+        thread while in the context, with a callback from create_sh_done_callback,
+        to this StepMetrics.
+        """
+        previous = getattr(StepMetrics.__current, 'step_metrics', None)
+        StepMetrics.__current.step_metrics = self
+        try:
+            yield self
+        finally:
+            StepMetrics.__current.step_metrics = previous
+
+    @staticmethod
+    def get_current():
+        """
+        Returns
+        -------
+        StepMetrics or None
+            StepMetrics recording the sh commands started by the current thread, if any.
+        """
+        return getattr(StepMetrics.__current, 'step_metrics', None)
+
+    def add_command(self, cmd, wall_seconds, rusage=None):
+        """Adds the metrics of a finished sh command.
+
+        Parameters
+        ----------
+        cmd : list of str or bytes
+            Program and arguments of the command.
+        wall_seconds : float
+            Seconds from starting to finishing the command.
+        rusage : resource.struct_rusage, optional
+            Resource usage of the command process, if known.
+            Its ru_maxrss can be None if the peak resident set size of the command is not known.
+        """
+        command_metrics = {
+            'command': StepMetrics.get_command_name(cmd),
+            'wall-seconds': round(wall_seconds, 6)
+        }
+        if rusage is not None:
+            command_metrics['user-cpu-seconds'] = round(rusage.ru_utime, 6)
+            command_metrics['sys-cpu-seconds'] = round(rusage.ru_stime, 6)
+            if rusage.ru_maxrss is not None:
+                command_metrics['max-rss-bytes'] = StepMetrics.__get_rss_bytes(rusage.ru_maxrss)
+
+        with self.__lock:
+            self.__commands.append(command_metrics)
+
+    def record_peak_rss(self):
+        """Records the current peak resident set size of the step runner process.
+        """
+        self.__peak_rss_bytes = StepMetrics.__get_rss_bytes(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        )
+
+    def get_metrics_dict(self):
+        """
+        Returns
+        -------
+        dict
+            Metrics of running the step.
+            For example:
+            {
+                'resolve-config-seconds': 0.012,
+                'run-step-seconds': 4.5,
+                'peak-rss-bytes': 52428800,
+                'commands': [
+                    {
+                        'command': 'git push',
+                        'wall-seconds': 1.2,
+                        'user-cpu-seconds': 0.05,
+                        'sys-cpu-seconds': 0.02,
+                        'max-rss-bytes': 10485760
+                    }
+                ]
+            }
+        """
+        metrics = {
+            f'{phase_name}-seconds': seconds
+            for phase_name, seconds in self.__phase_seconds.items()
+        }
+        if self.__peak_rss_bytes is not None:
+            metrics['peak-rss-bytes'] = self.__peak_rss_bytes
+        with self.__lock:
+            metrics['commands'] = [dict(command) for command in self.__commands]
+
+        return metrics
+
+    def get_summary(self):
+        """
+        Returns
+        -------
+        str
+            One line summary of the metrics of running the step.
+            For example:
+            resolve-config 0.012s, run-step 4.500s, peak RSS 50.0 MB,
+            2 commands 3.100s (git push 1.200s, argocd app sync 1.900s)
+        """
+        summary = [
+            f'{phase_name} {seconds:.3f}s'
+            for phase_name, seconds in self.__phase_seconds.items()
+        ]
+        if self.__peak_rss_bytes is not None:
+            summary.append(f'peak RSS {self.__peak_rss_bytes / (1024 * 1024):.1f} MB')
+
+        with self.__lock:
+            commands = list(self.__commands)
+        if commands:
+            commands_summary = ', '.join(
+                f"{command['command']} {command['wall-seconds']:.3f}s" for command in commands
+            )
+            commands_seconds = sum(command['wall-seconds'] for command in commands)
+            summary.append(
+                f'{len(commands)} commands {commands_seconds:.3f}s ({commands_summary})'
+            )
+
+        return ', '.join(summary)
+
+    @staticmethod
+    def create_sh_done_callback():
+        """Creates a callback, to give as the _done argument of a sh command as it is started,
+        that adds the metrics of the command to the StepMetrics recording commands for the
+        thread starting the command, if any, and records the command as a span on the
+        active tracer, if any.
+
+        Notes
+        -----
+        The CPU time and peak resident set size of the command are the change in the resource
+        usage of the reaped child processes of the step runner while the command ran, so they
+        are only recorded if no other sh command was started or running while the command ran.
+        Child processes not run by sh, such as with utils.commands, that are reaped while the
+        command runs are included.
+
+        Returns
+        -------
+        callable
+            Callback for sh to call with the running command, whether it succeeded, and its
+            exit code when the command has finished.
+
+        See Also
+        --------
+        utils.commands.sh_command_with_metrics
+        """
+        step_metrics = StepMetrics.get_current()
+        thread_id = threading.get_ident()
+
+        def sh_done_callback(running_command, success, exit_code): # pylint: disable=unused-argument
+            ended = time.time()
+            rusage = None
+            with StepMetrics.__sh_commands_lock:
+                ended_rusage = resource.getrusage(resource.RUSAGE_CHILDREN)
+                StepMetrics.__sh_commands_running.discard(sh_done_callback)
+                if exclusive and StepMetrics.__sh_commands_started == started_count:
+                    rusage = _CommandRusage(
+                        ru_utime=ended_rusage.ru_utime - started_rusage.ru_utime,
+                        ru_stime=ended_rusage.ru_stime - started_rusage.ru_stime,
+                        ru_maxrss=(
+                            ended_rusage.ru_maxrss
+                            if ended_rusage.ru_maxrss > started_rusage.ru_maxrss else None
+                        )
+                    )
+
+            if step_metrics is not None:
+                step_metrics.add_command(
+                    cmd=running_command.cmd,
+                    wall_seconds=ended - started,
+                    rusage=rusage
+                )
+
+            tracer = Tracer.get_active_tracer()
+            if tracer is not None:
+                tracer.add_span(
+                    name=StepMetrics.get_command_name(running_command.cmd),
+                    category=Tracer.CATEGORY_COMMAND,
+                    start=started,
+                    end=ended,
+                    args={'exit-code': exit_code},
+                    thread_id=thread_id
+                )
+
+        # NOTE: the callbacks of running commands are weakly referenced so the callback of a
+        #       command that never started, once garbage collected, does not stop the CPU time
+        #       of later commands being recorded
+        with StepMetrics.__sh_commands_lock:
+            exclusive = not StepMetrics.__sh_commands_running
+            StepMetrics.__sh_commands_running.add(sh_done_callback)
+            StepMetrics.__sh_commands_started += 1
+            started_count = StepMetrics.__sh_commands_started
+            started_rusage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        started = time.time()
+
+        return sh_done_callback
+
+    @staticmethod
+    def get_command_name(cmd):
+        """Gets the name of the given command that is safe to record, since it never includes
+        arguments that could contain credentials.
+
+        Parameters
+        ----------
+        cmd : list of str or bytes
+            Program and arguments of the command.
+
+        Returns
+        -------
+        str
+            Program name and leading sub command words of the given command.
+        """
+        words = [
+            os.fsdecode(arg) if isinstance(arg, bytes) else str(arg)
+            for arg in cmd[:StepMetrics.__MAX_COMMAND_WORDS]
+        ]
+        if not words:
+            return ''
+
+        command_name = [os.path.basename(words[0])]
+        for word in words[1:]:
+            if not StepMetrics.__COMMAND_WORD_PATTERN.match(word):
+                break
+            command_name.append(word)
+
+        return ' '.join(command_name)
+
+    @staticmethod
+    def __get_rss_bytes(max_rss):
+        """
+        Returns
+        -------
+        int
+            Given ru_maxrss in bytes, which is reported in bytes on macOS and kilobytes elsewhere.
+        """
+        if sys.platform == 'darwin':
+            return max_rss
+        return max_rss * 1024
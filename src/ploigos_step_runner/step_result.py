@@ -2,8 +2,6 @@
 """
 import json
 
-import yaml
-
 from ploigos_step_runner.exceptions import StepRunnerException
 
 
@@ -22,8 +20,19 @@ class StepResult: # pylint: disable=too-many-instance-attributes
     environment : str
         Optional. Environment that this step result is for
         if step was run against a specific environment.
+
+    Attributes
+    ----------
+    __change_listeners : tuple of callable
+        Called with this StepResult, and the name of the changed artifact or None,
+        whenever this StepResult is changed, see add_change_listener.
+        Not pickled or copied.
     """
 
+    # NOTE: class level default so StepResults pickled before metrics were recorded still load
+    __metrics = None
+    __change_listeners = ()
+
     def __init__(self, step_name, sub_step_name, sub_step_implementer_name, environment=None):
         self.__step_name = step_name
         self.__sub_step_name = sub_step_name
@@ -56,6 +65,35 @@ class StepResult: # pylint: disable=too-many-instance-attributes
         """
         return self.get_step_result_json()
 
+    def __getstate__(self):
+        """The change listeners are not pickled or copied, since they belong to whatever
+        this StepResult was added to rather than to the result itself.
+
+        Returns
+        -------
+        dict
+            State to pickle.
+        """
+        state = self.__dict__.copy()
+        state.pop('_StepResult__change_listeners', None)
+        return state
+
+    def add_change_listener(self, change_listener):
+        """Adds a callable to call whenever this StepResult is changed, such as by a
+        WorkflowResult this StepResult was added to, to keep its indexes up to date.
+
+        Parameters
+        ----------
+        change_listener : callable
+            Called with this StepResult, and the name of the changed artifact or
+            None if something other than an artifact changed.
+        """
+        self.__change_listeners = self.__change_listeners + (change_listener,)
+
+    def __changed(self, artifact_name=None):
+        for change_listener in self.__change_listeners:
+            change_listener(self, artifact_name)
+
     @property
     def step_name(self):
         """
@@ -179,6 +217,7 @@ class StepResult: # pylint: disable=too-many-instance-attributes
             'description': description,
             'value': value
         }
+        self.__changed(name)
 
     @property
     def success(self):
@@ -196,6 +235,7 @@ class StepResult: # pylint: disable=too-many-instance-attributes
         Setter for success
         """
         self.__success = success
+        self.__changed()
 
     @property
     def message(self):
@@ -213,6 +253,26 @@ class StepResult: # pylint: disable=too-many-instance-attributes
         Setter for message
         """
         self.__message = message
+        self.__changed()
+
+    @property
+    def metrics(self):
+        """
+        Returns
+        -------
+        dict or None
+            Performance metrics of running the step, see StepMetrics.get_metrics_dict,
+            or None if not recorded.
+        """
+        return self.__metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        """
+        Setter for metrics
+        """
+        self.__metrics = metrics
+        self.__changed()
 
     def get_sub_step_result(self):
         """
@@ -225,8 +285,11 @@ class StepResult: # pylint: disable=too-many-instance-attributes
                 'sub-step-implementer-name': 'value',
                 'success': Boolean,
                 'message': 'value',
-                'artifacts': {}
+                'artifacts': {},
+                'metrics': {}
             }
+
+            Where metrics is only included if recorded.
         """
         result = {
             'sub-step-implementer-name': self.sub_step_implementer_name,
@@ -234,6 +297,8 @@ class StepResult: # pylint: disable=too-many-instance-attributes
             'message': self.message,
             'artifacts': self.artifacts
         }
+        if self.metrics is not None:
+            result['metrics'] = self.metrics
         return result
 
     def get_step_result_dict(self):
@@ -290,4 +355,7 @@ class StepResult: # pylint: disable=too-many-instance-attributes
         str
             YAML formatted step result
         """
+        # NOTE: imported here since it is slow to import and rarely needed
+        import yaml # pylint: disable=import-outside-toplevel
+
         return yaml.dump(self.get_step_result_dict())
@@ -0,0 +1,377 @@
+"""Content addressed cache of StepResults, and the working files of the steps that produced
+them, so that a step whose inputs have not changed does not need to be run again.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import stat
+import tarfile
+import tempfile
+import threading
+
+
+class StepResultCache:
+    """Content addressed cache of StepResults and the working files of the steps that
+    produced them.
+
+    Notes
+    -----
+    Cached results are stored in the cache directory under the key of the inputs known before
+    running a step (its configuration, implementation, and sources), and then under a key of
+    the previous step result artifacts the step read while running. Since which artifacts a
+    step reads is only known after running it, the artifacts each cached result read are
+    stored with it so that they can be read again to check if they are unchanged.
+
+    Once the cached results are larger than the maximum size the least recently used cached
+    results are removed.
+
+    Since cached results are unpickled, and their working files extracted, the cache directory
+    is created so only the current user can use it, and is not used at all if it is owned by
+    another user or can be written to by others.
+
+    Parameters
+    ----------
+    cache_dir_path : str
+        Path to the directory to store cached results in.
+    max_size : int, optional
+        Maximum size in bytes of all of the cached results.
+        Default: DEFAULT_MAX_SIZE
+
+    Attributes
+    ----------
+    __cache_dir_path : str
+    __max_size : int
+    __lock : threading.Lock
+        Lock for adding and removing cached results within this process.
+    """
+
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+    __STEP_RESULT_FILE_NAME = 'step-result.pkl'
+    __READ_KEYS_FILE_NAME = 'read-keys.json'
+    __WORKING_FILES_FILE_NAME = 'working-files.tar.gz'
+    __TEMP_DIR_PREFIX = '.tmp-'
+
+    def __init__(self, cache_dir_path, max_size=DEFAULT_MAX_SIZE):
+        assert isinstance(max_size, int) and max_size >= 0, \
+            f"Step result cache max size ({max_size}) must be a non negative int."
+
+        self.__cache_dir_path = cache_dir_path
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+
+    @property
+    def cache_dir_path(self):
+        """
+        Returns
+        -------
+        str
+            Path to the directory cached results are stored in.
+        """
+        return self.__cache_dir_path
+
+    @property
+    def max_size(self):
+        """
+        Returns
+        -------
+        int
+            Maximum size in bytes of all of the cached results.
+        """
+        return self.__max_size
+
+    @staticmethod
+    def get_key(value):
+        """Gets the content addressed key for the given value.
+
+        Parameters
+        ----------
+        value : object
+            Value to get the key for. Anything that can not be serialized to JSON is
+            keyed by its repr.
+
+        Returns
+        -------
+        str
+            Hex digest of the given value.
+        """
+        return hashlib.sha256(
+            json.dumps(value, sort_keys=True, default=repr).encode('utf-8')
+        ).hexdigest()
+
+    @staticmethod
+    def get_paths_key(paths):
+        """Gets the content addressed key for the contents of the given files, and the files
+        in the given directories.
+
+        Parameters
+        ----------
+        paths : list of str
+            Files, or directories of files, to get the key of the contents of.
+
+        Returns
+        -------
+        str
+            Hex digest of the names and contents of the given files.
+        """
+        paths_hash = hashlib.sha256()
+        for path in paths:
+            file_paths = [path]
+            if os.path.isdir(path):
+                file_paths = sorted(
+                    os.path.join(dir_path, file_name)
+                    for dir_path, _, file_names in os.walk(path)
+                    for file_name in file_names
+                )
+
+            for file_path in file_paths:
+                paths_hash.update(file_path.encode('utf-8') + b'\0')
+                try:
+                    with open(file_path, 'rb') as file:
+                        for chunk in iter(lambda: file.read(1024 * 1024), b''): # pylint: disable=cell-var-from-loop
+                            paths_hash.update(chunk)
+                except OSError:
+                    paths_hash.update(b'\0missing\0')
+
+        return paths_hash.hexdigest()
+
+    def get(self, inputs_key, get_read_value, work_dir_path):
+        """Gets the cached StepResult for the given inputs, if any, restoring the working files
+        of the step that produced it.
+
+        Parameters
+        ----------
+        inputs_key : str
+            Key of the inputs known before running the step.
+        get_read_value : callable
+            Called with each of the read keys stored with a cached result to get its
+            current value.
+        work_dir_path : str
+            Path to the working directory to restore the working files to.
+
+        Returns
+        -------
+        StepResult or None
+            Cached StepResult for the given inputs or
+            None if there is none, or the cache directory is not trusted.
+        """
+        if not self.__is_cache_dir_trusted():
+            return None
+
+        inputs_dir_path = os.path.join(self.__cache_dir_path, inputs_key)
+        try:
+            result_keys = sorted(os.listdir(inputs_dir_path))
+        except OSError:
+            return None
+
+        for result_key in result_keys:
+            result_dir_path = os.path.join(inputs_dir_path, result_key)
+            try:
+                with open(
+                    os.path.join(result_dir_path, StepResultCache.__READ_KEYS_FILE_NAME),
+                    'r',
+                    encoding='utf-8'
+                ) as read_keys_file:
+                    read_keys = [tuple(read_key) for read_key in json.load(read_keys_file)]
+
+                if StepResultCache.__get_result_key(inputs_key, read_keys, get_read_value) \
+                        != result_key:
+                    continue
+
+                with open(
+                    os.path.join(result_dir_path, StepResultCache.__STEP_RESULT_FILE_NAME),
+                    'rb'
+                ) as step_result_file:
+                    step_result = pickle.load(step_result_file)
+
+                StepResultCache.__extract_working_files(
+                    os.path.join(result_dir_path, StepResultCache.__WORKING_FILES_FILE_NAME),
+                    work_dir_path
+                )
+
+                # mark as recently used
+                os.utime(result_dir_path)
+                return step_result
+            except (OSError, ValueError, pickle.UnpicklingError, tarfile.TarError):
+                # cached result removed, or only partly removed, while reading it
+                continue
+
+        return None
+
+    def put(self, inputs_key, read_keys, get_read_value, step_result, work_dir_path):
+        """Caches the given StepResult and working files of the step that produced it,
+        unless the cache directory is not trusted.
+
+        Parameters
+        ----------
+        inputs_key : str
+            Key of the inputs known before running the step.
+        read_keys : list of tuple
+            Keys of the values the step read while running,
+            that must be unchanged for the cached result to be used.
+        get_read_value : callable
+            Called with each of the given read keys to get its value.
+        step_result : StepResult
+            StepResult to cache.
+        work_dir_path : str
+            Path to the working directory of the step to cache the working files of.
+        """
+        read_keys = sorted(read_keys, key=repr)
+        result_key = StepResultCache.__get_result_key(inputs_key, read_keys, get_read_value)
+
+        os.makedirs(self.__cache_dir_path, mode=0o700, exist_ok=True)
+        if not self.__is_cache_dir_trusted():
+            return
+
+        temp_dir_path = tempfile.mkdtemp(
+            prefix=StepResultCache.__TEMP_DIR_PREFIX,
+            dir=self.__cache_dir_path
+        )
+        try:
+            with open(
+                os.path.join(temp_dir_path, StepResultCache.__READ_KEYS_FILE_NAME),
+                'w',
+                encoding='utf-8'
+            ) as read_keys_file:
+                json.dump(read_keys, read_keys_file)
+
+            with open(
+                os.path.join(temp_dir_path, StepResultCache.__STEP_RESULT_FILE_NAME),
+                'wb'
+            ) as step_result_file:
+                pickle.dump(step_result, step_result_file)
+
+            with tarfile.open(
+                os.path.join(temp_dir_path, StepResultCache.__WORKING_FILES_FILE_NAME),
+                'w:gz'
+            ) as working_files:
+                working_files.add(work_dir_path, arcname='.')
+
+            with self.__lock:
+                inputs_dir_path = os.path.join(self.__cache_dir_path, inputs_key)
+                os.makedirs(inputs_dir_path, exist_ok=True)
+                result_dir_path = os.path.join(inputs_dir_path, result_key)
+                if os.path.exists(result_dir_path):
+                    shutil.rmtree(result_dir_path, ignore_errors=True)
+                os.rename(temp_dir_path, result_dir_path)
+        finally:
+            shutil.rmtree(temp_dir_path, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used cached results until all of the cached results
+        are no larger than the maximum size.
+        """
+        with self.__lock:
+            cached_results = []
+            total_size = 0
+            for inputs_dir_path, result_dir_path in self.__get_result_dir_paths():
+                try:
+                    last_used = os.stat(result_dir_path).st_mtime
+                    size = sum(
+                        os.path.getsize(os.path.join(result_dir_path, file_name))
+                        for file_name in os.listdir(result_dir_path)
+                    )
+                except OSError:
+                    continue
+
+                cached_results.append((last_used, size, inputs_dir_path, result_dir_path))
+                total_size += size
+
+            for _, size, inputs_dir_path, result_dir_path in sorted(cached_results):
+                if total_size <= self.__max_size:
+                    break
+
+                shutil.rmtree(result_dir_path, ignore_errors=True)
+                total_size -= size
+
+                # remove the inputs directory once it has no more cached results
+                try:
+                    os.rmdir(inputs_dir_path)
+                except OSError:
+                    pass
+
+    def __is_cache_dir_trusted(self):
+        """
+        Returns
+        -------
+        bool
+            True if the cache directory does not exist yet, or is owned by the current user and
+            can not be written to by others, False otherwise.
+        """
+        try:
+            cache_dir_stat = os.stat(self.__cache_dir_path)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+        if hasattr(os, 'getuid') and cache_dir_stat.st_uid != os.getuid():
+            return False
+        return not cache_dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    def __get_result_dir_paths(self):
+        """
+        Returns
+        -------
+        list of tuple
+            Path to the inputs directory and path to the result directory of each cached result.
+        """
+        result_dir_paths = []
+        try:
+            inputs_keys = os.listdir(self.__cache_dir_path)
+        except OSError:
+            return result_dir_paths
+
+        for inputs_key in inputs_keys:
+            if inputs_key.startswith(StepResultCache.__TEMP_DIR_PREFIX):
+                continue
+
+            inputs_dir_path = os.path.join(self.__cache_dir_path, inputs_key)
+            try:
+                result_keys = os.listdir(inputs_dir_path)
+            except OSError:
+                continue
+
+            for result_key in result_keys:
+                result_dir_paths.append(
+                    (inputs_dir_path, os.path.join(inputs_dir_path, result_key))
+                )
+
+        return result_dir_paths
+
+    @staticmethod
+    def __get_result_key(inputs_key, read_keys, get_read_value):
+        """
+        Returns
+        -------
+        str
+            Key of the given inputs key and the current value of each of the given read keys.
+        """
+        return StepResultCache.get_key([
+            inputs_key,
+            [[read_key, get_read_value(read_key)] for read_key in read_keys]
+        ])
+
+    @staticmethod
+    def __extract_working_files(working_files_path, work_dir_path):
+        """Extracts the cached working files to the given working directory.
+        """
+        os.makedirs(work_dir_path, exist_ok=True)
+        with tarfile.open(working_files_path, 'r:gz') as working_files:
+            # NOTE: use the data filter, where available, to refuse to extract anything
+            #       outside of the working directory
+            if hasattr(tarfile, 'data_filter'):
+                working_files.extractall(work_dir_path, filter='data')
+            else:
+                for member in working_files.getmembers():
+                    member_path = os.path.realpath(os.path.join(work_dir_path, member.name))
+                    if not member_path.startswith(os.path.realpath(work_dir_path)):
+                        raise tarfile.TarError(
+                            f"Refusing to extract ({member.name}) outside of ({work_dir_path})"
+                        )
+                working_files.extractall(work_dir_path) # nosec
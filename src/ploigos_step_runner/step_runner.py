@@ -1,9 +1,20 @@
 """Constructs a given named StepImplementer using a given configuration, and runs it.
 """
+import io
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+
 from ploigos_step_runner.step_implementer import StepImplementer
 from ploigos_step_runner.config.config import Config
+from ploigos_step_runner.config.step_config import StepConfig
 from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.utils.file import parse_yaml_or_json_file
+from ploigos_step_runner.utils.io import TextIOThreadLocalRouter
+from ploigos_step_runner.trace import Tracer
 from ploigos_step_runner.utils.reflection import import_and_get_class
+from ploigos_step_runner.workflow_result import WorkflowResult
 
 
 class StepRunner:
@@ -25,10 +36,21 @@ class StepRunner:
         Default: step-runner-results
     results_file_name : str, optional
         Path to the file for steps to write their results to
-        Default: step-runner-results.yml
+        Default: step-runner-results.yml, or step-runner-results.{results_format}
+        if results_format is not yaml
     work_dir_path : str, optional
         Path to the working folder for step_implementers for runtime files
         Default: step-runner-working
+    results_format : str, optional
+        Format to write the results file in, one of WorkflowResult.RESULTS_FORMATS.
+        Default: yaml
+    step_result_cache : StepResultCache, optional
+        Cache of the results of previous step runs for steps that enable the cache step option.
+        Default: results are never cached
+    config_dump : str, optional
+        How much of the configuration of each sub step to print before running it,
+        one of StepConfig.CONFIG_DUMPS, for steps that do not set the config-dump step option.
+        Default: full
 
     Raises
     ------
@@ -46,21 +68,36 @@ class StepRunner:
 
     __DEFAULT_MODULE = 'ploigos_step_runner.step_implementers'
 
-    def __init__(
+    WORKFLOW_KEY = 'step-runner-workflow'
+    DEFAULT_WORKFLOW_MAX_WORKERS = 4
+
+    def __init__( # pylint: disable=too-many-arguments
             self,
             config,
             results_dir_path='step-runner-results',
-            results_file_name='step-runner-results.yml',
-            work_dir_path='step-runner-working'):
+            results_file_name=None,
+            work_dir_path='step-runner-working',
+            results_format=WorkflowResult.RESULTS_FORMAT_YAML,
+            step_result_cache=None,
+            config_dump=StepConfig.CONFIG_DUMP_FULL):
 
         if isinstance(config, Config):
             self.__config = config
         else:
             self.__config = Config(config)
 
+        if results_file_name is None:
+            if results_format == WorkflowResult.RESULTS_FORMAT_YAML:
+                results_file_name = 'step-runner-results.yml'
+            else:
+                results_file_name = f'step-runner-results.{results_format}'
+
         self.results_dir_path = results_dir_path
         self.results_file_name = results_file_name
         self.work_dir_path = work_dir_path
+        self.results_format = results_format
+        self.step_result_cache = step_result_cache
+        self.config_dump = config_dump
 
     @property
     def config(self):
@@ -72,7 +109,7 @@ class StepRunner:
         """
         return self.__config
 
-    def run_step(self, step_name, environment=None):
+    def run_step(self, step_name, environment=None, workflow_result=None):
         """
         Call the given step.
 
@@ -83,6 +120,9 @@ class StepRunner:
         environment : str, optional
             Name of the environment the step is being run in. Used to determine environment
             specific global defaults and step configuration.
+        workflow_result : WorkflowResult, optional
+            Results of previous steps to add the results of this step to.
+            Default: loaded from the work_dir_path
 
         Raises
         ------
@@ -99,32 +139,535 @@ class StepRunner:
            False if step returned an error message
         """
 
+        return self.__run_step(step_name, environment, workflow_result)
+
+    def run_workflow(self, workflow, environment=None, max_workers=None, workflow_result=None):
+        """Run a workflow of steps, running steps that do not depend on each other concurrently.
+
+        Notes
+        -----
+        Every step is run in this process sharing one WorkflowResult, so the configuration
+        is parsed and the results of previous steps are loaded only once for the workflow.
+
+        When running steps concurrently the output of each step is buffered and written
+        once the step finishes so that the output of steps is not interleaved.
+
+        Once a step is not successful no more steps are started, steps already running
+        are allowed to finish.
+
+        Parameters
+        ----------
+        workflow : dict, list, str (file)
+            See parse_workflow.
+        environment : str, optional
+            Name of the environment the steps are being run in.
+        max_workers : int, optional
+            Maximum number of steps to run concurrently.
+            Default: DEFAULT_WORKFLOW_MAX_WORKERS
+        workflow_result : WorkflowResult, optional
+            Results of previous steps to add the results of the workflow steps to.
+            Default: loaded from the work_dir_path
+
+        Raises
+        ------
+        ValueError
+            If given workflow can not be parsed.
+        AssertionError
+            If given workflow is not valid.
+        StepRunnerException
+            If any step raised a StepRunnerException, after running steps have finished.
+
+        Returns
+        -------
+        Bool
+           True if all of the steps completed successfully
+           False if any step returned an error message
+        """
+        workflow = StepRunner.parse_workflow(workflow)
+        if max_workers is None:
+            max_workers = StepRunner.DEFAULT_WORKFLOW_MAX_WORKERS
+        assert isinstance(max_workers, int) and max_workers > 0, \
+            f"Workflow max workers ({max_workers}) must be a positive int."
+
+        if workflow_result is None:
+            workflow_result = StepImplementer.load_workflow_result(
+                work_dir_path=self.work_dir_path,
+                results_file_name=self.results_file_name
+            )
+
+        # only route the output of each thread to its own buffer if steps can run concurrently
+        stdout = sys.stdout
+        stderr = sys.stderr
+        if max_workers > 1:
+            stdout = TextIOThreadLocalRouter(sys.stdout)
+            stderr = TextIOThreadLocalRouter(sys.stderr)
+
+        with redirect_stdout(stdout), redirect_stderr(stderr), \
+                ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                Tracer.trace_span('workflow', Tracer.CATEGORY_WORKFLOW):
+            return self.__run_workflow_steps(workflow, environment, workflow_result, executor)
+
+    def __run_workflow_steps( # pylint: disable=too-many-locals
+        self,
+        workflow,
+        environment,
+        workflow_result,
+        executor
+    ):
+        """Schedules each step of the given workflow once the steps it depends on have completed
+        successfully and waits for the running steps to finish.
+
+        Parameters
+        ----------
+        workflow : dict
+            Parsed workflow. See parse_workflow.
+        environment : str
+            Name of the environment the steps are being run in.
+        workflow_result : WorkflowResult
+            WorkflowResult shared by all of the steps.
+        executor : concurrent.futures.Executor
+            Executor to run the steps with.
+
+        Returns
+        -------
+        Bool
+           True if all of the steps completed successfully
+           False if any step returned an error message
+        """
+        pending_steps = dict(workflow)
+        completed_steps = set()
+        running_steps = {}
+        success = True
+        error = None
+        while pending_steps or running_steps:
+            if success:
+                for step_name, dependencies in list(pending_steps.items()):
+                    if completed_steps.issuperset(dependencies):
+                        del pending_steps[step_name]
+                        future = executor.submit(
+                            StepRunner.__run_with_buffered_output,
+                            self.__run_step,
+                            step_name,
+                            environment,
+                            workflow_result
+                        )
+                        running_steps[future] = step_name
+
+            if not running_steps:
+                break
+
+            done, _ = wait(running_steps, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_name = running_steps.pop(future)
+                step_success, step_error, step_output = future.result()
+
+                sys.stdout.write(step_output)
+                sys.stdout.flush()
+
+                if step_error is not None:
+                    success = False
+                    error = error or step_error
+                elif not step_success:
+                    success = False
+                else:
+                    completed_steps.add(step_name)
+
+        if error is not None:
+            raise error
+
+        return success
+
+    @staticmethod
+    def __run_with_buffered_output(function, *args):
+        """Calls the given function with the given arguments, buffering its output if sys.stdout
+        and sys.stderr are TextIOThreadLocalRouters.
+
+        Returns
+        -------
+        tuple (object, Exception, str)
+            Result of the function, error raised by the function if any, and the buffered output
+            of the function.
+        """
+        output = io.StringIO()
+        result = None
+        result_error = None
+
+        if isinstance(sys.stdout, TextIOThreadLocalRouter):
+            with sys.stdout.redirect(output), sys.stderr.redirect(output):
+                try:
+                    result = function(*args)
+                except Exception as error: # pylint: disable=broad-except
+                    result_error = error
+        else:
+            try:
+                result = function(*args)
+            except Exception as error: # pylint: disable=broad-except
+                result_error = error
+
+        return result, result_error, output.getvalue()
+
+    @staticmethod
+    def parse_workflow(workflow):
+        """Parses and validates a workflow definition.
+
+        Parameters
+        ----------
+        workflow : dict, list, str (file)
+            A dictionary of step names to the step name, or list of step names,
+            that step depends on,
+            or a list of step names to run one after the other,
+            or a string that is a path to a YAML or JSON file with either of the former
+            under the WORKFLOW_KEY top level key.
+
+        Examples
+        --------
+        step-runner-workflow:
+          generate-metadata: []
+          static-code-analysis: [generate-metadata]
+          unit-test: [generate-metadata]
+          package: [static-code-analysis, unit-test]
+
+        Raises
+        ------
+        ValueError
+            If given workflow file can not be parsed as YAML or JSON.
+            If given workflow is not of expected type.
+        AssertionError
+            If given workflow file does not have the WORKFLOW_KEY top level key.
+            If a step depends on a step that is not in the workflow.
+            If the steps depend on each other in a cycle.
+
+        Returns
+        -------
+        dict
+            Step names in declared order to the list of step names each step depends on.
+        """
+        if isinstance(workflow, str):
+            workflow_file = workflow
+            try:
+                parsed_workflow_file = parse_yaml_or_json_file(workflow_file)
+            except ValueError as error:
+                raise ValueError(
+                    f"Error parsing workflow file ({workflow_file}) as json or yaml"
+                ) from error
+
+            assert isinstance(parsed_workflow_file, dict) \
+                and StepRunner.WORKFLOW_KEY in parsed_workflow_file, \
+                f"Failed to parse workflow file ({workflow_file}): " + \
+                f"Missing expected top level key ({StepRunner.WORKFLOW_KEY})"
+            workflow = parsed_workflow_file[StepRunner.WORKFLOW_KEY]
+
+        parsed_workflow = {}
+        if isinstance(workflow, list):
+            previous_step_name = None
+            for step_name in workflow:
+                parsed_workflow[step_name] = [previous_step_name] if previous_step_name else []
+                previous_step_name = step_name
+        elif isinstance(workflow, dict):
+            for step_name, dependencies in workflow.items():
+                if dependencies is None:
+                    dependencies = []
+                elif isinstance(dependencies, str):
+                    dependencies = [dependencies]
+                elif not isinstance(dependencies, list):
+                    raise ValueError(
+                        f"Expected workflow step ({step_name}) dependencies to be" +
+                        f" a step name or list of step names but got: {dependencies}"
+                    )
+                parsed_workflow[step_name] = list(dependencies)
+        else:
+            raise ValueError(
+                f"Expected workflow to be a dict, list, or file path but got: {workflow}"
+            )
+
+        StepRunner.__validate_workflow_dependencies(parsed_workflow)
+
+        return parsed_workflow
+
+    @staticmethod
+    def __validate_workflow_dependencies(workflow):
+        """Validates the steps of the given workflow only depend on steps in the workflow
+        and do not depend on each other in a cycle.
+
+        Parameters
+        ----------
+        workflow : dict
+            Step names to the list of step names each step depends on.
+
+        Raises
+        ------
+        AssertionError
+            If a step depends on a step that is not in the workflow.
+            If the steps depend on each other in a cycle.
+        """
+        for step_name, dependencies in workflow.items():
+            for dependency in dependencies:
+                assert dependency in workflow, \
+                    f"Workflow step ({step_name}) depends on step ({dependency})" + \
+                    " which is not in the workflow."
+
+        # verify every step can be scheduled, if not the remaining steps depend on each other
+        scheduled_steps = set()
+        unscheduled_steps = dict(workflow)
+        while unscheduled_steps:
+            ready_steps = [
+                step_name for step_name, dependencies in unscheduled_steps.items()
+                if scheduled_steps.issuperset(dependencies)
+            ]
+            assert ready_steps, \
+                f"Workflow steps ({list(unscheduled_steps)}) have cyclic dependencies."
+            for step_name in ready_steps:
+                del unscheduled_steps[step_name]
+                scheduled_steps.add(step_name)
+
+    def __run_step(self, step_name, environment=None, workflow_result=None):
+        """Runs each of the sub steps of the given step.
+
+        Parameters
+        ----------
+        step_name : str
+            Ploigos step to run.
+        environment : str, optional
+            Name of the environment the step is being run in.
+        workflow_result : WorkflowResult, optional
+            WorkflowResult to share between the sub steps,
+            if not given each sub step loads the results of previous steps.
+
+        Returns
+        -------
+        Bool
+           True if step completed successfully
+           False if step returned an error message
+        """
+        with Tracer.trace_span(step_name, Tracer.CATEGORY_STEP, {'environment': environment}):
+            return self.__run_sub_steps(step_name, environment, workflow_result)
+
+    def __run_sub_steps(self, step_name, environment, workflow_result):
+        """Runs each of the sub steps of the given step.
+
+        See Also
+        --------
+        __run_step
+        """
         sub_step_configs = self.config.get_sub_step_configs(step_name)
         assert len(sub_step_configs) != 0, \
             f"Can not run step ({step_name}) because no step configuration provided."
 
+        step_config = self.config.get_step_config(step_name)
+        if step_config.parallel and len(sub_step_configs) > 1:
+            return self.__run_sub_steps_in_parallel(
+                step_config,
+                sub_step_configs,
+                environment,
+                workflow_result
+            )
+
         # for each sub step in the step config get the step implementer and run it
+        success = True
         for sub_step_config in sub_step_configs:
-            sub_step_implementer_name = sub_step_config.sub_step_implementer_name
+            sub_step = self.__create_sub_step(sub_step_config, environment, workflow_result)
+
+            # run the step
+            if not sub_step.run_step():
+                success = False
+                if step_config.fail_fast:
+                    break
+
+        return success
 
-            step_implementer_class = StepRunner.__get_step_implementer_class(
-                step_name,
-                sub_step_implementer_name)
+    def __run_sub_steps_in_parallel(
+        self,
+        step_config,
+        sub_step_configs,
+        environment,
+        workflow_result
+    ):
+        """Runs the given sub steps concurrently.
+
+        Notes
+        -----
+        The output of each sub step, including the output of the sh commands it runs with
+        streams resolved by get_thread_stream, is buffered and written in configuration order
+        once all of the sub steps have finished, and the results of the sub steps are added to the
+        workflow result in configuration order, regardless of the order the sub steps finish in.
+
+        If the step is configured to fail fast, once a sub step is not successful no more sub
+        steps are run, sub steps already running are allowed to finish.
+
+        Parameters
+        ----------
+        step_config : StepConfig
+            Configuration of the step the sub steps are part of.
+        sub_step_configs : list of SubStepConfig
+            Sub steps to run.
+        environment : str
+            Name of the environment the step is being run in.
+        workflow_result : WorkflowResult
+            WorkflowResult to share between the sub steps,
+            if not given it is loaded from the working directory.
 
-            # create the StepImplementer instance
-            sub_step = step_implementer_class(
-                results_dir_path=self.results_dir_path,
-                results_file_name=self.results_file_name,
+        Raises
+        ------
+        Exception
+            First error, in configuration order, raised by any of the sub steps, after all of the
+            running sub steps have finished.
+
+        Returns
+        -------
+        Bool
+           True if all of the sub steps completed successfully
+           False if any sub step returned an error message
+        """
+        # NOTE: sub steps must share a WorkflowResult so they do not overwrite each others results
+        if workflow_result is None:
+            workflow_result = StepImplementer.load_workflow_result(
                 work_dir_path=self.work_dir_path,
-                config=sub_step_config,
-                environment=environment
+                results_file_name=self.results_file_name
             )
 
-            # run the step
-            if not sub_step.run_step():
-                return False
+        max_workers = step_config.max_workers or len(sub_step_configs)
+
+        # if already running concurrently, for example as part of a workflow,
+        # then sys.stdout and sys.stderr are already TextIOThreadLocalRouters
+        stdout = sys.stdout
+        if not isinstance(stdout, TextIOThreadLocalRouter):
+            stdout = TextIOThreadLocalRouter(stdout)
+        stderr = sys.stderr
+        if not isinstance(stderr, TextIOThreadLocalRouter):
+            stderr = TextIOThreadLocalRouter(stderr)
+
+        with redirect_stdout(stdout), redirect_stderr(stderr), \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # each sub step waits for the previous sub step to add its result before adding its own
+            futures = []
+            saved_events = []
+            failed_event = threading.Event() if step_config.fail_fast else None
+            for sub_step_config in sub_step_configs:
+                saved_events.append(threading.Event())
+                futures.append(executor.submit(
+                    StepRunner.__run_with_buffered_output,
+                    StepRunner.__run_parallel_sub_step,
+                    self.__create_sub_step(sub_step_config, environment, workflow_result),
+                    saved_events[-2] if len(saved_events) > 1 else None,
+                    saved_events[-1],
+                    failed_event
+                ))
+
+        return StepRunner.__get_parallel_sub_steps_success(futures)
+
+    @staticmethod
+    def __get_parallel_sub_steps_success(futures):
+        """Writes the buffered output of the given finished sub steps in configuration order
+        and gets if they were all successful.
+
+        Parameters
+        ----------
+        futures : list of concurrent.futures.Future
+            Finished sub steps in configuration order.
+
+        Raises
+        ------
+        Exception
+            First error, in configuration order, raised by any of the sub steps.
+
+        Returns
+        -------
+        Bool
+           True if all of the sub steps completed successfully
+           False if any sub step returned an error message or was not run
+        """
+        success = True
+        error = None
+        for future in futures:
+            sub_step_success, sub_step_error, sub_step_output = future.result()
+            sys.stdout.write(sub_step_output)
+            success = success and bool(sub_step_success) and sub_step_error is None
+            error = error or sub_step_error
+        sys.stdout.flush()
+
+        if error is not None:
+            raise error
+
+        return success
+
+    @staticmethod
+    def __run_parallel_sub_step(sub_step, previous_saved_event, saved_event, failed_event):
+        """Runs the given sub step, adding its result to the workflow result once the previous
+        sub step has, and then signaling the next sub step that it can add its result.
+
+        Parameters
+        ----------
+        sub_step : StepImplementer
+            Sub step to run.
+        previous_saved_event : threading.Event
+            Event set once the previous sub step has added its result, or None if first sub step.
+        saved_event : threading.Event
+            Event to set once this sub step has added its result, or will not.
+        failed_event : threading.Event
+            If given, the sub step is not run if this event is set, and it is set if the sub step
+            is not successful.
+
+        Returns
+        -------
+        Bool
+           True if sub step completed successfully
+           False if sub step returned an error message
+           None if sub step was not run because another sub step was not successful
+        """
+        try:
+            if failed_event is not None and failed_event.is_set():
+                return None
+
+            sub_step_success = sub_step.run_step(save_after=previous_saved_event)
+            if not sub_step_success and failed_event is not None:
+                failed_event.set()
+            return sub_step_success
+        except Exception:
+            if failed_event is not None:
+                failed_event.set()
+            raise
+        finally:
+            # NOTE: if this sub step did not add its result, either because it was not run or
+            #       it raised an error, still wait for the previous sub step so that the next
+            #       sub step does not add its result before the previous sub step
+            if previous_saved_event is not None:
+                previous_saved_event.wait()
+            saved_event.set()
+
+    def __create_sub_step(self, sub_step_config, environment, workflow_result):
+        """Creates the StepImplementer for the given sub step.
+
+        Parameters
+        ----------
+        sub_step_config : SubStepConfig
+            Sub step to create the StepImplementer for.
+        environment : str
+            Name of the environment the step is being run in.
+        workflow_result : WorkflowResult
+            WorkflowResult for the sub step to use,
+            if not given the sub step loads the results of previous steps.
+
+        Returns
+        -------
+        StepImplementer
+            StepImplementer for the given sub step.
+        """
+        step_implementer_class = StepRunner.__get_step_implementer_class(
+            sub_step_config.step_name,
+            sub_step_config.sub_step_implementer_name)
 
-        return True
+        # create the StepImplementer instance
+        return step_implementer_class(
+            results_dir_path=self.results_dir_path,
+            results_file_name=self.results_file_name,
+            work_dir_path=self.work_dir_path,
+            config=sub_step_config,
+            environment=environment,
+            results_format=self.results_format,
+            workflow_result=workflow_result,
+            step_result_cache=self.step_result_cache,
+            config_dump=self.config_dump
+        )
 
     @staticmethod
     def __get_step_implementer_class(step_name, step_implementer_name):
@@ -0,0 +1,188 @@
+"""Recording of spans of time, such as steps, phases of steps, and commands, written as a trace
+file that can be loaded into a trace viewer.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """Records spans of time, such as steps, phases of steps, and commands, and writes them
+    in the Chrome trace event format.
+
+    Notes
+    -----
+    The Chrome trace event format is a JSON file of 'complete' events, one per span, which can
+    be loaded into chrome://tracing, https://ui.perfetto.dev, or other trace viewers to see
+    the timeline of each thread spans were recorded on.
+
+    Spans are only recorded by Tracer.trace_span, and the other code recording spans, while
+    a Tracer is the active tracer. See set_active_tracer.
+
+    Attributes
+    ----------
+    __trace_events : list of dict
+        Chrome trace events of the recorded spans.
+    __thread_ids : set of int
+        Threads that metadata events naming them have been added for.
+    __lock : threading.Lock
+        Lock for adding spans, which can be recorded from many threads.
+    """
+
+    CATEGORY_WORKFLOW = 'workflow'
+    CATEGORY_STEP = 'step'
+    CATEGORY_SUB_STEP = 'sub-step'
+    CATEGORY_PHASE = 'phase'
+    CATEGORY_COMMAND = 'command'
+
+    __active_tracer = None
+
+    def __init__(self):
+        self.__trace_events = [{
+            'name': 'process_name',
+            'ph': 'M',
+            'pid': os.getpid(),
+            'args': {'name': 'psr'}
+        }]
+        self.__thread_ids = set()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def set_active_tracer(tracer):
+        """Sets the Tracer to record spans to.
+
+        Parameters
+        ----------
+        tracer : Tracer or None
+            Tracer to record spans to, or None to stop recording spans.
+        """
+        Tracer.__active_tracer = tracer
+
+    @staticmethod
+    def get_active_tracer():
+        """
+        Returns
+        -------
+        Tracer or None
+            Tracer recording spans, or None if spans are not being recorded.
+        """
+        return Tracer.__active_tracer
+
+    @staticmethod
+    @contextmanager
+    def trace_span(name, category, args=None):
+        """Context manager recording the wrapped code as a span on the active tracer, if any.
+
+        Parameters
+        ----------
+        name : str
+            Name of the span.
+        category : str
+            Category of the span, one of the Tracer.CATEGORY_* constants.
+        args : dict, optional
+            Additional details of the span shown by trace viewers.
+        """
+        tracer = Tracer.get_active_tracer()
+        if tracer is None:
+            yield
+            return
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            tracer.add_span(name=name, category=category, start=start, end=time.time(), args=args)
+
+    @property
+    def trace_events(self):
+        """
+        Returns
+        -------
+        list of dict
+            Chrome trace events of the recorded spans.
+        """
+        with self.__lock:
+            return list(self.__trace_events)
+
+    def add_span(self, name, category, start, end, args=None, thread_id=None): # pylint: disable=too-many-arguments
+        """Adds a span.
+
+        Parameters
+        ----------
+        name : str
+            Name of the span.
+        category : str
+            Category of the span, one of the Tracer.CATEGORY_* constants.
+        start : float
+            Time, in seconds since the epoch, the span started.
+        end : float
+            Time, in seconds since the epoch, the span ended.
+        args : dict, optional
+            Additional details of the span shown by trace viewers.
+        thread_id : int, optional
+            Identifier, from threading.get_ident, of the thread the span was on.
+            Default: the current thread.
+        """
+        if thread_id is None:
+            thread_id = threading.get_ident()
+
+        trace_event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': int(start * 1000000),
+            'dur': max(int((end - start) * 1000000), 0),
+            'pid': os.getpid(),
+            'tid': thread_id
+        }
+        if args:
+            trace_event['args'] = args
+
+        with self.__lock:
+            if thread_id not in self.__thread_ids:
+                self.__thread_ids.add(thread_id)
+                self.__trace_events.append({
+                    'name': 'thread_name',
+                    'ph': 'M',
+                    'pid': os.getpid(),
+                    'tid': thread_id,
+                    'args': {'name': Tracer.__get_thread_name(thread_id)}
+                })
+            self.__trace_events.append(trace_event)
+
+    def write_trace_file(self, trace_file_path):
+        """Writes the recorded spans to the given file in the Chrome trace event format.
+
+        Parameters
+        ----------
+        trace_file_path : str
+            Path to the file to write.
+        """
+        trace_dir_path = os.path.dirname(trace_file_path)
+        if trace_dir_path:
+            os.makedirs(trace_dir_path, exist_ok=True)
+
+        with open(trace_file_path, 'w', encoding='utf-8') as trace_file:
+            json.dump(
+                {
+                    'traceEvents': self.trace_events,
+                    'displayTimeUnit': 'ms'
+                },
+                trace_file
+            )
+
+    @staticmethod
+    def __get_thread_name(thread_id):
+        """
+        Returns
+        -------
+        str
+            Name of the thread with the given identifier, or the identifier if not a known thread.
+        """
+        for thread in threading.enumerate():
+            if thread.ident == thread_id:
+                return thread.name
+        return str(thread_id)
@@ -0,0 +1,400 @@
+"""Shared utilities for running commands, so that independent commands can be run
+concurrently, with timeouts, and with their output streamed as it is written.
+
+Examples
+--------
+Run two commands at the same time from a step implementer's _run_step.
+>>> run_concurrently(
+...     partial(run_command, 'git', 'clone', repo_url, repo_dir, timeout=600),
+...     partial(run_command, 'argocd', 'login', argocd_api)
+... )
+[0, 0]
+"""
+
+import codecs
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+
+from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.step_metrics import StepMetrics
+from ploigos_step_runner.trace import Tracer
+from ploigos_step_runner.utils.io import TextIOThreadLocalRouter, get_thread_stream
+
+READ_SIZE = 64 * 1024
+STOP_TIMEOUT_SECONDS = 10
+
+_current = threading.local()
+
+
+class CommandError(StepRunnerException):
+    """Error running a command, including the command exiting with an unexpected exit code.
+
+    Parameters
+    ----------
+    message : str
+        Description of the error.
+    command_name : str
+        Program name and leading sub command words of the command.
+    exit_code : int, optional
+        Exit code of the command, if it ran and exited.
+    """
+
+    def __init__(self, message, command_name, exit_code=None):
+        super().__init__(message)
+        self.__command_name = command_name
+        self.__exit_code = exit_code
+
+    @property
+    def command_name(self):
+        """
+        Returns
+        -------
+        str
+            Program name and leading sub command words of the command.
+        """
+        return self.__command_name
+
+    @property
+    def exit_code(self):
+        """
+        Returns
+        -------
+        int or None
+            Exit code of the command, or None if it did not run or did not exit.
+        """
+        return self.__exit_code
+
+
+class CommandTimeoutError(CommandError):
+    """Error for a command that did not finish within its timeout.
+    """
+
+
+def run_command( # pylint: disable=too-many-arguments,too-many-locals
+    command,
+    *args,
+    out_streams=None,
+    err_streams=None,
+    cwd=None,
+    env=None,
+    timeout=None,
+    ok_exit_codes=(0,)
+):
+    """Runs the given command writing its output to the given streams as it is written.
+
+    Notes
+    -----
+    If the command is being run by one of the functions given to run_concurrently, and another
+    of them fails, or the timeout expires, the command is stopped, first with SIGTERM and if it
+    has not exited after STOP_TIMEOUT_SECONDS with SIGKILL.
+
+    The command is recorded to the StepMetrics recording commands for the calling thread,
+    if any, and as a span on the active tracer, if any. Unlike sh commands, the resource usage
+    of the command is not recorded since subprocess does not give it.
+
+    Parameters
+    ----------
+    command : str
+        Program to run.
+    *args : str
+        Arguments to the program. None arguments are left out, so that optional flags
+        can be given inline.
+    out_streams : list of io.IOBase, optional
+        Streams to write the stdout of the command to.
+        Default: [sys.stdout]
+    err_streams : list of io.IOBase, optional
+        Streams to write the stderr of the command to.
+        Default: [sys.stderr]
+    cwd : str, optional
+        Directory to run the command in.
+        Default: current working directory
+    env : dict, optional
+        Environment to run the command with.
+        Default: environment of this process
+    timeout : float, optional
+        Seconds to wait for the command to finish before stopping it.
+        Default: no timeout
+    ok_exit_codes : tuple of int, optional
+        Exit codes of the command that are not errors.
+
+    Returns
+    -------
+    int
+        Exit code of the command.
+
+    Raises
+    ------
+    CommandError
+        If the command can not be run or exits with an exit code not in ok_exit_codes,
+        including if it was stopped because a function run concurrently with it failed.
+    CommandTimeoutError
+        If the command does not finish within the timeout.
+    """
+    cmd = [str(command)] + [str(arg) for arg in args if arg is not None]
+    command_name = StepMetrics.get_command_name(cmd)
+    if out_streams is None:
+        out_streams = [sys.stdout]
+    if err_streams is None:
+        err_streams = [sys.stderr]
+    out_streams = [get_thread_stream(stream) for stream in out_streams]
+    err_streams = [get_thread_stream(stream) for stream in err_streams]
+
+    try:
+        process = subprocess.Popen( # pylint: disable=consider-using-with
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env
+        )
+    except OSError as error:
+        raise CommandError(
+            f"Error running command ({command_name}): {error}",
+            command_name
+        ) from error
+
+    started = time.time()
+    # NOTE: one lock for both output threads so streams given for both stdout and stderr
+    #       are not written to by two threads at once
+    write_lock = threading.Lock()
+    output_threads = [
+        threading.Thread(
+            target=_write_output,
+            args=(process.stdout, out_streams, write_lock),
+            daemon=True
+        ),
+        threading.Thread(
+            target=_write_output,
+            args=(process.stderr, err_streams, write_lock),
+            daemon=True
+        )
+    ]
+    for output_thread in output_threads:
+        output_thread.start()
+
+    command_group = getattr(_current, 'command_group', None)
+    try:
+        if command_group is not None:
+            command_group.add_process(process)
+        process.wait(timeout)
+    except subprocess.TimeoutExpired as error:
+        _stop_process(process)
+        raise CommandTimeoutError(
+            f"Command ({command_name}) did not finish within timeout ({timeout} seconds)",
+            command_name
+        ) from error
+    except BaseException:
+        _stop_process(process)
+        raise
+    finally:
+        for output_thread in output_threads:
+            output_thread.join()
+        if command_group is not None:
+            command_group.remove_process(process)
+        _record_command(cmd, started, process.returncode)
+
+    if process.returncode not in ok_exit_codes:
+        raise CommandError(
+            f"Command ({command_name}) failed with exit code ({process.returncode})",
+            command_name,
+            process.returncode
+        )
+
+    return process.returncode
+
+
+def run_concurrently(*functions):
+    """Runs the given functions, such as partials of run_command or of functions running
+    sh commands, concurrently each in its own thread.
+
+    If any of them raises an error the commands the rest are running with run_command are
+    stopped, and the rest are waited for before the error is raised, so that a failure cancels
+    the rest of the work of the step rather than leaving commands running in the background.
+
+    Notes
+    -----
+    Output the functions write to sys.stdout or sys.stderr, and sh commands they run, go to the
+    same place as they would for the calling thread.
+
+    Functions, and sh commands, can not be stopped, if one of the functions fails the rest
+    keep running until they return, skipping any commands they run with run_command.
+
+    Parameters
+    ----------
+    *functions : callable
+        Functions, taking no arguments, to run concurrently.
+
+    Returns
+    -------
+    list
+        What each of the given functions returned, in the order given.
+
+    Raises
+    ------
+    Exception
+        Error raised by the first of the given functions, in the order given, that raised one
+        before the rest were stopped.
+    """
+    stdout = get_thread_stream(sys.stdout)
+    stderr = get_thread_stream(sys.stderr)
+    step_metrics = StepMetrics.get_current()
+    command_group = _CommandGroup()
+
+    def run_function(function):
+        with ExitStack() as stack:
+            if isinstance(sys.stdout, TextIOThreadLocalRouter):
+                stack.enter_context(sys.stdout.redirect(stdout))
+            if isinstance(sys.stderr, TextIOThreadLocalRouter):
+                stack.enter_context(sys.stderr.redirect(stderr))
+            if step_metrics is not None:
+                stack.enter_context(step_metrics.record_commands())
+
+            _current.command_group = command_group
+            try:
+                return function()
+            finally:
+                _current.command_group = None
+
+    with ThreadPoolExecutor(max_workers=len(functions) or 1) as executor:
+        futures = [executor.submit(run_function, function) for function in functions]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+
+        # stops the rest if one raised an error
+        failed = [
+            future for future in futures if future in done and future.exception() is not None
+        ]
+        if failed:
+            command_group.stop()
+
+    if failed:
+        raise failed[0].exception()
+
+    return [future.result() for future in futures]
+
+
+def sh_command_with_metrics(command):
+    """Wraps the given sh command so that the metrics of each run of it are recorded, with a
+    callback from StepMetrics.create_sh_done_callback, as run_command records the metrics of
+    the commands it runs.
+
+    Notes
+    -----
+    The callback records when the command was started, so a new one is given as the _done
+    argument of each run of the command rather than baked in to the command.
+
+    Parameters
+    ----------
+    command : sh.Command
+        sh command, EG: sh.mvn, or a baked sh command.
+
+    Returns
+    -------
+    callable
+        Runs the given command with the given arguments, returning what the command returns.
+
+    Examples
+    --------
+    >>> sh_command_with_metrics(sh.git.push)(
+    ...     _out=get_thread_stream(sys.stdout)
+    ... )
+    """
+    def run_sh_command(*args, **kwargs):
+        return command(*args, _done=StepMetrics.create_sh_done_callback(), **kwargs)
+
+    return run_sh_command
+
+
+class _CommandGroup:
+    """Processes of the commands being run by the functions given to one run_concurrently call,
+    so they can be stopped if one of the functions fails.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__processes = set()
+        self.__stopped = False
+
+    def add_process(self, process):
+        """Adds the given process to the group, stopping it if the group has been stopped.
+        """
+        with self.__lock:
+            stopped = self.__stopped
+            if not stopped:
+                self.__processes.add(process)
+
+        if stopped:
+            _stop_process(process)
+
+    def remove_process(self, process):
+        """Removes the given process from the group.
+        """
+        with self.__lock:
+            self.__processes.discard(process)
+
+    def stop(self):
+        """Stops the processes in the group, and any later added to it.
+        """
+        with self.__lock:
+            self.__stopped = True
+            processes = list(self.__processes)
+
+        for process in processes:
+            _stop_process(process)
+
+
+def _write_output(pipe, streams, write_lock):
+    """Writes the output read from the given pipe to the given streams until the end of it.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with pipe:
+        while True:
+            data = pipe.read1(READ_SIZE)
+            text = decoder.decode(data, final=not data)
+            if text:
+                with write_lock:
+                    for stream in streams:
+                        stream.write(text)
+            if not data:
+                return
+
+
+def _stop_process(process):
+    """Stops the given process if it is still running and waits for it to exit.
+    """
+    if process.poll() is not None:
+        return
+
+    try:
+        process.terminate()
+        process.wait(STOP_TIMEOUT_SECONDS)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _record_command(cmd, started, exit_code):
+    """Records the given finished command to the StepMetrics recording commands for the calling
+    thread, if any, and as a span on the active tracer, if any.
+    """
+    ended = time.time()
+
+    step_metrics = StepMetrics.get_current()
+    if step_metrics is not None:
+        step_metrics.add_command(cmd=cmd, wall_seconds=ended - started)
+
+    tracer = Tracer.get_active_tracer()
+    if tracer is not None:
+        tracer.add_span(
+            name=StepMetrics.get_command_name(cmd),
+            category=Tracer.CATEGORY_COMMAND,
+            start=started,
+            end=ended,
+            args={'exit-code': exit_code}
+        )
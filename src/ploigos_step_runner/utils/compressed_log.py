@@ -0,0 +1,424 @@
+"""Shared utilities for writing the, potentially very large, output of tools run by steps
+to compressed logs of bounded size, and for reading them back.
+
+A log written to `LOG_PATH` is made up of:
+
+* `LOG_PATH.000001.gz`, `LOG_PATH.000002.gz`, ...
+    gzip compressed segments of the log, in order, from which the oldest segments are removed
+    to keep the log under its maximum size.
+* `LOG_PATH.tail`
+    The end of the log, uncompressed, for failure messages to point at.
+* `LOG_PATH`
+    The whole log, decompressed, which is only written on demand, EG: by decompress_log with
+    `psr logs STEP --decompress`, so that the uncompressed log does not take up space
+    unless it is needed.
+"""
+
+import gzip
+import io
+import os
+import re
+import threading
+import zlib
+
+SEGMENT_FILE_NAME_PATTERN = re.compile(r'^(?P<log_file_name>.+)\.(?P<index>[0-9]{6})\.gz$')
+REMOVED_SEGMENTS_MESSAGE = \
+    '[... earlier output removed to keep the log under its maximum size ...]\n'
+COPY_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 64 * 1024
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class TextIOCompressedLog(io.TextIOBase): # pylint: disable=too-many-instance-attributes
+    """Text stream writing to a compressed log of bounded size, which keeps the end of the log
+    uncompressed.
+
+    Notes
+    -----
+    The maximum size is of the compressed segments that have been finished, so the log can be
+    larger than it by up to one compressed segment while a segment is being written.
+
+    Parameters
+    ----------
+    log_path : str
+        Path of the log. The compressed segments, and the end of the log, are written next to
+        it, see get_log_segment_path and get_log_tail_path.
+    max_size : int, optional
+        Maximum size, in bytes, of the compressed segments of the log.
+        The oldest segments are removed first.
+    segment_size : int, optional
+        Size, in uncompressed bytes, of each compressed segment of the log.
+    tail_size : int, optional
+        Size, in bytes, of the end of the log to keep uncompressed.
+    append : bool, optional
+        True to append to the existing log, if any, False to replace it.
+
+    Attributes
+    ----------
+    __segment : gzip.GzipFile or None
+        Compressed segment being written.
+    __segment_index : int
+        Index of the last compressed segment.
+    __segment_length : int
+        Uncompressed bytes written to the compressed segment being written.
+    __pending : bytearray
+        Written bytes not yet compressed, so that the many small writes of line by line output
+        are compressed WRITE_BUFFER_SIZE at a time rather than each paying the overhead of gzip.
+    __tail : bytearray
+        End of the log written to the compressed segments, at least tail_size bytes of it if
+        that many have been written.
+    __lock : threading.Lock
+        Lock for writing, since streams are written to from sh and ShOutputTee threads.
+    """
+
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+    DEFAULT_SEGMENT_SIZE = 16 * 1024 * 1024
+    DEFAULT_TAIL_SIZE = 256 * 1024
+    COMPRESS_LEVEL = 6
+
+    def __init__( # pylint: disable=too-many-arguments
+        self,
+        log_path,
+        max_size=DEFAULT_MAX_SIZE,
+        segment_size=DEFAULT_SEGMENT_SIZE,
+        tail_size=DEFAULT_TAIL_SIZE,
+        append=False
+    ):
+        assert isinstance(max_size, int) and max_size >= 0, \
+            f"Log max size ({max_size}) must be a non negative int."
+        assert isinstance(segment_size, int) and segment_size > 0, \
+            f"Log segment size ({segment_size}) must be a positive int."
+        assert isinstance(tail_size, int) and tail_size >= 0, \
+            f"Log tail size ({tail_size}) must be a non negative int."
+
+        super().__init__()
+        self.__log_path = log_path
+        self.__max_size = max_size
+        self.__segment_size = segment_size
+        self.__tail_size = tail_size
+        self.__segment = None
+        self.__segment_length = 0
+        self.__pending = bytearray()
+        self.__tail = bytearray()
+        self.__lock = threading.Lock()
+
+        log_dir_path = os.path.dirname(os.path.abspath(log_path))
+        os.makedirs(log_dir_path, exist_ok=True)
+
+        segment_paths = get_log_segment_paths(log_path)
+        if append:
+            self.__segment_index = get_log_segment_index(segment_paths[-1]) if segment_paths else 0
+            if os.path.exists(get_log_tail_path(log_path)):
+                with open(get_log_tail_path(log_path), 'rb') as tail_file:
+                    self.__tail += tail_file.read()
+        else:
+            self.__segment_index = 0
+            for segment_path in segment_paths:
+                os.remove(segment_path)
+
+        # any decompressed log is out of date once the log is written to
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+        self.__write_tail_file()
+
+    @property
+    def log_path(self):
+        """
+        Returns
+        -------
+        str
+            Path of the log, which the whole log is written to decompressed on demand,
+            see decompress_log.
+        """
+        return self.__log_path
+
+    @property
+    def tail_path(self):
+        """
+        Returns
+        -------
+        str
+            Path the end of the log is written to, uncompressed.
+        """
+        return get_log_tail_path(self.__log_path)
+
+    @property
+    def tail(self):
+        """
+        Returns
+        -------
+        str
+            End of the log, up to tail_size bytes of it.
+        """
+        with self.__lock:
+            self.__write_pending()
+            return self.__get_tail_bytes().decode('utf-8', errors='replace')
+
+    def writable(self):
+        return True
+
+    def write(self, given):
+        """Writes the given text to the log.
+
+        Parameters
+        ----------
+        given : str or bytes
+            Text to write.
+
+        Returns
+        -------
+        int
+            Length of the given text.
+        """
+        if self.closed:
+            raise ValueError('I/O operation on closed log.')
+
+        data = given if isinstance(given, bytes) else given.encode('utf-8')
+        with self.__lock:
+            self.__pending += data
+            if len(self.__pending) >= WRITE_BUFFER_SIZE:
+                self.__write_pending()
+
+        return len(given)
+
+    def flush(self):
+        """Writes everything written so far to the compressed segments, and the end of the log
+        to its uncompressed file.
+        """
+        with self.__lock:
+            self.__write_pending()
+            if self.__segment is not None:
+                self.__segment.flush()
+            self.__write_tail_file()
+
+    def close(self):
+        """Finishes the log.
+        """
+        if self.closed:
+            return
+
+        with self.__lock:
+            self.__write_pending()
+            self.__close_segment()
+            self.__write_tail_file()
+        super().close()
+
+    def __write_pending(self):
+        data = bytes(self.__pending)
+        self.__pending.clear()
+
+        # trim the tail only once it is twice as long as needed so that it is not copied
+        # on every write
+        self.__tail += data[-self.__tail_size:] if self.__tail_size else b''
+        if len(self.__tail) > 2 * self.__tail_size:
+            del self.__tail[:len(self.__tail) - self.__tail_size]
+
+        start = 0
+        while start < len(data):
+            if self.__segment is None:
+                self.__open_segment()
+
+            chunk = data[start:start + self.__segment_size - self.__segment_length]
+            self.__segment.write(chunk)
+            self.__segment_length += len(chunk)
+            start += len(chunk)
+
+            if self.__segment_length >= self.__segment_size:
+                self.__close_segment()
+
+    def __open_segment(self):
+        self.__segment_index += 1
+        self.__segment = gzip.open(
+            get_log_segment_path(self.__log_path, self.__segment_index),
+            'wb',
+            compresslevel=TextIOCompressedLog.COMPRESS_LEVEL
+        )
+        self.__segment_length = 0
+
+    def __close_segment(self):
+        if self.__segment is None:
+            return
+
+        self.__segment.close()
+        self.__segment = None
+        self.__remove_oldest_segments()
+
+    def __remove_oldest_segments(self):
+        """Removes the oldest finished segments until they total no more than the max size.
+        """
+        segment_paths = [
+            segment_path for segment_path in get_log_segment_paths(self.__log_path)
+            if get_log_segment_index(segment_path) <= self.__segment_index
+        ]
+        segment_sizes = [os.path.getsize(segment_path) for segment_path in segment_paths]
+        total_size = sum(segment_sizes)
+        for segment_path, segment_size in zip(segment_paths, segment_sizes):
+            if total_size <= self.__max_size:
+                break
+            os.remove(segment_path)
+            total_size -= segment_size
+
+    def __get_tail_bytes(self):
+        tail = bytes(self.__tail[max(len(self.__tail) - self.__tail_size, 0):])
+
+        # do not start part way through a multi byte character
+        start = 0
+        while start < min(len(tail), 3) and (tail[start] & 0xC0) == 0x80:
+            start += 1
+
+        return tail[start:]
+
+    def __write_tail_file(self):
+        with open(get_log_tail_path(self.__log_path), 'wb') as tail_file:
+            tail_file.write(self.__get_tail_bytes())
+
+
+def get_log_segment_path(log_path, index):
+    """
+    Parameters
+    ----------
+    log_path : str
+        Path of a log.
+    index : int
+        Index of a compressed segment of the log.
+
+    Returns
+    -------
+    str
+        Path of the given compressed segment of the given log.
+    """
+    return f'{log_path}.{index:06d}.gz'
+
+
+def get_log_tail_path(log_path):
+    """
+    Parameters
+    ----------
+    log_path : str
+        Path of a log.
+
+    Returns
+    -------
+    str
+        Path of the uncompressed end of the given log.
+    """
+    return f'{log_path}.tail'
+
+
+def get_log_segment_index(segment_path):
+    """
+    Parameters
+    ----------
+    segment_path : str
+        Path of a compressed segment of a log.
+
+    Returns
+    -------
+    int
+        Index of the given compressed segment.
+    """
+    return int(SEGMENT_FILE_NAME_PATTERN.match(os.path.basename(segment_path)).group('index'))
+
+
+def get_log_segment_paths(log_path):
+    """
+    Parameters
+    ----------
+    log_path : str
+        Path of a log.
+
+    Returns
+    -------
+    list of str
+        Paths of the compressed segments of the given log, in order.
+    """
+    log_dir_path = os.path.dirname(os.path.abspath(log_path))
+    log_file_name = os.path.basename(log_path)
+    if not os.path.isdir(log_dir_path):
+        return []
+
+    segment_paths = []
+    for file_name in os.listdir(log_dir_path):
+        match = SEGMENT_FILE_NAME_PATTERN.match(file_name)
+        if match and match.group('log_file_name') == log_file_name:
+            segment_paths.append(os.path.join(os.path.dirname(log_path), file_name))
+
+    return sorted(segment_paths, key=get_log_segment_index)
+
+
+def find_logs(dir_path):
+    """Finds the compressed logs in the given directory and its sub directories.
+
+    Parameters
+    ----------
+    dir_path : str
+        Directory to find compressed logs in.
+
+    Returns
+    -------
+    list of str
+        Paths of the logs found, sorted.
+    """
+    log_paths = set()
+    for walk_dir_path, _, file_names in os.walk(dir_path):
+        for file_name in file_names:
+            match = SEGMENT_FILE_NAME_PATTERN.match(file_name)
+            if match:
+                log_paths.add(os.path.join(walk_dir_path, match.group('log_file_name')))
+
+    return sorted(log_paths)
+
+
+def copy_log(log_path, stream):
+    """Writes the given log, decompressed, to the given stream.
+
+    Notes
+    -----
+    If the log is being written the segment being written is copied as far as it has been
+    flushed.
+
+    Parameters
+    ----------
+    log_path : str
+        Path of the log.
+    stream : io.IOBase
+        Binary stream to write the log to.
+    """
+    segment_paths = get_log_segment_paths(log_path)
+    if segment_paths and get_log_segment_index(segment_paths[0]) > 1:
+        stream.write(REMOVED_SEGMENTS_MESSAGE.encode('utf-8'))
+
+    for segment_path in segment_paths:
+        # decompress with zlib rather than gzip so that a segment still being written can be
+        # copied as far as it has been flushed, rather than gzip raising EOFError
+        decompressor = zlib.decompressobj(GZIP_WBITS)
+        try:
+            with open(segment_path, 'rb') as segment:
+                while True:
+                    data = segment.read(COPY_SIZE)
+                    if not data:
+                        break
+                    stream.write(decompressor.decompress(data))
+        except FileNotFoundError:
+            # segment removed, to keep the log under its maximum size, since it was found
+            continue
+
+        if not decompressor.eof:
+            # segment still being written
+            break
+
+
+def decompress_log(log_path):
+    """Writes the given log, decompressed, to its path, replacing any earlier decompressed
+    copy of it.
+
+    Parameters
+    ----------
+    log_path : str
+        Path of the log.
+    """
+    decompressed_log_path = f'{log_path}.decompressing'
+    with open(decompressed_log_path, 'wb') as decompressed_log:
+        copy_log(log_path, decompressed_log)
+    os.replace(decompressed_log_path, log_path)
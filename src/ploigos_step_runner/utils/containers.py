@@ -5,6 +5,8 @@ import sys
 
 import sh
 from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.utils.commands import sh_command_with_metrics
+from ploigos_step_runner.utils.io import get_thread_stream
 
 
 def container_registries_login(  #pylint: disable=too-many-branches
@@ -242,11 +244,11 @@ def container_registry_login(
         #       required ordering by the login command and how sh handles
         #       escaping and ordering parameters
         login_comnmand = container_command.login.bake(**login_command_named_flags)
-        login_comnmand(
+        sh_command_with_metrics(login_comnmand)(
             container_registry_uri,
             _in=container_registry_password,
-            _out=sys.stdout,
-            _err=sys.stderr,
+            _out=get_thread_stream(sys.stdout),
+            _err=get_thread_stream(sys.stderr),
             _tee='err'
         )
     except sh.ErrorReturnCode as error:
@@ -6,14 +6,33 @@ import json
 import os
 import re
 import shutil
-import urllib.request
 
-import yaml
+JSON_FILE_EXTENSIONS = ('.json',)
+JSON_CONTENTS_PATTERN = re.compile(r'\s*[\[{]')
+
+def get_yaml_safe_loader():
+    """
+    Returns
+    -------
+    type
+        YAML safe loader backed by libyaml, if PyYAML was built with it,
+        else the pure python YAML safe loader.
+    """
+    # NOTE: imported here since it is slow to import and not needed for JSON files
+    import yaml # pylint: disable=import-outside-toplevel
+
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 def parse_yaml_or_json_file(yaml_or_json_file):
     """
     Parse YAML or JSON config files.
 
+    Notes
+    -----
+    Files with a .json extension, or whose contents start with { or [, are parsed as JSON first,
+    other files are parsed as YAML first, then the files are parsed as the other format
+    if that fails.
+
     Parameters
     ----------
     yaml_or_json_files : string
@@ -29,31 +48,70 @@ def parse_yaml_or_json_file(yaml_or_json_file):
     ValueError
         If the given file can not be parsed as YAML or JSON.
     """
-    parsed_file = None
-    json_parse_error = None
-    yaml_parse_error = None
+    return _parse_yaml_or_json_file(yaml_or_json_file, multiple_documents=False)
+
+def parse_yaml_or_json_documents_file(yaml_or_json_file):
+    """
+    Parse YAML files of one or more documents, such as manifests of Kubernetes resources,
+    or JSON files.
+
+    Notes
+    -----
+    Files are parsed as JSON or YAML first the same way as parse_yaml_or_json_file.
+
+    Parameters
+    ----------
+    yaml_or_json_file : string
+        Path to YAML or JSON file to load the documents of.
+
+    Returns
+    -------
+    list
+        Documents parsed from given YAML file, or the one document parsed from given JSON file.
+
+    Raises
+    ------
+    ValueError
+        If the given file can not be parsed as YAML or JSON.
+    """
+    return _parse_yaml_or_json_file(yaml_or_json_file, multiple_documents=True)
 
+def _parse_yaml_or_json_file(yaml_or_json_file, multiple_documents):
     with open(yaml_or_json_file, 'r') as open_yaml_or_json_file:
         file_contents = open_yaml_or_json_file.read()
 
-    try:
-        parsed_file = json.loads(file_contents)
-    except ValueError as err:
-        json_parse_error = err
+    if yaml_or_json_file.endswith(JSON_FILE_EXTENSIONS) or \
+            JSON_CONTENTS_PATTERN.match(file_contents):
+        parsers = [_parse_json, _parse_yaml]
+    else:
+        parsers = [_parse_yaml, _parse_json]
 
-    if not parsed_file:
+    parse_errors = {}
+    for parser in parsers:
         try:
-            parsed_file = yaml.safe_load(file_contents)
-        except (yaml.scanner.ScannerError, yaml.parser.ParserError, ValueError) as err:
-            yaml_parse_error = err
+            return parser(file_contents, multiple_documents)
+        except ValueError as err:
+            parse_errors[parser] = err
 
-    if json_parse_error and yaml_parse_error:
-        raise ValueError(
-            f"Error parsing file ({yaml_or_json_file}) as YAML or JSON: " +
-            f"\n  JSON error: {str(json_parse_error)}" +
-            f"\n  YAML error: {str(yaml_parse_error)}")
+    raise ValueError(
+        f"Error parsing file ({yaml_or_json_file}) as YAML or JSON: " +
+        f"\n  JSON error: {str(parse_errors[_parse_json])}" +
+        f"\n  YAML error: {str(parse_errors[_parse_yaml])}")
 
-    return parsed_file
+def _parse_json(file_contents, multiple_documents):
+    parsed_json = json.loads(file_contents)
+    return [parsed_json] if multiple_documents else parsed_json
+
+def _parse_yaml(file_contents, multiple_documents):
+    # NOTE: imported here since it is slow to import and not needed for JSON files
+    import yaml # pylint: disable=import-outside-toplevel
+
+    try:
+        if multiple_documents:
+            return list(yaml.load_all(file_contents, Loader=get_yaml_safe_loader()))
+        return yaml.load(file_contents, Loader=get_yaml_safe_loader())
+    except (yaml.scanner.ScannerError, yaml.parser.ParserError) as err:
+        raise ValueError(str(err)) from err
 
 def download_and_decompress_source_to_destination(
     source_url,
@@ -112,6 +170,10 @@ def download_and_decompress_source_to_destination(
         source_file_name = os.path.basename(source_url)
         destination_path = os.path.join(destination_dir, source_file_name)
 
+        # NOTE: imported here since it is slow to import and only needed to download files
+        import urllib.error # pylint: disable=import-outside-toplevel
+        import urllib.request # pylint: disable=import-outside-toplevel
+
         try:
             urllib.request.urlretrieve(
                 url=source_url,
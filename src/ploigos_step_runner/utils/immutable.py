@@ -0,0 +1,294 @@
+"""Shared utils for read only views of dictionaries and lists, so that configuration can be
+shared with callers without copying it to protect it from being changed.
+"""
+
+from collections.abc import Mapping, Sequence
+
+
+class FrozenDict(Mapping):
+    """Read only dictionary.
+
+    Notes
+    -----
+    Unlike types.MappingProxyType it can be pickled, such as with a snapshot of Config.
+
+    Parameters
+    ----------
+    items : dict or Mapping, optional
+        Items of the dictionary, which are not copied or frozen,
+        see freeze to freeze a dictionary and all of its children.
+
+    Attributes
+    ----------
+    __items : dict
+    """
+
+    __slots__ = ('__items',)
+
+    def __init__(self, items=None):
+        self.__items = dict(items) if items is not None else {}
+
+    def __getitem__(self, key):
+        return self.__items[key]
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __contains__(self, key):
+        return key in self.__items
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict):
+            return self.__items == other.__items # pylint: disable=protected-access
+        if isinstance(other, Mapping):
+            return self.__items == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.__items)
+
+    def __reduce__(self):
+        return (FrozenDict, (self.__items,))
+
+    def to_mutable(self):
+        """
+        Returns
+        -------
+        dict
+            Copy of this dictionary, and all of its children, that can be changed.
+
+        See Also
+        --------
+        to_mutable
+        """
+        return to_mutable(self)
+
+
+class FrozenList(Sequence):
+    """Read only list.
+
+    Parameters
+    ----------
+    items : iterable, optional
+        Items of the list, which are not copied or frozen,
+        see freeze to freeze a list and all of its children.
+
+    Attributes
+    ----------
+    __items : tuple
+    """
+
+    __slots__ = ('__items',)
+
+    def __init__(self, items=()):
+        self.__items = tuple(items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self.__items[index])
+        return self.__items[index]
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenList):
+            return self.__items == other.__items # pylint: disable=protected-access
+        if isinstance(other, (list, tuple)):
+            return self.__items == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self.__items))
+
+    def __reduce__(self):
+        return (FrozenList, (self.__items,))
+
+    def to_mutable(self):
+        """
+        Returns
+        -------
+        list
+            Copy of this list, and all of its children, that can be changed.
+
+        See Also
+        --------
+        to_mutable
+        """
+        return to_mutable(self)
+
+
+class FrozenPath(Sequence):
+    """Read only list of the parts of a path to an element of a dictionary or list.
+
+    Notes
+    -----
+    Only the last part of the path is stored, along with the path of the parent of the element,
+    so that the paths to all of the children of an element share the path to that element
+    rather than each having their own copy of it, see child.
+
+    Parameters
+    ----------
+    parts : iterable, optional
+        Parts of the path.
+
+    Attributes
+    ----------
+    __parent : FrozenPath or None
+        Path of the parent of the element, or None if the path has less than two parts.
+    __part : obj
+        Last part of the path, or None if the path has no parts.
+    __length : int
+        Number of parts of the path.
+    __parts_cache : tuple or None
+        All of the parts of the path, built the first time they are needed, since walking the
+        parents for every item, iteration, or comparison is slow. Not pickled.
+    """
+
+    __slots__ = ('__parent', '__part', '__length', '__parts_cache')
+
+    def __init__(self, parts=()):
+        self.__parent = None
+        self.__part = None
+        self.__length = 0
+        self.__parts_cache = None
+
+        for part in parts:
+            if self.__length:
+                parent = FrozenPath()
+                parent.__setstate__(self.__getstate__())
+                self.__parent = parent
+            self.__part = part
+            self.__length += 1
+
+    def child(self, part):
+        """Gets the path to a child of the element this is the path to.
+
+        Parameters
+        ----------
+        part : obj
+            Key or index of the child.
+
+        Returns
+        -------
+        FrozenPath
+            Path to the child, sharing this path as the path of its parent.
+        """
+        child = FrozenPath()
+        child.__setstate__((self if self.__length else None, part, self.__length + 1))
+        return child
+
+    def __getstate__(self):
+        return (self.__parent, self.__part, self.__length)
+
+    def __setstate__(self, state):
+        self.__parent, self.__part, self.__length = state
+        self.__parts_cache = None
+
+    def __reduce__(self):
+        # NOTE: pickle the parent rather than the parts so paths still share their parents
+        #       once unpickled, such as with a snapshot of Config
+        return (FrozenPath, (), self.__getstate__())
+
+    def __parts(self):
+        parts = self.__parts_cache
+        if parts is None:
+            parts = []
+            path = self
+            while path is not None and path.__length: # pylint: disable=protected-access
+                parts.append(path.__part) # pylint: disable=protected-access
+                path = path.__parent # pylint: disable=protected-access
+            parts.reverse()
+            parts = tuple(parts)
+            self.__parts_cache = parts
+        return parts
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FrozenList(self.__parts()[index])
+        return self.__parts()[index]
+
+    def __iter__(self):
+        return iter(self.__parts())
+
+    def __len__(self):
+        return self.__length
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenPath):
+            return self.__parts() == other.__parts() # pylint: disable=protected-access
+        if isinstance(other, (FrozenList, list, tuple)):
+            return self.__parts() == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self.__parts()))
+
+
+def freeze(value):
+    """Gets a read only view of the given value.
+
+    Parameters
+    ----------
+    value : dict, list, tuple, FrozenDict, FrozenList, or obj
+        Value to get a read only view of.
+
+    Returns
+    -------
+    FrozenDict, FrozenList, or obj
+        If given a dict returns a FrozenDict of it with all of its children frozen.
+        If given a list or tuple returns a FrozenList of it with all of its children frozen.
+        If given a FrozenDict or FrozenList returns it, since its children are already frozen.
+        If any other object returns that object.
+    """
+    if isinstance(value, (FrozenDict, FrozenList)): # pylint: disable=no-else-return
+        return value
+    elif isinstance(value, dict):
+        return FrozenDict({key: freeze(child) for key, child in value.items()})
+    elif isinstance(value, (list, tuple)):
+        return FrozenList(freeze(child) for child in value)
+    else:
+        return value
+
+
+def to_mutable(value):
+    """Gets a copy of the given value that can be changed.
+
+    Notes
+    -----
+    Only dictionaries and lists are copied, other values, such as the ConfigValues in them,
+    are not changed by callers and so are shared with the given value.
+
+    Parameters
+    ----------
+    value : dict, list, tuple, FrozenDict, FrozenList, or obj
+        Value to get a copy of that can be changed.
+
+    Returns
+    -------
+    dict, list, tuple, or obj
+        If given a dict or FrozenDict returns a dict copy of it with all of its children copied.
+        If given a list or FrozenList returns a list copy of it with all of its children copied.
+        If given a tuple returns a tuple of its children copied.
+        If any other object returns that object.
+    """
+    if isinstance(value, (dict, FrozenDict)): # pylint: disable=no-else-return
+        return {key: to_mutable(child) for key, child in value.items()}
+    elif isinstance(value, (list, FrozenList)):
+        return [to_mutable(child) for child in value]
+    elif isinstance(value, tuple):
+        return tuple(to_mutable(child) for child in value)
+    else:
+        return value
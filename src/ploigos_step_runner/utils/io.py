@@ -1,9 +1,16 @@
+# pylint: disable=too-many-lines
 """Shared utilities for dealing with IO
 """
 
+import codecs
 import io
+import os
 import random
 import re
+import selectors
+import sys
+import threading
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
 
 
 def create_sh_redirect_to_multiple_streams_fn_callback(streams):
@@ -38,6 +45,10 @@ def create_sh_redirect_to_multiple_streams_fn_callback(streams):
         Function that takes one parameter, data, and writes that value to all the given streams.
     """
 
+    # if given a TextIOThreadLocalRouter resolve it to the stream it routes to for the calling
+    # thread now since sh writes to the streams from its own threads
+    streams = [get_thread_stream(stream) for stream in streams]
+
     def sh_redirect_to_multiple_streams(data):
         for stream in streams:
             stream.write(data)
@@ -45,11 +56,168 @@ def create_sh_redirect_to_multiple_streams_fn_callback(streams):
     return sh_redirect_to_multiple_streams
 
 
-class TextIOSelectiveObfuscator(io.TextIOBase):
+class ShOutputTee:
+    """Context manager for writing the output of sh commands to multiple streams.
+
+    Unlike create_sh_redirect_to_multiple_streams_fn_callback, where sh calls back in to Python
+    for every line of output, this gives sh the write end of a pipe, which sh gives directly to
+    the command as its stdout or stderr. A single thread reads the output from the pipes in large
+    blocks and writes it to the streams, so commands with a lot of output, such as maven, do not
+    slow down the step runner, or themselves, calling back in to Python for every line.
+
+    Notes
+    -----
+    The output is written to the streams as it is read from the pipes so the blocks can end
+    anywhere in a line, see TextIOSelectiveObfuscator for obfuscating text split across writes.
+
+    Parameters
+    ----------
+    out_streams : list of io.IOBase
+        Streams to write the stdout of the commands to.
+    err_streams : list of io.IOBase
+        Streams to write the stderr of the commands to.
+
+    Attributes
+    ----------
+    __out_streams : list of io.IOBase
+    __err_streams : list of io.IOBase
+    __out_fd : int or None
+        Write end of the pipe the stdout of the commands is read from.
+    __err_fd : int or None
+        Write end of the pipe the stderr of the commands is read from.
+    __reader_thread : threading.Thread or None
+        Thread reading the pipes and writing to the streams.
+    __reader_error : Exception or None
+        Error the reader thread had writing to the streams, if any.
+
+    Examples
+    --------
+    Will write output directed at stdout to stdout and a results file and output directed
+    at stderr to stderr and a results file.
+    >>> with open('/tmp/results_file', 'w') as results_file, ShOutputTee(
+    ...     out_streams=[sys.stdout, results_file],
+    ...     err_streams=[sys.stderr, results_file]
+    ... ) as output_tee:
+    ...     sh.echo('hello world', _out=output_tee.out_fd, _err=output_tee.err_fd)
+    hello world
+    """
+
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, out_streams, err_streams):
+        # if given a TextIOThreadLocalRouter resolve it to the stream it routes to for the calling
+        # thread now since the streams are written to from the reader thread
+        self.__out_streams = [get_thread_stream(stream) for stream in out_streams]
+        self.__err_streams = [get_thread_stream(stream) for stream in err_streams]
+        self.__out_fd = None
+        self.__err_fd = None
+        self.__reader_thread = None
+        self.__reader_error = None
+
+    @property
+    def out_fd(self):
+        """
+        Returns
+        -------
+        int
+            File descriptor to give to sh as _out.
+        """
+        return self.__out_fd
+
+    @property
+    def err_fd(self):
+        """
+        Returns
+        -------
+        int
+            File descriptor to give to sh as _err.
+        """
+        return self.__err_fd
+
+    def __enter__(self):
+        out_read_fd, self.__out_fd = os.pipe()
+        err_read_fd, self.__err_fd = os.pipe()
+
+        self.__reader_error = None
+        self.__reader_thread = threading.Thread(
+            target=self.__read_pipes,
+            args=[{out_read_fd: self.__out_streams, err_read_fd: self.__err_streams}],
+            name='sh-output-tee',
+            daemon=True
+        )
+        self.__reader_thread.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # the commands have their own copies of the write ends,
+        # so the reader sees the end of the output once they and these are closed
+        os.close(self.__out_fd)
+        os.close(self.__err_fd)
+        self.__reader_thread.join()
+        self.__out_fd = None
+        self.__err_fd = None
+
+        if self.__reader_error is not None and exc_type is None:
+            raise self.__reader_error
+
+    def __read_pipes(self, read_fd_streams):
+        """Reads the given pipes until they are closed writing what is read to the given streams.
+
+        Parameters
+        ----------
+        read_fd_streams : dict
+            Read end of each pipe to the streams to write what is read from it to.
+        """
+        with selectors.DefaultSelector() as selector:
+            for read_fd, streams in read_fd_streams.items():
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                selector.register(read_fd, selectors.EVENT_READ, (streams, decoder))
+
+            while selector.get_map():
+                for key, _ in selector.select():
+                    streams, decoder = key.data
+                    data = os.read(key.fd, ShOutputTee.READ_SIZE)
+                    if not data:
+                        selector.unregister(key.fd)
+                        os.close(key.fd)
+                    text = decoder.decode(data, final=not data)
+
+                    # keep reading even if the streams can not be written to so that
+                    # the commands do not block writing to a full pipe
+                    if text and self.__reader_error is None:
+                        try:
+                            for stream in streams:
+                                stream.write(text)
+                        except Exception as error: # pylint: disable=broad-except
+                            self.__reader_error = error
+
+
+class TextIOSelectiveObfuscator(io.TextIOBase): # pylint: disable=too-many-instance-attributes
     """Extends the base class for text streams to allow the obfuscation of given patterns.
 
     This is useful to prevent accidentally writing "sensitive" information to stdout/stderr.
 
+    Notes
+    -----
+    All of the obfuscation targets are combined in to a single pattern, a trie of the targets,
+    so each write can be obfuscated in one pass no matter how many targets there are.
+    Searching a large write with a simple pattern for each target is faster than one pass of
+    the combined pattern though, so while there are fewer than combined_pattern_min_targets
+    targets, writes of at least PER_TARGET_PATTERN_MIN_TEXT_LENGTH characters for each target
+    are searched with the pattern of each target, see benchmarks/test_io_benchmarks.py for
+    where they cross over.
+    Where targets overlap the one starting first is obfuscated, and of the targets starting at
+    the same place, the longest.
+
+    Output of commands is written in arbitrary chunks, so a target can be split across writes
+    and never be matched. In buffered mode text is held in a buffer until a line ending is
+    written, or the buffer reaches buffer_size, and then everything but a tail that could be
+    the start of a target is obfuscated and written to the parent stream. The held back tail is
+    shorter than the longest target, and is written when more text is written or when this
+    stream is flushed. Targets of multiple words that are written with more whitespace
+    between the words than they were given with can still be split across writes.
+
     Parameters
     ----------
     parent_stream : IOBase
@@ -59,20 +227,83 @@ class TextIOSelectiveObfuscator(io.TextIOBase):
         False to use the same length replacement for any obfuscated text in the stream.
     replacement_char : char
         Character to replace the target strings to obfuscate with.
+    buffered : bool, optional
+        True to buffer text written to this stream so that targets split across writes are
+        obfuscated. False to obfuscate and write text to the parent stream as it is written.
+    buffer_size : int, optional
+        Number of characters to buffer, in buffered mode, before writing to the parent stream
+        even if no line ending has been written.
+    combined_pattern_min_targets : int, optional
+        Number of targets from which all of the targets are combined in to a single pattern
+        rather than each being searched for with its own pattern.
 
     Attributes
     ----------
     __parent_stream : IOBase
-    __obfuscation_patterns : list
+    __obfuscation_trie : dict
+        Trie of the characters of the targets to obfuscate, see __add_to_trie.
+    __obfuscation_target_patterns : dict
+        Words of each target to obfuscate to the pattern matching the target.
+    __obfuscation_patterns : tuple or None
+        Pattern matching all of the targets to obfuscate, and a tuple of the pattern of each
+        target, which is empty if there are at least combined_pattern_min_targets targets.
+        None if there are no targets.
+    __combined_pattern_min_targets : int
+    __obfuscation_targets_lock : threading.Lock
+        Lock for adding targets, which can be added while other threads are writing.
+    __max_target_lengths : tuple of int
+        Length of the longest target of a single word, which can not contain whitespace, and of
+        the longest target of multiple words, which can.
+    __multiple_word_target_start_chars : set of str
+        First character of each of the targets of multiple words.
+    __multiple_word_target_start_pattern : re.Pattern or None
+        Pattern matching the first character of any of the targets of multiple words,
+        or None if there are no targets of multiple words.
+    __buffered : bool
+    __buffer_size : int
+    __buffer : list of str
+        Text written to this stream, in buffered mode, not yet written to the parent stream.
+    __buffer_length : int
+        Number of characters in the buffer.
+    __buffer_lock : threading.Lock
+        Lock for the buffer, which can be written to by many threads.
     __replacement_char : char
     __randomize_replacement_length : bool
     __random_replacement_length_min : int
     __random_replacement_length_max : int
     """
 
-    def __init__(self, parent_stream, randomize_replacment_length=True, replacement_char='*'):
+    # NOTE: targets are split on whitespace so their words never contain these
+    __TRIE_END = ''
+    __TRIE_WHITESPACE = ' '
+
+    DEFAULT_BUFFER_SIZE = 8 * 1024
+    DEFAULT_COMBINED_PATTERN_MIN_TARGETS = 250
+    PER_TARGET_PATTERN_MIN_TEXT_LENGTH = 16
+
+    def __init__( # pylint: disable=too-many-arguments
+        self,
+        parent_stream,
+        randomize_replacment_length=True,
+        replacement_char='*',
+        buffered=False,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        combined_pattern_min_targets=DEFAULT_COMBINED_PATTERN_MIN_TARGETS
+    ):
         self.__parent_stream = parent_stream
-        self.__obfuscation_patterns = []
+        self.__obfuscation_trie = {}
+        self.__obfuscation_target_patterns = {}
+        self.__obfuscation_patterns = None
+        self.__combined_pattern_min_targets = combined_pattern_min_targets
+        self.__obfuscation_targets_lock = threading.Lock()
+        self.__max_target_lengths = (0, 0)
+        self.__multiple_word_target_start_chars = set()
+        self.__multiple_word_target_start_pattern = None
+        self.__buffered = buffered
+        self.__buffer_size = buffer_size
+        self.__buffer = []
+        self.__buffer_length = 0
+        self.__buffer_lock = threading.Lock()
         self.__replacement_char = replacement_char
         self.__randomize_replacement_length = randomize_replacment_length
         self.__random_replacement_length_min = 5
@@ -120,14 +351,26 @@ class TextIOSelectiveObfuscator(io.TextIOBase):
         """
         return self.__randomize_replacement_length
 
+    @property
+    def buffered(self):
+        """
+        Returns
+        -------
+        bool
+            True if this stream buffers text so that targets split across writes are obfuscated.
+            False if this stream obfuscates and writes text to the parent stream as it is written.
+        """
+        return self.__buffered
+
     def add_obfuscation_targets(self, targets):
         """Adds a target pattern to be obfuscated whenever writing to this stream.
 
         Notes
         -----
         This is a bit involved to deal with secrets that span multiple lines and various ways they
-        can be printed. so the regex gets pretty involved to escape the right things and ignore
-        whitespace, so forth and so on.
+        can be printed. so any amount of whitespace in a target, and anything between the words
+        of the target, matches any amount of anything, including new lines, and the leading and
+        trailing whitespace of the target is ignored.
 
         There are unit tests covering the scenarios this is dealing with, if you are messing in
         here be sure you don't break any of the existing unit tests.
@@ -140,46 +383,178 @@ class TextIOSelectiveObfuscator(io.TextIOBase):
         if not isinstance(targets, list):
             targets = [targets]
 
-        for target in targets:
-            target_pattern = target
+        with self.__obfuscation_targets_lock:
+            for target in targets:
+                # split on any amount of whitespace, ignoring leading and trailing whitespace
+                target_words = tuple(target.split())
+
+                # an empty target would match between every character
+                if not target_words:
+                    continue
+
+                TextIOSelectiveObfuscator.__add_to_trie(self.__obfuscation_trie, target_words)
+
+                if target_words not in self.__obfuscation_target_patterns:
+                    self.__obfuscation_target_patterns[target_words] = re.compile(
+                        '.*'.join(re.escape(word) for word in target_words),
+                        re.DOTALL
+                    )
+
+                max_single_word_length, max_multiple_word_length = self.__max_target_lengths
+                if len(target_words) == 1:
+                    max_single_word_length = max(max_single_word_length, len(target_words[0]))
+                else:
+                    max_multiple_word_length = max(max_multiple_word_length, len(target.strip()))
+                    self.__multiple_word_target_start_chars.add(target_words[0][0])
+                self.__max_target_lengths = (max_single_word_length, max_multiple_word_length)
+
+            if self.__multiple_word_target_start_chars:
+                start_chars = ''.join(
+                    re.escape(char) for char in sorted(self.__multiple_word_target_start_chars)
+                )
+                self.__multiple_word_target_start_pattern = re.compile(f'[{start_chars}]')
+
+            if self.__obfuscation_trie:
+                target_patterns = ()
+                if len(self.__obfuscation_target_patterns) < self.__combined_pattern_min_targets:
+                    target_patterns = tuple(self.__obfuscation_target_patterns.values())
+
+                # make sure that .* matches accross lines
+                self.__obfuscation_patterns = (
+                    re.compile(
+                        TextIOSelectiveObfuscator.__get_trie_pattern(self.__obfuscation_trie),
+                        re.DOTALL
+                    ),
+                    target_patterns
+                )
+
+    @staticmethod
+    def __add_to_trie(trie, target_words):
+        """Adds a target to a trie of targets.
 
-            # replace any amount of whitespace with a single space
-            target_pattern = re.sub(r'\s+', ' ', target_pattern)
+        Parameters
+        ----------
+        trie : dict
+            Trie to add the target to. Each node is a dict of the next character of a target,
+            __TRIE_WHITESPACE for between the words of a target, or __TRIE_END for the end of
+            a target, to the next node.
+        target_words : tuple of str
+            Words of the target to add.
+        """
+        node = trie
+        for word_index, word in enumerate(target_words):
+            if word_index > 0:
+                node = node.setdefault(TextIOSelectiveObfuscator.__TRIE_WHITESPACE, {})
+            for char in word:
+                node = node.setdefault(char, {})
+        node[TextIOSelectiveObfuscator.__TRIE_END] = {}
+
+    @staticmethod
+    def __is_target_prefix(trie, text, start):
+        """
+        Parameters
+        ----------
+        trie : dict
+            Trie of targets.
+        text : str
+            Text to check.
+        start : int
+            Index in the given text to check from.
 
-            # strip off leading and trialing whitespace
-            target_pattern = target_pattern.strip()
+        Returns
+        -------
+        bool
+            True if the given text from the given start could be the start of a target that more
+            text has yet to be written for, else False.
+        """
+        node = trie
+        for char in text[start:]:
+            # anything can be between the words of a target
+            if TextIOSelectiveObfuscator.__TRIE_WHITESPACE in node:
+                return True
 
-            # escape for use in regex pattern
-            target_pattern = re.escape(target_pattern)
+            node = node.get(char)
+            if node is None:
+                return False
 
-            # the spaces we added in now got escaped, so unescape them and turn them into .*
-            target_pattern = re.sub(r'\\ ', r'.*', target_pattern)
+        return True
 
-            # eat up pre and post newlines
-            # target_pattern = f"(\s*)({target_pattern})(\s*)"
+    @staticmethod
+    def __get_trie_pattern(node):
+        """Gets the regex pattern matching everything the given trie node leads to.
 
-            # compile the pattern for re-use and make sure that .* matches accross lines
-            target_compiled_pattern = re.compile(target_pattern, re.DOTALL)
+        Notes
+        -----
+        Longer matches are tried first so that a target is not partially obfuscated by a
+        shorter target it starts with.
 
-            # add the pattern
-            self.__obfuscation_patterns.append(target_compiled_pattern)
+        Parameters
+        ----------
+        node : dict
+            Trie node of target characters, whitespace, and end of target, to the next node.
 
-    def __obfuscator(self, match):
-        """Given a regex match returns a corresponding obfuscated string.
+        Returns
+        -------
+        str
+            Regex pattern matching everything the given trie node leads to,
+            or an empty string if the node is the end of a target with nothing following.
+        """
+        alternatives = []
+        end_chars = []
+        for token, child in node.items():
+            if token == TextIOSelectiveObfuscator.__TRIE_END:
+                continue
+
+            # follow runs of nodes with one child as one literal rather than nested groups
+            tokens = [token]
+            while len(child) == 1 and TextIOSelectiveObfuscator.__TRIE_END not in child:
+                token, child = next(iter(child.items()))
+                tokens.append(token)
+
+            if len(tokens) == 1 and child.keys() == {TextIOSelectiveObfuscator.__TRIE_END} and \
+                    token != TextIOSelectiveObfuscator.__TRIE_WHITESPACE:
+                end_chars.append(token)
+                continue
+
+            pattern = ''.join(
+                '.*' if chain_token == TextIOSelectiveObfuscator.__TRIE_WHITESPACE \
+                    else re.escape(chain_token)
+                for chain_token in tokens
+            ) + TextIOSelectiveObfuscator.__get_trie_pattern(child)
+
+            # anything between words matches the most so try it first
+            if tokens[0] == TextIOSelectiveObfuscator.__TRIE_WHITESPACE:
+                alternatives.insert(0, pattern)
+            else:
+                alternatives.append(pattern)
+
+        if len(end_chars) == 1:
+            alternatives.append(re.escape(end_chars[0]))
+        elif end_chars:
+            alternatives.append(f"[{''.join(re.escape(char) for char in end_chars)}]")
+
+        if not alternatives:
+            return ''
+
+        pattern = '|'.join(alternatives)
+        if TextIOSelectiveObfuscator.__TRIE_END in node:
+            return f'(?:{pattern})?'
+        if len(alternatives) > 1:
+            return f'(?:{pattern})'
+        return pattern
+
+    def __obfuscator(self, match_length):
+        """Given the length of matched text returns a corresponding obfuscated string.
 
         Parameters
         ----------
-        match : re.Match
-            re.Match to replace with obfuscated text
+        match_length : int
+            Length of the matched text to replace with obfuscated text.
 
         Returns
         -------
         str
-            String to replace the given match with.
-
-        Also See
-        --------
-        re.sub
+            String to replace the matched text with.
         """
 
         if self.randomize_replacement_length:
@@ -188,10 +563,159 @@ class TextIOSelectiveObfuscator(io.TextIOBase):
                 self.__random_replacement_length_max
             )
         else:
-            replacement_length = len(match.group())
+            replacement_length = match_length
 
         return self.replacement_char * replacement_length
 
+    @staticmethod
+    def __find_targets(obfuscation_patterns, text):
+        """Finds the targets to obfuscate in the given text.
+
+        Parameters
+        ----------
+        obfuscation_patterns : tuple of re.Pattern
+            Patterns of the targets to obfuscate.
+        text : str
+            Text to find the targets in.
+
+        Yields
+        ------
+        tuple of int
+            Start and end of each target in the given text, in order, not overlapping.
+        """
+        if len(obfuscation_patterns) == 1:
+            for match in obfuscation_patterns[0].finditer(text):
+                yield match.span()
+            return
+
+        # NOTE: the next match of each pattern is kept, and only searched for again once a
+        #       match starting before it has been found, so the text is searched once for
+        #       each pattern unless the targets overlap
+        next_matches = [pattern.search(text) for pattern in obfuscation_patterns]
+        position = 0
+        while True:
+            first_match = None
+            for index, match in enumerate(next_matches):
+                if match is not None and match.start() < position:
+                    match = obfuscation_patterns[index].search(text, position)
+                    next_matches[index] = match
+                if match is None:
+                    continue
+
+                if first_match is None or match.start() < first_match.start() or (
+                        match.start() == first_match.start() and match.end() > first_match.end()
+                ):
+                    first_match = match
+
+            if first_match is None:
+                return
+
+            yield first_match.span()
+            position = first_match.end()
+
+    def __obfuscate(self, text, hold_back=False):
+        """Obfuscates all of the obfuscation targets in the given text.
+
+        Parameters
+        ----------
+        text : str
+            Text to obfuscate.
+        hold_back : bool, optional
+            True to not obfuscate the end of the given text that could be the start of a target
+            that more text has yet to be written for.
+
+        Returns
+        -------
+        tuple of str
+            The obfuscated text, and the end of the given text held back, if any.
+        """
+        obfuscation_patterns = self.__obfuscation_patterns
+        if obfuscation_patterns is None:
+            return text, ''
+
+        combined_pattern, target_patterns = obfuscation_patterns
+        if target_patterns and \
+                len(text) >= len(target_patterns) * self.PER_TARGET_PATTERN_MIN_TEXT_LENGTH:
+            obfuscation_patterns = target_patterns
+        else:
+            obfuscation_patterns = (combined_pattern,)
+
+        hold_back_start = len(text)
+        if hold_back:
+            hold_back_start = self.__get_hold_back_start(text)
+
+        # only obfuscate targets starting before the held back text, any other target starts
+        # too close to the end of the text to know if it is the whole target
+        obfuscated = []
+        position = 0
+        for start, end in TextIOSelectiveObfuscator.__find_targets(obfuscation_patterns, text):
+            if start >= hold_back_start:
+                break
+            obfuscated.append(text[position:start])
+            obfuscated.append(self.__obfuscator(end - start))
+            position = end
+
+        hold_back_start = max(hold_back_start, position)
+        obfuscated.append(text[position:hold_back_start])
+        return ''.join(obfuscated), text[hold_back_start:]
+
+    def __get_hold_back_start(self, text):
+        """
+        Parameters
+        ----------
+        text : str
+            Text to check the end of.
+
+        Returns
+        -------
+        int
+            Index of the start of the end of the given text that could be the start of a target
+            that more text has yet to be written for, or the length of the text if none could.
+        """
+        max_single_word_length, max_multiple_word_length = self.__max_target_lengths
+
+        # targets of a single word can not contain whitespace so can only start in the last word
+        starts = []
+        start = len(text)
+        while start > len(text) - max_single_word_length + 1 and not text[start - 1].isspace():
+            start -= 1
+        starts.append(range(start, len(text)))
+
+        # targets of multiple words can only start with the first character of one of them
+        multiple_word_target_start_pattern = self.__multiple_word_target_start_pattern
+        if multiple_word_target_start_pattern is not None:
+            starts.insert(0, (
+                match.start() for match in multiple_word_target_start_pattern.finditer(
+                    text,
+                    max(len(text) - max_multiple_word_length + 1, 0)
+                )
+            ))
+
+        for possible_starts in starts:
+            for start in possible_starts:
+                if TextIOSelectiveObfuscator.__is_target_prefix(
+                        self.__obfuscation_trie, text, start
+                ):
+                    return start
+
+        return len(text)
+
+    def __write_buffer(self, hold_back):
+        """Obfuscates the buffered text and writes it to the parent stream.
+
+        Parameters
+        ----------
+        hold_back : bool
+            True to keep the end of the buffered text that could be the start of a target
+            in the buffer. False to write all of the buffered text.
+        """
+        obfuscated, held_back = self.__obfuscate(''.join(self.__buffer), hold_back)
+        self.__buffer = [held_back] if held_back else []
+        self.__buffer_length = len(held_back)
+
+        if obfuscated:
+            self.parent_stream.write(obfuscated)
+
     def write(self, given):
         """Writes to this streams parent stream after obfuscating all of the obfuscation targets.
 
@@ -211,22 +735,42 @@ class TextIOSelectiveObfuscator(io.TextIOBase):
         """
 
         if isinstance(given, bytes):
-            obfuscated = given.decode('utf-8')
+            text = given.decode('utf-8')
         else:
-            obfuscated = given
+            text = given
+
+        if not self.__buffered:
+            obfuscated, _ = self.__obfuscate(text)
+            return self.parent_stream.write(obfuscated)
+
+        with self.__buffer_lock:
+            # nothing to hold back if there is nothing to obfuscate
+            if self.__obfuscation_patterns is None and not self.__buffer:
+                self.parent_stream.write(text)
+                return len(text)
+
+            self.__buffer.append(text)
+            self.__buffer_length += len(text)
 
-        for obfuscation_pattern in self.__obfuscation_patterns:
-            obfuscated = obfuscation_pattern.sub(self.__obfuscator, obfuscated)
+            # allow for the held back text so it is not obfuscated again on every write
+            if '\n' in text or '\r' in text or \
+                    self.__buffer_length >= self.__buffer_size + max(self.__max_target_lengths):
+                self.__write_buffer(hold_back=True)
 
-        return self.parent_stream.write(obfuscated)
+        return len(text)
 
     def flush(self):
-        """Flush the parent stream.
+        """Write any buffered text, including any held back text, and flush the parent stream.
 
         See Also
         --------
         io.TextIOBase.flush
         """
+        if self.__buffered:
+            with self.__buffer_lock:
+                if self.__buffer:
+                    self.__write_buffer(hold_back=False)
+
         self.parent_stream.flush()
 
 
@@ -426,3 +970,149 @@ class TextIOIndenter(io.TextIOBase):
         io.TextIOBase.flush
         """
         self.parent_stream.flush()
+
+
+class TextIOThreadLocalRouter(io.TextIOBase):
+    """Routes text written to this stream to a stream specific to the writing thread.
+
+    This is useful for running steps concurrently in threads where each step needs its output
+    written to its own stream while sys.stdout and sys.stderr are shared by the process.
+
+    Notes
+    -----
+    Output written by threads that have not redirected this stream, for example the threads
+    sh uses to write command output when given this stream directly as _out or _err,
+    is written to the default stream. So resolve this stream with get_thread_stream before
+    giving it to sh, or use ShOutputTee, which does.
+
+    Parameters
+    ----------
+    default_stream : IOBase
+        Stream to write to for threads that have not redirected this stream.
+
+    Attributes
+    ----------
+    __default_stream : IOBase
+    __thread_local : threading.local
+    """
+
+    def __init__(self, default_stream):
+        self.__default_stream = default_stream
+        self.__thread_local = threading.local()
+        super().__init__()
+
+    @property
+    def default_stream(self):
+        """
+        Returns
+        -------
+        IOBase
+            Stream to write to for threads that have not redirected this stream.
+        """
+        return self.__default_stream
+
+    @property
+    def stream(self):
+        """
+        Returns
+        -------
+        IOBase
+            Stream that text written to this stream by the calling thread is written to.
+        """
+        return getattr(self.__thread_local, 'stream', self.__default_stream)
+
+    @contextmanager
+    def redirect(self, stream):
+        """Context manager for redirecting text written to this stream by the calling thread
+        to the given stream.
+
+        Parameters
+        ----------
+        stream : IOBase
+            Stream to write text written to this stream by the calling thread to.
+        """
+        previous_stream = self.stream
+        self.__thread_local.stream = stream
+        try:
+            yield stream
+        finally:
+            self.__thread_local.stream = previous_stream
+
+    def write(self, given):
+        """Writes the given text to the stream for the calling thread.
+
+        Parameters
+        ----------
+        given : str
+            Text to write.
+        """
+        return self.stream.write(given)
+
+    def flush(self):
+        """Flush the stream for the calling thread.
+
+        See Also
+        --------
+        io.TextIOBase.flush
+        """
+        self.stream.flush()
+
+
+def get_thread_stream(stream):
+    """Get the stream text written to the given stream by the calling thread will be written to.
+
+    Parameters
+    ----------
+    stream : IOBase
+        Stream to resolve.
+
+    Returns
+    -------
+    IOBase
+        If the given stream is a TextIOThreadLocalRouter then the stream it routes to for
+        the calling thread, else the given stream.
+    """
+    if isinstance(stream, TextIOThreadLocalRouter):
+        return stream.stream
+
+    return stream
+
+
+@contextmanager
+def redirect_stdout_for_thread(stream):
+    """Context manager for redirecting sys.stdout to the given stream.
+
+    If sys.stdout is a TextIOThreadLocalRouter only the output of the calling thread is
+    redirected, else sys.stdout is redirected for the process.
+
+    Parameters
+    ----------
+    stream : IOBase
+        Stream to redirect sys.stdout to.
+    """
+    if isinstance(sys.stdout, TextIOThreadLocalRouter):
+        with sys.stdout.redirect(stream):
+            yield stream
+    else:
+        with redirect_stdout(stream):
+            yield stream
+
+
+@contextmanager
+def redirect_stderr_for_thread(stream):
+    """Context manager for redirecting sys.stderr to the given stream.
+
+    If sys.stderr is a TextIOThreadLocalRouter only the output of the calling thread is
+    redirected, else sys.stderr is redirected for the process.
+
+    Parameters
+    ----------
+    stream : IOBase
+        Stream to redirect sys.stderr to.
+    """
+    if isinstance(sys.stderr, TextIOThreadLocalRouter):
+        with sys.stderr.redirect(stream):
+            yield stream
+    else:
+        with redirect_stderr(stream):
+            yield stream
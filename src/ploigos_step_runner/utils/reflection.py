@@ -2,6 +2,8 @@
 Shared utilities for dealing with Python reflection.
 """
 
+import sys
+
 def import_and_get_class(module_name, class_name):
     """Dynamically loads a class from a given module.
 
@@ -25,3 +27,50 @@ def import_and_get_class(module_name, class_name):
         clazz = None
 
     return clazz
+
+def import_classes_lazily(package_name, class_module_names):
+    """Creates a module level __getattr__ for a package that imports the given classes
+    from the package's sub modules the first time they are accessed.
+
+    This lets a package expose all of its classes without importing every sub module,
+    and the dependencies of every sub module, when only one of them is used.
+
+    Notes
+    -----
+    Module level __getattr__ (PEP 562) is only supported by Python 3.7 and later,
+    so on older versions the given classes are imported, as attributes of the package,
+    when this is called instead.
+
+    Parameters
+    ----------
+    package_name : str
+        Name of the package to create the __getattr__ for.
+    class_module_names : dict
+        Names of the sub modules of the package, relative to the package, to import
+        each class from keyed by class name.
+
+    Returns
+    -------
+    callable
+        Module level __getattr__ for the given package.
+
+    Examples
+    --------
+    >>> __getattr__ = import_classes_lazily(__name__, {
+    ...     'Git': 'git'
+    ... })
+    """
+
+    def lazy_import_getattr(name):
+        if name not in class_module_names:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+
+        module = __import__(f"{package_name}.{class_module_names[name]}", fromlist=[name])
+        return getattr(module, name)
+
+    if sys.version_info < (3, 7):
+        package = sys.modules[package_name]
+        for class_name in class_module_names:
+            setattr(package, class_name, lazy_import_getattr(class_name))
+
+    return lazy_import_getattr
@@ -1,10 +1,15 @@
 """Abstract class and helper constants for WorkflowResult
 """
+import copy
+import itertools
 import json
 import os
 import pickle
-
-import yaml
+import struct
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
 
 from ploigos_step_runner.exceptions import StepRunnerException
 from ploigos_step_runner.step_result import StepResult
@@ -16,10 +21,95 @@ class WorkflowResult:
     """
     Class to manage a list of StepResults.
     The WorkflowResult represents ALL previous results.
+
+    Notes
+    -----
+    StepResults and their artifacts are indexed as they are added so that lookups do not
+    have to scan the entire workflow list. Each StepResult is indexed under every combination
+    of its step name, sub step name, and environment with each of those replaced by None,
+    where None matches any value, so that the first match in workflow list order for any
+    combination of given filters can be found directly.
+
+    If a StepResult is changed after it is added, such as by adding an artifact to it,
+    the indexes, merged results, and journals are updated to include the change,
+    see __step_result_changed.
+
+    StepResults can be persisted either by rewriting a pickle of the entire WorkflowResult or
+    by appending only the new StepResults to a journal file, see write_to_journal_file.
+
+    Attributes
+    ----------
+    __workflow_list : list of StepResult
+    __step_result_index : dict
+        (step name, sub step name, environment) filter to first StepResult matching it.
+    __artifact_index : dict
+        Artifact name to (step name, sub step name, environment) filter to first StepResult
+        matching it with a value for the artifact.
+    __journal_states : dict
+        Absolute journal file path to state of what has been written to that journal.
+    __all_step_results_dict : dict or None
+        All of the StepResult dictionaries merged together in workflow list order,
+        or None if a StepResult changed since they were merged.
+    __lock : threading.RLock
+        Held while adding StepResults or writing, so StepResults can be added from
+        multiple threads.
     """
 
+    RESULTS_FORMAT_YAML = 'yaml'
+    RESULTS_FORMAT_JSON = 'json'
+    RESULTS_FORMAT_JSONL = 'jsonl'
+    RESULTS_FORMATS = [RESULTS_FORMAT_YAML, RESULTS_FORMAT_JSON, RESULTS_FORMAT_JSONL]
+
+    JOURNAL_MAGIC = b'PSRJ0001'
+    JOURNAL_RECORD_HEADER = struct.Struct('>II')
+    JOURNAL_COMPACTION_THRESHOLD = 50
+
     def __init__(self):
         self.__workflow_list = []
+        self.__step_result_index = {}
+        self.__artifact_index = {}
+        self.__journal_states = {}
+        self.__all_step_results_dict = {}
+        self.__lock = threading.RLock()
+
+    def __getstate__(self):
+        """Only the workflow list is pickled, the indexes are rebuilt when unpickled.
+
+        Returns
+        -------
+        dict
+            State to pickle.
+        """
+        return {'_WorkflowResult__workflow_list': self.__workflow_list}
+
+    def __setstate__(self, state):
+        """Restores the workflow list and rebuilds the indexes from it.
+
+        Parameters
+        ----------
+        state : dict
+            Pickled state.
+        """
+        self.__workflow_list = []
+        self.__step_result_index = {}
+        self.__artifact_index = {}
+        self.__journal_states = {}
+        self.__all_step_results_dict = {}
+        self.__lock = threading.RLock()
+        for step_result in state['_WorkflowResult__workflow_list']:
+            self.__append_step_result(step_result)
+
+    @property
+    def lock(self):
+        """
+        Returns
+        -------
+        threading.RLock
+            Reentrant lock held while adding StepResults to or writing this WorkflowResult.
+            Hold it to add a StepResult and write the results without another thread
+            adding a StepResult in between.
+        """
+        return self.__lock
 
     @property
     def workflow_list(self):
@@ -33,7 +123,7 @@ class WorkflowResult:
         step_name=None,
         sub_step_name=None,
         environment=None
-    ): # pylint: disable=too-many-boolean-expressions
+    ):
         """Search for an artifact.
 
         If step_name, sub_step_name, or environment are provided ensure the artifact comes
@@ -60,16 +150,13 @@ class WorkflowResult:
            'v1.0.2'
         """
 
+        step_result = self.__artifact_index.get(artifact, {}).get(
+            (step_name or None, sub_step_name or None, environment or None)
+        )
+
         value = None
-        for step_result in self.workflow_list:
-            if ( \
-                (not step_name or step_result.step_name == step_name) and \
-                (not sub_step_name or step_result.sub_step_name == sub_step_name) and \
-                (not environment or step_result.environment == environment)
-            ):
-                value = step_result.get_artifact_value(name=artifact)
-                if value is not None:
-                    break
+        if step_result is not None:
+            value = step_result.get_artifact_value(name=artifact)
 
         return value
 
@@ -96,28 +183,167 @@ class WorkflowResult:
         StepResult is passed as a parameter
         """
 
-        if isinstance(step_result, StepResult):
-            existing_step_result = self.get_step_result(
-                step_name=step_result.step_name,
-                sub_step_name=step_result.sub_step_name,
-                environment=step_result.environment
-            )
-            if existing_step_result:
-                raise StepRunnerException(
-                    f'Can not add duplicate StepResult for step ({step_result.step_name}),'
-                    f' sub step ({step_result.sub_step_name}),'
-                    f' and environment ({step_result.environment}).'
+        with self.__lock:
+            if isinstance(step_result, StepResult):
+                existing_step_result = self.get_step_result(
+                    step_name=step_result.step_name,
+                    sub_step_name=step_result.sub_step_name,
+                    environment=step_result.environment
                 )
+                if existing_step_result:
+                    raise StepRunnerException(
+                        f'Can not add duplicate StepResult for step ({step_result.step_name}),'
+                        f' sub step ({step_result.sub_step_name}),'
+                        f' and environment ({step_result.environment}).'
+                    )
 
-            self.workflow_list.append(step_result)
+                self.__append_step_result(step_result)
 
-        else:
-            raise StepRunnerException('expect StepResult instance type')
+            else:
+                raise StepRunnerException('expect StepResult instance type')
+
+    def __append_step_result(self, step_result):
+        """Appends the given StepResult to the workflow list and indexes it and its artifacts.
+
+        Parameters
+        ----------
+        step_result : StepResult
+           StepResult to append and index.
+        """
+        self.__workflow_list.append(step_result)
+        step_result.add_change_listener(self.__step_result_changed)
+
+        if self.__all_step_results_dict is not None:
+            self.__merge_step_result_dict(step_result)
+
+        for filter_key in WorkflowResult.__get_filter_keys(step_result):
+            self.__step_result_index.setdefault(filter_key, step_result)
+
+            for artifact_name in step_result.artifacts:
+                if step_result.get_artifact_value(name=artifact_name) is not None:
+                    self.__artifact_index.setdefault(artifact_name, {}).setdefault(
+                        filter_key,
+                        step_result
+                    )
+
+    def __step_result_changed(self, step_result, artifact_name):
+        """Updates the indexes, merged results, and journals with the change to the given
+        StepResult after it was added.
+
+        Parameters
+        ----------
+        step_result : StepResult
+            StepResult that changed.
+        artifact_name : str or None
+            Name of the artifact that changed or None if something other than an artifact
+            of the StepResult changed.
+        """
+        with self.__lock:
+            if artifact_name is not None:
+                self.__index_artifact(artifact_name)
+
+            # NOTE: re-merge all of the step results the next time they are needed since the
+            #       changed step result may have been merged over by later step results
+            self.__all_step_results_dict = None
+
+            # NOTE: journals only have new step results appended to them so forget any journal
+            #       that already has the changed step result so that it is compacted
+            #       the next time it is written to
+            step_result_position = next(
+                position for position, workflow_step_result in enumerate(self.__workflow_list)
+                if workflow_step_result is step_result
+            )
+            for journal_filename, journal_state in list(self.__journal_states.items()):
+                if step_result_position < journal_state['num_step_results']:
+                    del self.__journal_states[journal_filename]
+
+    def __index_artifact(self, artifact_name):
+        """Re-indexes the first StepResult in workflow list order matching each filter
+        with a value for the given artifact.
+
+        Parameters
+        ----------
+        artifact_name : str
+            Name of the artifact to re-index.
+        """
+        artifact_index = {}
+        for step_result in self.__workflow_list:
+            if step_result.get_artifact_value(name=artifact_name) is not None:
+                for filter_key in WorkflowResult.__get_filter_keys(step_result):
+                    artifact_index.setdefault(filter_key, step_result)
+        self.__artifact_index[artifact_name] = artifact_index
+
+    def __merge_step_result_dict(self, step_result):
+        """Merges the dictionary of the given StepResult into all of the StepResult dictionaries.
+
+        Parameters
+        ----------
+        step_result : StepResult
+            StepResult to merge the dictionary of.
+        """
+        # NOTE: copy the step result dictionary since it references the step result artifacts
+        #       which later merges would otherwise modify
+        self.__all_step_results_dict = deep_merge(
+            dest=self.__all_step_results_dict,
+            source=copy.deepcopy(step_result.get_step_result_dict()),
+            overwrite_duplicate_keys=True
+        )
+
+    @staticmethod
+    def __get_filter_keys(step_result):
+        """
+        Returns
+        -------
+        set of tuple
+            Every (step name, sub step name, environment) filter the given StepResult matches.
+        """
+        # NOTE: use a set since if any of the step result values are None the
+        #       specific and the any value keys are the same
+        return set(itertools.product(
+            (step_result.step_name or None, None),
+            (step_result.sub_step_name or None, None),
+            (step_result.environment or None, None)
+        ))
 
     # ARTIFACT helpers:
+    def write_results_to_file(self, results_filename, results_format=RESULTS_FORMAT_YAML):
+        """Write the workflow results to file in the given format.
+
+        Parameters
+        ----------
+        results_filename : str
+             Name of file to write (eg: step-runner-results/step-runner-results.yml)
+        results_format : str
+            One of RESULTS_FORMATS.
+            RESULTS_FORMAT_YAML to write all results as a YAML document.
+            RESULTS_FORMAT_JSON to write all results as a JSON document.
+            RESULTS_FORMAT_JSONL to append the most recently added StepResult as a JSON line.
+
+        Raises
+        ------
+        Raises a RuntimeError if the file cannot be dumped
+        Raises a ValueError if the results format is unknown
+        """
+        if results_format == WorkflowResult.RESULTS_FORMAT_YAML:
+            self.write_results_to_yml_file(yml_filename=results_filename)
+        elif results_format == WorkflowResult.RESULTS_FORMAT_JSON:
+            self.write_results_to_json_file(json_filename=results_filename)
+        elif results_format == WorkflowResult.RESULTS_FORMAT_JSONL:
+            self.write_results_to_jsonl_file(jsonl_filename=results_filename)
+        else:
+            raise ValueError(
+                f"Unknown results format ({results_format}), expected one of:" +
+                f" {WorkflowResult.RESULTS_FORMATS}"
+            )
+
     def write_results_to_yml_file(self, yml_filename):
         """Write the workflow list in a yaml format to file
 
+        Notes
+        -----
+        The file is written to a temporary file and then renamed so that readers never see
+        a partially written file.
+
         Parameters
         ----------
         yml_filename : str
@@ -127,17 +353,28 @@ class WorkflowResult:
         ------
         Raises a RuntimeError if the file cannot be dumped
         """
-        try:
-            create_parent_dir(yml_filename)
-            with open(yml_filename, 'w') as file:
-                results = self.__get_all_step_results_dict()
-                yaml.dump(results, file, indent=4)
-        except Exception as error:
-            raise RuntimeError(f'error dumping {yml_filename}: {error}') from error
+        # NOTE: imported here since it is slow to import and only needed for yml results
+        import yaml # pylint: disable=import-outside-toplevel
+
+        # use the libyaml C emitter if available since it is significantly faster
+        yaml_dumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
+        with self.__lock:
+            try:
+                with WorkflowResult.__open_atomic_write(yml_filename) as file:
+                    results = self.__get_all_step_results_dict()
+                    yaml.dump(results, file, indent=4, Dumper=yaml_dumper)
+            except Exception as error:
+                raise RuntimeError(f'error dumping {yml_filename}: {error}') from error
 
     def write_results_to_json_file(self, json_filename):
         """Write the workflow list in a json format to file.
 
+        Notes
+        -----
+        The file is written to a temporary file and then renamed so that readers never see
+        a partially written file.
+
         Parameters
         ----------
         json_filename : str
@@ -147,13 +384,41 @@ class WorkflowResult:
         ------
         Raises a RuntimeError if the file cannot be dumped
         """
-        try:
-            create_parent_dir(json_filename)
-            with open(json_filename, 'w') as file:
-                results = self.__get_all_step_results_dict()
-                json.dump(results, file, indent=4)
-        except Exception as error:
-            raise RuntimeError(f'error dumping {json_filename}: {error}') from error
+        with self.__lock:
+            try:
+                with WorkflowResult.__open_atomic_write(json_filename) as file:
+                    results = self.__get_all_step_results_dict()
+                    json.dump(results, file, indent=4)
+            except Exception as error:
+                raise RuntimeError(f'error dumping {json_filename}: {error}') from error
+
+    def write_results_to_jsonl_file(self, jsonl_filename):
+        """Append the most recently added StepResult as a single line of JSON to file.
+
+        Notes
+        -----
+        Useful for tooling that only needs the latest StepResult since it can read the last
+        line of the file rather than parsing all of the results.
+
+        Parameters
+        ----------
+        jsonl_filename : str
+             Name of file to append to (eg: step-runner-results.jsonl)
+
+        Raises
+        ------
+        Raises a RuntimeError if the file cannot be appended to
+        """
+        with self.__lock:
+            if not self.workflow_list:
+                return
+
+            try:
+                create_parent_dir(jsonl_filename)
+                with open(jsonl_filename, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(self.workflow_list[-1].get_step_result_dict()) + '\n')
+            except Exception as error:
+                raise RuntimeError(f'error dumping {jsonl_filename}: {error}') from error
 
     # File handlers
 
@@ -197,6 +462,11 @@ class WorkflowResult:
     def write_to_pickle_file(self, pickle_filename):
         """Write the workflow list in a pickle format to file
 
+        Notes
+        -----
+        The file is written to a temporary file and then renamed so that readers never see
+        a partially written file.
+
         Parameters
         ----------
         pickle_filename : str
@@ -206,39 +476,285 @@ class WorkflowResult:
         ------
         Raises a RuntimeError if the file cannot be dumped
         """
+        with self.__lock:
+            try:
+                with WorkflowResult.__open_atomic_write(pickle_filename, mode='wb') as file:
+                    pickle.dump(self, file)
+            except Exception as error:
+                raise RuntimeError(f'error dumping {pickle_filename}: {error}') from error
+
+    @staticmethod
+    def load_from_journal_file(journal_filename):
+        """Replay a journal file written by write_to_journal_file.
+
+        Notes
+        -----
+        The journal is a magic header followed by records, each of which is a 4 byte length,
+        a 4 byte CRC32 checksum, and then a pickled list of StepResults. Replay stops at the
+        first incomplete or corrupt record since that can only be the result of an interrupted
+        write, and that record is discarded the next time the journal is written to.
+
+        Parameters
+        ----------
+        journal_filename: str
+           Name of the journal file to load
+
+        Returns
+        -------
+        WorkflowResult
+            WorkflowResult with all of the StepResults from the journal or an empty
+            WorkflowResult if the journal file does not exist or is empty.
+
+        Raises
+        ------
+        Raises a StepRunnerException if the file cannot be loaded
+        Raises a StepRunnerException if the file is not a journal or contains non
+        StepResult instances
+        """
+        workflow_result = WorkflowResult()
+
         try:
-            create_parent_dir(pickle_filename)
-            with open(pickle_filename, 'wb') as file:
-                pickle.dump(self, file)
+            create_parent_dir(journal_filename)
+
+            # if the file does not exist or is empty return empty object
+            if not os.path.isfile(journal_filename) or os.path.getsize(journal_filename) == 0:
+                return workflow_result
+
+            with open(journal_filename, 'rb') as journal:
+                if journal.read(len(WorkflowResult.JOURNAL_MAGIC)) != WorkflowResult.JOURNAL_MAGIC:
+                    raise StepRunnerException(f'error {journal_filename} is not a journal')
+
+                valid_size = journal.tell()
+                num_records = 0
+                for step_results in WorkflowResult.__read_journal_records(journal):
+                    for step_result in step_results:
+                        if not isinstance(step_result, StepResult):
+                            raise StepRunnerException(
+                                f'error {journal_filename} has invalid data'
+                            )
+                        workflow_result.add_step_result(step_result)
+
+                    valid_size = journal.tell()
+                    num_records += 1
         except Exception as error:
-            raise RuntimeError(f'error dumping {pickle_filename}: {error}') from error
+            raise StepRunnerException(f'error loading {journal_filename}: {error}') from error
+
+        workflow_result.__journal_states[ # pylint: disable=protected-access
+            os.path.abspath(journal_filename)
+        ] = {
+            'num_step_results': len(workflow_result.workflow_list),
+            'num_records': num_records,
+            'valid_size': valid_size
+        }
+
+        return workflow_result
+
+    def write_to_journal_file(self, journal_filename, pickle_filename=None):
+        """Append any StepResults not yet written to the given journal file to it.
+
+        Notes
+        -----
+        Each write is flushed and synced to disk before returning so that a crash can at most
+        lose the record being written rather than corrupting all previously written results.
+
+        If this WorkflowResult was not loaded from or previously written to the given journal
+        file, or the journal has at least JOURNAL_COMPACTION_THRESHOLD records, the journal is
+        compacted by atomically replacing it with a journal containing a single record with all
+        of the StepResults, and the directory of the journal is synced to disk so that the
+        replacement survives a crash.
+
+        If given a pickle file, it is only rewritten, see write_to_pickle_file, when the journal
+        is compacted, so that writing each StepResult does not rewrite all of them. Tools that
+        only read the pickle file see the StepResults as of the last compaction.
+
+        Parameters
+        ----------
+        journal_filename : str
+             Name of file to write (eg: step-runner-results.journal)
+        pickle_filename : str, optional
+             Name of pickle file to write when the journal is compacted
+             (eg: step-runner-results.pkl)
+
+        Raises
+        ------
+        Raises a RuntimeError if the file cannot be written
+        """
+        with self.__lock:
+            try:
+                create_parent_dir(journal_filename)
+                journal_state = self.__journal_states.get(os.path.abspath(journal_filename))
+
+                if journal_state is None or \
+                        journal_state['num_records'] >= WorkflowResult.JOURNAL_COMPACTION_THRESHOLD:
+                    self.__compact_journal_file(journal_filename)
+                    if pickle_filename is not None:
+                        self.write_to_pickle_file(pickle_filename)
+                    return
+
+                new_step_results = self.workflow_list[journal_state['num_step_results']:]
+                if not new_step_results:
+                    return
+
+                with open(journal_filename, 'r+b') as journal:
+                    # discard any partially written record from an interrupted write
+                    journal.truncate(journal_state['valid_size'])
+                    journal.seek(journal_state['valid_size'])
+                    WorkflowResult.__write_journal_record(journal, new_step_results)
+                    journal_state['valid_size'] = journal.tell()
+
+                journal_state['num_step_results'] = len(self.workflow_list)
+                journal_state['num_records'] += 1
+            except Exception as error:
+                raise RuntimeError(f'error writing {journal_filename}: {error}') from error
+
+    def __compact_journal_file(self, journal_filename):
+        """Atomically replaces the given journal file with a journal containing a single record
+        with all of the StepResults of this WorkflowResult.
+
+        Parameters
+        ----------
+        journal_filename : str
+             Name of journal file to compact.
+        """
+        journal_dir = os.path.dirname(os.path.abspath(journal_filename))
+        with tempfile.NamedTemporaryFile(dir=journal_dir, delete=False) as journal:
+            try:
+                journal.write(WorkflowResult.JOURNAL_MAGIC)
+                WorkflowResult.__write_journal_record(journal, self.workflow_list)
+                valid_size = journal.tell()
+            except Exception:
+                os.unlink(journal.name)
+                raise
+        os.replace(journal.name, journal_filename)
+        WorkflowResult.__fsync_dir(journal_dir)
+
+        self.__journal_states[os.path.abspath(journal_filename)] = {
+            'num_step_results': len(self.workflow_list),
+            'num_records': 1,
+            'valid_size': valid_size
+        }
+
+    @staticmethod
+    def __fsync_dir(dir_path):
+        """Syncs the given directory to disk so that a file renamed into it survives a crash.
+
+        Parameters
+        ----------
+        dir_path : str
+            Path to the directory to sync.
+        """
+        dir_fd = os.open(dir_path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @staticmethod
+    def __write_journal_record(journal, step_results):
+        """Writes a single length prefixed and checksummed record to the given journal and
+        syncs it to disk.
+
+        Parameters
+        ----------
+        journal : io.BufferedIOBase
+            Journal file opened for binary writing positioned where to write the record.
+        step_results : list of StepResult
+            StepResults to write as a single record.
+        """
+        payload = pickle.dumps(list(step_results))
+        journal.write(WorkflowResult.JOURNAL_RECORD_HEADER.pack(
+            len(payload),
+            zlib.crc32(payload)
+        ))
+        journal.write(payload)
+        journal.flush()
+        os.fsync(journal.fileno())
+
+    @staticmethod
+    def __read_journal_records(journal):
+        """Reads records from the given journal until the end of the journal or until the first
+        incomplete or corrupt record.
+
+        Parameters
+        ----------
+        journal : io.BufferedIOBase
+            Journal file opened for binary reading positioned after the magic header.
+
+        Yields
+        ------
+        list of StepResult
+            StepResults from each record.
+        """
+        header_size = WorkflowResult.JOURNAL_RECORD_HEADER.size
+        while True:
+            header = journal.read(header_size)
+            if len(header) < header_size:
+                return
+
+            payload_size, checksum = WorkflowResult.JOURNAL_RECORD_HEADER.unpack(header)
+            payload = journal.read(payload_size)
+            if len(payload) < payload_size or zlib.crc32(payload) != checksum:
+                return
+
+            yield pickle.loads(payload)
 
     def __get_all_step_results_dict(self):
         """Get a dictionary of all of the recorded StepResults.
 
+        Notes
+        -----
+        The StepResults are merged together as they are added so this does not
+        need to re-merge all of the StepResults, unless a StepResult changed after it was added.
+
         Returns
         -------
         results: dict
             results of all steps from list
         """
-        all_results = {}
-        for step_result in self.workflow_list:
-            all_results = deep_merge(
-                dest=all_results,
-                source=step_result.get_step_result_dict(),
-                overwrite_duplicate_keys=True
-            )
+        if self.__all_step_results_dict is None:
+            self.__all_step_results_dict = {}
+            for step_result in self.__workflow_list:
+                self.__merge_step_result_dict(step_result)
+
         step_runner_results = {
-            'step-runner-results': all_results
+            'step-runner-results': self.__all_step_results_dict
         }
         return step_runner_results
 
+    @staticmethod
+    @contextmanager
+    def __open_atomic_write(filename, mode='w'):
+        """Opens a temporary file next to the given file for writing which replaces the given
+        file once successfully written.
+
+        Parameters
+        ----------
+        filename : str
+            Name of file to atomically write.
+        mode : str, optional
+            Mode to open the temporary file with, 'w' for text or 'wb' for binary.
+
+        Yields
+        ------
+        io.TextIOBase or io.BufferedIOBase
+            Temporary file to write to.
+        """
+        create_parent_dir(filename)
+        temp_filename = f'{filename}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_filename, mode, encoding=None if 'b' in mode else 'utf-8') as file:
+                yield file
+            os.replace(temp_filename, filename)
+        finally:
+            if os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+
     def get_step_result(
         self,
         step_name,
         sub_step_name=None,
         environment=None
-    ): # pylint: disable=too-many-boolean-expressions
+    ):
         """Helper method to return a step result.
 
         Parameters
@@ -254,13 +770,6 @@ class WorkflowResult:
         -------
         StepResult
         """
-
-        for step_result in self.workflow_list:
-            if ( \
-                (not step_name or step_result.step_name == step_name) and \
-                (not sub_step_name or step_result.sub_step_name == sub_step_name) and \
-                (not environment or step_result.environment == environment)
-            ):
-                return step_result
-
-        return None
+        return self.__step_result_index.get(
+            (step_name or None, sub_step_name or None, environment or None)
+        )
@@ -5,11 +5,11 @@ import sh
 
 import unittest
 from testfixtures import TempDirectory
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from tests.helpers.base_test_case import BaseTestCase
 from tests.helpers.sops_integration_test_case import SOPSIntegrationTestCase
-from tests.helpers.test_utils import Any
+from tests.helpers.test_utils import Any, create_sops_side_effect
 
 from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.config.decryptors.sops import SOPS
@@ -94,7 +94,8 @@ class TestSOPSConfigValueDecryptor(BaseTestCase):
             encrypted_config_file_path,
             _in=None,
             _out=Any(StringIO),
-            _err=Any(StringIO)
+            _err=Any(StringIO),
+            _done=ANY
         )
 
     def test_decrypt_additional_sops_args(self, sops_mock):
@@ -125,7 +126,8 @@ class TestSOPSConfigValueDecryptor(BaseTestCase):
             '--aws-profile=foo',
             _in=None,
             _out=Any(StringIO),
-            _err=Any(StringIO)
+            _err=Any(StringIO),
+            _done=ANY
         )
 
     def test_decrypt_parent_source_dict(self, sops_mock):
@@ -154,7 +156,8 @@ class TestSOPSConfigValueDecryptor(BaseTestCase):
             '/dev/stdin',
             _in=encrypted_config_json,
             _out=Any(StringIO),
-            _err=Any(StringIO)
+            _err=Any(StringIO),
+            _done=ANY
         )
 
     def test_decrypt_parent_source_file_does_not_exist(self, sops_mock):
@@ -361,4 +364,149 @@ class TestSOPSConfigValueDecryptorSOPSIntegrationTests(SOPSIntegrationTestCase):
             RuntimeError,
             r"Error invoking sops when trying to decrypt config value \(ConfigValue\(.*\)\):"
         ):
-            sops_decryptor.decrypt(config_value)
\ No newline at end of file
+            sops_decryptor.decrypt(config_value)
+@patch('sh.sops', create=True)
+class TestSOPSConfigValueDecryptorBatchDecrypt(BaseTestCase):
+    ENCRYPTED_VALUE = 'ENC[AES256_GCM,data:UGKfnzsSrciR7GXZJhOCMmFrz3Y6V3pZsd3P,iv:yuReqA+n+rRXVHMc+2US5t7yPx54sooZSXWV4KLjDIs=,tag:jueP7/ZWLfYrEuhh+4eS8g==,type:str]'
+    DECRYPTED_PARENT_SOURCE = json.dumps({
+        'step-runner-config': {
+            'global-environment-defaults': {
+                'DEV': {
+                    'kube-api-token': 'super secret kube api token',
+                    'kube-api-port': 6443
+                }
+            },
+            'step-foo': [{'config': {'test1': 'secret in list'}}]
+        }
+    })
+
+    def test_decrypt_batch_parent_source_file(self, sops_mock):
+        sops_mock.side_effect = create_sops_side_effect(self.DECRYPTED_PARENT_SOURCE)
+        encrypted_config_file_path = os.path.join(
+            os.path.dirname(__file__),
+            'files',
+            'step-runner-config-secret-stuff.yml'
+        )
+
+        sops_decryptor = SOPS(batch_decrypt=True)
+        self.assertTrue(sops_decryptor.batch_decrypt)
+
+        decrypted_value_1 = sops_decryptor.decrypt(ConfigValue(
+            value=self.ENCRYPTED_VALUE,
+            parent_source=encrypted_config_file_path,
+            path_parts=['step-runner-config', 'global-environment-defaults', 'DEV', 'kube-api-token']
+        ))
+        decrypted_value_2 = sops_decryptor.decrypt(ConfigValue(
+            value=self.ENCRYPTED_VALUE,
+            parent_source=encrypted_config_file_path,
+            path_parts=['step-runner-config', 'global-environment-defaults', 'DEV', 'kube-api-port']
+        ))
+        decrypted_value_3 = sops_decryptor.decrypt(ConfigValue(
+            value=self.ENCRYPTED_VALUE,
+            parent_source=encrypted_config_file_path,
+            path_parts=['step-runner-config', 'step-foo', 0, 'config', 'test1']
+        ))
+
+        self.assertEqual(decrypted_value_1, 'super secret kube api token')
+        self.assertEqual(decrypted_value_2, '6443')
+        self.assertEqual(decrypted_value_3, 'secret in list')
+        sops_mock.assert_called_once_with(
+            '--decrypt',
+            '--output-type=json',
+            None,
+            encrypted_config_file_path,
+            _in=None,
+            _out=Any(StringIO),
+            _err=Any(StringIO),
+            _done=ANY
+        )
+
+    def test_decrypt_batch_parent_source_file_changed(self, sops_mock):
+        sops_mock.side_effect = create_sops_side_effect(self.DECRYPTED_PARENT_SOURCE)
+
+        with TempDirectory() as temp_dir:
+            parent_source = temp_dir.write('secrets.yml', b'foo: 1')
+            config_value = ConfigValue(
+                value=self.ENCRYPTED_VALUE,
+                parent_source=parent_source,
+                path_parts=['step-runner-config', 'global-environment-defaults', 'DEV', 'kube-api-token']
+            )
+
+            sops_decryptor = SOPS(batch_decrypt=True)
+            sops_decryptor.decrypt(config_value)
+            sops_decryptor.decrypt(config_value)
+            self.assertEqual(sops_mock.call_count, 1)
+
+            temp_dir.write('secrets.yml', b'foo: 12')
+            sops_decryptor.decrypt(config_value)
+            self.assertEqual(sops_mock.call_count, 2)
+
+    def test_decrypt_batch_parent_source_dict(self, sops_mock):
+        sops_mock.side_effect = create_sops_side_effect(self.DECRYPTED_PARENT_SOURCE)
+        encrypted_config = {'step-runner-config': {'foo': self.ENCRYPTED_VALUE}}
+
+        sops_decryptor = SOPS(batch_decrypt=True, additional_sops_args=['--aws-profile=foo'])
+        for _ in range(2):
+            decrypted_value = sops_decryptor.decrypt(ConfigValue(
+                value=self.ENCRYPTED_VALUE,
+                parent_source=encrypted_config,
+                path_parts=['step-runner-config', 'global-environment-defaults', 'DEV', 'kube-api-token']
+            ))
+            self.assertEqual(decrypted_value, 'super secret kube api token')
+
+        sops_mock.assert_called_once_with(
+            '--decrypt',
+            '--output-type=json',
+            '--input-type=json',
+            '/dev/stdin',
+            '--aws-profile=foo',
+            _in=json.dumps(encrypted_config),
+            _out=Any(StringIO),
+            _err=Any(StringIO),
+            _done=ANY
+        )
+
+    def test_decrypt_batch_path_does_not_exist(self, sops_mock):
+        sops_mock.side_effect = create_sops_side_effect(self.DECRYPTED_PARENT_SOURCE)
+
+        sops_decryptor = SOPS(batch_decrypt=True)
+        with self.assertRaisesRegex(
+            RuntimeError,
+            r"Error extracting config value \(ConfigValue\(.*\)\) from decrypted parent source:" \
+            r" path \(\[\"step-runner-config\"\]\[\"does-not-exist\"\]\) does not exist"
+        ):
+            sops_decryptor.decrypt(ConfigValue(
+                value=self.ENCRYPTED_VALUE,
+                parent_source={'step-runner-config': {}},
+                path_parts=['step-runner-config', 'does-not-exist']
+            ))
+
+    def test_decrypt_batch_sops_error(self, sops_mock):
+        sops_mock.side_effect = sh.ErrorReturnCode('sops', b'mock stdout', b'mock error')
+
+        sops_decryptor = SOPS(batch_decrypt=True)
+        with self.assertRaisesRegex(
+            RuntimeError,
+            r"Error invoking sops when trying to decrypt parent source of" \
+            r" config value \(ConfigValue\(.*\)\):"
+        ):
+            sops_decryptor.decrypt(ConfigValue(
+                value=self.ENCRYPTED_VALUE,
+                parent_source={'step-runner-config': {}},
+                path_parts=['step-runner-config', 'foo']
+            ))
+
+    def test_decrypt_batch_sops_invalid_output(self, sops_mock):
+        sops_mock.side_effect = create_sops_side_effect('not json')
+
+        sops_decryptor = SOPS(batch_decrypt=True)
+        with self.assertRaisesRegex(
+            RuntimeError,
+            r"Error parsing sops output when trying to decrypt parent source of" \
+            r" config value \(ConfigValue\(.*\)\):"
+        ):
+            sops_decryptor.decrypt(ConfigValue(
+                value=self.ENCRYPTED_VALUE,
+                parent_source={'step-runner-config': {}},
+                path_parts=['step-runner-config', 'foo']
+            ))
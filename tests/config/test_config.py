@@ -1,4 +1,6 @@
 import os.path
+import threading
+from unittest.mock import patch
 
 from testfixtures import TempDirectory
 
@@ -181,6 +183,78 @@ class TestConfig(BaseTestCase):
             self.assertEqual(config.global_defaults, {})
             self.assertEqual(config.global_environment_defaults, {})
 
+    def test_add_config_dir_files_added_in_sorted_order(self):
+        with TempDirectory() as temp_dir:
+            for sub_step_name in ['c', 'a', 'b']:
+                temp_dir.write(
+                    os.path.join('test', f'{sub_step_name}.yml'),
+                    bytes(f"""---
+step-runner-config:
+    step-foo:
+    - name: {sub_step_name}
+      implementer: foo
+""", 'utf-8')
+                )
+
+            config = Config()
+            config.add_config(os.path.join(temp_dir.path, 'test'))
+
+            self.assertEqual(
+                [sub_step.sub_step_name for sub_step in config.get_sub_step_configs('step-foo')],
+                ['a', 'b', 'c']
+            )
+
+    def test_add_config_dir_conflict_names_file(self):
+        with TempDirectory() as temp_dir:
+            for config_file_name, value in [('a.yml', 'foo'), ('b.yml', 'foo'), ('c.yml', 'bar')]:
+                temp_dir.write(
+                    os.path.join('test', config_file_name),
+                    bytes(f"""---
+step-runner-config:
+    global-defaults:
+        dup-key: {value}
+""", 'utf-8')
+                )
+
+            with self.assertRaisesRegex(
+                ValueError,
+                r"Failed to add parsed configuration file \(.*c\.yml\): "
+                r"Error merging global defaults: Conflict at dup-key"
+            ):
+                Config(os.path.join(temp_dir.path, 'test'))
+
+    def test_add_config_dir_parse_error_names_first_invalid_file(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('test/a.yml', b'step-runner-config: {}\n')
+            temp_dir.write('test/b.yml', b'step-runner-config: [\n')
+            temp_dir.write('test/c.yml', b'step-runner-config: [\n')
+
+            with self.assertRaisesRegex(
+                ValueError,
+                r"Error parsing config file \(.*b\.yml\) as json or yaml"
+            ):
+                Config(os.path.join(temp_dir.path, 'test'))
+
+    def test_add_config_dir_files_parsed_concurrently(self):
+        barrier = threading.Barrier(2, timeout=10)
+
+        def parse_after_other_file_started(config_file):
+            # fails with BrokenBarrierError if the files are parsed one after the other
+            barrier.wait()
+            return {Config.CONFIG_KEY: {}}
+
+        with TempDirectory() as temp_dir:
+            temp_dir.write('test/a.yml', b'')
+            temp_dir.write('test/b.yml', b'')
+
+            with patch(
+                'ploigos_step_runner.config.config.parse_yaml_or_json_file',
+                side_effect=parse_after_other_file_started
+            ):
+                config = Config(os.path.join(temp_dir.path, 'test'))
+
+        self.assertEqual(config.step_configs, {})
+
     def test_add_two_valid_files(self):
         with TempDirectory() as temp_dir:
             config_dir = "test"
@@ -672,6 +746,119 @@ class TestConfig(BaseTestCase):
             }
         )
 
+    def test_sub_steps_with_step_options(self):
+        config = Config({
+            Config.CONFIG_KEY: {
+                'step-foo': {
+                    'parallel': True,
+                    'max-workers': 2,
+                    'fail-fast': False,
+                    'sub-steps': [
+                        {
+                            'implementer': 'foo1',
+                            'config': {
+                                'test1': 'foo'
+                            }
+                        },
+                        {
+                            'implementer': 'foo2'
+                        }
+                    ]
+                }
+            }
+        })
+
+        step_config = config.get_step_config('step-foo')
+        self.assertEqual(len(step_config.sub_steps), 2)
+        self.assertTrue(step_config.parallel)
+        self.assertEqual(step_config.max_workers, 2)
+        self.assertFalse(step_config.fail_fast)
+        self.assertEqual(
+            ConfigValue.convert_leaves_to_values(
+                step_config.get_sub_step('foo1').sub_step_config,
+            ),
+            {
+                'test1': 'foo'
+            }
+        )
+
+    def test_sub_steps_without_step_options(self):
+        config = Config({
+            Config.CONFIG_KEY: {
+                'step-foo': {
+                    'sub-steps': [
+                        {
+                            'implementer': 'foo1'
+                        }
+                    ]
+                }
+            }
+        })
+
+        step_config = config.get_step_config('step-foo')
+        self.assertEqual(len(step_config.sub_steps), 1)
+        self.assertFalse(step_config.parallel)
+        self.assertIsNone(step_config.max_workers)
+        self.assertTrue(step_config.fail_fast)
+
+    def test_sub_steps_not_list(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Expected step \(step-foo\) to have sub-steps \(.*\) of type list but got:"
+        ):
+            Config({
+                Config.CONFIG_KEY: {
+                    'step-foo': {
+                        'parallel': True,
+                        'sub-steps': {
+                            'implementer': 'foo1'
+                        }
+                    }
+                }
+            })
+
+    def test_sub_steps_unknown_step_option(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Step \(step-foo\) has unknown step options \(\['paralel'\]\),"
+        ):
+            Config({
+                Config.CONFIG_KEY: {
+                    'step-foo': {
+                        'paralel': True,
+                        'sub-steps': [
+                            {
+                                'implementer': 'foo1'
+                            }
+                        ]
+                    }
+                }
+            })
+
+    def test_sub_steps_duplicate_step_options(self):
+        with self.assertRaisesRegex(
+            ValueError,
+            r"Error merging step \(step-foo\) options:"
+        ):
+            Config([
+                {
+                    Config.CONFIG_KEY: {
+                        'step-foo': {
+                            'parallel': True,
+                            'sub-steps': [{'implementer': 'foo1'}]
+                        }
+                    }
+                },
+                {
+                    Config.CONFIG_KEY: {
+                        'step-foo': {
+                            'parallel': False,
+                            'sub-steps': [{'implementer': 'foo2'}]
+                        }
+                    }
+                }
+            ])
+
     def test_sub_step_with_name(self):
         config = Config({
             Config.CONFIG_KEY: {
@@ -803,6 +990,39 @@ class TestConfig(BaseTestCase):
             ['--aws-profile=foo']
         )
 
+    def test_config_decryptors_definitions(self):
+        config = Config({
+            'step-runner-config': {
+                'config-decryptors': [
+                    {
+                        'implementer': 'SOPS'
+                    }
+                ]
+            }
+        })
+
+        self.assertEqual(config.config_decryptors_definitions, [{'implementer': 'SOPS'}])
+
+    def test_get_config_files(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config/b.yml', b'')
+            temp_dir.write('config/a.yml', b'')
+            temp_dir.write('config/nested/c.yml', b'')
+            temp_dir.write('other.yml', b'')
+
+            self.assertEqual(
+                Config.get_config_files([
+                    os.path.join(temp_dir.path, 'other.yml'),
+                    os.path.join(temp_dir.path, 'config')
+                ]),
+                [
+                    os.path.join(temp_dir.path, 'other.yml'),
+                    os.path.join(temp_dir.path, 'config', 'a.yml'),
+                    os.path.join(temp_dir.path, 'config', 'b.yml'),
+                    os.path.join(temp_dir.path, 'config', 'nested', 'c.yml')
+                ]
+            )
+
     def test_initial_config_dict_valid_with_decryptor_definition(self):
         config = Config({
             'step-runner-config': {
@@ -0,0 +1,208 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+import os
+import stat
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from tests.helpers.base_test_case import BaseTestCase
+
+from ploigos_step_runner.config import ConfigSnapshotCache, ConfigValue
+from ploigos_step_runner.config.decryptors.sops import SOPS
+from ploigos_step_runner.decryption_utils import DecryptionUtils
+from ploigos_step_runner.utils.file import parse_yaml_or_json_file
+
+FOO_CONFIG = b"""---
+step-runner-config:
+    global-defaults:
+        organization: foo-org
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+        config:
+            test: foo
+"""
+
+DECRYPTORS_CONFIG = b"""---
+step-runner-config:
+    config-decryptors:
+    - implementer: SOPS
+"""
+
+
+class TestConfigSnapshotCache(BaseTestCase):
+    @staticmethod
+    def __load(temp_dir, config_paths):
+        with patch(
+            'ploigos_step_runner.config.config.parse_yaml_or_json_file',
+            side_effect=parse_yaml_or_json_file
+        ) as parse_mock:
+            config = ConfigSnapshotCache(os.path.join(temp_dir.path, 'cache')).load([
+                os.path.join(temp_dir.path, config_path) for config_path in config_paths
+            ])
+
+        return config, parse_mock.call_count
+
+    def __assert_foo_config(self, config):
+        self.assertEqual(
+            ConfigValue.convert_leaves_to_values(config.global_defaults),
+            {'organization': 'foo-org'}
+        )
+        self.assertEqual(
+            config.get_step_config('foo').get_sub_step(
+                'tests.helpers.sample_step_implementers.FooStepImplementer'
+            ).get_config_value('test'),
+            'foo'
+        )
+
+    def test_snapshot_used(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+
+            config, parse_count = self.__load(temp_dir, ['config.yml'])
+            self.__assert_foo_config(config)
+            self.assertEqual(parse_count, 1)
+
+            config, parse_count = self.__load(temp_dir, ['config.yml'])
+            self.__assert_foo_config(config)
+            self.assertEqual(parse_count, 0)
+
+    def test_snapshot_rebuilt_when_file_changed(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+
+            temp_dir.write('config.yml', FOO_CONFIG.replace(b'foo-org', b'bar-org'))
+            config, parse_count = self.__load(temp_dir, ['config.yml'])
+
+            self.assertEqual(parse_count, 1)
+            self.assertEqual(
+                ConfigValue.convert_leaves_to_values(config.global_defaults),
+                {'organization': 'bar-org'}
+            )
+
+    def test_snapshot_used_when_only_modification_time_changed(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+
+            os.utime(os.path.join(temp_dir.path, 'config.yml'), (0, 0))
+            config, parse_count = self.__load(temp_dir, ['config.yml'])
+
+            self.assertEqual(parse_count, 0)
+            self.__assert_foo_config(config)
+
+    def test_snapshot_rebuilt_when_file_added_to_dir(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config/foo.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config'])
+
+            temp_dir.write('config/bar.yml', b"""---
+step-runner-config:
+    bar:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""")
+            config, parse_count = self.__load(temp_dir, ['config'])
+
+            self.assertEqual(parse_count, 2)
+            self.assertEqual(sorted(config.step_configs), ['bar', 'foo'])
+
+            _, parse_count = self.__load(temp_dir, ['config'])
+            self.assertEqual(parse_count, 0)
+
+    def test_snapshot_per_config_paths(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('foo.yml', FOO_CONFIG)
+            temp_dir.write('decryptors.yml', DECRYPTORS_CONFIG)
+            self.__load(temp_dir, ['foo.yml'])
+
+            _, parse_count = self.__load(temp_dir, ['foo.yml', 'decryptors.yml'])
+
+            self.assertEqual(parse_count, 2)
+            self.assertEqual(len(os.listdir(os.path.join(temp_dir.path, 'cache'))), 2)
+
+    def test_decryptors_registered_from_snapshot(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('decryptors.yml', DECRYPTORS_CONFIG)
+            self.__load(temp_dir, ['decryptors.yml'])
+            DecryptionUtils._DecryptionUtils__config_value_decryptors = []
+
+            config, parse_count = self.__load(temp_dir, ['decryptors.yml'])
+
+            self.assertEqual(parse_count, 0)
+            self.assertEqual(config.config_decryptors_definitions, [{'implementer': 'SOPS'}])
+            decryptors = DecryptionUtils._DecryptionUtils__config_value_decryptors
+            self.assertEqual(len(decryptors), 1)
+            self.assertIsInstance(decryptors[0], SOPS)
+
+    def test_corrupt_snapshot_rebuilt(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+            cache_dir_path = os.path.join(temp_dir.path, 'cache')
+            for snapshot_file_name in os.listdir(cache_dir_path):
+                with open(os.path.join(cache_dir_path, snapshot_file_name), 'wb') as snapshot:
+                    snapshot.write(b'not a snapshot')
+
+            config, parse_count = self.__load(temp_dir, ['config.yml'])
+            self.assertEqual(parse_count, 1)
+            self.__assert_foo_config(config)
+
+            _, parse_count = self.__load(temp_dir, ['config.yml'])
+            self.assertEqual(parse_count, 0)
+
+    def test_invalid_config_not_snapshotted(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', b'foo: bar\n')
+
+            with self.assertRaisesRegex(AssertionError, r'Failed to add parsed configuration'):
+                self.__load(temp_dir, ['config.yml'])
+
+            self.assertFalse(os.path.exists(os.path.join(temp_dir.path, 'cache')))
+
+    def test_cache_dir_owner_only(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+
+            cache_dir_mode = os.stat(os.path.join(temp_dir.path, 'cache')).st_mode
+            self.assertEqual(stat.S_IMODE(cache_dir_mode) & 0o077, 0)
+
+    def test_cache_dir_writable_by_others_not_used(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+            cache_dir_path = os.path.join(temp_dir.path, 'cache')
+            os.chmod(cache_dir_path, 0o777)
+
+            with patch('pickle.load') as pickle_load_mock:
+                config, parse_count = self.__load(temp_dir, ['config.yml'])
+
+            pickle_load_mock.assert_not_called()
+            self.assertEqual(parse_count, 1)
+            self.__assert_foo_config(config)
+
+    def test_cache_dir_not_owned_not_used(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            self.__load(temp_dir, ['config.yml'])
+            snapshot_file_names = os.listdir(os.path.join(temp_dir.path, 'cache'))
+
+            with patch('os.getuid', return_value=os.getuid() + 1), \
+                    patch('pickle.load') as pickle_load_mock:
+                config, parse_count = self.__load(temp_dir, ['config.yml'])
+
+            pickle_load_mock.assert_not_called()
+            self.assertEqual(parse_count, 1)
+            self.__assert_foo_config(config)
+            self.assertEqual(os.listdir(os.path.join(temp_dir.path, 'cache')), snapshot_file_names)
+
+    def test_cache_dir_not_writable(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', FOO_CONFIG)
+            temp_dir.write('cache', b'not a directory')
+
+            config, _ = self.__load(temp_dir, ['config.yml'])
+
+            self.__assert_foo_config(config)
@@ -1,9 +1,10 @@
+import copy
 from io import StringIO
 import os.path
 
 import unittest
 from testfixtures import TempDirectory
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from tests.helpers.base_test_case import BaseTestCase
 from tests.helpers.test_utils import Any, create_sops_side_effect
@@ -320,9 +321,85 @@ class TestConfigValue(BaseTestCase):
             encrypted_config_file_path,
             _in=None,
             _out=Any(StringIO),
-            _err=Any(StringIO)
+            _err=Any(StringIO),
+            _done=ANY
         )
         self.assertEqual(
             decrypted_value,
             'mock decrypted value'
         )
+
+    def test_parent_source_shared_and_read_only(self):
+        config = Config({
+            Config.CONFIG_KEY: {
+                'global-defaults': {
+                    'foo': 'foo-value',
+                    'bar': 'bar-value'
+                }
+            }
+        })
+
+        foo_config_value = config.global_defaults['foo']
+        bar_config_value = config.global_defaults['bar']
+        self.assertIs(foo_config_value.parent_source, bar_config_value.parent_source)
+        self.assertIs(foo_config_value.parent_source, foo_config_value.parent_source)
+        self.assertEqual(
+            foo_config_value.parent_source,
+            {Config.CONFIG_KEY: {'global-defaults': {'foo': 'foo-value', 'bar': 'bar-value'}}}
+        )
+        self.assertEqual(
+            foo_config_value.path_parts,
+            [Config.CONFIG_KEY, 'global-defaults', 'foo']
+        )
+        with self.assertRaises(TypeError):
+            foo_config_value.parent_source[Config.CONFIG_KEY] = {}
+        with self.assertRaises(TypeError):
+            foo_config_value.path_parts[0] = 'changed'
+
+    def test_slots(self):
+        config_value = ConfigValue('foo')
+
+        with self.assertRaises(AttributeError):
+            config_value.foo = 'bar' # pylint: disable=attribute-defined-outside-init
+
+    def test_copies_are_same_config_value(self):
+        config_value = ConfigValue('foo', {'foo': 'bar'}, ['foo'])
+
+        self.assertIs(copy.copy(config_value), config_value)
+        self.assertIs(copy.deepcopy(config_value), config_value)
+        self.assertIs(copy.deepcopy({'foo': [config_value]})['foo'][0], config_value)
+
+    def test_convert_leaves_to_config_values_shares_parent_source_and_paths(self):
+        source = {
+            Config.CONFIG_KEY: {
+                'step-foo': {
+                    'implementer': 'foo1',
+                    'config': {
+                        'test1': 'foo',
+                        'test2': 'bar'
+                    }
+                }
+            }
+        }
+
+        config_values = ConfigValue.convert_leaves_to_config_values(
+            values=copy.deepcopy(source),
+            parent_source=source
+        )
+
+        test1 = config_values[Config.CONFIG_KEY]['step-foo']['config']['test1']
+        test2 = config_values[Config.CONFIG_KEY]['step-foo']['config']['test2']
+        self.assertIs(test1.parent_source, test2.parent_source)
+        self.assertEqual(test1.parent_source, source)
+        self.assertEqual(test1.path_parts, [Config.CONFIG_KEY, 'step-foo', 'config', 'test1'])
+        self.assertEqual(test2.path_parts, [Config.CONFIG_KEY, 'step-foo', 'config', 'test2'])
+        self.assertIs(
+            test1.path_parts._FrozenPath__parent, # pylint: disable=protected-access
+            test2.path_parts._FrozenPath__parent # pylint: disable=protected-access
+        )
+
+        source[Config.CONFIG_KEY]['step-foo']['config']['test1'] = 'changed'
+        self.assertEqual(
+            test1.parent_source[Config.CONFIG_KEY]['step-foo']['config']['test1'],
+            'foo'
+        )
@@ -105,3 +105,86 @@ class TestStepConfig(BaseTestCase):
         step_config = config.get_step_config('step-foo')
 
         self.assertIsNone(step_config.get_sub_step('does-not-exist'))
+
+    def test_step_options_defaults(self):
+        config = Config({
+            Config.CONFIG_KEY: {
+                'step-foo': [
+                    {
+                        'implementer': 'foo1'
+                    }
+                ]
+            }
+        })
+
+        step_config = config.get_step_config('step-foo')
+
+        self.assertFalse(step_config.parallel)
+        self.assertIsNone(step_config.max_workers)
+        self.assertTrue(step_config.fail_fast)
+        self.assertFalse(step_config.cache)
+        self.assertEqual(step_config.cache_source_paths, [])
+        self.assertIsNone(step_config.config_dump)
+
+    def test_add_step_options(self):
+        config = Config({
+            Config.CONFIG_KEY: {
+                'step-foo': [
+                    {
+                        'implementer': 'foo1'
+                    }
+                ]
+            }
+        })
+
+        step_config = config.get_step_config('step-foo')
+        step_config.add_step_options({'parallel': True})
+        step_config.add_step_options({'max-workers': 3, 'fail-fast': False})
+        step_config.add_step_options({'cache': True, 'cache-source-paths': ['src', 'pom.xml']})
+        step_config.add_step_options({'config-dump': 'keys'})
+
+        self.assertTrue(step_config.parallel)
+        self.assertEqual(step_config.max_workers, 3)
+        self.assertFalse(step_config.fail_fast)
+        self.assertTrue(step_config.cache)
+        self.assertEqual(step_config.cache_source_paths, ['src', 'pom.xml'])
+        self.assertEqual(step_config.config_dump, 'keys')
+
+    def test_add_step_options_invalid_bool(self):
+        step_config = Config({Config.CONFIG_KEY: {'step-foo': {'implementer': 'foo1'}}}).get_step_config('step-foo')
+
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Step \(step-foo\) option \(fail-fast\) must be a bool but got: no"
+        ):
+            step_config.add_step_options({'fail-fast': 'no'})
+
+    def test_add_step_options_invalid_max_workers(self):
+        step_config = Config({Config.CONFIG_KEY: {'step-foo': {'implementer': 'foo1'}}}).get_step_config('step-foo')
+
+        for max_workers in [0, -1, True, '2']:
+            with self.assertRaisesRegex(
+                AssertionError,
+                rf"Step \(step-foo\) option \(max-workers\) must be a positive int but got: {max_workers}"
+            ):
+                step_config.add_step_options({'max-workers': max_workers})
+
+    def test_add_step_options_invalid_cache_source_paths(self):
+        step_config = Config({Config.CONFIG_KEY: {'step-foo': {'implementer': 'foo1'}}}).get_step_config('step-foo')
+
+        for cache_source_paths in ['src', ['src', 1]]:
+            with self.assertRaisesRegex(
+                AssertionError,
+                r"Step \(step-foo\) option \(cache-source-paths\) must be a list of paths but got: "
+            ):
+                step_config.add_step_options({'cache-source-paths': cache_source_paths})
+
+    def test_add_step_options_invalid_config_dump(self):
+        step_config = Config({Config.CONFIG_KEY: {'step-foo': {'implementer': 'foo1'}}}).get_step_config('step-foo')
+
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Step \(step-foo\) option \(config-dump\) must be one of \['none', 'keys', 'full'\]"
+            r" but got: values"
+        ):
+            step_config.add_step_options({'config-dump': 'values'})
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch, PropertyMock
 from testfixtures import TempDirectory
 
 import os.path
@@ -626,3 +627,172 @@ class TestSubStepConfig(BaseTestCase):
             "step-foo-foo-env2")
 
         self.assertIsNone(sub_step.get_config_value('does-not-exist'))
+
+class TestSubStepConfigRuntimeStepConfigCache(BaseTestCase):
+    @staticmethod
+    def __create_config():
+        return Config({
+            Config.CONFIG_KEY: {
+                'global-defaults': {
+                    'global-default': 'global-default-value'
+                },
+                'global-environment-defaults' : {
+                    'env1': {
+                        'global-env-default': 'global-env-default-value-env1'
+                    }
+                },
+                'step-foo': [
+                    {
+                        'implementer': 'foo1',
+                        'config': {
+                            'step-config': 'step-config-value'
+                        }
+                    }
+                ]
+            }
+        })
+
+    def test_get_config_value_merges_once(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        with patch.object(
+            SubStepConfig,
+            'global_defaults',
+            new_callable=PropertyMock,
+            return_value=config.global_defaults
+        ) as global_defaults_mock:
+            for _ in range(5):
+                self.assertEqual(
+                    sub_step.get_config_value('global-default', 'env1', {'foo': 'bar'}),
+                    'global-default-value'
+                )
+                self.assertEqual(
+                    sub_step.get_config_value('foo', 'env1', {'foo': 'bar'}),
+                    'bar'
+                )
+            self.assertEqual(global_defaults_mock.call_count, 1)
+
+            # different environment or defaults results in new merge
+            sub_step.get_config_value('foo', 'env2', {'foo': 'bar'})
+            sub_step.get_config_value('foo', 'env1', {'foo': 'bar2'})
+            self.assertEqual(global_defaults_mock.call_count, 3)
+
+    def test_get_config_value_step_config_overrides_changed(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        self.assertEqual(sub_step.get_config_value('step-config'), 'step-config-value')
+
+        config.set_step_config_overrides('step-foo', {'step-config': 'override'})
+        self.assertEqual(sub_step.get_config_value('step-config'), 'override')
+
+    def test_get_config_value_sub_step_config_changed(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        self.assertIsNone(sub_step.get_config_value('new-step-config', 'env1'))
+
+        config.add_config({
+            Config.CONFIG_KEY: {
+                'step-foo': [
+                    {
+                        'implementer': 'foo1',
+                        'config': {
+                            'new-step-config': 'new-step-config-value'
+                        },
+                        'environment-config': {
+                            'env1': {
+                                'new-step-env-config': 'new-step-env-config-value'
+                            }
+                        }
+                    }
+                ]
+            }
+        })
+        self.assertEqual(
+            sub_step.get_config_value('new-step-config', 'env1'),
+            'new-step-config-value'
+        )
+        self.assertEqual(
+            sub_step.get_config_value('new-step-env-config', 'env1'),
+            'new-step-env-config-value'
+        )
+
+    def test_get_config_value_global_defaults_changed(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        self.assertIsNone(sub_step.get_config_value('new-global-default', 'env1'))
+        self.assertIsNone(sub_step.get_config_value('new-global-env-default', 'env1'))
+
+        config.add_config({
+            Config.CONFIG_KEY: {
+                'global-defaults': {
+                    'new-global-default': 'new-global-default-value'
+                },
+                'global-environment-defaults' : {
+                    'env1': {
+                        'new-global-env-default': 'new-global-env-default-value'
+                    }
+                }
+            }
+        })
+        self.assertEqual(
+            sub_step.get_config_value('new-global-default', 'env1'),
+            'new-global-default-value'
+        )
+        self.assertEqual(
+            sub_step.get_config_value('new-global-env-default', 'env1'),
+            'new-global-env-default-value'
+        )
+
+    def test_get_copy_of_runtime_step_config_does_not_change_cache(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        runtime_step_config = sub_step.get_copy_of_runtime_step_config()
+        runtime_step_config['step-config'] = 'changed'
+        del runtime_step_config['global-default']
+
+        self.assertEqual(sub_step.get_config_value('step-config'), 'step-config-value')
+        self.assertEqual(sub_step.get_config_value('global-default'), 'global-default-value')
+
+    def test_get_config_value_does_not_change_cache(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        value = sub_step.get_config_value('list-default', defaults={'list-default': ['a']})
+        value.append('b')
+
+        self.assertEqual(
+            sub_step.get_config_value('list-default', defaults={'list-default': ['a']}),
+            ['a']
+        )
+
+    def test_views_read_only_and_not_copied(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+
+        self.assertIs(sub_step.sub_step_config, sub_step.sub_step_config)
+        self.assertIs(sub_step.sub_step_env_config, sub_step.sub_step_env_config)
+        self.assertIs(sub_step.global_defaults, config.global_defaults)
+        self.assertIs(
+            sub_step.get_global_environment_defaults('env1'),
+            config.get_global_environment_defaults_for_environment('env1')
+        )
+        with self.assertRaises(TypeError):
+            sub_step.sub_step_config['step-config'] = 'changed'
+
+    def test_merge_sub_step_config_does_not_change_previous_view(self):
+        config = self.__create_config()
+        sub_step = config.get_step_config('step-foo').get_sub_step('foo1')
+        previous_sub_step_config = sub_step.sub_step_config
+
+        sub_step.merge_sub_step_config({'new-step-config': 'new-step-config-value'})
+
+        self.assertNotIn('new-step-config', previous_sub_step_config)
+        self.assertEqual(
+            sub_step.get_config_value('new-step-config'),
+            'new-step-config-value'
+        )
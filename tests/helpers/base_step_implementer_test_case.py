@@ -26,6 +26,7 @@ class BaseStepImplementerTestCase(BaseTestCase):
         results_dir_path='',
         results_file_name='',
         work_dir_path='',
+        workflow_result=None
     ):
         config = Config({
             Config.CONFIG_KEY: {
@@ -46,7 +47,8 @@ class BaseStepImplementerTestCase(BaseTestCase):
             results_file_name=results_file_name,
             work_dir_path=work_dir_path,
             config=sub_step_config,
-            environment=environment
+            environment=environment,
+            workflow_result=workflow_result
         )
 
         return step_implementer
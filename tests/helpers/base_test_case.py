@@ -14,8 +14,10 @@ class BaseTestCase(unittest.TestCase):
     def tearDown(self):
         DecryptionUtils._DecryptionUtils__config_value_decryptors = []
         DecryptionUtils._DecryptionUtils__obfuscation_streams = []
+        DecryptionUtils._DecryptionUtils__obfuscation_targets = []
+        DecryptionUtils.clear_decrypted_value_cache()
 
         try:
             shutil.rmtree("./step-runner-working")
         except FileNotFoundError:
-            pass
\ No newline at end of file
+            pass
@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+
+FAKE_COMMAND_SCRIPT = '''#!{python}
+import json
+import sys
+import time
+
+FAKE_COMMAND = json.loads({fake_command!r})
+
+with open(FAKE_COMMAND['calls-file-path'], 'a', encoding='utf-8') as calls_file:
+    calls_file.write(json.dumps(sys.argv[1:]) + '\\n')
+
+time.sleep(FAKE_COMMAND['seconds'])
+sys.stdout.write(FAKE_COMMAND['stdout'])
+sys.stdout.flush()
+sys.stderr.write(FAKE_COMMAND['stderr'])
+sys.exit(FAKE_COMMAND['exit-code'])
+'''
+
+
+class FakeCommands:
+    """Context manager putting fake commands first on the PATH, so that step implementers
+    can be tested and benchmarked running commands, with sh or with
+    ploigos_step_runner.utils.commands, without the real tools installed.
+
+    Examples
+    --------
+    >>> with FakeCommands() as fake_commands:
+    ...     fake_commands.add('argocd', stdout='logged in\\n')
+    ...     sh.argocd.login('argocd.ploigos.xyz')
+    ...     fake_commands.get_calls('argocd')
+    [['login', 'argocd.ploigos.xyz']]
+    """
+
+    def __init__(self):
+        self.__bin_dir_path = None
+        self.__original_path = None
+
+    def __enter__(self):
+        self.__bin_dir_path = tempfile.mkdtemp(prefix='fake-commands-')
+        self.__original_path = os.environ.get('PATH')
+        os.environ['PATH'] = os.pathsep.join(
+            [self.__bin_dir_path] + ([self.__original_path] if self.__original_path else [])
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.__original_path is None:
+            os.environ.pop('PATH', None)
+        else:
+            os.environ['PATH'] = self.__original_path
+        shutil.rmtree(self.__bin_dir_path)
+
+    def add(self, name, stdout='', stderr='', exit_code=0, seconds=0): # pylint: disable=too-many-arguments
+        """Adds a fake command that records how it was called, waits the given seconds,
+        writes the given output, and exits with the given exit code.
+        """
+        command_path = os.path.join(self.__bin_dir_path, name)
+        fake_command = json.dumps({
+            'calls-file-path': self.__get_calls_file_path(name),
+            'stdout': stdout,
+            'stderr': stderr,
+            'exit-code': exit_code,
+            'seconds': seconds
+        })
+        with open(command_path, 'w', encoding='utf-8') as command_file:
+            command_file.write(
+                FAKE_COMMAND_SCRIPT.format(python=sys.executable, fake_command=fake_command)
+            )
+        os.chmod(command_path, os.stat(command_path).st_mode | stat.S_IEXEC)
+
+    def get_calls(self, name):
+        """Gets the arguments of each call of the given fake command, in the order called.
+        """
+        calls_file_path = self.__get_calls_file_path(name)
+        if not os.path.exists(calls_file_path):
+            return []
+
+        with open(calls_file_path, encoding='utf-8') as calls_file:
+            return [json.loads(line) for line in calls_file]
+
+    def __get_calls_file_path(self, name):
+        return os.path.join(self.__bin_dir_path, f'{name}.calls')
@@ -1,5 +1,10 @@
+import sys
+import threading
+import time
+
 from ploigos_step_runner import StepImplementer, StepResult
 from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.utils.io import get_thread_stream
 
 
 class FailStepImplementer(StepImplementer):
@@ -74,5 +79,132 @@ class WriteConfigAsResultsStepImplementer(StepImplementer):
         return step_result
 
 
+class ConcurrentStepImplementer(StepImplementer):
+    # set to a threading.Barrier for the number of steps expected to run concurrently
+    barrier = None
+
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        print(f'{self.step_name} waiting')
+        ConcurrentStepImplementer.barrier.wait(timeout=10)
+        print(f'{self.step_name} done')
+
+        step_result = StepResult.from_step_implementer(self)
+        step_result.add_artifact(name=f'{self.step_name}-ran', value=True)
+        return step_result
+
+
+class ShOutputStepImplementer(StepImplementer):
+    # set to a threading.Barrier for the number of steps expected to run concurrently
+    barrier = None
+
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        if ShOutputStepImplementer.barrier is not None:
+            ShOutputStepImplementer.barrier.wait(timeout=10)
+
+        # NOTE: imported here since sh is slow to import and no other step here needs it
+        import sh # pylint: disable=import-outside-toplevel
+
+        name = self.sub_step_name
+        sh.Command('sh')(
+            '-c',
+            f'echo "{name} out 1"; sleep 0.2; echo "{name} err" 1>&2; echo "{name} out 2"',
+            _out=get_thread_stream(sys.stdout),
+            _err=get_thread_stream(sys.stderr)
+        )
+
+        step_result = StepResult.from_step_implementer(self)
+        step_result.add_artifact(name='ran', value=name)
+        return step_result
+
+
+class SleepStepImplementer(StepImplementer):
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {
+            'sleep-seconds': 0
+        }
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        print(f'{self.sub_step_name} sleeping')
+        time.sleep(self.get_value('sleep-seconds'))
+        print(f'{self.sub_step_name} awake')
+
+        step_result = StepResult.from_step_implementer(self)
+        step_result.add_artifact(name='slept', value=self.sub_step_name)
+        return step_result
+
+
+class RaiseExceptionStepImplementer(StepImplementer):
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        raise RuntimeError(f'{self.step_name} exploded')
+
+
+class CountRunsStepImplementer(StepImplementer):
+    # number of times _run_step has been called
+    runs = 0
+
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        CountRunsStepImplementer.runs += 1
+
+        input_value = self.get_value('input')
+        self.write_working_file('output.txt', f'{input_value}'.encode())
+
+        step_result = StepResult.from_step_implementer(self)
+        step_result.add_artifact(name='output', value=f'{input_value}-output')
+        return step_result
+
+
+class PhasesStepImplementer(StepImplementer):
+    @staticmethod
+    def step_implementer_config_defaults():
+        return {}
+
+    @staticmethod
+    def _required_config_or_result_keys():
+        return []
+
+    def _run_step(self):
+        self._start_phase('first-phase')
+        self._start_phase('second-phase')
+
+        return StepResult.from_step_implementer(self)
+
+
 class NotSubClassOfStepImplementer():
     pass
@@ -61,6 +61,25 @@ def Any(cls):
     return Any()
 
 
+def pop_step_result_metrics(results):
+    """Removes the metrics, which differ from run to run, from each sub step result in the
+    given step results dictionary.
+
+    Returns
+    -------
+    list of dict
+        The removed metrics.
+    """
+    metrics = []
+    if isinstance(results, dict):
+        if 'sub-step-implementer-name' in results and 'metrics' in results:
+            metrics.append(results.pop('metrics'))
+        for value in results.values():
+            metrics += pop_step_result_metrics(value)
+
+    return metrics
+
+
 class StringRegexParam():
     def __init__(self, regex):
         self.__regex = regex
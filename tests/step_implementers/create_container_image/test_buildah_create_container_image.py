@@ -2,7 +2,7 @@ import os
 import re
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -117,7 +117,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 temp_dir.path,
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
             buildah_mock.push.assert_called_once_with(
@@ -126,7 +127,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 'docker-archive:' + work_dir_path + '/create-container-image/image-app-name-service-name-1.0-123abc.tar',
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
@@ -183,7 +185,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 temp_dir.path,
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
             buildah_mock.push.assert_called_once_with(
@@ -192,7 +195,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 'docker-archive:' + work_dir_path + '/create-container-image/image-app-name-service-name-latest.tar',
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
@@ -258,7 +262,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 temp_dir.path,
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
             buildah_mock.push.assert_called_once_with(
@@ -267,7 +272,8 @@ class TestStepImplementerCreateContainerImageBuildah(BaseStepImplementerTestCase
                 'docker-archive:' + work_dir_path + '/create-container-image/image-app-name-service-name-1.0-123abc.tar',
                 _out=sys.stdout,
                 _err=sys.stderr,
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
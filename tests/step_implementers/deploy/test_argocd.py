@@ -1,12 +1,14 @@
 import os
 import re
-from io import IOBase
-from unittest.mock import call, patch
+from contextlib import redirect_stderr, redirect_stdout
+from io import IOBase, StringIO
+from unittest.mock import ANY, call, patch
 
 import sh
 from testfixtures import TempDirectory
 from tests.helpers.base_step_implementer_test_case import \
     BaseStepImplementerTestCase
+from tests.helpers.fake_commands import FakeCommands
 from tests.helpers.test_utils import Any, create_sh_side_effect
 from ploigos_step_runner import StepResult
 from ploigos_step_runner.exceptions import StepRunnerException
@@ -520,7 +522,13 @@ class TestStepImplementerDeployArgoCD_run_step(TestStepImplementerDeployArgoCDBa
             git_commit_file_mock.assert_not_called()
             get_deployment_config_repo_tag_mock.assert_not_called()
             git_tag_and_push_deployment_config_repo_mock.assert_not_called()
-            argocd_sign_in_mock.assert_not_called()
+            # signing into ArgoCD is started at the same time as cloning the repository
+            argocd_sign_in_mock.assert_called_once_with(
+                argocd_api=step_config['argocd-api'],
+                username=step_config['argocd-username'],
+                password=step_config['argocd-password'],
+                insecure=step_config['argocd-skip-tls']
+            )
             argocd_add_target_cluster_mock.assert_not_called()
             argocd_app_create_or_update_mock.assert_not_called()
             argocd_app_sync_mock.assert_not_called()
@@ -663,7 +671,8 @@ class TestStepImplementerDeployArgoCD__update_yaml_file_value(TestStepImplemente
             yq_mock.write.assert_called_once_with(
                 '/does/not/matter/chart/values-PROD.yaml',
                 f'--script={yq_script_file_path}',
-                '--inplace'
+                '--inplace',
+                _done=ANY
             )
             with open(yq_script_file_path, 'r') as yq_script_file:
                 actual_yq_script = yq_script_file.read()
@@ -1478,13 +1487,15 @@ class TestStepImplementerDeployArgoCD__clone_repo(TestStepImplementerDeployArgoC
             repo_url,
             repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         git_mock.checkout.assert_called_once_with(
             repo_branch,
             _cwd=repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         git_mock.config.assert_has_calls([
             call(
@@ -1492,14 +1503,16 @@ class TestStepImplementerDeployArgoCD__clone_repo(TestStepImplementerDeployArgoC
                 user_email,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             ),
             call(
                 'user.name',
                 user_name,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
         ])
 
@@ -1528,21 +1541,24 @@ class TestStepImplementerDeployArgoCD__clone_repo(TestStepImplementerDeployArgoC
             repo_url,
             repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         git_mock.checkout.assert_has_calls([
             call(
                 repo_branch,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             ),
             call(
                 '-b',
                 repo_branch,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
         ])
         git_mock.config.assert_has_calls([
@@ -1551,14 +1567,16 @@ class TestStepImplementerDeployArgoCD__clone_repo(TestStepImplementerDeployArgoC
                 user_email,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             ),
             call(
                 'user.name',
                 user_name,
                 _cwd=repo_dir,
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
         ])
 
@@ -1807,7 +1825,8 @@ class TestStepImplementerDeployArgoCD__get_repo_branch(TestStepImplementerDeploy
         git_mock.assert_called_once_with(
             'rev-parse',
             '--abbrev-ref',
-            'HEAD'
+            'HEAD',
+            _done=ANY
         )
 
     @patch.object(sh, 'git')
@@ -1851,12 +1870,14 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
         git_mock.push.assert_has_calls([
             call(
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             ),
             call(
                 '--tag',
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             )
         ])
         git_mock.tag.assert_called_once_with(
@@ -1864,7 +1885,8 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
             '-f',
             _cwd=repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch.object(sh, 'git')
@@ -1881,12 +1903,14 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
         git_mock.push.bake().assert_has_calls([
             call(
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             ),
             call(
                 '--tag',
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             )
         ])
         git_mock.tag.assert_called_once_with(
@@ -1894,7 +1918,8 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
             '-f',
             _cwd=repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch.object(sh, 'git')
@@ -2040,13 +2065,15 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
         git_mock.push.assert_has_calls([
             call(
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             ),
             call(
                 '--tag',
                 '--force',
                 _cwd=repo_dir,
-                _out=Any(IOBase)
+                _out=Any(IOBase),
+                _done=ANY
             )
         ])
         git_mock.tag.assert_called_once_with(
@@ -2054,7 +2081,8 @@ class TestStepImplementerDeployArgoCD__git_tag_and_push(TestStepImplementerDeplo
             '-f',
             _cwd=repo_dir,
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
 
@@ -2071,7 +2099,8 @@ class TestStepImplementerDeployArgoCD__git_commit_file(TestStepImplementerDeploy
             'charts/foo/values-DEV.yaml',
             _cwd='/does/not/matter',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
         git_mock.commit.assert_called_once_with(
@@ -2080,7 +2109,8 @@ class TestStepImplementerDeployArgoCD__git_commit_file(TestStepImplementerDeploy
             '--message', 'hello world',
             _cwd='/does/not/matter',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch.object(sh, 'git')
@@ -2159,86 +2189,80 @@ class TestStepImplementerDeployArgoCD__git_commit_file(TestStepImplementerDeploy
             )
 
 class TestStepImplementerDeployArgoCD__argocd_sign_in(TestStepImplementerDeployArgoCDBase):
-    @patch('sh.argocd', create=True)
-    def test_ArgoCD__argocd_sign_in_success_not_insecure(self, argocd_mock):
-        argocd_api='argo.dev.ploigos.xyz'
-        username='test'
-        password='secrettest'
-        ArgoCD._ArgoCD__argocd_sign_in(
-            argocd_api=argocd_api,
-            username=username,
-            password=password,
-            insecure=False
-        )
-
-        argocd_mock.login.assert_called_once_with(
-            argocd_api,
-            f'--username={username}',
-            f'--password={password}',
-            None,
-            _out=Any(IOBase),
-            _err=Any(IOBase)
-        )
-
-    @patch('sh.argocd', create=True)
-    def test_ArgoCD__argocd_sign_in_success_insecure(self, argocd_mock):
+    def test_ArgoCD__argocd_sign_in_success_not_insecure(self):
         argocd_api='argo.dev.ploigos.xyz'
         username='test'
         password='secrettest'
-        ArgoCD._ArgoCD__argocd_sign_in(
-            argocd_api=argocd_api,
-            username=username,
-            password=password,
-            insecure=True
-        )
+        with FakeCommands() as fake_commands:
+            fake_commands.add('argocd', stdout='mock logged in\n')
+
+            stdout_buff = StringIO()
+            with redirect_stdout(stdout_buff):
+                ArgoCD._ArgoCD__argocd_sign_in(
+                    argocd_api=argocd_api,
+                    username=username,
+                    password=password,
+                    insecure=False
+                )
 
-        argocd_mock.login.assert_called_once_with(
-            argocd_api,
-            f'--username={username}',
-            f'--password={password}',
-            '--insecure',
-            _out=Any(IOBase),
-            _err=Any(IOBase)
-        )
+            self.assertEqual(
+                fake_commands.get_calls('argocd'),
+                [[
+                    'login',
+                    argocd_api,
+                    f'--username={username}',
+                    f'--password={password}'
+                ]]
+            )
+        self.assertEqual(stdout_buff.getvalue(), 'mock logged in\n')
 
-    @patch('sh.argocd', create=True)
-    def test_ArgoCD__argocd_sign_in_fail_not_insecure(self, argocd_mock):
+    def test_ArgoCD__argocd_sign_in_success_insecure(self):
         argocd_api='argo.dev.ploigos.xyz'
         username='test'
         password='secrettest'
+        with FakeCommands() as fake_commands:
+            fake_commands.add('argocd')
 
-        argocd_mock.login.side_effect = create_sh_side_effect(
-            exception=sh.ErrorReturnCode('argocd', b'mock out', b'mock login error')
-        )
-
-        with self.assertRaisesRegex(
-            StepRunnerException,
-            re.compile(
-                rf"Error logging in to ArgoCD:"
-                r".*RAN: argocd"
-                r".*STDOUT:"
-                r".*mock out"
-                r".*STDERR:"
-                r".*mock login error",
-                re.DOTALL
-            )
-        ):
             ArgoCD._ArgoCD__argocd_sign_in(
                 argocd_api=argocd_api,
                 username=username,
                 password=password,
-                insecure=False
+                insecure=True
             )
 
-            argocd_mock.login.assert_called_once_with(
-                argocd_api,
-                f'--username={username}',
-                f'--password={password}',
-                None,
-                _out=Any(IOBase),
-                _err=Any(IOBase)
+            self.assertEqual(
+                fake_commands.get_calls('argocd'),
+                [[
+                    'login',
+                    argocd_api,
+                    f'--username={username}',
+                    f'--password={password}',
+                    '--insecure'
+                ]]
             )
 
+    def test_ArgoCD__argocd_sign_in_fail_not_insecure(self):
+        argocd_api='argo.dev.ploigos.xyz'
+        username='test'
+        password='secrettest'
+        with FakeCommands() as fake_commands:
+            fake_commands.add('argocd', stderr='mock login error\n', exit_code=20)
+
+            stderr_buff = StringIO()
+            with redirect_stderr(stderr_buff), self.assertRaisesRegex(
+                StepRunnerException,
+                r"Error logging in to ArgoCD: Command \(argocd login\) failed with exit code \(20\)"
+            ):
+                ArgoCD._ArgoCD__argocd_sign_in(
+                    argocd_api=argocd_api,
+                    username=username,
+                    password=password,
+                    insecure=False
+                )
+
+            self.assertEqual(len(fake_commands.get_calls('argocd')), 1)
+        self.assertEqual(stderr_buff.getvalue(), 'mock login error\n')
+
 class TestStepImplementerDeployArgoCD__argocd_add_target_cluster(TestStepImplementerDeployArgoCDBase):
     @patch('sh.argocd', create=True)
     def test_ArgoCD__argocd_add_target_cluster_default_cluster(self, argocd_mock):
@@ -2308,7 +2332,8 @@ users:
                 '--kubeconfig', config_argocd_cluster_context_file_path,
                 'https://api.dev.ploigos.xyz-context',
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
 
             with open(config_argocd_cluster_context_file_path, 'r') as \
@@ -2370,7 +2395,8 @@ users:
                 '--kubeconfig', config_argocd_cluster_context_file_path,
                 'https://api.dev.ploigos.xyz-context',
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
 
             with open(config_argocd_cluster_context_file_path, 'r') as \
@@ -2496,7 +2522,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_create_or_update(TestStepImple
             values_params,
             '--upsert',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch('sh.argocd', create=True)
@@ -2531,7 +2558,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_create_or_update(TestStepImple
             values_params,
             '--upsert',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch('sh.argocd', create=True)
@@ -2566,7 +2594,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_create_or_update(TestStepImple
             values_params,
             '--upsert',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch('sh.argocd', create=True)
@@ -2601,7 +2630,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_create_or_update(TestStepImple
             values_params,
             '--upsert',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch('sh.argocd', create=True)
@@ -2653,7 +2683,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_create_or_update(TestStepImple
             values_params,
             '--upsert',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
 class TestStepImplementerDeployArgoCD__argocd_app_sync(TestStepImplementerDeployArgoCDBase):
@@ -2669,14 +2700,16 @@ class TestStepImplementerDeployArgoCD__argocd_app_sync(TestStepImplementerDeploy
             '--timeout', 120,
             'test',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         argocd_mock.app.wait.assert_called_once_with(
             '--timeout', 120,
             '--health',
             'test',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
     @patch('sh.argocd', create=True)
@@ -2707,7 +2740,8 @@ class TestStepImplementerDeployArgoCD__argocd_app_sync(TestStepImplementerDeploy
             '--timeout', 120,
             'test',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         argocd_mock.app.wait.assert_not_called()
 
@@ -2739,14 +2773,16 @@ class TestStepImplementerDeployArgoCD__argocd_app_sync(TestStepImplementerDeploy
             '--timeout', 120,
             'test',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
         argocd_mock.app.wait.assert_called_once_with(
             '--timeout', 120,
             '--health',
             'test',
             _out=Any(IOBase),
-            _err=Any(IOBase)
+            _err=Any(IOBase),
+            _done=ANY
         )
 
 class TestStepImplementerDeployArgoCD__argocd_get_app_manifest(TestStepImplementerDeployArgoCDBase):
@@ -2773,7 +2809,8 @@ class TestStepImplementerDeployArgoCD__argocd_get_app_manifest(TestStepImplement
                 '--source=live',
                 'test',
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
 
     @patch('sh.argocd', create=True)
@@ -2799,7 +2836,8 @@ class TestStepImplementerDeployArgoCD__argocd_get_app_manifest(TestStepImplement
                 '--source=git',
                 'test',
                 _out=Any(IOBase),
-                _err=Any(IOBase)
+                _err=Any(IOBase),
+                _done=ANY
             )
 
     @patch('sh.argocd', create=True)
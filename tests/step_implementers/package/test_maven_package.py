@@ -142,6 +142,11 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
 
             self.assertEqual(expected_step_result.get_step_result_dict(), result.get_step_result_dict())
 
@@ -201,6 +206,11 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
 
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
@@ -276,6 +286,11 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
             expected_step_result.success = False
 
             self.assertEqual(result.success, expected_step_result.success)
@@ -344,6 +359,11 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
     @patch('sh.mvn', create=True)
@@ -397,6 +417,11 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
 
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
 
@@ -464,5 +489,10 @@ class TestStepImplementerMavenPackageBase(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
 
             self.assertEqual(expected_step_result.get_step_result_dict(), result.get_step_result_dict())
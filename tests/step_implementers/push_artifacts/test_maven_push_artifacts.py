@@ -110,6 +110,11 @@ class TestStepImplementerMavenPushArtifacts(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
             self.assertEqual(expected_step_result.get_step_result_dict(), result.get_step_result_dict())
 
     @patch('sh.mvn', create=True)
@@ -170,6 +175,11 @@ class TestStepImplementerMavenPushArtifacts(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
             expected_step_result.success = False
 
             self.assertEqual(result.success, expected_step_result.success)
@@ -245,5 +255,10 @@ class TestStepImplementerMavenPushArtifacts(BaseStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_output_file_path}.tail'
+            )
             self.assertEqual(expected_step_result.get_step_result_dict(), result.get_step_result_dict())
 
@@ -3,14 +3,15 @@
 # pylint: disable=missing-function-docstring
 import os
 import re
-from contextlib import redirect_stdout
+from contextlib import redirect_stderr, redirect_stdout
 from io import IOBase, StringIO
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
 from tests.helpers.base_step_implementer_test_case import \
     BaseStepImplementerTestCase
+from tests.helpers.fake_commands import FakeCommands
 from tests.helpers.test_utils import Any, create_sh_side_effect
 from ploigos_step_runner import StepResult
 from ploigos_step_runner.exceptions import StepRunnerException
@@ -159,59 +160,53 @@ class TestStepImplementerSharedOpenSCAPGeneric(BaseStepImplementerTestCase):
             ):
                 step_implementer._validate_required_config_or_previous_step_result_artifact_keys()
 
-    @patch('sh.buildah', create=True)
-    def test___buildah_import_image_from_tar_success(self, buildah_mock):
+    def test___buildah_import_image_from_tar_success(self):
         image_tar_file = "/does/not/matter.tar"
         container_name = "test"
 
-        OpenSCAPGeneric._OpenSCAPGeneric__buildah_import_image_from_tar(
-            image_tar_file=image_tar_file,
-            container_name=container_name
-        )
+        with FakeCommands() as fake_commands:
+            fake_commands.add('buildah', stdout='mock imported\n')
 
-        buildah_mock.assert_called_once_with(
-            'from',
-            '--storage-driver', 'vfs',
-            '--name', container_name,
-            f"docker-archive:{image_tar_file}",
-            _out=Any(IOBase),
-            _err=Any(IOBase),
-            _tee='err'
-        )
+            stdout_buff = StringIO()
+            with redirect_stdout(stdout_buff):
+                actual_container_name = \
+                    OpenSCAPGeneric._OpenSCAPGeneric__buildah_import_image_from_tar(
+                        image_tar_file=image_tar_file,
+                        container_name=container_name
+                    )
 
-    @patch('sh.buildah', create=True)
-    def test___buildah_import_image_from_tar_error(self, buildah_mock):
+            self.assertEqual(actual_container_name, container_name)
+            self.assertEqual(
+                fake_commands.get_calls('buildah'),
+                [[
+                    'from',
+                    '--storage-driver', 'vfs',
+                    '--name', container_name,
+                    f"docker-archive:{image_tar_file}"
+                ]]
+            )
+        self.assertEqual(stdout_buff.getvalue(), 'mock imported\n')
+
+    def test___buildah_import_image_from_tar_error(self):
         image_tar_file = "/does/not/matter.tar"
         container_name = "test"
 
-        buildah_mock.side_effect = sh.ErrorReturnCode('buildah', b'mock out', b'mock error')
+        with FakeCommands() as fake_commands:
+            fake_commands.add('buildah', stderr='mock error\n', exit_code=125)
 
-        with self.assertRaisesRegex(
+            stderr_buff = StringIO()
+            with redirect_stderr(stderr_buff), self.assertRaisesRegex(
                 StepRunnerException,
-                re.compile(
-                    rf"Error importing the image \({image_tar_file}\):"
-                    r".*RAN: buildah"
-                    r".*STDOUT:"
-                    r".*mock out"
-                    r".*STDERR:"
-                    r".*mock error",
-                    re.DOTALL
+                rf"Error importing the image \({image_tar_file}\):"
+                r" Command \(buildah from\) failed with exit code \(125\)"
+            ):
+                OpenSCAPGeneric._OpenSCAPGeneric__buildah_import_image_from_tar(
+                    image_tar_file=image_tar_file,
+                    container_name=container_name
                 )
-        ):
-            OpenSCAPGeneric._OpenSCAPGeneric__buildah_import_image_from_tar(
-                image_tar_file=image_tar_file,
-                container_name=container_name
-            )
 
-        buildah_mock.assert_called_once_with(
-            'from',
-            '--storage-driver', 'vfs',
-            '--name', container_name,
-            f"docker-archive:{image_tar_file}",
-            _out=Any(IOBase),
-            _err=Any(IOBase),
-            _tee='err'
-        )
+            self.assertEqual(len(fake_commands.get_calls('buildah')), 1)
+        self.assertEqual(stderr_buff.getvalue(), 'mock error\n')
 
     @patch('sh.buildah', create=True)
     def test___buildah_mount_container_success(self, buildah_mock):
@@ -235,7 +230,8 @@ class TestStepImplementerSharedOpenSCAPGeneric(BaseStepImplementerTestCase):
             container_name,
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -271,7 +267,8 @@ class TestStepImplementerSharedOpenSCAPGeneric(BaseStepImplementerTestCase):
             container_name,
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.oscap', create=True)
@@ -305,7 +302,8 @@ No dictionaries."""
 
         sh.oscap.info.assert_called_once_with(
             oscap_input_file,
-            _out=Any(IOBase)
+            _out=Any(IOBase),
+            _done=ANY
         )
 
         self.assertEqual(oscap_document_type, 'Source Data Stream')
@@ -368,7 +366,8 @@ Referenced check files:
 
         sh.oscap.info.assert_called_once_with(
             oscap_input_file,
-            _out=Any(IOBase)
+            _out=Any(IOBase),
+            _done=ANY
         )
 
         self.assertEqual(oscap_document_type, 'XCCDF Checklist')
@@ -402,7 +401,8 @@ Referenced check files:
 
         sh.oscap.info.assert_called_once_with(
             oscap_input_file,
-            _out=Any(IOBase)
+            _out=Any(IOBase),
+            _done=ANY
         )
 
     def test___get_oscap_eval_type_based_on_document_type_sds(self):
@@ -534,7 +534,8 @@ Referenced check files:
                 oscap_input_file,
                 _out=Any(IOBase),
                 _err=Any(IOBase),
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
             self.assertEqual(oscap_eval_success, oscap_eval_success_expected)
@@ -986,10 +987,12 @@ Result	pass
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__run_oscap_scan')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_mount_container')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__get_oscap_document_type')
+    @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_import_image_from_tar')
     @patch('sh.buildah', create=True)
     def test_run_step_pass(
         self,
         buildah_mock,
+        buildah_import_image_from_tar_mock,
         get_oscap_document_type_mock,
         buildah_mount_container_mock,
         run_oscap_scan_mock
@@ -1056,11 +1059,11 @@ Result	pass
                 stdout,
                 re.compile(
                     rf".*Import image: {image_tar_file}"
+                    rf".*Download input definitions: {oscap_input_definitions_uri}"
                     rf".*Imported image: {image_tar_file}"
+                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Mount container: {image_tar_file_name}\-test\-OpenSCAP.*"
                     rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'"
-                    rf".*Download input definitions: {oscap_input_definitions_uri}"
-                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Determine OpenSCAP document type of input file: /.+/working/test/rhel\-8\.ds\.xml"
                     rf".*Determined OpenSCAP document type of input file \(/.+/working/test/rhel\-8\.ds\.xml\): {oscap_document_type}"
                     rf".*Determine OpenSCAP eval type for input file \(/.+/working/test/rhel\-8\.ds\.xml\) of document type: {oscap_document_type}"
@@ -1074,9 +1077,11 @@ Result	pass
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__run_oscap_scan')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_mount_container')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__get_oscap_document_type')
+    @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_import_image_from_tar')
     @patch('sh.buildah', create=True)
     def test_run_step_fail(self,
                            buildah_mock,
+                           buildah_import_image_from_tar_mock,
                            get_oscap_document_type_mock,
                            buildah_mount_container_mock,
                            run_oscap_scan_mock
@@ -1148,11 +1153,11 @@ Result	fail
                 stdout,
                 re.compile(
                     rf".*Import image: {image_tar_file}"
+                    rf".*Download input definitions: {oscap_input_definitions_uri}"
                     rf".*Imported image: {image_tar_file}"
+                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Mount container: {image_tar_file_name}\-test\-OpenSCAP.*"
                     rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'"
-                    rf".*Download input definitions: {oscap_input_definitions_uri}"
-                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Determine OpenSCAP document type of input file: /.+/working/test/rhel\-8\.ds\.xml"
                     rf".*Determined OpenSCAP document type of input file \(/.+/working/test/rhel\-8\.ds\.xml\): {oscap_document_type}"
                     rf".*Determine OpenSCAP eval type for input file \(/.+/working/test/rhel\-8\.ds\.xml\) of document type: {oscap_document_type}"
@@ -1166,10 +1171,12 @@ Result	fail
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__run_oscap_scan')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_mount_container')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__get_oscap_document_type')
+    @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_import_image_from_tar')
     @patch('sh.buildah', create=True)
     def test_run_step_pass_with_tailoring_file(
         self,
         buildah_mock,
+        buildah_import_image_from_tar_mock,
         get_oscap_document_type_mock,
         buildah_mount_container_mock,
         run_oscap_scan_mock
@@ -1240,11 +1247,11 @@ Result	fail
                 stdout,
                 re.compile(
                     rf".*Import image: {image_tar_file}"
+                    rf".*Download input definitions: {oscap_input_definitions_uri}"
                     rf".*Imported image: {image_tar_file}"
+                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Mount container: {image_tar_file_name}\-test\-OpenSCAP.*"
                     rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'"
-                    rf".*Download input definitions: {oscap_input_definitions_uri}"
-                    rf".*Downloaded input definitions to: /.+/working/test/rhel\-8.ds.xml"
                     rf".*Download oscap tailoring file: {oscap_tailoring_uri}"
                     rf".*Download oscap tailoring file to: /.+/working/test/xccdf_com.redhat\.ploigos_profile_example_ubi8\-tailoring\-xccdf\.xml"
                     rf".*Determine OpenSCAP document type of input file: /.+/working/test/rhel\-8\.ds\.xml"
@@ -1261,10 +1268,12 @@ Result	fail
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__run_oscap_scan')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_mount_container')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__get_oscap_document_type')
+    @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_import_image_from_tar')
     @patch('sh.buildah', create=True)
     def test_run_step_fail_downloading_open_scap_input_file(
         self,
         buildah_mock,
+        buildah_import_image_from_tar_mock,
         get_oscap_document_type_mock,
         buildah_mount_container_mock,
         run_oscap_scan_mock,
@@ -1335,9 +1344,6 @@ Result	fail
                 stdout,
                 re.compile(
                     rf".*Import image: {image_tar_file}"
-                    rf".*Imported image: {image_tar_file}"
-                    rf".*Mount container: {image_tar_file_name}\-test\-OpenSCAP.*"
-                    rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'"
                     rf".*Download input definitions: {oscap_input_definitions_uri}",
                     re.DOTALL
                 )
@@ -1347,10 +1353,12 @@ Result	fail
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__run_oscap_scan')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_mount_container')
     @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__get_oscap_document_type')
+    @patch.object(OpenSCAPGeneric, '_OpenSCAPGeneric__buildah_import_image_from_tar')
     @patch('sh.buildah', create=True)
     def test_run_step_fail_downloading_open_scap_tailoring_file(
         self,
         buildah_mock,
+        buildah_import_image_from_tar_mock,
         get_oscap_document_type_mock,
         buildah_mount_container_mock,
         run_oscap_scan_mock,
@@ -1424,10 +1432,10 @@ Result	fail
                 stdout,
                 re.compile(
                     rf".*Import image: {image_tar_file}"
+                    rf".*Download input definitions: {oscap_input_definitions_uri}"
                     rf".*Imported image: {image_tar_file}"
                     rf".*Mount container: {image_tar_file_name}\-test\-OpenSCAP.*"
-                    rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'"
-                    rf".*Download input definitions: {oscap_input_definitions_uri}",
+                    rf".*Mounted container \({image_tar_file_name}\-test\-OpenSCAP.*\) with mount path: '{mount_path}'",
                     re.DOTALL
                 )
             )
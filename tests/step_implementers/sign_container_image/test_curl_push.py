@@ -4,7 +4,7 @@
 import os
 import re
 from io import IOBase
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -105,7 +105,8 @@ class TestStepImplementerCurlPushSourceBase(BaseStepImplementerTestCase):
                 f"https://sigserver/signatures/{container_image_signature_name}",
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
 
     @patch('sh.curl', create=True)
@@ -165,7 +166,8 @@ class TestStepImplementerCurlPushSourceBase(BaseStepImplementerTestCase):
                 f"https://sigserver/signatures/{container_image_signature_name}",
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
 
     @patch('sh.curl', create=True)
@@ -238,5 +240,6 @@ class TestStepImplementerCurlPushSourceBase(BaseStepImplementerTestCase):
                 f"https://sigserver/signatures/{container_image_signature_name}",
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
@@ -5,7 +5,7 @@ import os
 import re
 from io import IOBase
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -309,7 +309,8 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
             _in=pgp_private_key,
             _out=Any(IOBase),
             _err_to_out=True,
-            _tee='out'
+            _tee='out',
+            _done=ANY
         )
 
     @patch('sh.gpg', create=True)
@@ -342,7 +343,8 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
             _in=pgp_private_key,
             _out=Any(IOBase),
             _err_to_out=True,
-            _tee='out'
+            _tee='out',
+            _done=ANY
         )
 
     @patch('sh.gpg', create=True)
@@ -369,7 +371,8 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
             _in=pgp_private_key,
             _out=Any(IOBase),
             _err_to_out=True,
-            _tee='out'
+            _tee='out',
+            _done=ANY
         )
 
     @patch('sh.podman', create=True)
@@ -395,7 +398,8 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
                 f'docker://{container_image_tag}',
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
 
     @patch('sh.podman', create=True)
@@ -432,7 +436,8 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
                 f'docker://{container_image_tag}',
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
 
     @patch('sh.podman', create=True)
@@ -465,5 +470,6 @@ class TestStepImplementerSignContainerImagePodman(BaseStepImplementerTestCase):
                 f'docker://{container_image_tag}',
                 _out=Any(IOBase),
                 _err_to_out=True,
-                _tee='out'
+                _tee='out',
+                _done=ANY
             )
@@ -4,7 +4,7 @@
 import os
 import re
 import sys
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -189,7 +189,8 @@ class TestStepImplementerSonarQubePackageBase(BaseStepImplementerTestCase):
                     '-Dsonar.working.directory=' + work_dir_path,
                     '-Djavax.net.ssl.trustStore=/etc/pki/java/cacerts',
                     _out=sys.stdout,
-                    _err=sys.stderr
+                    _err=sys.stderr,
+                    _done=ANY
             )
 
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
@@ -246,7 +247,8 @@ class TestStepImplementerSonarQubePackageBase(BaseStepImplementerTestCase):
                     '-Dsonar.working.directory=' + work_dir_path,
                     '-Djavax.net.ssl.trustStore=/etc/pki/java/cacerts',
                     _out=sys.stdout,
-                    _err=sys.stderr
+                    _err=sys.stderr,
+                    _done=ANY
             )
 
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
@@ -350,7 +352,8 @@ class TestStepImplementerSonarQubePackageBase(BaseStepImplementerTestCase):
                     '-Dsonar.working.directory=' + work_dir_path,
                     '-Djavax.net.ssl.trustStore=' + java_truststore,
                     _out=sys.stdout,
-                    _err=sys.stderr
+                    _err=sys.stderr,
+                    _done=ANY
             )
 
             self.assertEqual(result.get_step_result_dict(), expected_step_result.get_step_result_dict())
@@ -4,7 +4,7 @@
 import os
 import re
 from io import IOBase
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -786,7 +786,8 @@ class TestStepImplementerTagSourceGit(BaseStepImplementerTestCase):
                 '-f',
                 _out=Any(IOBase),
                 _err=Any(IOBase),
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
     @patch('sh.git', create=True)
@@ -854,7 +855,8 @@ class TestStepImplementerTagSourceGit(BaseStepImplementerTestCase):
                 '--tag',
                 _out=Any(IOBase),
                 _err=Any(IOBase),
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
     @patch('sh.git', create=True)
@@ -886,7 +888,8 @@ class TestStepImplementerTagSourceGit(BaseStepImplementerTestCase):
                 '--tag',
                 _out=Any(IOBase),
                 _err=Any(IOBase),
-                _tee='err'
+                _tee='err',
+                _done=ANY
             )
 
     @patch('sh.git', create=True)
@@ -2,7 +2,7 @@ import os
 from io import IOBase
 from pathlib import Path
 from shutil import copyfile
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -255,7 +255,8 @@ class TestStepImplementerMavenSeleniumCucumber_Other(TestStepImplementerMavenSel
                     '-f', pom_file_path,
                     '-s', settings_file_path,
                     _out=Any(IOBase),
-                    _err=Any(IOBase)
+                    _err=Any(IOBase),
+                    _done=ANY
                 )
             else:
                 mvn_mock.assert_called_once_with(
@@ -273,7 +274,8 @@ class TestStepImplementerMavenSeleniumCucumber_Other(TestStepImplementerMavenSel
                     '-Dmaven.wagon.http.ssl.allowall=true',
                     '-Dmaven.wagon.http.ssl.ignore.validity.dates=true',
                     _out=Any(IOBase),
-                    _err=Any(IOBase)
+                    _err=Any(IOBase),
+                    _done=ANY
                 )
 
         expected_step_result = StepResult(
@@ -295,6 +297,11 @@ class TestStepImplementerMavenSeleniumCucumber_Other(TestStepImplementerMavenSel
                 name='maven-output',
                 value=mvn_test_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_test_output_file_path}.tail'
+            )
             expected_step_result.add_artifact(
                 description=f"Surefire reports generated by 'mvn -P{uat_maven_profile} test'.",
                 name='surefire-reports',
@@ -2,7 +2,7 @@ import os
 import re
 from io import IOBase, StringIO
 from shutil import copyfile
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from testfixtures import TempDirectory
 from tests.helpers.maven_step_implementer_test_case import \
@@ -127,7 +127,8 @@ class TestStepImplementerMavenUnitTest(MaveStepImplementerTestCase):
                     '-f', pom_file_path,
                     '-s', settings_file_path,
                     _out=Any(IOBase),
-                    _err=Any(IOBase)
+                    _err=Any(IOBase),
+                    _done=ANY
                 )
             else:
                 mvn_mock.assert_called_once_with(
@@ -139,7 +140,8 @@ class TestStepImplementerMavenUnitTest(MaveStepImplementerTestCase):
                     '-Dmaven.wagon.http.ssl.allowall=true',
                     '-Dmaven.wagon.http.ssl.ignore.validity.dates=true',
                     _out=Any(IOBase),
-                    _err=Any(IOBase)
+                    _err=Any(IOBase),
+                    _done=ANY
                 )
 
         expected_step_result = StepResult(
@@ -161,6 +163,11 @@ class TestStepImplementerMavenUnitTest(MaveStepImplementerTestCase):
                 name='maven-output',
                 value=mvn_test_output_file_path
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'maven-output', uncompressed.",
+                name='maven-output-tail',
+                value=f'{mvn_test_output_file_path}.tail'
+            )
             expected_step_result.add_artifact(
                 name='surefire-reports',
                 description="Surefire reports generated from 'mvn test'.",
@@ -21,8 +21,8 @@ class TestStepImplementerConfiglint(BaseStepImplementerTestCase):
             config_lint_fail=False
     ):
         def config_lint_side_effect(*args, **kwargs):
-            kwargs['_out'](config_lint_stdout)
-            kwargs['_err'](config_lint_stderr)
+            os.write(kwargs['_out'], config_lint_stdout.encode())
+            os.write(kwargs['_err'], config_lint_stderr.encode())
 
             if config_lint_fail:
                 raise sh.ErrorReturnCode_255(
@@ -176,6 +176,11 @@ class TestStepImplementerConfiglint(BaseStepImplementerTestCase):
                 name='configlint-result-set',
                 value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt'
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'configlint-result-set', uncompressed.",
+                name='configlint-result-set-tail',
+                value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt.tail'
+            )
             expected_step_result.add_artifact(
                 name='configlint-yml-path',
                 value=test_file_path
@@ -231,6 +236,11 @@ class TestStepImplementerConfiglint(BaseStepImplementerTestCase):
                 name='configlint-result-set',
                 value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt'
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'configlint-result-set', uncompressed.",
+                name='configlint-result-set-tail',
+                value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt.tail'
+            )
             expected_step_result.add_artifact(
                 name='configlint-yml-path',
                 value=file_to_validate_file_path
@@ -275,6 +285,11 @@ class TestStepImplementerConfiglint(BaseStepImplementerTestCase):
                 name='configlint-result-set',
                 value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt'
             )
+            expected_step_result.add_artifact(
+                description="End of the log 'configlint-result-set', uncompressed.",
+                name='configlint-result-set-tail',
+                value=f'{work_dir_path}/validate-environment-configuration/configlint_results_file.txt.tail'
+            )
             expected_step_result.add_artifact(
                 name='configlint-yml-path',
                 value=test_file_path
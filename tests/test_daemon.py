@@ -0,0 +1,398 @@
+# pylint: disable=line-too-long
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+
+import io
+import os
+import socket
+import sys
+import threading
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from ploigos_step_runner import StepImplementer, StepRunnerException
+from ploigos_step_runner.__main__ import run
+from ploigos_step_runner.daemon import (DaemonOutputStream, StepRunnerDaemon,
+                                        run_in_daemon)
+from ploigos_step_runner.decryption_utils import DecryptionUtils
+
+from tests.helpers.base_test_case import BaseTestCase
+
+FOO_CONFIG = """---
+step-runner-config:
+  foo:
+    implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+  fail:
+    implementer: 'tests.helpers.sample_step_implementers.FailStepImplementer'
+  explode:
+    implementer: 'tests.helpers.sample_step_implementers.RaiseExceptionStepImplementer'
+"""
+
+
+class BaseDaemonTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = TempDirectory()
+        self.socket_path = os.path.join(self.temp_dir.path, 'psr.sock')
+        self.config_path = os.path.join(self.temp_dir.path, 'psr.yml')
+        self.temp_dir.write('psr.yml', bytes(FOO_CONFIG, 'utf-8'))
+        self.serve_thread = None
+
+    def tearDown(self):
+        if self.serve_thread is not None:
+            self.step_runner_daemon.shutdown()
+            self.serve_thread.join()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def start_daemon(self, run_function=run):
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run_function)
+        ready_event = threading.Event()
+        self.serve_thread = threading.Thread(
+            target=self.step_runner_daemon.serve,
+            kwargs={'ready_event': ready_event}
+        )
+        self.serve_thread.start()
+        ready_event.wait()
+
+    def run_in_daemon(self, argv):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = run_in_daemon(self.socket_path, argv, stdout, stderr)
+
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def step_argv(self, step, *args):
+        return [
+            '--step', step,
+            '--config', self.config_path,
+            '--results-dir', os.path.join(self.temp_dir.path, 'step-runner-results')
+        ] + list(args)
+
+    def run_request(self, argv, cwd=None, env=None):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = self.step_runner_daemon.run_request(
+            argv=argv,
+            cwd=cwd or self.temp_dir.path,
+            env=env if env is not None else dict(os.environ),
+            stdout=stdout,
+            stderr=stderr
+        )
+
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+class TestStepRunnerDaemonClient(BaseDaemonTestCase):
+    def test_success(self):
+        self.start_daemon()
+
+        exit_code, stdout, _ = self.run_in_daemon(self.step_argv('foo'))
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn('Step Start - foo', stdout)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.temp_dir.path, 'step-runner-results', 'step-runner-results.yml')
+        ))
+
+    def test_config_does_not_exist(self):
+        self.start_daemon()
+
+        exit_code, _, stderr = self.run_in_daemon(
+            ['--step', 'foo', '--config', 'does-not-exist.yml']
+        )
+
+        self.assertEqual(exit_code, 101)
+        self.assertIn('specified -c/--config must exist and not be empty', stderr)
+
+    def test_config_invalid(self):
+        self.start_daemon()
+        self.temp_dir.write('invalid.yml', b'foo: bar')
+
+        exit_code, _, stderr = self.run_in_daemon(
+            ['--step', 'foo', '--config', os.path.join(self.temp_dir.path, 'invalid.yml')]
+        )
+
+        self.assertEqual(exit_code, 102)
+        self.assertIn('specified -c/--config is invalid configuration', stderr)
+
+    def test_step_not_successful(self):
+        self.start_daemon()
+
+        exit_code, _, stderr = self.run_in_daemon(self.step_argv('fail'))
+
+        self.assertEqual(exit_code, 200)
+        self.assertIn('Step fail not successful', stderr)
+
+    def test_step_exception(self):
+        self.start_daemon()
+
+        exit_code, stdout, stderr = self.run_in_daemon(self.step_argv('explode'))
+
+        self.assertEqual(exit_code, 300)
+        self.assertIn('Fatal error calling step (explode)', stderr)
+        self.assertIn('Traceback', stdout)
+
+    def test_invalid_arguments(self):
+        self.start_daemon()
+
+        exit_code, _, stderr = self.run_in_daemon(['--bad-arg'])
+
+        self.assertEqual(exit_code, 2)
+        self.assertIn('usage:', stderr)
+
+    def test_relative_paths_from_client_working_dir(self):
+        self.start_daemon()
+
+        original_cwd = os.getcwd()
+        os.chdir(self.temp_dir.path)
+        try:
+            exit_code, _, _ = self.run_in_daemon(['--step', 'foo', '--config', 'psr.yml'])
+        finally:
+            os.chdir(original_cwd)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(os.getcwd(), original_cwd)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.temp_dir.path, 'step-runner-results', 'step-runner-results.yml')
+        ))
+
+    def test_daemon_not_listening(self):
+        with self.assertRaises(OSError):
+            run_in_daemon(self.socket_path, self.step_argv('foo'))
+
+    def test_invalid_request(self):
+        self.start_daemon()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            client.sendall(b'not json\n')
+            with client.makefile('r', encoding='utf-8') as responses:
+                response_lines = responses.readlines()
+
+        self.assertIn('Invalid psr daemon request', response_lines[0])
+        self.assertEqual(response_lines[-1], '{"exit": 300}\n')
+
+    def test_closed_without_exit_code(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(1)
+
+        def close_connection():
+            connection, _ = server.accept()
+            connection.recv(65536)
+            connection.sendall(b'{"stdout": "hello\\n"}\n')
+            connection.close()
+
+        server_thread = threading.Thread(target=close_connection)
+        server_thread.start()
+        try:
+            exit_code, stdout, stderr = self.run_in_daemon(self.step_argv('foo'))
+        finally:
+            server_thread.join()
+            server.close()
+
+        self.assertEqual(exit_code, 300)
+        self.assertEqual(stdout, 'hello\n')
+        self.assertIn('closed connection without an exit code', stderr)
+
+
+class TestStepRunnerDaemonRunRequest(BaseDaemonTestCase):
+    def test_cwd_and_env(self):
+        def run_function(argv, config_loader, workflow_result_loader): # pylint: disable=unused-argument
+            print(os.getcwd())
+            print(os.environ['PSR_TEST_VALUE'])
+
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run_function)
+        original_cwd = os.getcwd()
+
+        exit_code, stdout, _ = self.run_request([], env={'PSR_TEST_VALUE': 'hello'})
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, f"{self.temp_dir.path}\nhello\n")
+        self.assertEqual(os.getcwd(), original_cwd)
+        self.assertNotIn('PSR_TEST_VALUE', os.environ)
+
+    def test_cwd_does_not_exist(self):
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        exit_code, _, stderr = self.run_request(
+            [],
+            cwd=os.path.join(self.temp_dir.path, 'does-not-exist')
+        )
+
+        self.assertEqual(exit_code, 300)
+        self.assertIn('Error running psr daemon request in directory', stderr)
+
+    def test_exit_codes(self):
+        def run_function(argv, config_loader, workflow_result_loader): # pylint: disable=unused-argument
+            if argv[0] == 'none':
+                sys.exit()
+            if argv[0] == 'message':
+                sys.exit('goodbye')
+            raise RuntimeError('boom')
+
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run_function)
+
+        self.assertEqual(self.run_request(['none'])[0], 0)
+
+        exit_code, _, stderr = self.run_request(['message'])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stderr, 'goodbye\n')
+
+        exit_code, _, stderr = self.run_request(['raise'])
+        self.assertEqual(exit_code, 300)
+        self.assertIn('boom', stderr)
+
+    def test_workflow_result_reused_between_requests(self):
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        with patch.object(
+            StepImplementer,
+            'load_workflow_result',
+            wraps=StepImplementer.load_workflow_result
+        ) as load_workflow_result_mock:
+            self.assertEqual(self.run_request(['--step', 'foo', '--config', 'psr.yml'])[0], 0)
+            self.assertEqual(self.run_request(['--step', 'fail', '--config', 'psr.yml'])[0], 200)
+            self.assertEqual(load_workflow_result_mock.call_count, 1)
+
+            # result files changed outside of the daemon
+            self.temp_dir.write('step-runner-working/step-runner-results.journal', b'')
+            self.assertEqual(self.run_request(['--step', 'foo', '--config', 'psr.yml'])[0], 0)
+            self.assertEqual(load_workflow_result_mock.call_count, 2)
+
+    def test_workflow_result_not_reused_after_fatal_error(self):
+        self.step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        with patch.object(
+            StepImplementer,
+            'load_workflow_result',
+            wraps=StepImplementer.load_workflow_result
+        ) as load_workflow_result_mock:
+            self.assertEqual(self.run_request(['--step', 'explode', '--config', 'psr.yml'])[0], 300)
+            self.assertEqual(self.run_request(['--step', 'foo', '--config', 'psr.yml'])[0], 0)
+            self.assertEqual(load_workflow_result_mock.call_count, 2)
+
+
+class TestStepRunnerDaemonLoadConfig(BaseDaemonTestCase):
+    def test_config_reused(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        config = step_runner_daemon.load_config([self.config_path])
+        config.set_step_config_overrides('foo', {'hello': 'world'})
+
+        reused_config = step_runner_daemon.load_config([self.config_path])
+        self.assertIs(reused_config, config)
+        self.assertEqual(reused_config.get_step_config('foo').step_config_overrides, {})
+
+    def test_config_reparsed_when_file_changed(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        config = step_runner_daemon.load_config([self.config_path])
+        self.temp_dir.write('psr.yml', bytes(FOO_CONFIG + "  bar:\n    implementer: 'foo'\n", 'utf-8'))
+
+        changed_config = step_runner_daemon.load_config([self.config_path])
+        self.assertIsNot(changed_config, config)
+        self.assertIn('bar', changed_config.step_configs)
+
+    def test_config_dir_reparsed_when_file_added(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+        self.temp_dir.write('config/psr.yml', bytes(FOO_CONFIG, 'utf-8'))
+        config_dir = os.path.join(self.temp_dir.path, 'config')
+
+        config = step_runner_daemon.load_config([config_dir])
+        self.assertIs(step_runner_daemon.load_config([config_dir]), config)
+
+        self.temp_dir.write(
+            'config/nested/bar.yml',
+            b"step-runner-config:\n  bar:\n    implementer: 'foo'\n"
+        )
+        changed_config = step_runner_daemon.load_config([config_dir])
+        self.assertIsNot(changed_config, config)
+        self.assertIn('bar', changed_config.step_configs)
+
+    def test_decryptors_not_duplicated_when_config_reparsed(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+        decryptors_config = FOO_CONFIG + "  config-decryptors:\n  - implementer: SOPS\n"
+        self.temp_dir.write('psr.yml', bytes(decryptors_config, 'utf-8'))
+
+        step_runner_daemon.load_config([self.config_path])
+        self.temp_dir.write('psr.yml', bytes(decryptors_config + "  bar:\n    implementer: 'foo'\n", 'utf-8'))
+        step_runner_daemon.load_config([self.config_path])
+        self.temp_dir.write('psr.yml', bytes(decryptors_config + "  baz:\n    implementer: 'foo'\n", 'utf-8'))
+        step_runner_daemon.load_config([self.config_path])
+
+        self.assertEqual(len(DecryptionUtils._DecryptionUtils__config_value_decryptors), 1)
+
+    def test_decryptors_of_reused_config_registered(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+        self.temp_dir.write(
+            'psr.yml',
+            bytes(FOO_CONFIG + "  config-decryptors:\n  - implementer: SOPS\n", 'utf-8')
+        )
+        self.temp_dir.write('other.yml', bytes(FOO_CONFIG, 'utf-8'))
+
+        config = step_runner_daemon.load_config([self.config_path])
+        step_runner_daemon.load_config([os.path.join(self.temp_dir.path, 'other.yml')])
+        self.assertEqual(len(DecryptionUtils._DecryptionUtils__config_value_decryptors), 0)
+
+        self.assertIs(step_runner_daemon.load_config([self.config_path]), config)
+        self.assertEqual(len(DecryptionUtils._DecryptionUtils__config_value_decryptors), 1)
+
+
+class TestStepRunnerDaemonServe(BaseDaemonTestCase):
+    def test_idle_timeout(self):
+        step_runner_daemon = StepRunnerDaemon(self.socket_path, run)
+
+        step_runner_daemon.serve(idle_timeout=0)
+
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_socket_only_accessible_by_owner(self):
+        self.start_daemon()
+
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+
+    def test_socket_in_use(self):
+        self.start_daemon()
+
+        with self.assertRaisesRegex(StepRunnerException, r'is already in use by a running daemon'):
+            StepRunnerDaemon(self.socket_path, run).serve(idle_timeout=0)
+
+    def test_stale_socket_removed(self):
+        stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale_socket.bind(self.socket_path)
+        stale_socket.close()
+
+        self.start_daemon()
+
+        exit_code, _, _ = self.run_in_daemon(self.step_argv('foo'))
+        self.assertEqual(exit_code, 0)
+
+    def test_socket_path_not_socket(self):
+        self.temp_dir.write('psr.sock', b'not a socket')
+
+        with self.assertRaisesRegex(StepRunnerException, r'exists and is not a socket'):
+            StepRunnerDaemon(self.socket_path, run).serve(idle_timeout=0)
+
+
+class TestDaemonOutputStream(BaseTestCase):
+    def test_write(self):
+        response_file = io.BytesIO()
+        output_stream = DaemonOutputStream(response_file, 'stdout', threading.Lock())
+
+        self.assertEqual(output_stream.write('hello\n'), 6)
+        output_stream.write('')
+
+        self.assertEqual(response_file.getvalue(), b'{"stdout": "hello\\n"}\n')
+        self.assertFalse(output_stream.disconnected)
+
+    def test_write_disconnected(self):
+        response_file = io.BytesIO()
+        response_file.close()
+        output_stream = DaemonOutputStream(response_file, 'stderr', threading.Lock())
+
+        self.assertEqual(output_stream.write('hello\n'), 6)
+        self.assertTrue(output_stream.disconnected)
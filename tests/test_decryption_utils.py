@@ -4,15 +4,19 @@ from ploigos_step_runner.config.config_value import ConfigValue
 from ploigos_step_runner.config.config_value_decryptor import ConfigValueDecryptor
 from ploigos_step_runner.decryption_utils import DecryptionUtils
 from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.utils.immutable import FrozenDict, freeze
 from ploigos_step_runner.utils.io import TextIOSelectiveObfuscator
 from ploigos_step_runner.config.decryptors.sops import SOPS
 
 from contextlib import redirect_stdout
+from unittest.mock import patch
 import io
 import unittest
 import re
 import sys
 
+from testfixtures import TempDirectory
+
 from tests.helpers.base_test_case import BaseTestCase
 
 class SampleConfigValueDecryptor(ConfigValueDecryptor):
@@ -122,6 +126,28 @@ class TestDecryptionUtils(BaseTestCase):
                 new_stdout.close()
                 sys.stdout = old_stdout
 
+    def test_unregister_obfuscation_stream(self):
+        secret_value = "decrypt me"
+        config_value = ConfigValue(
+            f'TEST_ENC[{secret_value}]'
+        )
+
+        DecryptionUtils.register_config_value_decryptor(
+            SampleConfigValueDecryptor()
+        )
+
+        out = io.StringIO()
+        obfuscated_out = TextIOSelectiveObfuscator(out)
+        DecryptionUtils.register_obfuscation_stream(obfuscated_out)
+        DecryptionUtils.unregister_obfuscation_stream(obfuscated_out)
+
+        # not registered so ignored
+        DecryptionUtils.unregister_obfuscation_stream(obfuscated_out)
+
+        DecryptionUtils.decrypt(config_value)
+        obfuscated_out.write(f"no longer obfuscated ({secret_value})")
+        self.assertEqual(out.getvalue(), f"no longer obfuscated ({secret_value})")
+
     def test__get_decryption_class_sops_short_name(self):
         decryptor_class = DecryptionUtils._DecryptionUtils__get_decryption_class('SOPS')
         self.assertEqual(
@@ -214,3 +240,151 @@ class TestDecryptionUtils(BaseTestCase):
             decrypted_value,
             secret_value
         )
+
+class CountingConfigValueDecryptor(SampleConfigValueDecryptor):
+    def __init__(self):
+        self.decrypt_count = 0
+
+    def decrypt(self, config_value):
+        self.decrypt_count += 1
+        return super().decrypt(config_value)
+
+class TestDecryptionUtilsDecryptedValueCache(BaseTestCase):
+    def tearDown(self):
+        DecryptionUtils.set_decrypted_value_cache_max_size(
+            DecryptionUtils._DecryptionUtils__DEFAULT_DECRYPTED_VALUE_CACHE_MAX_SIZE
+        )
+        super().tearDown()
+
+    def test_decrypt_cached(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        parent_source = freeze({'foo': 'bar'})
+        for _ in range(3):
+            decrypted_value = DecryptionUtils.decrypt(
+                ConfigValue('TEST_ENC[decrypt me]', parent_source, ['foo'])
+            )
+            self.assertEqual(decrypted_value, 'decrypt me')
+
+        self.assertEqual(decryptor.decrypt_count, 1)
+
+    def test_decrypt_cached_dict_parent_source_not_serialized(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+        config_value = ConfigValue('TEST_ENC[decrypt me]', {'foo': 'bar'}, ['foo'])
+
+        with patch.object(FrozenDict, '__repr__', side_effect=AssertionError('serialized')):
+            DecryptionUtils.decrypt(config_value)
+            DecryptionUtils.decrypt(config_value)
+
+        self.assertEqual(decryptor.decrypt_count, 1)
+
+    def test_decrypt_cached_different_dict_parent_sources(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', {'foo': 'bar'}, ['foo']))
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', {'foo': 'bar'}, ['foo']))
+
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_decrypt_cached_different_path_parts(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', None, ['foo']))
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', None, ['bar']))
+
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_decrypt_cached_file_parent_source_changed(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        with TempDirectory() as temp_dir:
+            parent_source = temp_dir.write('secrets.yml', b'foo: 1')
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', parent_source, ['foo']))
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', parent_source, ['foo']))
+            self.assertEqual(decryptor.decrypt_count, 1)
+
+            temp_dir.write('secrets.yml', b'foo: 12')
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', parent_source, ['foo']))
+            self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_clear_decrypted_value_cache(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+        DecryptionUtils.clear_decrypted_value_cache()
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_reset(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+
+        DecryptionUtils.reset()
+
+        self.assertIsNone(DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]')))
+        self.assertEqual(DecryptionUtils._DecryptionUtils__obfuscation_targets, [])
+
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_register_config_value_decryptor_clears_cache(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+        DecryptionUtils.register_config_value_decryptor(SampleConfigValueDecryptor())
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+    def test_set_decrypted_value_cache_max_size(self):
+        decryptor = CountingConfigValueDecryptor()
+        DecryptionUtils.register_config_value_decryptor(decryptor)
+        DecryptionUtils.set_decrypted_value_cache_max_size(1)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me 1]'))
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me 2]'))
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me 2]'))
+        self.assertEqual(decryptor.decrypt_count, 2)
+
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me 1]'))
+        self.assertEqual(decryptor.decrypt_count, 3)
+
+    def test_set_decrypted_value_cache_max_size_invalid(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Decrypted value cache max size \(-1\) must be a non negative int."
+        ):
+            DecryptionUtils.set_decrypted_value_cache_max_size(-1)
+
+    def test_obfuscation_targets_added_once(self):
+        DecryptionUtils.register_config_value_decryptor(SampleConfigValueDecryptor())
+        obfuscator = TextIOSelectiveObfuscator(io.StringIO())
+        DecryptionUtils.register_obfuscation_stream(obfuscator)
+
+        with patch.object(obfuscator, 'add_obfuscation_targets') as add_targets_mock:
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', None, ['foo']))
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', None, ['bar']))
+            DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]', None, ['foo']))
+
+            add_targets_mock.assert_called_once_with('decrypt me')
+
+    def test_register_obfuscation_stream_after_decrypt(self):
+        DecryptionUtils.register_config_value_decryptor(SampleConfigValueDecryptor())
+        DecryptionUtils.decrypt(ConfigValue('TEST_ENC[decrypt me]'))
+
+        out = io.StringIO()
+        obfuscator = TextIOSelectiveObfuscator(out)
+        DecryptionUtils.register_obfuscation_stream(obfuscator)
+        obfuscator.write('secret (decrypt me)')
+
+        self.assertRegex(out.getvalue(), r"secret \(\*+\)")
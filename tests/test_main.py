@@ -3,16 +3,27 @@
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
 
+from contextlib import redirect_stderr, redirect_stdout
 from unittest.mock import patch
 
+import io
+import json
 import os
+import re
+import subprocess
+import sys
+import threading
 import yaml
 from testfixtures import TempDirectory
 
-from ploigos_step_runner.__main__ import main
+from ploigos_step_runner.__main__ import main, run
+from ploigos_step_runner.daemon import StepRunnerDaemon
+from ploigos_step_runner.decryption_utils import DecryptionUtils
+from ploigos_step_runner.utils.compressed_log import TextIOCompressedLog
 
 from tests.helpers.base_test_case import BaseTestCase
-from tests.helpers.test_utils import create_sops_side_effect
+from tests.helpers.test_utils import (create_sops_side_effect,
+                                     pop_step_result_metrics)
 
 
 class TestInit(BaseTestCase):
@@ -47,6 +58,7 @@ class TestInit(BaseTestCase):
                 if expected_results:
                     with open(os.path.join(results_dir_path, "step-runner-results.yml"), 'r') as step_results_file:
                         results = yaml.safe_load(step_results_file.read())
+                        pop_step_result_metrics(results)
                         print(expected_results)
                         print(results)
                         self.assertEqual(results, expected_results)
@@ -92,6 +104,283 @@ class TestInit(BaseTestCase):
             }]
                             )
 
+    def test_results_format_json(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('step-runner-config.yaml', b"""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""")
+            config_file_path = os.path.join(temp_dir.path, 'step-runner-config.yaml')
+            results_dir_path = os.path.join(temp_dir.path, 'step-runner-results')
+
+            main([
+                '--step', 'foo',
+                '--config', config_file_path,
+                '--results-dir', results_dir_path,
+                '--results-format', 'json'
+            ])
+
+            self.assertTrue(os.path.exists(os.path.join(results_dir_path, 'step-runner-results.json')))
+            self.assertFalse(os.path.exists(os.path.join(results_dir_path, 'step-runner-results.yml')))
+
+    def test_results_format_invalid(self):
+        with self.assertRaisesRegex(SystemExit, '2'):
+            main(['--step', 'foo', '--results-format', 'xml'])
+
+    def _run_main_workflow_test(self, workflow, config, extra_argv=None, expected_exit_code=None):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('step-runner-config.yaml', bytes(config, 'utf-8'))
+            temp_dir.write('step-runner-workflow.yaml', bytes(workflow, 'utf-8'))
+            results_dir_path = os.path.join(temp_dir.path, 'step-runner-results')
+
+            argv = [
+                '--workflow', os.path.join(temp_dir.path, 'step-runner-workflow.yaml'),
+                '--config', os.path.join(temp_dir.path, 'step-runner-config.yaml'),
+                '--results-dir', results_dir_path
+            ] + (extra_argv or [])
+
+            if expected_exit_code is not None:
+                with self.assertRaisesRegex(SystemExit, f"{expected_exit_code}"):
+                    main(argv)
+                return None
+
+            main(argv)
+            with open(os.path.join(results_dir_path, 'step-runner-results.yml'), 'r') as results_file:
+                return yaml.safe_load(results_file)
+
+    def test_workflow(self):
+        results = self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    foo: []
+    bar: [foo]
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+    bar:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""",
+            extra_argv=['--workflow-max-workers', '2']
+        )
+        self.assertEqual(sorted(results['step-runner-results']), ['bar', 'foo'])
+
+    def test_trace_file(self):
+        with TempDirectory() as temp_dir:
+            trace_file_path = os.path.join(temp_dir.path, 'trace.json')
+            self._run_main_workflow_test(
+                workflow="""---
+step-runner-workflow:
+    foo: []
+    bar: [foo]
+""",
+                config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.PhasesStepImplementer'
+    bar:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""",
+                extra_argv=['--trace-file', trace_file_path]
+            )
+
+            with open(trace_file_path, 'r', encoding='utf-8') as trace_file:
+                trace_events = json.load(trace_file)['traceEvents']
+
+        spans = {
+            (event['cat'], event['name'])
+            for event in trace_events if event['ph'] == 'X'
+        }
+        self.assertTrue({
+            ('workflow', 'workflow'),
+            ('step', 'foo'),
+            ('step', 'bar'),
+            ('sub-step', 'foo - tests.helpers.sample_step_implementers.PhasesStepImplementer'),
+            ('sub-step', 'bar - tests.helpers.sample_step_implementers.FooStepImplementer'),
+            ('phase', 'resolve-config'),
+            ('phase', 'run-step'),
+            ('phase', 'write-results'),
+            ('phase', 'first-phase'),
+            ('phase', 'second-phase')
+        }.issubset(spans), spans)
+
+    def test_workflow_not_successful(self):
+        self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    foo: []
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FailStepImplementer'
+""",
+            expected_exit_code=200
+        )
+
+    def test_workflow_exception(self):
+        self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    foo: []
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.RaiseExceptionStepImplementer'
+""",
+            expected_exit_code=300
+        )
+
+    def test_workflow_invalid(self):
+        self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    bar: [foo]
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""",
+            expected_exit_code=103
+        )
+
+    def test_workflow_with_step_config(self):
+        self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    foo: []
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""",
+            extra_argv=['--step-config', 'foo=bar'],
+            expected_exit_code=2
+        )
+
+    def test_workflow_invalid_max_workers(self):
+        self._run_main_workflow_test(
+            workflow="""---
+step-runner-workflow:
+    foo: []
+""",
+            config="""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""",
+            extra_argv=['--workflow-max-workers', '0'],
+            expected_exit_code=2
+        )
+
+    def __run_main_step_runner_test(self, extra_argv):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('step-runner-config.yaml', b"""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""")
+
+            with patch('ploigos_step_runner.__main__.StepRunner') as step_runner_mock:
+                step_runner_mock.DEFAULT_WORKFLOW_MAX_WORKERS = 4
+                main([
+                    '--step', 'foo',
+                    '--config', os.path.join(temp_dir.path, 'step-runner-config.yaml')
+                ] + extra_argv)
+
+            return step_runner_mock.call_args.kwargs
+
+    def test_cache_dir_and_max_size(self):
+        step_runner_kwargs = self.__run_main_step_runner_test(
+            ['--cache-dir', 'my-cache', '--cache-max-size', '2']
+        )
+
+        step_result_cache = step_runner_kwargs['step_result_cache']
+        self.assertEqual(step_result_cache.cache_dir_path, 'my-cache')
+        self.assertEqual(step_result_cache.max_size, 2 * 1024 * 1024)
+
+    def test_cache_defaults(self):
+        step_runner_kwargs = self.__run_main_step_runner_test([])
+
+        step_result_cache = step_runner_kwargs['step_result_cache']
+        self.assertEqual(step_result_cache.cache_dir_path, 'step-runner-cache')
+        self.assertEqual(step_result_cache.max_size, 1024 * 1024 * 1024)
+
+    def test_no_cache(self):
+        step_runner_kwargs = self.__run_main_step_runner_test(['--no-cache'])
+
+        self.assertIsNone(step_runner_kwargs['step_result_cache'])
+
+    def __run_main_config_cache_test(self, extra_argv):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('step-runner-config.yaml', b"""---
+step-runner-config:
+    foo:
+        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+""")
+            config_cache_dir_path = os.path.join(temp_dir.path, 'config-cache')
+            extra_argv = [
+                config_cache_dir_path if arg == 'CONFIG_CACHE_DIR' else arg
+                for arg in extra_argv
+            ]
+
+            with patch('ploigos_step_runner.__main__.StepRunner') as step_runner_mock:
+                step_runner_mock.DEFAULT_WORKFLOW_MAX_WORKERS = 4
+                main([
+                    '--step', 'foo',
+                    '--config', os.path.join(temp_dir.path, 'step-runner-config.yaml')
+                ] + extra_argv)
+
+            config = step_runner_mock.call_args.kwargs['config']
+            self.assertEqual(list(config.step_configs), ['foo'])
+            return os.listdir(config_cache_dir_path) if os.path.isdir(config_cache_dir_path) else []
+
+    def test_config_cache(self):
+        self.assertEqual(
+            len(self.__run_main_config_cache_test(['--config-cache-dir', 'CONFIG_CACHE_DIR'])),
+            1
+        )
+
+    def test_config_cache_default_off(self):
+        with patch('ploigos_step_runner.__main__.ConfigSnapshotCache') as config_snapshot_cache_mock:
+            self.assertEqual(self.__run_main_config_cache_test([]), [])
+
+        config_snapshot_cache_mock.assert_not_called()
+
+    def test_buffer_output(self):
+        for extra_argv, expected_buffered in [([], False), (['--buffer-output'], True)]:
+            with patch.object(DecryptionUtils, 'register_obfuscation_stream') as register_mock:
+                self.__run_main_step_runner_test(extra_argv)
+
+            self.assertEqual(
+                [call.args[0].buffered for call in register_mock.call_args_list],
+                [expected_buffered, expected_buffered]
+            )
+
+    def test_config_dump(self):
+        self.assertEqual(self.__run_main_step_runner_test([])['config_dump'], 'full')
+        self.assertEqual(
+            self.__run_main_step_runner_test(['--config-dump', 'keys'])['config_dump'],
+            'keys'
+        )
+
+    def test_config_dump_invalid(self):
+        with redirect_stderr(io.StringIO()), self.assertRaisesRegex(SystemExit, '2'):
+            main(['--step', 'foo', '--config', 'config.yml', '--config-dump', 'values'])
+
+    def test_cache_max_size_invalid(self):
+        with self.assertRaisesRegex(SystemExit, '2'):
+            main(['--step', 'foo', '--config', 'config.yml', '--cache-max-size', '-1'])
+
+    def test_step_and_workflow(self):
+        with self.assertRaisesRegex(SystemExit, '2'):
+            main(['--step', 'foo', '--workflow', 'workflow.yml', '--config', 'config.yml'])
+
     def test_config_file_valid_yaml(self):
         self._run_main_test(['--step', 'foo'], None, [
             {
@@ -510,3 +799,278 @@ class TestInit(BaseTestCase):
             }]
                             )
 
+    def test_daemon_socket_not_listening(self):
+        stderr = io.StringIO()
+        with TempDirectory() as temp_dir, redirect_stderr(stderr):
+            self._run_main_test(
+                ['--step', 'foo', '--daemon-socket', os.path.join(temp_dir.path, 'psr.sock')],
+                None,
+                [
+                    {
+                        'name': 'step-runner-config.yaml',
+                        'contents': '''---
+                        step-runner-config:
+                            foo:
+                                implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+                        '''
+                    }
+                ]
+            )
+
+        self.assertIn('WARNING: psr daemon not listening on --daemon-socket', stderr.getvalue())
+
+    def test_daemon_socket(self):
+        with TempDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir.path, 'psr.sock')
+            step_runner_daemon = StepRunnerDaemon(socket_path, run)
+            ready_event = threading.Event()
+            serve_thread = threading.Thread(
+                target=step_runner_daemon.serve,
+                kwargs={'ready_event': ready_event}
+            )
+            serve_thread.start()
+            ready_event.wait()
+
+            try:
+                with patch.dict(os.environ, {'PSR_DAEMON_SOCKET': socket_path}):
+                    self._run_main_test(['--step', 'foo'], 200, [
+                        {
+                            'name': 'step-runner-config.yaml',
+                            'contents': '''---
+                            step-runner-config:
+                                foo:
+                                    implementer: 'tests.helpers.sample_step_implementers.FailStepImplementer'
+                            '''
+                        }
+                    ])
+                    with patch('ploigos_step_runner.__main__.run') as run_mock:
+                        self._run_main_test(['--step', 'foo'], None, [
+                            {
+                                'name': 'step-runner-config.yaml',
+                                'contents': '''---
+                                step-runner-config:
+                                    foo:
+                                        implementer: 'tests.helpers.sample_step_implementers.FooStepImplementer'
+                                '''
+                            }
+                        ])
+                        run_mock.assert_not_called()
+            finally:
+                step_runner_daemon.shutdown()
+                serve_thread.join()
+
+    def test_serve(self):
+        with TempDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir.path, 'psr.sock')
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                main(['serve', '--socket', socket_path, '--idle-timeout', '0'])
+
+            self.assertEqual(stdout.getvalue(), f"psr daemon listening on {socket_path}\n")
+            self.assertFalse(os.path.exists(socket_path))
+
+    def test_serve_socket_not_socket(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('psr.sock', b'not a socket')
+            with redirect_stdout(io.StringIO()), \
+                    self.assertRaisesRegex(SystemExit, '104'):
+                main(['serve', '--socket', os.path.join(temp_dir.path, 'psr.sock')])
+
+    def test_serve_no_socket(self):
+        with patch.dict(os.environ, clear=True), \
+                redirect_stderr(io.StringIO()), \
+                self.assertRaisesRegex(SystemExit, '2'):
+            main(['serve'])
+
+    def _run_logs_test(self, argv):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        with redirect_stdout(stdout):
+            main(['logs'] + argv)
+        stdout.flush()
+        return stdout.buffer.getvalue().decode('utf-8')
+
+    def test_logs(self):
+        with TempDirectory() as temp_dir:
+            work_dir_path = os.path.join(temp_dir.path, 'step-runner-working')
+            log = TextIOCompressedLog(
+                os.path.join(work_dir_path, 'unit-test', 'mvn_test_output.txt'),
+                segment_size=1024,
+                tail_size=10
+            )
+            with log:
+                log.write('mvn output\n' * 200)
+
+            self.assertEqual(
+                self._run_logs_test(['unit-test', '--work-dir', work_dir_path]),
+                'mvn output\n' * 200
+            )
+            self.assertEqual(
+                self._run_logs_test(['unit-test', '--work-dir', work_dir_path, '--tail']),
+                'vn output\n'
+            )
+
+    def test_logs_decompress(self):
+        with TempDirectory() as temp_dir:
+            work_dir_path = os.path.join(temp_dir.path, 'step-runner-working')
+            log_path = os.path.join(work_dir_path, 'unit-test', 'mvn_test_output.txt')
+            with TextIOCompressedLog(log_path, segment_size=1024, tail_size=10) as log:
+                log.write('mvn output\n' * 200)
+
+            self.assertEqual(
+                self._run_logs_test(['unit-test', '--work-dir', work_dir_path, '--decompress']),
+                f'{log_path}\n'
+            )
+            with open(log_path, encoding='utf-8') as log_file:
+                self.assertEqual(log_file.read(), 'mvn output\n' * 200)
+
+    def test_logs_multiple(self):
+        with TempDirectory() as temp_dir:
+            work_dir_path = os.path.join(temp_dir.path, 'step-runner-working')
+            step_dir_path = os.path.join(work_dir_path, 'container-image-static-compliance-scan')
+            for log_file_name in ['oscap-oval-out', 'oscap-xccdf-out']:
+                with TextIOCompressedLog(os.path.join(step_dir_path, log_file_name)) as log:
+                    log.write(f'{log_file_name} output\n')
+
+            self.assertEqual(
+                self._run_logs_test([
+                    'container-image-static-compliance-scan',
+                    '--work-dir', work_dir_path
+                ]),
+                f"==> {os.path.join(step_dir_path, 'oscap-oval-out')} <==\n"
+                'oscap-oval-out output\n'
+                f"==> {os.path.join(step_dir_path, 'oscap-xccdf-out')} <==\n"
+                'oscap-xccdf-out output\n'
+            )
+            self.assertEqual(
+                self._run_logs_test([
+                    'container-image-static-compliance-scan',
+                    '--work-dir', work_dir_path,
+                    '--log', 'oscap-xccdf-out'
+                ]),
+                'oscap-xccdf-out output\n'
+            )
+
+    def test_logs_not_found(self):
+        with TempDirectory() as temp_dir:
+            stderr = io.StringIO()
+            with redirect_stderr(stderr), \
+                    self.assertRaisesRegex(SystemExit, '105'):
+                main(['logs', 'unit-test', '--work-dir', temp_dir.path])
+
+            self.assertRegex(stderr.getvalue(), r'No logs found for step \(unit-test\)')
+
+
+class TestStartupTime(BaseTestCase):
+    """Budgets for how long psr takes to import the modules it needs, so that the cost
+    of starting psr for each step does not creep up.
+
+    Notes
+    -----
+    Budgets are generous for slow CI hosts, typical import times are a small fraction of them.
+    """
+
+    HELP_IMPORT_TIME_BUDGET_SECONDS = 0.25
+    NO_OP_STEP_IMPORT_TIME_BUDGET_SECONDS = 0.5
+
+    # modules that should only be imported by the steps, or file formats, that use them
+    LAZY_MODULES = ['sh', 'git', 'jinja2', 'xml.etree.ElementTree', 'urllib.request', 'yaml']
+
+    IMPORT_TIME_REGEX = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$')
+
+    @staticmethod
+    def _run_import_times(python_argv, cwd=None):
+        repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([os.path.join(repo_dir, 'src'), repo_dir])
+        env.pop('PSR_DAEMON_SOCKET', None)
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + python_argv,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=False
+        )
+
+        import_times = {}
+        for line in completed.stderr.splitlines():
+            match = TestStartupTime.IMPORT_TIME_REGEX.match(line)
+            if match:
+                import_times[match.group(2)] = int(match.group(1))
+
+        return completed.returncode, import_times
+
+    @staticmethod
+    def _run_psr_import_times(psr_argv, cwd):
+        # only count the modules psr imports on top of those imported by starting python
+        _, python_import_times = TestStartupTime._run_import_times(['-c', 'pass'], cwd)
+        returncode, import_times = TestStartupTime._run_import_times(
+            ['-m', 'ploigos_step_runner'] + psr_argv,
+            cwd
+        )
+
+        return returncode, {
+            module_name: import_time for module_name, import_time in import_times.items()
+            if module_name not in python_import_times
+        }
+
+    def _assert_import_time_budget(self, import_times, budget_seconds):
+        imported_lazy_modules = [
+            module for module in TestStartupTime.LAZY_MODULES if module in import_times
+        ]
+        self.assertEqual(imported_lazy_modules, [])
+
+        import_seconds = sum(import_times.values()) / 1000000
+        self.assertLess(
+            import_seconds,
+            budget_seconds,
+            f"psr import time ({import_seconds:.3f}s) over budget ({budget_seconds}s), " +
+            "slowest imports: " +
+            str(sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:10])
+        )
+
+    def test_help_import_time(self):
+        with TempDirectory() as temp_dir:
+            returncode, import_times = TestStartupTime._run_psr_import_times(
+                ['--help'],
+                temp_dir.path
+            )
+
+        self.assertEqual(returncode, 0)
+        self.assertIn('ploigos_step_runner.step_runner', import_times)
+        self._assert_import_time_budget(
+            import_times,
+            TestStartupTime.HELP_IMPORT_TIME_BUDGET_SECONDS
+        )
+
+    def test_no_op_step_import_time(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('psr.json', b'''{
+                "step-runner-config": {
+                    "foo": {
+                        "implementer": "tests.helpers.sample_step_implementers.FooStepImplementer"
+                    }
+                }
+            }''')
+            returncode, import_times = TestStartupTime._run_psr_import_times(
+                ['--step', 'foo', '--config', 'psr.json', '--results-format', 'jsonl'],
+                temp_dir.path
+            )
+
+        self.assertEqual(returncode, 0)
+        self.assertIn('tests.helpers.sample_step_implementers', import_times)
+        self._assert_import_time_budget(
+            import_times,
+            TestStartupTime.NO_OP_STEP_IMPORT_TIME_BUDGET_SECONDS
+        )
+
+    def test_step_implementer_package_imports_lazily(self):
+        returncode, import_times = TestStartupTime._run_import_times(
+            ['-c', 'from ploigos_step_runner.step_implementers.generate_metadata import Npm']
+        )
+
+        self.assertEqual(returncode, 0)
+        self.assertIn('ploigos_step_runner.step_implementers.generate_metadata.npm', import_times)
+        self.assertNotIn('ploigos_step_runner.step_implementers.generate_metadata.git', import_times)
+        self.assertNotIn('git', import_times)
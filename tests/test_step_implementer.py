@@ -2,19 +2,25 @@
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
 import os
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO
+from unittest.mock import PropertyMock, patch
 
 from testfixtures import TempDirectory
-from ploigos_step_runner import StepResult
-from ploigos_step_runner.config import Config
+from ploigos_step_runner import StepImplementer, StepResult
+from ploigos_step_runner.config import Config, ConfigValue, StepConfig
 from ploigos_step_runner.exceptions import StepRunnerException
+from ploigos_step_runner.step_result_cache import StepResultCache
 from ploigos_step_runner.step_runner import StepRunner
+from ploigos_step_runner.utils.compressed_log import TextIOCompressedLog, copy_log, find_logs
 from ploigos_step_runner.workflow_result import WorkflowResult
 
 from tests.helpers.base_step_implementer_test_case import \
     BaseStepImplementerTestCase
 from tests.helpers.sample_step_implementers import (
-    FailStepImplementer, FooStepImplementer,
+    CountRunsStepImplementer, FailStepImplementer, FooStepImplementer,
     WriteConfigAsResultsStepImplementer)
+from tests.helpers.test_utils import pop_step_result_metrics
 
 
 class TestStepImplementer(BaseStepImplementerTestCase):
@@ -33,13 +39,16 @@ class TestStepImplementer(BaseStepImplementerTestCase):
             environment=environment
         )
 
-        pickle = f'{working_dir_path}/step-runner-results.pkl'
-        workflow_results = WorkflowResult.load_from_pickle_file(pickle)
+        journal = f'{working_dir_path}/step-runner-results.journal'
+        workflow_results = WorkflowResult.load_from_journal_file(journal)
 
         step_result = workflow_results.get_step_result(
             step_name=step
         )
-        self.assertEqual(expected_step_results, step_result.get_step_result_dict())
+        step_result_dict = step_result.get_step_result_dict()
+        for metrics in pop_step_result_metrics(step_result_dict):
+            self.assertIn('resolve-config-seconds', metrics)
+        self.assertEqual(expected_step_results, step_result_dict)
 
     def test_one_step_writes_to_empty_results_file(self):
         config1 = {
@@ -115,6 +124,296 @@ class TestStepImplementer(BaseStepImplementerTestCase):
                     test_dir
                 )
 
+    def test_one_step_existing_results_pickle_migrated_to_journal(self):
+        config = {
+            'step-runner-config': {
+                'write-config-as-results': {
+                    'implementer': 'tests.helpers.sample_step_implementers.'
+                                   'WriteConfigAsResultsStepImplementer',
+                    'config': {
+                        'required-config-key': 'required'
+                    }
+                }
+            }
+        }
+
+        with TempDirectory() as test_dir:
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            previous_step_result = StepResult('previous-step', 'sub', 'implementer')
+            previous_step_result.add_artifact('previous-artifact', 'previous-value')
+            previous_workflow_result = WorkflowResult()
+            previous_workflow_result.add_step_result(previous_step_result)
+            previous_workflow_result.write_to_pickle_file(
+                os.path.join(working_dir_path, 'step-runner-results.pkl')
+            )
+
+            self._run_step_implementer_test(
+                config,
+                'write-config-as-results',
+                {
+                    'write-config-as-results': {
+                        'tests.helpers.sample_step_implementers.'
+                        'WriteConfigAsResultsStepImplementer': {
+                            'sub-step-implementer-name':
+                                'tests.helpers.sample_step_implementers.'
+                                'WriteConfigAsResultsStepImplementer',
+                            'success': True,
+                            'message': '',
+                            'artifacts': {
+                                'required-config-key':
+                                    {'description': '', 'value': 'required'}
+                            }
+                        }
+                    }
+                },
+                test_dir
+            )
+
+            journal_workflow_result = WorkflowResult.load_from_journal_file(
+                os.path.join(working_dir_path, 'step-runner-results.journal')
+            )
+            self.assertEqual(
+                journal_workflow_result.get_artifact_value('previous-artifact'),
+                'previous-value'
+            )
+
+    def test_one_step_results_pickle_written_when_journal_created(self):
+        config = {
+            'step-runner-config': {
+                'write-config-as-results': {
+                    'implementer': 'tests.helpers.sample_step_implementers.'
+                                   'WriteConfigAsResultsStepImplementer',
+                    'config': {
+                        'required-config-key': 'required'
+                    }
+                }
+            }
+        }
+
+        with TempDirectory() as test_dir:
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            self._run_step_implementer_test(
+                config,
+                'write-config-as-results',
+                {
+                    'write-config-as-results': {
+                        'tests.helpers.sample_step_implementers.'
+                        'WriteConfigAsResultsStepImplementer': {
+                            'sub-step-implementer-name':
+                                'tests.helpers.sample_step_implementers.'
+                                'WriteConfigAsResultsStepImplementer',
+                            'success': True,
+                            'message': '',
+                            'artifacts': {
+                                'required-config-key':
+                                    {'description': '', 'value': 'required'}
+                            }
+                        }
+                    }
+                },
+                test_dir
+            )
+
+            pickle_workflow_result = WorkflowResult.load_from_pickle_file(
+                os.path.join(working_dir_path, 'step-runner-results.pkl')
+            )
+            self.assertEqual(
+                pickle_workflow_result.get_artifact_value('required-config-key'),
+                'required'
+            )
+
+    def test_load_workflow_result_journal_preferred_to_newer_pickle(self):
+        with TempDirectory() as test_dir:
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            journal_file_path, pickle_file_path = \
+                StepImplementer.get_workflow_result_file_paths(
+                    working_dir_path,
+                    'step-runner-results'
+                )
+
+            workflow_result = WorkflowResult()
+            workflow_result.add_step_result(StepResult('compacted-step', 'sub', 'implementer'))
+            workflow_result.write_to_journal_file(journal_file_path, pickle_file_path)
+            workflow_result.add_step_result(StepResult('journal-step', 'sub', 'implementer'))
+            workflow_result.write_to_journal_file(journal_file_path, pickle_file_path)
+
+            # pickle file written after the journal file, but without the journaled step
+            pickle_workflow_result = WorkflowResult()
+            pickle_workflow_result.add_step_result(
+                StepResult('compacted-step', 'sub', 'implementer')
+            )
+            pickle_workflow_result.write_to_pickle_file(pickle_file_path)
+            journal_stat = os.stat(journal_file_path)
+            os.utime(
+                journal_file_path,
+                ns=(journal_stat.st_atime_ns, journal_stat.st_mtime_ns - 1000000000)
+            )
+
+            workflow_result = StepImplementer.load_workflow_result(
+                working_dir_path,
+                'step-runner-results'
+            )
+            self.assertIsNotNone(workflow_result.get_step_result('compacted-step'))
+            self.assertIsNotNone(workflow_result.get_step_result('journal-step'))
+
+    def test_load_workflow_result_invalid_journal(self):
+        with TempDirectory() as test_dir:
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            journal_file_path, pickle_file_path = \
+                StepImplementer.get_workflow_result_file_paths(
+                    working_dir_path,
+                    'step-runner-results'
+                )
+
+            pickle_workflow_result = WorkflowResult()
+            pickle_workflow_result.add_step_result(StepResult('pickle-step', 'sub', 'implementer'))
+            pickle_workflow_result.write_to_pickle_file(pickle_file_path)
+            with open(journal_file_path, 'wb') as journal_file:
+                journal_file.write(b'not a journal')
+
+            workflow_result = StepImplementer.load_workflow_result(
+                working_dir_path,
+                'step-runner-results'
+            )
+            self.assertIsNotNone(workflow_result.get_step_result('pickle-step'))
+
+    def test_given_workflow_result_used_instead_of_loading(self):
+        with TempDirectory() as test_dir:
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            previous_step_result = StepResult('previous-step', 'sub', 'implementer')
+            previous_step_result.add_artifact('previous-artifact', 'previous-value')
+            workflow_result = WorkflowResult()
+            workflow_result.add_step_result(previous_step_result)
+
+            step_implementer = self.create_given_step_implementer(
+                step_implementer=FooStepImplementer,
+                step_name='foo',
+                implementer='FooStepImplementer',
+                results_dir_path=os.path.join(test_dir.path, 'step-runner-results'),
+                results_file_name='step-runner-results.yml',
+                work_dir_path=working_dir_path,
+                workflow_result=workflow_result
+            )
+
+            self.assertIs(step_implementer.workflow_result, workflow_result)
+            self.assertEqual(step_implementer.get_value('previous-artifact'), 'previous-value')
+
+            step_implementer.run_step()
+
+            self.assertEqual(len(workflow_result.workflow_list), 2)
+            self.assertEqual(
+                len(StepImplementer.load_workflow_result(
+                    working_dir_path,
+                    'step-runner-results.yml'
+                ).workflow_list),
+                2
+            )
+
+    def test_run_step_records_metrics(self):
+        with TempDirectory() as test_dir:
+            step_implementer = self.create_given_step_implementer(
+                step_implementer=FooStepImplementer,
+                step_name='foo',
+                implementer='FooStepImplementer',
+                results_dir_path=os.path.join(test_dir.path, 'step-runner-results'),
+                results_file_name='step-runner-results.yml',
+                work_dir_path=os.path.join(test_dir.path, 'step-runner-working')
+            )
+
+            with patch('sys.stdout', new_callable=StringIO) as stdout:
+                step_implementer.run_step()
+
+            metrics = step_implementer.workflow_result.get_step_result(
+                step_name='foo'
+            ).metrics
+            self.assertEqual(
+                sorted(metrics),
+                ['commands', 'peak-rss-bytes', 'resolve-config-seconds', 'run-step-seconds']
+            )
+            self.assertEqual(metrics['commands'], [])
+            self.assertRegex(
+                stdout.getvalue(),
+                r"Metrics\n\s+'resolve-config \d+\.\d{3}s, run-step \d+\.\d{3}s,"
+                r" write-results \d+\.\d{3}s, peak RSS \d+\.\d MB'\n"
+            )
+
+    def __run_config_dump_step(self, test_dir, config_dump=None, step_option=None):
+        step_config = {
+            'sub-steps': [
+                {
+                    'implementer': 'tests.helpers.sample_step_implementers.FooStepImplementer',
+                    'config': {
+                        'password': 'secret-value'
+                    }
+                }
+            ]
+        }
+        if step_option is not None:
+            step_config['config-dump'] = step_option
+        config = Config({
+            'step-runner-config': {
+                'global-defaults': {
+                    'service-name': 'service-value'
+                },
+                'foo': step_config
+            }
+        })
+        step_implementer = FooStepImplementer(
+            results_dir_path=os.path.join(test_dir.path, 'step-runner-results'),
+            results_file_name='step-runner-results.yml',
+            work_dir_path=os.path.join(test_dir.path, 'step-runner-working'),
+            config=config.get_step_config('foo').sub_steps[0],
+            **({} if config_dump is None else {'config_dump': config_dump})
+        )
+
+        with patch('sys.stdout', new_callable=StringIO) as stdout, \
+                patch.object(ConfigValue, 'value', new_callable=PropertyMock) as value_mock:
+            value_mock.return_value = 'read-value'
+            self.assertTrue(step_implementer.run_step())
+
+        return stdout.getvalue(), value_mock.call_count
+
+    def test_run_step_config_dump_full(self):
+        with TempDirectory() as test_dir:
+            stdout, value_reads = self.__run_config_dump_step(test_dir)
+
+            self.assertIn('Configuration - foo', stdout)
+            self.assertRegex(stdout, r"Step Configuration\n\s+\{'password': 'read-value'\}")
+            self.assertRegex(
+                stdout,
+                r"Runtime Step Configuration\n"
+                r"\s+\{'password': 'read-value', 'service-name': 'read-value'\}"
+            )
+            self.assertGreater(value_reads, 0)
+
+    def test_run_step_config_dump_keys(self):
+        with TempDirectory() as test_dir:
+            stdout, value_reads = self.__run_config_dump_step(
+                test_dir,
+                config_dump=StepConfig.CONFIG_DUMP_KEYS
+            )
+
+            self.assertIn('Configuration - foo', stdout)
+            self.assertRegex(stdout, r"Step Configuration\n\s+\['password'\]")
+            self.assertRegex(
+                stdout,
+                r"Runtime Step Configuration\n\s+\['password', 'service-name'\]"
+            )
+            self.assertNotIn('read-value', stdout)
+            self.assertEqual(value_reads, 0)
+
+    def test_run_step_config_dump_none_step_option(self):
+        with TempDirectory() as test_dir:
+            stdout, value_reads = self.__run_config_dump_step(
+                test_dir,
+                config_dump=StepConfig.CONFIG_DUMP_FULL,
+                step_option=StepConfig.CONFIG_DUMP_NONE
+            )
+
+            self.assertNotIn('Configuration - foo', stdout)
+            self.assertIn('Step Start - foo', stdout)
+            self.assertEqual(value_reads, 0)
+
     def test_boolean_false_config_variable(self):
         config = {
             'step-runner-config': {
@@ -621,6 +920,114 @@ class TestStepImplementer(BaseStepImplementerTestCase):
             with open(working_file_path, 'r') as working_file:
                 self.assertEqual(working_file.read(), '')
 
+    def test_open_output_log(self):
+        config = Config({
+            'step-runner-config': {
+                'foo': {
+                    'implementer': 'tests.helpers.sample_step_implementers.FooStepImplementer',
+                    'config': {
+                        'output-log-tail-size': 1
+                    }
+                }
+            }
+        })
+        step_config = config.get_step_config('foo')
+        sub_step = step_config.get_sub_step(
+            'tests.helpers.sample_step_implementers.FooStepImplementer')
+
+        with TempDirectory() as test_dir:
+            results_dir_path = os.path.join(test_dir.path, 'step-runner-results')
+            working_dir_path = os.path.join(test_dir.path, 'step-runner-working')
+            step = FooStepImplementer(
+                results_dir_path=results_dir_path,
+                results_file_name='step-runner-results.yml',
+                work_dir_path=working_dir_path,
+                config=sub_step
+            )
+
+            output_log_path = step.write_working_file('output.txt')
+            with step.open_output_log(output_log_path) as output_log:
+                output_log.write('a' * 1024 + 'b' * 1024)
+
+            with open(f'{output_log_path}.tail', 'r') as working_file:
+                self.assertEqual(working_file.read(), 'b' * 1024)
+            self.assertEqual(find_logs(working_dir_path), [output_log_path])
+
+    def test_output_log_tee(self):
+        config = Config({
+            'step-runner-config': {
+                'foo': {
+                    'implementer': 'tests.helpers.sample_step_implementers.FooStepImplementer'
+                }
+            }
+        })
+        step_config = config.get_step_config('foo')
+        sub_step = step_config.get_sub_step(
+            'tests.helpers.sample_step_implementers.FooStepImplementer')
+
+        with TempDirectory() as test_dir:
+            step = FooStepImplementer(
+                results_dir_path=os.path.join(test_dir.path, 'step-runner-results'),
+                results_file_name='step-runner-results.yml',
+                work_dir_path=os.path.join(test_dir.path, 'step-runner-working'),
+                config=sub_step
+            )
+            step_result = StepResult('foo', 'Foo', 'FooStepImplementer')
+            output_log_path = step.write_working_file('output.txt')
+
+            stdout = StringIO()
+            with redirect_stdout(stdout), \
+                    self.assertRaisesRegex(StepRunnerException, 'foo failed'):
+                with step.output_log_tee(
+                    step_result=step_result,
+                    name='foo-output',
+                    log_path=output_log_path,
+                    description='Output of foo.'
+                ) as output_tee:
+                    os.write(output_tee.out_fd, b'foo output\n')
+                    raise StepRunnerException('foo failed')
+
+            self.assertEqual(stdout.getvalue(), 'foo output\n')
+            log = BytesIO()
+            copy_log(output_log_path, log)
+            self.assertEqual(log.getvalue(), b'foo output\n')
+            self.assertEqual(
+                step_result.get_artifact('foo-output'),
+                {'description': 'Output of foo.', 'value': output_log_path}
+            )
+            self.assertEqual(
+                step_result.get_artifact_value('foo-output-tail'),
+                f'{output_log_path}.tail'
+            )
+
+    def test_add_output_log_artifacts(self):
+        with TempDirectory() as test_dir:
+            output_log_path = os.path.join(test_dir.path, 'output.txt')
+            with TextIOCompressedLog(output_log_path, segment_size=1024, tail_size=1) as output_log:
+                output_log.write('a' * 1024 + 'b' * 1024)
+
+            step_result = StepResult('foo', 'Foo', 'FooStepImplementer')
+            StepImplementer.add_output_log_artifacts(
+                step_result=step_result,
+                name='foo-output',
+                log_path=output_log_path,
+                description='Output of foo.'
+            )
+
+            self.assertEqual(
+                step_result.get_artifact('foo-output'),
+                {'description': 'Output of foo.', 'value': output_log_path}
+            )
+            self.assertEqual(
+                step_result.get_artifact('foo-output-tail'),
+                {
+                    'description': "End of the log 'foo-output', uncompressed.",
+                    'value': f'{output_log_path}.tail'
+                }
+            )
+            with open(f'{output_log_path}.tail', 'r') as tail_file:
+                self.assertEqual(tail_file.read(), 'b')
+
     def test_get_config_value(self):
         step_config = {
             'test': 'hello world'
@@ -837,6 +1244,11 @@ class TestStepImplementer(BaseStepImplementerTestCase):
                 step._StepImplementer__workflow_result_pickle_file_path
             )
 
+            self.assertEqual(
+                f'{working_dir_path}/myfile.journal',
+                step._StepImplementer__workflow_result_journal_file_path
+            )
+
     def test_get_value_no_env(self):
         step_config = {
             'test': 'hello world'
@@ -949,3 +1361,133 @@ class TestStepImplementer(BaseStepImplementerTestCase):
                 step.get_value('deployed-host-urls'),
                 'https://awesome-app.test.ploigos.xyz'
             )
+
+
+class TestStepImplementerStepResultCache(BaseStepImplementerTestCase):
+    def setUp(self):
+        super().setUp()
+        CountRunsStepImplementer.runs = 0
+
+    @staticmethod
+    def __create_config(cache=True, cache_source_paths=None, config_value='a'):
+        step_config = {
+            'sub-steps': [
+                {
+                    'implementer': 'tests.helpers.sample_step_implementers.'
+                                   'CountRunsStepImplementer',
+                    'config': {
+                        'config-value': config_value
+                    }
+                }
+            ]
+        }
+        if cache:
+            step_config['cache'] = True
+        if cache_source_paths is not None:
+            step_config['cache-source-paths'] = cache_source_paths
+
+        return Config({
+            'step-runner-config': {
+                'count-runs': step_config
+            }
+        })
+
+    @staticmethod
+    def __run_step(test_dir, config, input_value='input-1', step_result_cache=True):
+        previous_step_result = StepResult('previous-step', 'sub', 'implementer')
+        previous_step_result.add_artifact('input', input_value)
+        workflow_result = WorkflowResult()
+        workflow_result.add_step_result(previous_step_result)
+
+        if step_result_cache:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'step-runner-cache'))
+        else:
+            step_result_cache = None
+
+        step_runner = StepRunner(
+            config=config,
+            results_dir_path=os.path.join(test_dir.path, 'step-runner-results'),
+            work_dir_path=os.path.join(test_dir.path, 'step-runner-working'),
+            step_result_cache=step_result_cache
+        )
+        success = step_runner.run_step('count-runs', workflow_result=workflow_result)
+
+        return success, workflow_result
+
+    def test_unchanged_inputs_restores_cached_result_and_working_files(self):
+        with TempDirectory() as test_dir:
+            success, _ = self.__run_step(test_dir, self.__create_config())
+            self.assertTrue(success)
+            self.assertEqual(CountRunsStepImplementer.runs, 1)
+
+            output_file_path = os.path.join(
+                test_dir.path, 'step-runner-working', 'count-runs', 'output.txt'
+            )
+            os.remove(output_file_path)
+
+            success, workflow_result = self.__run_step(test_dir, self.__create_config())
+            self.assertTrue(success)
+            self.assertEqual(CountRunsStepImplementer.runs, 1)
+            self.assertEqual(
+                workflow_result.get_artifact_value('output', step_name='count-runs'),
+                'input-1-output'
+            )
+            with open(output_file_path, 'r', encoding='utf-8') as output_file:
+                self.assertEqual(output_file.read(), 'input-1')
+
+    def test_changed_previous_step_result_artifact_runs_step(self):
+        with TempDirectory() as test_dir:
+            self.__run_step(test_dir, self.__create_config())
+            success, workflow_result = self.__run_step(
+                test_dir,
+                self.__create_config(),
+                input_value='input-2'
+            )
+
+            self.assertTrue(success)
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
+            self.assertEqual(
+                workflow_result.get_artifact_value('output', step_name='count-runs'),
+                'input-2-output'
+            )
+
+            # both results are cached
+            self.__run_step(test_dir, self.__create_config())
+            self.__run_step(test_dir, self.__create_config(), input_value='input-2')
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
+
+    def test_changed_config_runs_step(self):
+        with TempDirectory() as test_dir:
+            self.__run_step(test_dir, self.__create_config())
+            self.__run_step(test_dir, self.__create_config(config_value='b'))
+
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
+
+    def test_changed_cache_source_paths_runs_step(self):
+        with TempDirectory() as test_dir:
+            source_dir_path = os.path.join(test_dir.path, 'src')
+            test_dir.write('src/main.py', b'version 1')
+            config = self.__create_config(cache_source_paths=[source_dir_path])
+
+            self.__run_step(test_dir, config)
+            self.__run_step(test_dir, config)
+            self.assertEqual(CountRunsStepImplementer.runs, 1)
+
+            test_dir.write('src/main.py', b'version 2')
+            self.__run_step(test_dir, config)
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
+
+    def test_cache_step_option_not_set_runs_step(self):
+        with TempDirectory() as test_dir:
+            self.__run_step(test_dir, self.__create_config(cache=False))
+            self.__run_step(test_dir, self.__create_config(cache=False))
+
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
+            self.assertFalse(os.path.exists(os.path.join(test_dir.path, 'step-runner-cache')))
+
+    def test_no_step_result_cache_runs_step(self):
+        with TempDirectory() as test_dir:
+            self.__run_step(test_dir, self.__create_config(), step_result_cache=False)
+            self.__run_step(test_dir, self.__create_config(), step_result_cache=False)
+
+            self.assertEqual(CountRunsStepImplementer.runs, 2)
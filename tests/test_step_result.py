@@ -154,3 +154,25 @@ class TestStepResultTest(BaseTestCase):
         step_result.add_artifact('artifact1', 'value1', 'description1')
         print(step_result.get_step_result_yaml())
         self.assertEqual(step_result.get_step_result_yaml(), step_result_expected)
+
+    def test_metrics(self):
+        step_result = StepResult('step1', 'sub1', 'implementer1')
+        self.assertIsNone(step_result.metrics)
+        self.assertNotIn('metrics', step_result.get_sub_step_result())
+
+        step_result.metrics = {'run-step-seconds': 1.5, 'commands': []}
+
+        self.assertEqual(
+            step_result.get_step_result_dict(),
+            {
+                'step1': {
+                    'sub1': {
+                        'sub-step-implementer-name': 'implementer1',
+                        'success': True,
+                        'message': '',
+                        'artifacts': {},
+                        'metrics': {'run-step-seconds': 1.5, 'commands': []}
+                    }
+                }
+            }
+        )
@@ -0,0 +1,179 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+import os
+import stat
+from unittest.mock import patch
+
+from testfixtures import TempDirectory
+
+from ploigos_step_runner.step_result import StepResult
+from ploigos_step_runner.step_result_cache import StepResultCache
+from tests.helpers.base_test_case import BaseTestCase
+
+
+class TestStepResultCache(BaseTestCase):
+    @staticmethod
+    def __create_step_result(value):
+        step_result = StepResult('step1', 'sub1', 'implementer1')
+        step_result.add_artifact('output', value)
+        return step_result
+
+    def __put(self, step_result_cache, test_dir, inputs_key, read_values, value):
+        work_dir_path = os.path.join(test_dir.path, 'working')
+        os.makedirs(work_dir_path, exist_ok=True)
+        with open(os.path.join(work_dir_path, 'output.txt'), 'w', encoding='utf-8') as file:
+            file.write(value)
+
+        step_result_cache.put(
+            inputs_key=inputs_key,
+            read_keys=list(read_values.keys()),
+            get_read_value=read_values.get,
+            step_result=self.__create_step_result(value),
+            work_dir_path=work_dir_path
+        )
+
+    def test_get_empty_cache(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+
+            self.assertIsNone(step_result_cache.get('inputs', {}.get, test_dir.path))
+
+    def test_put_and_get(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {('input',): 'a'}, 'value-a')
+
+            restore_dir_path = os.path.join(test_dir.path, 'restored')
+            step_result = step_result_cache.get('inputs', {('input',): 'a'}.get, restore_dir_path)
+
+            self.assertEqual(step_result.get_artifact_value('output'), 'value-a')
+            with open(os.path.join(restore_dir_path, 'output.txt'), encoding='utf-8') as file:
+                self.assertEqual(file.read(), 'value-a')
+
+    def test_get_changed_read_value(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {('input',): 'a'}, 'value-a')
+            self.__put(step_result_cache, test_dir, 'inputs', {('input',): 'b'}, 'value-b')
+
+            self.assertIsNone(
+                step_result_cache.get('inputs', {('input',): 'c'}.get, test_dir.path)
+            )
+            self.assertEqual(
+                step_result_cache.get(
+                    'inputs', {('input',): 'b'}.get, test_dir.path
+                ).get_artifact_value('output'),
+                'value-b'
+            )
+
+    def test_get_changed_inputs_key(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {}, 'value-a')
+
+            self.assertIsNone(step_result_cache.get('other-inputs', {}.get, test_dir.path))
+
+    def test_evict_least_recently_used(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs-1', {}, 'value-1')
+            self.__put(step_result_cache, test_dir, 'inputs-2', {}, 'value-2')
+            os.utime(os.path.join(test_dir.path, 'cache', 'inputs-1'), (0, 0))
+            for result_key in os.listdir(os.path.join(test_dir.path, 'cache', 'inputs-1')):
+                os.utime(os.path.join(test_dir.path, 'cache', 'inputs-1', result_key), (0, 0))
+
+            # only room for one cached result
+            cache_size = sum(
+                os.path.getsize(os.path.join(dir_path, file_name))
+                for dir_path, _, file_names in os.walk(os.path.join(test_dir.path, 'cache'))
+                for file_name in file_names
+            )
+            step_result_cache = StepResultCache(
+                os.path.join(test_dir.path, 'cache'),
+                max_size=cache_size - 1
+            )
+            step_result_cache.evict()
+
+            self.assertIsNone(step_result_cache.get('inputs-1', {}.get, test_dir.path))
+            self.assertFalse(os.path.exists(os.path.join(test_dir.path, 'cache', 'inputs-1')))
+            self.assertIsNotNone(step_result_cache.get('inputs-2', {}.get, test_dir.path))
+
+    def test_max_size_zero_keeps_nothing(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'), max_size=0)
+            self.__put(step_result_cache, test_dir, 'inputs', {}, 'value-a')
+
+            self.assertIsNone(step_result_cache.get('inputs', {}.get, test_dir.path))
+            self.assertEqual(os.listdir(os.path.join(test_dir.path, 'cache')), [])
+
+    def test_cache_dir_owner_only(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {}, 'value-a')
+
+            cache_dir_mode = os.stat(os.path.join(test_dir.path, 'cache')).st_mode
+            self.assertEqual(stat.S_IMODE(cache_dir_mode) & 0o077, 0)
+
+    def test_cache_dir_writable_by_others_not_used(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {}, 'value-a')
+            cache_dir_path = os.path.join(test_dir.path, 'cache')
+            os.chmod(cache_dir_path, 0o777)
+
+            with patch('pickle.load') as pickle_load_mock:
+                step_result = step_result_cache.get('inputs', {}.get, test_dir.path)
+                self.__put(step_result_cache, test_dir, 'other-inputs', {}, 'value-b')
+
+            pickle_load_mock.assert_not_called()
+            self.assertIsNone(step_result)
+            self.assertEqual(os.listdir(cache_dir_path), ['inputs'])
+
+    def test_cache_dir_not_owned_not_used(self):
+        with TempDirectory() as test_dir:
+            step_result_cache = StepResultCache(os.path.join(test_dir.path, 'cache'))
+            self.__put(step_result_cache, test_dir, 'inputs', {}, 'value-a')
+            cache_dir_path = os.path.join(test_dir.path, 'cache')
+
+            with patch('os.getuid', return_value=os.getuid() + 1), \
+                    patch('pickle.load') as pickle_load_mock:
+                step_result = step_result_cache.get('inputs', {}.get, test_dir.path)
+                self.__put(step_result_cache, test_dir, 'other-inputs', {}, 'value-b')
+
+            pickle_load_mock.assert_not_called()
+            self.assertIsNone(step_result)
+            self.assertEqual(os.listdir(cache_dir_path), ['inputs'])
+
+    def test_invalid_max_size(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Step result cache max size \(-1\) must be a non negative int."
+        ):
+            StepResultCache('cache', max_size=-1)
+
+    def test_get_key(self):
+        self.assertEqual(
+            StepResultCache.get_key({'a': 1, 'b': [1, 2]}),
+            StepResultCache.get_key({'b': [1, 2], 'a': 1})
+        )
+        self.assertNotEqual(
+            StepResultCache.get_key({'a': 1}),
+            StepResultCache.get_key({'a': 2})
+        )
+
+    def test_get_paths_key(self):
+        with TempDirectory() as test_dir:
+            test_dir.write('src/a.py', b'a')
+            src_dir_path = os.path.join(test_dir.path, 'src')
+            key_a = StepResultCache.get_paths_key([src_dir_path])
+
+            self.assertEqual(StepResultCache.get_paths_key([src_dir_path]), key_a)
+
+            test_dir.write('src/a.py', b'changed')
+            self.assertNotEqual(StepResultCache.get_paths_key([src_dir_path]), key_a)
+
+            self.assertNotEqual(
+                StepResultCache.get_paths_key([os.path.join(test_dir.path, 'missing')]),
+                StepResultCache.get_paths_key([])
+            )
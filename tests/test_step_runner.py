@@ -3,13 +3,21 @@
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
 
+import io
+import json
+import os
 import re
+import threading
+from contextlib import redirect_stdout
 
+import yaml
 from testfixtures import TempDirectory
-from ploigos_step_runner import StepRunner, StepRunnerException
+from ploigos_step_runner import StepImplementer, StepRunner, StepRunnerException
 from ploigos_step_runner.config import Config
 
 from tests.helpers.base_test_case import BaseTestCase
+from tests.helpers.sample_step_implementers import (ConcurrentStepImplementer,
+                                               ShOutputStepImplementer)
 
 
 class TestFactory(BaseTestCase):
@@ -106,6 +114,57 @@ class TestFactory(BaseTestCase):
             factory = StepRunner(config, temp_dir.path)
             factory.run_step('foo')
 
+    def test_init_results_file_name_default_yaml(self):
+        step_runner = StepRunner({'step-runner-config': {}})
+        self.assertEqual(step_runner.results_file_name, 'step-runner-results.yml')
+
+    def test_init_results_file_name_default_from_results_format(self):
+        step_runner = StepRunner({'step-runner-config': {}}, results_format='json')
+        self.assertEqual(step_runner.results_file_name, 'step-runner-results.json')
+
+    def test_run_step_results_format_json(self):
+        config = {
+            'step-runner-config': {
+                'foo': [
+                    {
+                        'implementer': 'tests.helpers.sample_step_implementers.FooStepImplementer'
+                    }
+                ]
+            }
+        }
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(config, temp_dir.path, results_format='json')
+            step_runner.run_step('foo')
+
+            with open(os.path.join(temp_dir.path, 'step-runner-results.json'), 'r') as results_file:
+                results = json.load(results_file)
+
+            self.assertIn('foo', results['step-runner-results'])
+
+    def test_run_step_config_dump_none(self):
+        config = {
+            'step-runner-config': {
+                'foo': [
+                    {
+                        'implementer': 'tests.helpers.sample_step_implementers.FooStepImplementer'
+                    }
+                ]
+            }
+        }
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                temp_dir.path,
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working'),
+                config_dump='none'
+            )
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertTrue(step_runner.run_step('foo'))
+
+            self.assertIn('Step Start - foo', stdout.getvalue())
+            self.assertNotIn('Configuration - foo', stdout.getvalue())
+
     def test_init_with_config_object(self):
         config = {
             Config.CONFIG_KEY: {
@@ -174,3 +233,583 @@ class TestFactory(BaseTestCase):
                 'tests.helpers.sample_step_implementers.FooStepImplementer'
             )
         )
+
+
+class TestStepRunnerParseWorkflow(BaseTestCase):
+    def test_dict(self):
+        self.assertEqual(
+            StepRunner.parse_workflow({
+                'generate-metadata': [],
+                'static-code-analysis': ['generate-metadata'],
+                'unit-test': 'generate-metadata',
+                'package': ['static-code-analysis', 'unit-test'],
+                'tag-source': None
+            }),
+            {
+                'generate-metadata': [],
+                'static-code-analysis': ['generate-metadata'],
+                'unit-test': ['generate-metadata'],
+                'package': ['static-code-analysis', 'unit-test'],
+                'tag-source': []
+            }
+        )
+
+    def test_list(self):
+        self.assertEqual(
+            StepRunner.parse_workflow(['generate-metadata', 'unit-test', 'package']),
+            {
+                'generate-metadata': [],
+                'unit-test': ['generate-metadata'],
+                'package': ['unit-test']
+            }
+        )
+
+    def test_file(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('workflow.yml', b'''---
+step-runner-workflow:
+  generate-metadata: []
+  unit-test: [generate-metadata]
+''')
+            self.assertEqual(
+                StepRunner.parse_workflow(os.path.join(temp_dir.path, 'workflow.yml')),
+                {
+                    'generate-metadata': [],
+                    'unit-test': ['generate-metadata']
+                }
+            )
+
+    def test_file_missing_workflow_key(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('workflow.yml', b'''---
+step-runner-config: {}
+''')
+            with self.assertRaisesRegex(
+                AssertionError,
+                r"Failed to parse workflow file \(.*workflow.yml\): "
+                r"Missing expected top level key \(step-runner-workflow\)"
+            ):
+                StepRunner.parse_workflow(os.path.join(temp_dir.path, 'workflow.yml'))
+
+    def test_file_invalid(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('workflow.yml', b'{ not: valid: yaml')
+            with self.assertRaisesRegex(
+                ValueError,
+                r"Error parsing workflow file \(.*workflow.yml\) as json or yaml"
+            ):
+                StepRunner.parse_workflow(os.path.join(temp_dir.path, 'workflow.yml'))
+
+    def test_invalid_type(self):
+        with self.assertRaisesRegex(
+            ValueError,
+            r"Expected workflow to be a dict, list, or file path but got: 42"
+        ):
+            StepRunner.parse_workflow(42)
+
+    def test_invalid_dependencies_type(self):
+        with self.assertRaisesRegex(
+            ValueError,
+            r"Expected workflow step \(unit-test\) dependencies to be a step name"
+            r" or list of step names but got: 42"
+        ):
+            StepRunner.parse_workflow({'unit-test': 42})
+
+    def test_unknown_dependency(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Workflow step \(unit-test\) depends on step \(generate-metadata\)"
+            r" which is not in the workflow."
+        ):
+            StepRunner.parse_workflow({'unit-test': ['generate-metadata']})
+
+    def test_cyclic_dependencies(self):
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Workflow steps \(\['unit-test', 'package'\]\) have cyclic dependencies."
+        ):
+            StepRunner.parse_workflow({
+                'generate-metadata': [],
+                'unit-test': ['generate-metadata', 'package'],
+                'package': ['unit-test']
+            })
+
+
+class TestStepRunnerRunWorkflow(BaseTestCase):
+    def tearDown(self):
+        ConcurrentStepImplementer.barrier = None
+        super().tearDown()
+
+    @staticmethod
+    def _create_config(steps):
+        return {
+            'step-runner-config': {
+                step_name: {
+                    'implementer': f'tests.helpers.sample_step_implementers.{implementer}',
+                    'config': step_config or {}
+                } for step_name, (implementer, step_config) in steps.items()
+            }
+        }
+
+    def _load_results(self, temp_dir):
+        with open(os.path.join(temp_dir.path, 'step-runner-results', 'step-runner-results.yml')) as results_file:
+            return yaml.safe_load(results_file)['step-runner-results']
+
+    def test_independent_steps_run_concurrently(self):
+        ConcurrentStepImplementer.barrier = threading.Barrier(2)
+        config = TestStepRunnerRunWorkflow._create_config({
+            'generate-metadata': ('FooStepImplementer', None),
+            'static-code-analysis': ('ConcurrentStepImplementer', None),
+            'unit-test': ('ConcurrentStepImplementer', None),
+            'package': ('FooStepImplementer', None)
+        })
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertTrue(step_runner.run_workflow({
+                    'generate-metadata': [],
+                    'static-code-analysis': ['generate-metadata'],
+                    'unit-test': ['generate-metadata'],
+                    'package': ['static-code-analysis', 'unit-test']
+                }))
+
+            results = self._load_results(temp_dir)
+            self.assertEqual(
+                sorted(results),
+                ['generate-metadata', 'package', 'static-code-analysis', 'unit-test']
+            )
+            for step_name in ['static-code-analysis', 'unit-test']:
+                self.assertTrue(
+                    results[step_name]['tests.helpers.sample_step_implementers.ConcurrentStepImplementer']
+                    ['artifacts'][f'{step_name}-ran']['value']
+                )
+
+            # the output of each step is written together even though they ran concurrently
+            step_outputs = {
+                step_output.split()[0]: step_output
+                for step_output in stdout.getvalue().split('Step Start - ')[1:]
+            }
+            self.assertEqual(
+                sorted(step_outputs),
+                ['generate-metadata', 'package', 'static-code-analysis', 'unit-test']
+            )
+            for step_name in ['static-code-analysis', 'unit-test']:
+                self.assertRegex(
+                    step_outputs[step_name],
+                    rf"{step_name} waiting\n\s*{step_name} done\n(.|\n)*Step End - {step_name}"
+                )
+
+            # workflow results are also journaled for later steps
+            workflow_result = StepImplementer.load_workflow_result(
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working'),
+                results_file_name='step-runner-results.yml'
+            )
+            self.assertEqual(len(workflow_result.workflow_list), 4)
+
+    def test_sh_output_of_concurrent_steps_buffered_per_step(self):
+        ShOutputStepImplementer.barrier = threading.Barrier(2)
+        config = {
+            'step-runner-config': {
+                step_name: {
+                    'name': step_name,
+                    'implementer': 'tests.helpers.sample_step_implementers.ShOutputStepImplementer'
+                }
+                for step_name in ['static-code-analysis', 'unit-test']
+            }
+        }
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertTrue(step_runner.run_workflow({
+                    'static-code-analysis': [],
+                    'unit-test': []
+                }))
+
+            step_outputs = stdout.getvalue().split('Step Start - ')[1:]
+            self.assertEqual(len(step_outputs), 2)
+            for step_output in step_outputs:
+                step_name = step_output.split()[0]
+                other_step_name = 'unit-test' \
+                    if step_name == 'static-code-analysis' else 'static-code-analysis'
+                # NOTE: sh reads stderr in a separate thread so it can be written between stdout
+                self.assertRegex(
+                    step_output,
+                    rf"\n +{step_name} out 1\n( +{step_name} err\n)? +{step_name} out 2\n"
+                )
+                self.assertRegex(step_output, rf"\n +{step_name} err\n")
+                self.assertNotIn(other_step_name, step_output)
+
+    def test_steps_use_results_of_steps_they_depend_on(self):
+        config = TestStepRunnerRunWorkflow._create_config({
+            'generate-metadata': ('WriteConfigAsResultsStepImplementer', {'required-config-key': 'from-metadata'}),
+            'unit-test': ('RequiredStepConfigStepImplementer', None)
+        })
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(step_runner.run_workflow(['generate-metadata', 'unit-test']))
+
+            results = self._load_results(temp_dir)
+            self.assertTrue(results['unit-test']['tests.helpers.sample_step_implementers.RequiredStepConfigStepImplementer']['success'])
+
+    def test_failed_step_stops_dependent_steps(self):
+        config = TestStepRunnerRunWorkflow._create_config({
+            'generate-metadata': ('FooStepImplementer', None),
+            'unit-test': ('FailStepImplementer', None),
+            'package': ('FooStepImplementer', None)
+        })
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            with redirect_stdout(io.StringIO()):
+                self.assertFalse(step_runner.run_workflow({
+                    'generate-metadata': [],
+                    'unit-test': ['generate-metadata'],
+                    'package': ['unit-test']
+                }))
+
+            results = self._load_results(temp_dir)
+            self.assertEqual(sorted(results), ['generate-metadata', 'unit-test'])
+
+    def test_step_exception_raised_after_running_steps_finish(self):
+        ConcurrentStepImplementer.barrier = threading.Barrier(1)
+        config = TestStepRunnerRunWorkflow._create_config({
+            'static-code-analysis': ('RaiseExceptionStepImplementer', None),
+            'unit-test': ('ConcurrentStepImplementer', None),
+            'package': ('FooStepImplementer', None)
+        })
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaisesRegex(RuntimeError, r"static-code-analysis exploded"):
+                    step_runner.run_workflow({
+                        'static-code-analysis': [],
+                        'unit-test': [],
+                        'package': ['static-code-analysis', 'unit-test']
+                    })
+
+            results = self._load_results(temp_dir)
+            self.assertEqual(list(results), ['unit-test'])
+
+    def test_max_workers_one_runs_steps_in_order_without_buffering(self):
+        config = TestStepRunnerRunWorkflow._create_config({
+            'generate-metadata': ('FooStepImplementer', None),
+            'unit-test': ('FooStepImplementer', None),
+            'package': ('FooStepImplementer', None)
+        })
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertTrue(step_runner.run_workflow(
+                    {
+                        'generate-metadata': [],
+                        'unit-test': [],
+                        'package': ['generate-metadata', 'unit-test']
+                    },
+                    max_workers=1
+                ))
+
+            self.assertEqual(
+                re.findall(r"Step Start - (\S+)", stdout.getvalue()),
+                ['generate-metadata', 'unit-test', 'package']
+            )
+
+    def test_invalid_max_workers(self):
+        step_runner = StepRunner(TestStepRunnerRunWorkflow._create_config({
+            'generate-metadata': ('FooStepImplementer', None)
+        }))
+        with self.assertRaisesRegex(
+            AssertionError,
+            r"Workflow max workers \(0\) must be a positive int."
+        ):
+            step_runner.run_workflow(['generate-metadata'], max_workers=0)
+
+
+class TestStepRunnerRunStepSubSteps(BaseTestCase):
+    def tearDown(self):
+        ConcurrentStepImplementer.barrier = None
+        super().tearDown()
+
+    @staticmethod
+    def _create_config(sub_steps, **step_options):
+        return {
+            'step-runner-config': {
+                'foo': {
+                    **step_options,
+                    'sub-steps': [
+                        {
+                            'name': sub_step_name,
+                            'implementer': f'tests.helpers.sample_step_implementers.{implementer}',
+                            'config': sub_step_config or {}
+                        } for sub_step_name, implementer, sub_step_config in sub_steps
+                    ]
+                }
+            }
+        }
+
+    def _run_step(self, temp_dir, config, expected_success=True):
+        step_runner = StepRunner(
+            config,
+            os.path.join(temp_dir.path, 'step-runner-results'),
+            work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+        )
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            self.assertEqual(step_runner.run_step('foo'), expected_success)
+
+        workflow_result = StepImplementer.load_workflow_result(
+            work_dir_path=os.path.join(temp_dir.path, 'step-runner-working'),
+            results_file_name='step-runner-results.yml'
+        )
+        return workflow_result, stdout.getvalue()
+
+    def test_sequential_fail_fast(self):
+        config = TestStepRunnerRunStepSubSteps._create_config([
+            ('sub1', 'FailStepImplementer', None),
+            ('sub2', 'FooStepImplementer', None)
+        ])
+
+        with TempDirectory() as temp_dir:
+            workflow_result, _ = self._run_step(temp_dir, config, expected_success=False)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1']
+            )
+
+    def test_sequential_run_all(self):
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'FailStepImplementer', None),
+                ('sub2', 'FooStepImplementer', None)
+            ],
+            **{'fail-fast': False}
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, _ = self._run_step(temp_dir, config, expected_success=False)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub2']
+            )
+
+    def test_parallel_sub_steps_run_concurrently(self):
+        ConcurrentStepImplementer.barrier = threading.Barrier(2)
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'ConcurrentStepImplementer', None),
+                ('sub2', 'ConcurrentStepImplementer', None)
+            ],
+            parallel=True
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, _ = self._run_step(temp_dir, config)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub2']
+            )
+
+    def test_parallel_sub_steps_results_and_output_in_config_order(self):
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'SleepStepImplementer', {'sleep-seconds': 0.3}),
+                ('sub2', 'SleepStepImplementer', None),
+                ('sub3', 'SleepStepImplementer', {'sleep-seconds': 0.1})
+            ],
+            parallel=True
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, output = self._run_step(temp_dir, config)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub2', 'sub3']
+            )
+            self.assertEqual(workflow_result.get_artifact_value('slept', step_name='foo'), 'sub1')
+            self.assertEqual(
+                re.findall(r"(sub\d) (sleeping|awake)", output),
+                [
+                    ('sub1', 'sleeping'), ('sub1', 'awake'),
+                    ('sub2', 'sleeping'), ('sub2', 'awake'),
+                    ('sub3', 'sleeping'), ('sub3', 'awake')
+                ]
+            )
+
+            with open(os.path.join(temp_dir.path, 'step-runner-results', 'step-runner-results.yml')) as results_file:
+                results = yaml.safe_load(results_file)
+            self.assertEqual(sorted(results['step-runner-results']['foo']), ['sub1', 'sub2', 'sub3'])
+
+    def test_parallel_sub_steps_sh_output_buffered_per_sub_step_in_config_order(self):
+        ShOutputStepImplementer.barrier = threading.Barrier(2)
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'ShOutputStepImplementer', None),
+                ('sub2', 'ShOutputStepImplementer', None)
+            ],
+            parallel=True
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, output = self._run_step(temp_dir, config)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub2']
+            )
+            self.assertEqual(
+                re.findall(r"(sub\d) out \d", output),
+                ['sub1', 'sub1', 'sub2', 'sub2']
+            )
+            sub_step_outputs = output.split('Standard Out - foo')[1:]
+            self.assertEqual(len(sub_step_outputs), 2)
+            for sub_step_name, sub_step_output in zip(['sub1', 'sub2'], sub_step_outputs):
+                sub_step_output = sub_step_output.split('Results - foo')[0]
+                self.assertRegex(
+                    sub_step_output,
+                    rf"\n +{sub_step_name} out 1\n( +{sub_step_name} err\n)?"
+                    rf" +{sub_step_name} out 2\n"
+                )
+                self.assertRegex(sub_step_output, rf"\n +{sub_step_name} err\n")
+
+    def test_parallel_fail_fast(self):
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'FailStepImplementer', None),
+                ('sub2', 'FooStepImplementer', None),
+                ('sub3', 'FooStepImplementer', None)
+            ],
+            **{'parallel': True, 'max-workers': 1}
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, _ = self._run_step(temp_dir, config, expected_success=False)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1']
+            )
+
+    def test_parallel_run_all(self):
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'FailStepImplementer', None),
+                ('sub2', 'FooStepImplementer', None),
+                ('sub3', 'FooStepImplementer', None)
+            ],
+            **{'parallel': True, 'max-workers': 1, 'fail-fast': False}
+        )
+
+        with TempDirectory() as temp_dir:
+            workflow_result, _ = self._run_step(temp_dir, config, expected_success=False)
+
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub2', 'sub3']
+            )
+
+    def test_parallel_exception_raised_after_sub_steps_finish(self):
+        config = TestStepRunnerRunStepSubSteps._create_config(
+            [
+                ('sub1', 'SleepStepImplementer', {'sleep-seconds': 0.1}),
+                ('sub2', 'RaiseExceptionStepImplementer', None),
+                ('sub3', 'FooStepImplementer', None)
+            ],
+            **{'parallel': True, 'fail-fast': False}
+        )
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaisesRegex(RuntimeError, r"foo exploded"):
+                    step_runner.run_step('foo')
+
+            workflow_result = StepImplementer.load_workflow_result(
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working'),
+                results_file_name='step-runner-results.yml'
+            )
+            self.assertEqual(
+                [step_result.sub_step_name for step_result in workflow_result.workflow_list],
+                ['sub1', 'sub3']
+            )
+
+    def test_parallel_sub_steps_in_workflow(self):
+        ConcurrentStepImplementer.barrier = threading.Barrier(3)
+        config = {
+            'step-runner-config': {
+                'foo': {
+                    'parallel': True,
+                    'sub-steps': [
+                        {
+                            'name': sub_step_name,
+                            'implementer': 'tests.helpers.sample_step_implementers.ConcurrentStepImplementer'
+                        } for sub_step_name in ['sub1', 'sub2']
+                    ]
+                },
+                'bar': {
+                    'implementer': 'tests.helpers.sample_step_implementers.ConcurrentStepImplementer'
+                }
+            }
+        }
+
+        with TempDirectory() as temp_dir:
+            step_runner = StepRunner(
+                config,
+                os.path.join(temp_dir.path, 'step-runner-results'),
+                work_dir_path=os.path.join(temp_dir.path, 'step-runner-working')
+            )
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                self.assertTrue(step_runner.run_workflow({'foo': [], 'bar': []}))
+
+            # the output of each sub step is written together even though they ran concurrently
+            step_outputs = stdout.getvalue().split('Step Start - ')[1:]
+            self.assertEqual(
+                sorted(step_output.split()[0] for step_output in step_outputs),
+                ['bar', 'foo', 'foo']
+            )
+            for step_output in step_outputs:
+                step_name = step_output.split()[0]
+                self.assertEqual(
+                    re.findall(r"(\S+) waiting", step_output),
+                    [step_name]
+                )
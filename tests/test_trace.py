@@ -0,0 +1,105 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+import json
+import os
+import sys
+import threading
+
+import sh
+from testfixtures import TempDirectory
+
+from ploigos_step_runner.step_metrics import StepMetrics
+from ploigos_step_runner.trace import Tracer
+from tests.helpers.base_test_case import BaseTestCase
+
+
+class TestTracer(BaseTestCase):
+    def tearDown(self):
+        Tracer.set_active_tracer(None)
+
+    @staticmethod
+    def __get_spans(tracer):
+        return [event for event in tracer.trace_events if event['ph'] == 'X']
+
+    def test_trace_span_no_active_tracer(self):
+        self.assertIsNone(Tracer.get_active_tracer())
+        with Tracer.trace_span('foo', Tracer.CATEGORY_STEP):
+            pass
+
+    def test_trace_span(self):
+        tracer = Tracer()
+        Tracer.set_active_tracer(tracer)
+
+        with Tracer.trace_span('foo', Tracer.CATEGORY_STEP, {'environment': 'DEV'}):
+            with Tracer.trace_span('bar', Tracer.CATEGORY_PHASE):
+                pass
+
+        spans = self.__get_spans(tracer)
+        self.assertEqual([span['name'] for span in spans], ['bar', 'foo'])
+        bar_span, foo_span = spans
+        self.assertEqual(foo_span['cat'], 'step')
+        self.assertEqual(foo_span['args'], {'environment': 'DEV'})
+        self.assertEqual(foo_span['pid'], os.getpid())
+        self.assertEqual(foo_span['tid'], threading.get_ident())
+        self.assertNotIn('args', bar_span)
+        self.assertLessEqual(foo_span['ts'], bar_span['ts'])
+        self.assertGreaterEqual(foo_span['ts'] + foo_span['dur'], bar_span['ts'] + bar_span['dur'])
+
+    def test_trace_span_records_span_on_error(self):
+        tracer = Tracer()
+        Tracer.set_active_tracer(tracer)
+
+        with self.assertRaises(RuntimeError):
+            with Tracer.trace_span('foo', Tracer.CATEGORY_STEP):
+                raise RuntimeError('mock error')
+
+        self.assertEqual([span['name'] for span in self.__get_spans(tracer)], ['foo'])
+
+    def test_add_span_names_threads(self):
+        tracer = Tracer()
+        thread = threading.Thread(
+            target=tracer.add_span,
+            args=['foo', Tracer.CATEGORY_SUB_STEP, 1.0, 1.5],
+            name='sub-step-thread'
+        )
+        thread.start()
+        thread.join()
+        tracer.add_span('bar', Tracer.CATEGORY_SUB_STEP, 1.0, 2.0)
+
+        thread_names = {
+            event['tid']: event['args']['name']
+            for event in tracer.trace_events if event['name'] == 'thread_name'
+        }
+        self.assertEqual(thread_names[threading.get_ident()], 'MainThread')
+        self.assertIn('sub-step-thread', thread_names.values())
+        self.assertEqual(
+            [(span['ts'], span['dur']) for span in self.__get_spans(tracer)],
+            [(1000000, 500000), (1000000, 1000000)]
+        )
+
+    def test_sh_commands_traced(self):
+        tracer = Tracer()
+        Tracer.set_active_tracer(tracer)
+        sh.Command(sys.executable)('-c', 'pass', _done=StepMetrics.create_sh_done_callback())
+
+        spans = self.__get_spans(tracer)
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]['name'], os.path.basename(sys.executable))
+        self.assertEqual(spans[0]['cat'], 'command')
+        self.assertEqual(spans[0]['args'], {'exit-code': 0})
+        self.assertEqual(spans[0]['tid'], threading.get_ident())
+
+    def test_write_trace_file(self):
+        tracer = Tracer()
+        tracer.add_span('foo', Tracer.CATEGORY_STEP, 1.0, 2.0)
+
+        with TempDirectory() as temp_dir:
+            trace_file_path = os.path.join(temp_dir.path, 'traces', 'trace.json')
+            tracer.write_trace_file(trace_file_path)
+
+            with open(trace_file_path, 'r', encoding='utf-8') as trace_file:
+                trace = json.load(trace_file)
+
+        self.assertEqual(trace['traceEvents'], tracer.trace_events)
+        self.assertEqual(trace['traceEvents'][0]['name'], 'process_name')
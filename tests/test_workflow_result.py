@@ -1,8 +1,13 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-class-docstring
 # pylint: disable=missing-function-docstring
+import os
+import json
 import pickle
 import filecmp
+import threading
+from unittest.mock import patch
+import yaml
 from testfixtures import TempDirectory
 
 from tests.helpers.base_test_case import BaseTestCase
@@ -460,6 +465,156 @@ class TestStepWorkflowResultTest(BaseTestCase):
                 RuntimeError):
             wfr.write_results_to_json_file('/NotAStepResult/dir/test.json')
 
+    def test_write_results_to_file_yaml(self):
+        wfr = setup_test()
+
+        with TempDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir.path, 'step-runner-results.yml')
+            expected_file = os.path.join(temp_dir.path, 'expected.yml')
+            wfr.write_results_to_file(results_file)
+            wfr.write_results_to_yml_file(expected_file)
+
+            self.assertTrue(filecmp.cmp(results_file, expected_file))
+            self.assertEqual(
+                sorted(os.listdir(temp_dir.path)),
+                ['expected.yml', 'step-runner-results.yml']
+            )
+
+    def test_write_results_to_file_json(self):
+        wfr = setup_test()
+
+        with TempDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir.path, 'step-runner-results.json')
+            expected_file = os.path.join(temp_dir.path, 'expected.json')
+            wfr.write_results_to_file(results_file, WorkflowResult.RESULTS_FORMAT_JSON)
+            wfr.write_results_to_json_file(expected_file)
+
+            self.assertTrue(filecmp.cmp(results_file, expected_file))
+
+    def test_write_results_to_file_jsonl(self):
+        wfr = WorkflowResult()
+
+        with TempDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir.path, 'step-runner-results.jsonl')
+
+            step_result1 = StepResult('step1', 'sub1', 'implementer1')
+            step_result1.add_artifact('artifact1', 'value1')
+            wfr.add_step_result(step_result1)
+            wfr.write_results_to_file(results_file, WorkflowResult.RESULTS_FORMAT_JSONL)
+
+            step_result2 = StepResult('step2', 'sub2', 'implementer2')
+            step_result2.add_artifact('artifact2', 'value2')
+            wfr.add_step_result(step_result2)
+            wfr.write_results_to_file(results_file, WorkflowResult.RESULTS_FORMAT_JSONL)
+
+            with open(results_file, 'r') as file:
+                lines = file.readlines()
+
+            self.assertEqual(
+                [json.loads(line) for line in lines],
+                [
+                    step_result1.get_step_result_dict(),
+                    step_result2.get_step_result_dict()
+                ]
+            )
+
+    def test_write_results_to_file_jsonl_no_step_results(self):
+        wfr = WorkflowResult()
+
+        with TempDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir.path, 'step-runner-results.jsonl')
+            wfr.write_results_to_file(results_file, WorkflowResult.RESULTS_FORMAT_JSONL)
+
+            self.assertFalse(os.path.exists(results_file))
+
+    def test_write_results_to_file_unknown_format(self):
+        wfr = setup_test()
+
+        with self.assertRaisesRegex(
+            ValueError,
+            r"Unknown results format \(xml\), expected one of:"
+        ):
+            wfr.write_results_to_file('step-runner-results.xml', 'xml')
+
+    def test_write_results_to_yml_file_after_more_step_results_added(self):
+        wfr = setup_test()
+
+        with TempDirectory() as temp_dir:
+            yml_file = os.path.join(temp_dir.path, 'step-runner-results.yml')
+            wfr.write_results_to_yml_file(yml_file)
+
+            step_result = StepResult('step1', 'sub3', 'implementer3')
+            step_result.add_artifact('artifact6', 'value6')
+            wfr.add_step_result(step_result)
+            wfr.write_results_to_yml_file(yml_file)
+
+            with open(yml_file, 'r') as file:
+                results = yaml.safe_load(file)
+
+            self.assertEqual(
+                results['step-runner-results']['step1']['sub1'],
+                setup_test().workflow_list[0].get_step_result_dict()['step1']['sub1']
+            )
+            self.assertEqual(
+                results['step-runner-results']['step1']['sub3']['artifacts']['artifact6'],
+                {'description': '', 'value': 'value6'}
+            )
+
+    def test_write_results_to_yml_file_artifact_changed_after_added(self):
+        wfr = WorkflowResult()
+        step_result = StepResult('step1', 'sub1', 'implementer1')
+        step_result.add_artifact('artifact1', 'value1')
+        wfr.add_step_result(step_result)
+
+        step_result.add_artifact('artifact1', 'changed')
+
+        with TempDirectory() as temp_dir:
+            yml_file = os.path.join(temp_dir.path, 'step-runner-results.yml')
+            wfr.write_results_to_yml_file(yml_file)
+
+            with open(yml_file, 'r') as file:
+                results = yaml.safe_load(file)
+
+            self.assertEqual(
+                results['step-runner-results']['step1']['sub1']['artifacts']['artifact1']['value'],
+                'changed'
+            )
+
+    def test_add_step_result_from_multiple_threads(self):
+        wfr = WorkflowResult()
+
+        def add_step_results(step_name):
+            for sub_step_number in range(25):
+                step_result = StepResult(step_name, f'sub{sub_step_number}', 'implementer')
+                step_result.add_artifact(f'{step_name}-artifact', sub_step_number)
+                with wfr.lock:
+                    wfr.add_step_result(step_result)
+
+        threads = [
+            threading.Thread(target=add_step_results, args=[f'step{step_number}'])
+            for step_number in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(wfr.workflow_list), 100)
+        for step_number in range(4):
+            self.assertEqual(
+                wfr.get_artifact_value(f'step{step_number}-artifact', sub_step_name='sub24'),
+                24
+            )
+
+    def test_lock_rebuilt_when_unpickled(self):
+        wfr = setup_test()
+
+        unpickled_wfr = pickle.loads(pickle.dumps(wfr))
+
+        self.assertIsNot(unpickled_wfr.lock, wfr.lock)
+        with unpickled_wfr.lock:
+            unpickled_wfr.add_step_result(StepResult('step3', 'sub3', 'implementer3'))
+
     def test_load_from_pickle_file_no_file(self):
         pickle_wfr = WorkflowResult.load_from_pickle_file('test.pkl')
         expected_wfr = WorkflowResult()
@@ -516,3 +671,296 @@ class TestStepWorkflowResultTest(BaseTestCase):
         with self.assertRaises(
                 RuntimeError):
             wfr.write_to_pickle_file(None)
+
+    def test_load_from_pickle_file_indexes_rebuilt(self):
+        with TempDirectory() as temp_dir:
+            pickle_file = temp_dir.path + '/test.pkl'
+            setup_test().write_to_pickle_file(pickle_file)
+            pickle_wfr = WorkflowResult.load_from_pickle_file(pickle_file)
+
+            self.assertEqual(len(pickle_wfr.workflow_list), 4)
+            self.assertEqual(
+                pickle_wfr.get_artifact_value('same-artifact-diff-env', environment='test'),
+                'value-test-env'
+            )
+            self.assertEqual(
+                pickle_wfr.get_step_result('deploy', environment='test').environment,
+                'test'
+            )
+
+            with self.assertRaisesRegex(
+                StepRunnerException,
+                r'Can not add duplicate StepResult for step \(step1\)'
+            ):
+                pickle_wfr.add_step_result(StepResult('step1', 'sub1', 'implementer1'))
+
+    def test_get_step_result(self):
+        wfr = setup_test()
+
+        self.assertEqual(wfr.get_step_result('step1').sub_step_name, 'sub1')
+        self.assertEqual(wfr.get_step_result('deploy').environment, 'dev')
+        self.assertEqual(wfr.get_step_result('deploy', 'deploy-sub').environment, 'dev')
+        self.assertEqual(wfr.get_step_result('deploy', environment='test').environment, 'test')
+        self.assertEqual(wfr.get_step_result(None, environment='test').step_name, 'deploy')
+        self.assertIsNone(wfr.get_step_result('deploy', environment='prod'))
+        self.assertIsNone(wfr.get_step_result('step1', 'does-not-exist'))
+
+    def test_get_artifact_value_first_match_wins(self):
+        wfr = WorkflowResult()
+        for i in range(100):
+            step_result = StepResult(f'step{i}', 'sub', 'implementer', f'env{i % 3}')
+            step_result.add_artifact('artifact', f'value{i}')
+            if i % 2 == 0:
+                step_result.add_artifact('even-artifact', f'value{i}')
+            wfr.add_step_result(step_result)
+
+        self.assertEqual(wfr.get_artifact_value('artifact'), 'value0')
+        self.assertEqual(wfr.get_artifact_value('artifact', environment='env2'), 'value2')
+        self.assertEqual(wfr.get_artifact_value('even-artifact', environment='env1'), 'value4')
+        self.assertEqual(wfr.get_artifact_value('artifact', step_name='step42'), 'value42')
+        self.assertIsNone(wfr.get_artifact_value('even-artifact', step_name='step41'))
+        self.assertIsNone(
+            wfr.get_artifact_value('artifact', step_name='step42', environment='env1')
+        )
+
+    def test_get_artifact_value_artifact_added_after_step_result_added(self):
+        wfr = setup_test()
+        step_result1 = wfr.get_step_result('step1')
+        step_result2 = wfr.get_step_result('step2')
+
+        step_result2.add_artifact('added-artifact', 'value2')
+        self.assertEqual(wfr.get_artifact_value('added-artifact'), 'value2')
+
+        # the first step result in workflow list order still wins
+        step_result1.add_artifact('added-artifact', 'value1')
+        self.assertEqual(wfr.get_artifact_value('added-artifact'), 'value1')
+        self.assertEqual(wfr.get_artifact_value('added-artifact', step_name='step2'), 'value2')
+
+        step_result1.add_artifact('artifact5', 'changed-value5')
+        self.assertEqual(wfr.get_artifact_value('artifact5'), 'changed-value5')
+
+    def test_write_results_to_json_file_step_result_changed_after_added(self):
+        with TempDirectory() as temp_dir:
+            json_file = temp_dir.path + '/step-runner-results.json'
+            wfr = setup_test()
+            wfr.write_results_to_json_file(json_file)
+
+            step_result = wfr.get_step_result('step1')
+            step_result.add_artifact('added-artifact', 'added-value')
+            step_result.success = False
+            wfr.write_results_to_json_file(json_file)
+
+            with open(json_file, encoding='utf-8') as file:
+                results = json.load(file)['step-runner-results']
+            self.assertEqual(
+                results['step1']['sub1']['artifacts']['added-artifact']['value'],
+                'added-value'
+            )
+            self.assertFalse(results['step1']['sub1']['success'])
+
+    def test_write_to_journal_file_step_result_changed_after_written(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            wfr = setup_test()
+            wfr.write_to_journal_file(journal_file)
+
+            wfr.get_step_result('step1').add_artifact('added-artifact', 'added-value')
+            wfr.write_to_journal_file(journal_file)
+
+            journal_wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(len(journal_wfr.workflow_list), 4)
+            self.assertEqual(journal_wfr.get_artifact_value('added-artifact'), 'added-value')
+
+    def test_step_result_change_listeners_not_pickled(self):
+        wfr = setup_test()
+        step_result = wfr.get_step_result('step1')
+
+        unpickled_step_result = pickle.loads(pickle.dumps(step_result))
+        unpickled_step_result.add_artifact('added-artifact', 'added-value')
+
+        self.assertIsNone(wfr.get_artifact_value('added-artifact'))
+
+    def test_load_from_journal_file_no_file(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(wfr.workflow_list, [])
+
+    def test_write_to_journal_file_round_trip(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            expected_wfr = setup_test()
+            expected_wfr.write_to_journal_file(journal_file)
+
+            journal_wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(
+                [str(step_result) for step_result in journal_wfr.workflow_list],
+                [str(step_result) for step_result in expected_wfr.workflow_list]
+            )
+            self.assertEqual(
+                journal_wfr.get_artifact_value('same-artifact-diff-env', environment='test'),
+                'value-test-env'
+            )
+
+    def test_write_to_journal_file_appends_only_new_step_results(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            setup_test().write_to_journal_file(journal_file)
+            journal_size = os.path.getsize(journal_file)
+
+            for i in range(3):
+                wfr = WorkflowResult.load_from_journal_file(journal_file)
+                step_result = StepResult(f'new-step-{i}', 'sub', 'implementer')
+                step_result.add_artifact('new-artifact', f'new-value-{i}')
+                wfr.add_step_result(step_result)
+
+                with patch('pickle.dumps', wraps=pickle.dumps) as dumps_mock:
+                    wfr.write_to_journal_file(journal_file)
+                    dumps_mock.assert_called_once_with([step_result])
+
+                # writing again with no new step results is a no-op
+                wfr.write_to_journal_file(journal_file)
+
+                self.assertGreater(os.path.getsize(journal_file), journal_size)
+                journal_size = os.path.getsize(journal_file)
+
+            journal_wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(len(journal_wfr.workflow_list), 7)
+            self.assertEqual(
+                journal_wfr.get_artifact_value('new-artifact', step_name='new-step-2'),
+                'new-value-2'
+            )
+
+    def test_load_from_journal_file_interrupted_write(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            setup_test().write_to_journal_file(journal_file)
+            valid_journal_size = os.path.getsize(journal_file)
+
+            # simulate a crash part way through writing a record
+            with open(journal_file, 'ab') as journal:
+                journal.write(b'\x00\x00\x10\x00\x00\x00')
+
+            wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(len(wfr.workflow_list), 4)
+
+            step_result = StepResult('new-step', 'sub', 'implementer')
+            wfr.add_step_result(step_result)
+            wfr.write_to_journal_file(journal_file)
+            self.assertGreater(os.path.getsize(journal_file), valid_journal_size)
+
+            wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(len(wfr.workflow_list), 5)
+
+    def test_load_from_journal_file_corrupt_record(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            wfr = setup_test()
+            wfr.write_to_journal_file(journal_file)
+            wfr.add_step_result(StepResult('new-step', 'sub', 'implementer'))
+            wfr.write_to_journal_file(journal_file)
+
+            # flip the last byte of the last record so its checksum no longer matches
+            with open(journal_file, 'r+b') as journal:
+                journal.seek(-1, os.SEEK_END)
+                last_byte = journal.read(1)
+                journal.seek(-1, os.SEEK_END)
+                journal.write(bytes([last_byte[0] ^ 0xFF]))
+
+            wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(len(wfr.workflow_list), 4)
+
+    def test_write_to_journal_file_compaction(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            wfr = WorkflowResult()
+            for i in range(WorkflowResult.JOURNAL_COMPACTION_THRESHOLD + 1):
+                wfr.add_step_result(StepResult(f'step-{i}', 'sub', 'implementer'))
+                wfr.write_to_journal_file(journal_file)
+
+            self.assertEqual(
+                wfr._WorkflowResult__journal_states[journal_file]['num_records'],
+                1
+            )
+            journal_wfr = WorkflowResult.load_from_journal_file(journal_file)
+            self.assertEqual(
+                len(journal_wfr.workflow_list),
+                WorkflowResult.JOURNAL_COMPACTION_THRESHOLD + 1
+            )
+
+    def test_write_to_journal_file_pickle_only_written_on_compaction(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            pickle_file = temp_dir.path + '/test.pkl'
+            wfr = WorkflowResult()
+            wfr.add_step_result(StepResult('step-0', 'sub', 'implementer'))
+            wfr.write_to_journal_file(journal_file, pickle_filename=pickle_file)
+            self.assertEqual(
+                len(WorkflowResult.load_from_pickle_file(pickle_file).workflow_list),
+                1
+            )
+
+            with patch.object(WorkflowResult, 'write_to_pickle_file') as write_to_pickle_file_mock:
+                for i in range(1, WorkflowResult.JOURNAL_COMPACTION_THRESHOLD):
+                    wfr.add_step_result(StepResult(f'step-{i}', 'sub', 'implementer'))
+                    wfr.write_to_journal_file(journal_file, pickle_filename=pickle_file)
+                write_to_pickle_file_mock.assert_not_called()
+
+            wfr.add_step_result(StepResult('step-last', 'sub', 'implementer'))
+            wfr.write_to_journal_file(journal_file, pickle_filename=pickle_file)
+            self.assertEqual(
+                len(WorkflowResult.load_from_pickle_file(pickle_file).workflow_list),
+                WorkflowResult.JOURNAL_COMPACTION_THRESHOLD + 1
+            )
+
+    def test_write_to_journal_file_compaction_syncs_dir(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            wfr = setup_test()
+
+            with patch.object(
+                WorkflowResult,
+                '_WorkflowResult__fsync_dir',
+                wraps=WorkflowResult._WorkflowResult__fsync_dir
+            ) as fsync_dir_mock:
+                wfr.write_to_journal_file(journal_file)
+
+            fsync_dir_mock.assert_called_once_with(temp_dir.path)
+
+    def test_write_to_pickle_file_no_temp_file_left(self):
+        with TempDirectory() as temp_dir:
+            pickle_file = temp_dir.path + '/test.pkl'
+            setup_test().write_to_pickle_file(pickle_file)
+
+            self.assertEqual(os.listdir(temp_dir.path), ['test.pkl'])
+
+    def test_load_from_journal_file_not_a_journal(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.write('test.journal', b'not a journal')
+
+            with self.assertRaisesRegex(
+                StepRunnerException,
+                f'error loading {journal_file}: error {journal_file} is not a journal'
+            ):
+                WorkflowResult.load_from_journal_file(journal_file)
+
+    def test_load_from_journal_file_invalid_data(self):
+        with TempDirectory() as temp_dir:
+            journal_file = temp_dir.path + '/test.journal'
+            with open(journal_file, 'wb') as journal:
+                journal.write(WorkflowResult.JOURNAL_MAGIC)
+                WorkflowResult._WorkflowResult__write_journal_record(journal, ['not a result'])
+
+            with self.assertRaisesRegex(
+                StepRunnerException,
+                f'error {journal_file} has invalid data'
+            ):
+                WorkflowResult.load_from_journal_file(journal_file)
+
+    def test_write_to_journal_file_exception(self):
+        wfr = setup_test()
+        with self.assertRaisesRegex(
+            RuntimeError,
+            'error writing None'
+        ):
+            wfr.write_to_journal_file(None)
@@ -0,0 +1,152 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+import gzip
+import io
+import os
+
+from testfixtures import TempDirectory
+from tests.helpers.base_test_case import BaseTestCase
+from ploigos_step_runner.utils.compressed_log import (REMOVED_SEGMENTS_MESSAGE,
+                                                      TextIOCompressedLog, copy_log,
+                                                      decompress_log, find_logs,
+                                                      get_log_segment_paths)
+
+
+def read_log(log_path):
+    stream = io.BytesIO()
+    copy_log(log_path, stream)
+    return stream.getvalue().decode('utf-8')
+
+
+class TestTextIOCompressedLog(BaseTestCase):
+    def test_write_and_copy(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'mvn_test_output.txt')
+            with TextIOCompressedLog(log_path, tail_size=12) as log:
+                self.assertEqual(log.write('[INFO] foo\n'), 11)
+                log.write(b'[INFO] bar\n')
+
+                self.assertEqual(log.tail, '\n[INFO] bar\n')
+
+            self.assertEqual(read_log(log_path), '[INFO] foo\n[INFO] bar\n')
+            self.assertEqual(log.tail_path, f'{log_path}.tail')
+            with open(log.tail_path, encoding='utf-8') as tail_file:
+                self.assertEqual(tail_file.read(), '\n[INFO] bar\n')
+            self.assertEqual(get_log_segment_paths(log_path), [f'{log_path}.000001.gz'])
+            self.assertFalse(os.path.exists(log_path))
+
+    def test_copy_while_writing(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'mvn_test_output.txt')
+            with TextIOCompressedLog(log_path) as log:
+                log.write('[INFO] foo\n')
+                log.flush()
+
+                self.assertEqual(read_log(log_path), '[INFO] foo\n')
+
+    def test_segments_rolled_and_oldest_removed(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'mvn_test_output.txt')
+            lines = [f'[INFO] line {index}\n' for index in range(10000)]
+            with TextIOCompressedLog(log_path, max_size=2048, segment_size=4096) as log:
+                for line in lines:
+                    log.write(line)
+
+            segment_paths = get_log_segment_paths(log_path)
+            self.assertGreater(len(segment_paths), 1)
+            self.assertLessEqual(
+                sum(os.path.getsize(segment_path) for segment_path in segment_paths),
+                2048
+            )
+
+            log_text = read_log(log_path)
+            self.assertTrue(log_text.startswith(REMOVED_SEGMENTS_MESSAGE))
+            self.assertTrue(log_text.endswith('[INFO] line 9999\n'))
+            self.assertIn(
+                log_text[len(REMOVED_SEGMENTS_MESSAGE):],
+                ''.join(lines)
+            )
+
+            with gzip.open(segment_paths[0], 'rb') as segment:
+                self.assertEqual(len(segment.read()), 4096)
+
+    def test_tail_does_not_split_characters(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'oscap-xccdf-out')
+            with TextIOCompressedLog(log_path, tail_size=5) as log:
+                log.write('ééééé')
+
+                self.assertEqual(log.tail, 'éé')
+
+    def test_replace_and_append(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'mvn_push_artifacts_output.txt')
+            with TextIOCompressedLog(log_path) as log:
+                log.write('first\n')
+            with TextIOCompressedLog(log_path, append=True) as log:
+                log.write('second\n')
+
+            self.assertEqual(read_log(log_path), 'first\nsecond\n')
+            with open(f'{log_path}.tail', encoding='utf-8') as tail_file:
+                self.assertEqual(tail_file.read(), 'first\nsecond\n')
+
+            with TextIOCompressedLog(log_path) as log:
+                log.write('third\n')
+
+            self.assertEqual(read_log(log_path), 'third\n')
+            self.assertEqual(len(get_log_segment_paths(log_path)), 1)
+
+    def test_decompress(self):
+        with TempDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir.path, 'mvn_test_output.txt')
+            with TextIOCompressedLog(log_path, segment_size=1024, tail_size=1) as log:
+                log.write('mvn output\n' * 200)
+
+            decompress_log(log_path)
+
+            with open(log_path, encoding='utf-8') as log_file:
+                self.assertEqual(log_file.read(), 'mvn output\n' * 200)
+            self.assertEqual(
+                sorted(os.listdir(temp_dir.path)),
+                ['mvn_test_output.txt', 'mvn_test_output.txt.000001.gz',
+                 'mvn_test_output.txt.000002.gz', 'mvn_test_output.txt.000003.gz',
+                 'mvn_test_output.txt.tail']
+            )
+
+            # the decompressed log is out of date once the log is written to again
+            with TextIOCompressedLog(log_path, append=True) as log:
+                log.write('more mvn output\n')
+
+            self.assertFalse(os.path.exists(log_path))
+            self.assertEqual(read_log(log_path), 'mvn output\n' * 200 + 'more mvn output\n')
+
+    def test_write_closed(self):
+        with TempDirectory() as temp_dir:
+            log = TextIOCompressedLog(os.path.join(temp_dir.path, 'log.txt'))
+            log.close()
+
+            with self.assertRaisesRegex(ValueError, r'I/O operation on closed log'):
+                log.write('foo')
+
+    def test_invalid_size(self):
+        with TempDirectory() as temp_dir, \
+                self.assertRaisesRegex(AssertionError, r'Log segment size \(0\)'):
+            TextIOCompressedLog(os.path.join(temp_dir.path, 'log.txt'), segment_size=0)
+
+
+class TestFindLogs(BaseTestCase):
+    def test_find_logs(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('unit-test/other-file.txt', b'not a log')
+            for log_file_name in ['unit-test/mvn_test_output.txt', 'unit-test/dev/oscap-out']:
+                with TextIOCompressedLog(os.path.join(temp_dir.path, log_file_name)) as log:
+                    log.write('foo\n')
+
+            self.assertEqual(
+                find_logs(os.path.join(temp_dir.path, 'unit-test')),
+                [
+                    os.path.join(temp_dir.path, 'unit-test', 'dev', 'oscap-out'),
+                    os.path.join(temp_dir.path, 'unit-test', 'mvn_test_output.txt')
+                ]
+            )
@@ -2,7 +2,7 @@ import sys
 import sh
 import re
 from io import IOBase
-from unittest.mock import patch, call
+from unittest.mock import ANY, patch, call
 
 from tests.helpers.base_test_case import BaseTestCase
 from tests.helpers.test_utils import *
@@ -45,7 +45,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.podman', create=True)
@@ -73,7 +74,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.skopeo', create=True)
@@ -101,7 +103,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -131,7 +134,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -160,7 +164,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -189,7 +194,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -218,7 +224,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -247,7 +254,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.buildah', create=True)
@@ -278,7 +286,8 @@ class TestContainerRegistryLogin(BaseTestCase):
             _in='nope',
             _out=Any(IOBase),
             _err=Any(IOBase),
-            _tee='err'
+            _tee='err',
+            _done=ANY
         )
 
     @patch('sh.which', create=True)
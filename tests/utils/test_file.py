@@ -1,10 +1,14 @@
 
 import os
+from unittest.mock import patch
 
+import yaml
 from testfixtures import TempDirectory
 from tests.helpers.base_test_case import BaseTestCase
 from ploigos_step_runner.utils.file import (create_parent_dir,
                              download_and_decompress_source_to_destination,
+                             get_yaml_safe_loader,
+                             parse_yaml_or_json_documents_file,
                              parse_yaml_or_json_file)
 
 
@@ -48,6 +52,100 @@ class TestParseYAMLOrJASONFile(BaseTestCase):
         ):
             parse_yaml_or_json_file(sample_file_path)
 
+    def test_yaml_not_parsed_as_json(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', b'foo: bar\n')
+
+            with patch('json.loads') as json_loads_mock:
+                self.assertEqual(
+                    parse_yaml_or_json_file(os.path.join(temp_dir.path, 'config.yml')),
+                    {'foo': 'bar'}
+                )
+
+            json_loads_mock.assert_not_called()
+
+    def test_json_contents_parsed_as_json(self):
+        with TempDirectory() as temp_dir:
+            # NOTE: 1e3 is a string in YAML 1.1 but a number in JSON
+            temp_dir.write('config.yml', b'  {"foo": 1e3}\n')
+
+            self.assertEqual(
+                parse_yaml_or_json_file(os.path.join(temp_dir.path, 'config.yml')),
+                {'foo': 1000.0}
+            )
+
+    def test_json_extension_with_yaml_contents(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.json', b'foo: bar\n')
+
+            self.assertEqual(
+                parse_yaml_or_json_file(os.path.join(temp_dir.path, 'config.json')),
+                {'foo': 'bar'}
+            )
+
+    def test_yaml_flow_mapping(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('config.yml', b'{foo: bar}\n')
+
+            self.assertEqual(
+                parse_yaml_or_json_file(os.path.join(temp_dir.path, 'config.yml')),
+                {'foo': 'bar'}
+            )
+
+class TestParseYAMLOrJSONDocumentsFile(BaseTestCase):
+    def test_yaml_documents(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('manifest.yaml', b'---\nkind: Route\n---\n---\nkind: Ingress\n')
+
+            self.assertEqual(
+                parse_yaml_or_json_documents_file(os.path.join(temp_dir.path, 'manifest.yaml')),
+                [{'kind': 'Route'}, None, {'kind': 'Ingress'}]
+            )
+
+    def test_empty(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('manifest.yaml', b'')
+
+            self.assertEqual(
+                parse_yaml_or_json_documents_file(os.path.join(temp_dir.path, 'manifest.yaml')),
+                []
+            )
+
+    def test_json_document(self):
+        with TempDirectory() as temp_dir:
+            temp_dir.write('manifest.json', b'{"kind": "List", "items": []}')
+
+            self.assertEqual(
+                parse_yaml_or_json_documents_file(os.path.join(temp_dir.path, 'manifest.json')),
+                [{'kind': 'List', 'items': []}]
+            )
+
+    def test_bad(self):
+        sample_file_path = os.path.join(
+            os.path.dirname(__file__),
+            'files',
+            'bad.yaml'
+        )
+
+        with self.assertRaisesRegex(
+            ValueError,
+            r"Error parsing file \(.+\) as YAML or JSON:"
+        ):
+            parse_yaml_or_json_documents_file(sample_file_path)
+
+class TestGetYAMLSafeLoader(BaseTestCase):
+    def test_libyaml(self):
+        with patch.object(yaml, 'CSafeLoader', create=True) as c_safe_loader_mock:
+            self.assertIs(get_yaml_safe_loader(), c_safe_loader_mock)
+
+    def test_no_libyaml(self):
+        c_safe_loader = yaml.__dict__.pop('CSafeLoader', None)
+        try:
+            self.assertIs(get_yaml_safe_loader(), yaml.SafeLoader)
+        finally:
+            if c_safe_loader is not None:
+                yaml.CSafeLoader = c_safe_loader
+
 class TestDownloadAndDecompressSourceToDestination(BaseTestCase):
     def test_https_bz2(self):
         with TempDirectory() as test_dir:
@@ -0,0 +1,225 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+import copy
+import pickle
+
+from tests.helpers.base_test_case import BaseTestCase
+from ploigos_step_runner.config.config_value import ConfigValue
+from ploigos_step_runner.utils.immutable import (FrozenDict, FrozenList, FrozenPath, freeze,
+                                                 to_mutable)
+
+
+class TestFreeze(BaseTestCase):
+    def test_freeze(self):
+        frozen = freeze({'foo': [1, {'bar': 'baz'}], 'qux': (2, 3)})
+
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIsInstance(frozen['foo'], FrozenList)
+        self.assertIsInstance(frozen['foo'][1], FrozenDict)
+        self.assertIsInstance(frozen['qux'], FrozenList)
+        self.assertEqual(frozen, {'foo': [1, {'bar': 'baz'}], 'qux': [2, 3]})
+
+    def test_freeze_frozen_not_copied(self):
+        frozen = freeze({'foo': 'bar'})
+
+        self.assertIs(freeze(frozen), frozen)
+
+    def test_freeze_leaves(self):
+        self.assertEqual(freeze('foo'), 'foo')
+        self.assertIsNone(freeze(None))
+
+    def test_given_not_changed_through_frozen(self):
+        given = {'foo': ['bar']}
+        frozen = freeze(given)
+
+        given['foo'].append('baz')
+
+        self.assertEqual(frozen, {'foo': ['bar']})
+
+
+class TestFrozenDict(BaseTestCase):
+    def test_read(self):
+        frozen = freeze({'foo': 'bar', 'baz': 1})
+
+        self.assertEqual(frozen['foo'], 'bar')
+        self.assertEqual(frozen.get('qux', 'default'), 'default')
+        self.assertIn('baz', frozen)
+        self.assertEqual(list(frozen), ['foo', 'baz'])
+        self.assertEqual(len(frozen), 2)
+        self.assertEqual({**frozen}, {'foo': 'bar', 'baz': 1})
+        self.assertEqual(repr(frozen), "{'foo': 'bar', 'baz': 1}")
+
+    def test_can_not_change(self):
+        frozen = freeze({'foo': 'bar'})
+
+        with self.assertRaises(TypeError):
+            frozen['foo'] = 'baz'
+        with self.assertRaises(TypeError):
+            del frozen['foo']
+        with self.assertRaises(AttributeError):
+            frozen.update({'foo': 'baz'}) # pylint: disable=no-member
+
+    def test_equal(self):
+        self.assertEqual(freeze({'foo': ['bar']}), freeze({'foo': ['bar']}))
+        self.assertEqual({'foo': ['bar']}, freeze({'foo': ['bar']}))
+        self.assertNotEqual(freeze({'foo': ['bar']}), {'foo': ['baz']})
+        self.assertNotEqual(freeze({'foo': 'bar'}), 'foo')
+
+    def test_to_mutable(self):
+        config_value = ConfigValue('bar')
+        frozen = freeze({'foo': [config_value], 'baz': {'qux': 1}})
+
+        mutable = frozen.to_mutable()
+        mutable['foo'].append('added')
+        mutable['baz']['qux'] = 2
+
+        self.assertEqual(type(mutable), dict)
+        self.assertEqual(type(mutable['foo']), list)
+        self.assertIs(mutable['foo'][0], config_value)
+        self.assertEqual(frozen, {'foo': [config_value], 'baz': {'qux': 1}})
+
+    def test_pickle_and_deepcopy(self):
+        frozen = freeze({'foo': ['bar', {'baz': 1}]})
+
+        for copied in [pickle.loads(pickle.dumps(frozen)), copy.deepcopy(frozen)]:
+            self.assertIsInstance(copied, FrozenDict)
+            self.assertIsInstance(copied['foo'], FrozenList)
+            self.assertEqual(copied, frozen)
+
+
+class TestFrozenList(BaseTestCase):
+    def test_read(self):
+        frozen = freeze(['foo', 'bar', 'baz'])
+
+        self.assertEqual(frozen[0], 'foo')
+        self.assertEqual(frozen[-1], 'baz')
+        self.assertIsInstance(frozen[1:], FrozenList)
+        self.assertEqual(frozen[1:], ['bar', 'baz'])
+        self.assertEqual(tuple(frozen), ('foo', 'bar', 'baz'))
+        self.assertIn('bar', frozen)
+        self.assertEqual(repr(frozen), "['foo', 'bar', 'baz']")
+
+    def test_can_not_change(self):
+        frozen = freeze(['foo'])
+
+        with self.assertRaises(TypeError):
+            frozen[0] = 'bar'
+        with self.assertRaises(AttributeError):
+            frozen.append('bar') # pylint: disable=no-member
+
+    def test_equal(self):
+        self.assertEqual(freeze(['foo']), ['foo'])
+        self.assertEqual(['foo'], freeze(['foo']))
+        self.assertEqual(freeze(['foo']), ('foo',))
+        self.assertNotEqual(freeze(['foo']), ['bar'])
+
+    def test_to_mutable(self):
+        frozen = freeze([{'foo': 'bar'}])
+
+        mutable = frozen.to_mutable()
+        mutable[0]['foo'] = 'baz'
+
+        self.assertEqual(mutable, [{'foo': 'baz'}])
+        self.assertEqual(frozen, [{'foo': 'bar'}])
+
+
+class TestFrozenPath(BaseTestCase):
+    def test_read(self):
+        path = FrozenPath(['foo', 0, 'bar'])
+
+        self.assertEqual(len(path), 3)
+        self.assertEqual(path[1], 0)
+        self.assertEqual(path[-1], 'bar')
+        self.assertEqual(path[1:], [0, 'bar'])
+        self.assertEqual(tuple(path), ('foo', 0, 'bar'))
+        self.assertEqual(repr(path), "['foo', 0, 'bar']")
+
+    def test_empty(self):
+        path = FrozenPath()
+
+        self.assertEqual(len(path), 0)
+        self.assertEqual(path, [])
+        self.assertEqual(path.child('foo'), ['foo'])
+
+    def test_child(self):
+        path = FrozenPath(['foo'])
+
+        foo_child = path.child('bar')
+        baz_child = path.child('baz')
+
+        self.assertEqual(path, ['foo'])
+        self.assertEqual(foo_child, ['foo', 'bar'])
+        self.assertEqual(baz_child, ['foo', 'baz'])
+        self.assertIs(
+            foo_child._FrozenPath__parent, # pylint: disable=protected-access
+            baz_child._FrozenPath__parent # pylint: disable=protected-access
+        )
+
+    def test_can_not_change(self):
+        path = FrozenPath(['foo'])
+
+        with self.assertRaises(TypeError):
+            path[0] = 'bar'
+        with self.assertRaises(AttributeError):
+            path.append('bar') # pylint: disable=no-member
+
+    def test_equal(self):
+        self.assertEqual(FrozenPath(['foo', 0]), FrozenPath(['foo', 0]))
+        self.assertEqual(FrozenPath(['foo', 0]), ['foo', 0])
+        self.assertEqual(['foo', 0], FrozenPath(['foo', 0]))
+        self.assertEqual(FrozenList(['foo', 0]), FrozenPath(['foo', 0]))
+        self.assertNotEqual(FrozenPath(['foo', 0]), ['foo', 1])
+        self.assertNotEqual(FrozenPath(['foo']), 'foo')
+
+    def test_pickle_parents_still_shared(self):
+        path = FrozenPath(['foo'])
+
+        bar_child, baz_child = pickle.loads(pickle.dumps([path.child('bar'), path.child('baz')]))
+
+        self.assertEqual(bar_child, ['foo', 'bar'])
+        self.assertEqual(baz_child, ['foo', 'baz'])
+        self.assertIs(
+            bar_child._FrozenPath__parent, # pylint: disable=protected-access
+            baz_child._FrozenPath__parent # pylint: disable=protected-access
+        )
+
+    def test_parts_built_once(self):
+        path = FrozenPath(['foo']).child('bar').child('baz')
+        self.assertIsNone(path._FrozenPath__parts_cache) # pylint: disable=protected-access
+
+        self.assertEqual(path[1], 'bar')
+        parts = path._FrozenPath__parts_cache # pylint: disable=protected-access
+        self.assertEqual(parts, ('foo', 'bar', 'baz'))
+
+        self.assertEqual(list(path), ['foo', 'bar', 'baz'])
+        self.assertEqual(path, ['foo', 'bar', 'baz'])
+        self.assertEqual(path[:2], ['foo', 'bar'])
+        self.assertIs(path._FrozenPath__parts_cache, parts) # pylint: disable=protected-access
+
+    def test_pickle_parts_not_pickled(self):
+        path = FrozenPath(['foo']).child('bar')
+        self.assertEqual(path, ['foo', 'bar'])
+
+        unpickled_path = pickle.loads(pickle.dumps(path))
+
+        self.assertEqual(pickle.dumps(path), pickle.dumps(FrozenPath(['foo']).child('bar')))
+        self.assertIsNone(
+            unpickled_path._FrozenPath__parts_cache # pylint: disable=protected-access
+        )
+        self.assertEqual(unpickled_path, ['foo', 'bar'])
+
+
+class TestToMutable(BaseTestCase):
+    def test_copies_plain_containers(self):
+        given = {'foo': ['bar'], 'baz': ('qux', ['quux'])}
+
+        mutable = to_mutable(given)
+        mutable['foo'].append('added')
+        mutable['baz'][1].append('added')
+
+        self.assertEqual(given, {'foo': ['bar'], 'baz': ('qux', ['quux'])})
+
+    def test_leaves(self):
+        self.assertEqual(to_mutable('foo'), 'foo')
+        self.assertIsNone(to_mutable(None))
@@ -3,13 +3,19 @@ import io
 import json
 import re
 import sys
-from contextlib import redirect_stdout
+import threading
+from contextlib import redirect_stderr, redirect_stdout
 from io import StringIO
+from unittest.mock import patch
 
+import sh
 import yaml
 from tests.helpers.base_test_case import BaseTestCase
-from ploigos_step_runner.utils.io import (TextIOIndenter, TextIOSelectiveObfuscator,
-                           create_sh_redirect_to_multiple_streams_fn_callback)
+from ploigos_step_runner.utils.io import (ShOutputTee, TextIOIndenter,
+                           TextIOSelectiveObfuscator, TextIOThreadLocalRouter,
+                           create_sh_redirect_to_multiple_streams_fn_callback,
+                           get_thread_stream, redirect_stderr_for_thread,
+                           redirect_stdout_for_thread)
 
 class TestCreateSHRedirectToMultipleStreamsFNCallback(BaseTestCase):
     def test_one_stream(self):
@@ -37,23 +43,214 @@ class TestCreateSHRedirectToMultipleStreamsFNCallback(BaseTestCase):
         self.assertEqual('data1', stream_one.getvalue())
         self.assertEqual('data1', stream_two.getvalue())
 
-class TestTextIOSelectiveObfuscator(BaseTestCase):
-    def run_test(self, input, expected, randomize_replacment_length=False, obfuscation_targets=None, replacment_char=None):
-        out = io.StringIO()
-        with redirect_stdout(out):
-            io_obfuscator = TextIOSelectiveObfuscator(
-                parent_stream=sys.stdout,
-                randomize_replacment_length=randomize_replacment_length
+    def test_thread_local_router_resolved_to_calling_thread_stream(self):
+        default_stream = StringIO()
+        thread_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        with router.redirect(thread_stream):
+            sh_redirect_to_multiple_streams_fn_callback = \
+                create_sh_redirect_to_multiple_streams_fn_callback([
+                    router
+                ])
+
+        # sh calls the callback from its own threads
+        thread = threading.Thread(target=sh_redirect_to_multiple_streams_fn_callback, args=['data1'])
+        thread.start()
+        thread.join()
+
+        self.assertEqual('data1', thread_stream.getvalue())
+
+class TestShOutputTee(BaseTestCase):
+    def test_out_and_err_to_multiple_streams(self):
+        out_stream = StringIO()
+        err_stream = StringIO()
+        results_stream = StringIO()
+
+        with ShOutputTee(
+            out_streams=[out_stream, results_stream],
+            err_streams=[err_stream, results_stream]
+        ) as output_tee:
+            sh.Command(sys.executable)(
+                '-c',
+                "import sys; print('out1', flush=True); print('err1', file=sys.stderr)",
+                _out=output_tee.out_fd,
+                _err=output_tee.err_fd
             )
 
-            if obfuscation_targets is not None:
-                io_obfuscator.add_obfuscation_targets(obfuscation_targets)
-            if replacment_char is not None:
-                io_obfuscator.replacement_char = replacment_char
+        self.assertEqual('out1\n', out_stream.getvalue())
+        self.assertEqual('err1\n', err_stream.getvalue())
+        self.assertEqual('out1\nerr1\n', results_stream.getvalue())
 
-            io_obfuscator.write(input)
+    def test_output_larger_than_read_size(self):
+        out_stream = StringIO()
 
-            self.assertRegex(out.getvalue(), expected)
+        # multi byte characters split across reads are decoded
+        with ShOutputTee(out_streams=[out_stream], err_streams=[]) as output_tee:
+            sh.Command(sys.executable)(
+                '-c',
+                f"import sys; sys.stdout.buffer.write(b'a' + '\u00e9'.encode() * {ShOutputTee.READ_SIZE})",
+                _out=output_tee.out_fd,
+                _err=output_tee.err_fd
+            )
+
+        self.assertEqual('a' + '\u00e9' * ShOutputTee.READ_SIZE, out_stream.getvalue())
+
+    def test_output_written_before_command_error_raised(self):
+        out_stream = StringIO()
+
+        with self.assertRaises(sh.ErrorReturnCode):
+            with ShOutputTee(out_streams=[out_stream], err_streams=[]) as output_tee:
+                sh.Command(sys.executable)(
+                    '-c',
+                    "import sys; print('out1'); sys.exit(1)",
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
+                )
+
+        self.assertEqual('out1\n', out_stream.getvalue())
+
+    def test_stream_write_error_raised(self):
+        closed_stream = StringIO()
+        closed_stream.close()
+
+        with self.assertRaises(ValueError):
+            with ShOutputTee(out_streams=[closed_stream], err_streams=[]) as output_tee:
+                # the command does not block once the stream can not be written to
+                sh.Command(sys.executable)(
+                    '-c',
+                    f"print('a' * {ShOutputTee.READ_SIZE * 4})",
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
+                )
+
+    def test_thread_local_router_resolved_to_calling_thread_stream(self):
+        default_stream = StringIO()
+        thread_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        with router.redirect(thread_stream):
+            with ShOutputTee(out_streams=[router], err_streams=[router]) as output_tee:
+                sh.Command(sys.executable)(
+                    '-c',
+                    "print('out1')",
+                    _out=output_tee.out_fd,
+                    _err=output_tee.err_fd
+                )
+
+        self.assertEqual('out1\n', thread_stream.getvalue())
+        self.assertEqual('', default_stream.getvalue())
+        self.assertEqual('', default_stream.getvalue())
+
+class TestTextIOThreadLocalRouter(BaseTestCase):
+    def test_write_default_stream(self):
+        default_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        router.write('hello world')
+        router.flush()
+
+        self.assertEqual('hello world', default_stream.getvalue())
+        self.assertIs(router.default_stream, default_stream)
+        self.assertIs(router.stream, default_stream)
+
+    def test_redirect_only_calling_thread(self):
+        default_stream = StringIO()
+        thread_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        def write_from_other_thread():
+            router.write('other thread')
+
+        with router.redirect(thread_stream):
+            router.write('this thread')
+            thread = threading.Thread(target=write_from_other_thread)
+            thread.start()
+            thread.join()
+
+        router.write(' after')
+
+        self.assertEqual('this thread', thread_stream.getvalue())
+        self.assertEqual('other thread after', default_stream.getvalue())
+
+    def test_redirect_nested(self):
+        default_stream = StringIO()
+        outer_stream = StringIO()
+        inner_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        with router.redirect(outer_stream):
+            with router.redirect(inner_stream):
+                router.write('inner')
+            router.write('outer')
+
+        self.assertEqual('inner', inner_stream.getvalue())
+        self.assertEqual('outer', outer_stream.getvalue())
+        self.assertEqual('', default_stream.getvalue())
+
+    def test_get_thread_stream(self):
+        default_stream = StringIO()
+        thread_stream = StringIO()
+        router = TextIOThreadLocalRouter(default_stream)
+
+        self.assertIs(get_thread_stream(default_stream), default_stream)
+        self.assertIs(get_thread_stream(router), default_stream)
+        with router.redirect(thread_stream):
+            self.assertIs(get_thread_stream(router), thread_stream)
+
+    def test_redirect_for_thread_with_router(self):
+        default_stream = StringIO()
+        thread_stream = StringIO()
+        stdout_router = TextIOThreadLocalRouter(default_stream)
+        stderr_router = TextIOThreadLocalRouter(default_stream)
+
+        with redirect_stdout(stdout_router), redirect_stderr(stderr_router):
+            with redirect_stdout_for_thread(thread_stream), \
+                    redirect_stderr_for_thread(thread_stream):
+                # sys.stdout and sys.stderr are not replaced, only routed for this thread
+                self.assertIs(sys.stdout, stdout_router)
+                self.assertIs(sys.stderr, stderr_router)
+                print('out')
+                print('err', file=sys.stderr)
+
+        self.assertEqual('out\nerr\n', thread_stream.getvalue())
+        self.assertEqual('', default_stream.getvalue())
+
+    def test_redirect_for_thread_without_router(self):
+        stream = StringIO()
+
+        with redirect_stdout_for_thread(stream), redirect_stderr_for_thread(stream):
+            self.assertIs(sys.stdout, stream)
+            self.assertIs(sys.stderr, stream)
+            print('out')
+            print('err', file=sys.stderr)
+
+        self.assertIsNot(sys.stdout, stream)
+        self.assertIsNot(sys.stderr, stream)
+        self.assertEqual('out\nerr\n', stream.getvalue())
+
+class TestTextIOSelectiveObfuscator(BaseTestCase):
+    def run_test(self, input, expected, randomize_replacment_length=False, obfuscation_targets=None, replacment_char=None):
+        # search with the combined pattern of the targets, and with the pattern of each target
+        for combined_pattern_min_targets in [0, len(obfuscation_targets or []) + 1]:
+            with self.subTest(combined_pattern_min_targets=combined_pattern_min_targets), \
+                    patch.object(TextIOSelectiveObfuscator, 'PER_TARGET_PATTERN_MIN_TEXT_LENGTH', 0):
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    io_obfuscator = TextIOSelectiveObfuscator(
+                        parent_stream=sys.stdout,
+                        randomize_replacment_length=randomize_replacment_length,
+                        combined_pattern_min_targets=combined_pattern_min_targets
+                    )
+
+                    if obfuscation_targets is not None:
+                        io_obfuscator.add_obfuscation_targets(obfuscation_targets)
+                    if replacment_char is not None:
+                        io_obfuscator.replacement_char = replacment_char
+
+                    io_obfuscator.write(input)
+
+                    self.assertRegex(out.getvalue(), expected)
 
     def test_no_obfuscation(self):
         self.run_test(
@@ -257,6 +454,109 @@ class TestTextIOSelectiveObfuscator(BaseTestCase):
             obfuscation_targets=private_key_block
         )
 
+    def test_overlapping_obfuscation(self):
+        self.run_test(
+            input='secret-key is longer than secret which is longer than sec',
+            expected=r'^\*{10} is longer than \*{6} which is longer than \*{3}$',
+            obfuscation_targets=['sec', 'secret', 'secret-key']
+        )
+
+    def test_overlapping_obfuscation_starting_in_earlier_target(self):
+        self.run_test(
+            input='abcdef, cdef, abcd',
+            expected=r'^\*{4}ef, \*{4}, \*{4}$',
+            obfuscation_targets=['cdef', 'abcd']
+        )
+
+    def test_multiple_word_obfuscation_with_common_prefix(self):
+        self.run_test(
+            input='foo then bar, fox, foo, fo',
+            expected=r'^\*{12}, \*{3}, \*{3}, fo$',
+            obfuscation_targets=['foo  bar', 'fox', 'foo']
+        )
+
+    def test_empty_obfuscation_target_ignored(self):
+        self.run_test(
+            input='hello world secret',
+            expected=r'^hello world \*+$',
+            obfuscation_targets=['', ' \n', 'secret'],
+            randomize_replacment_length=True
+        )
+
+    def test_obfuscation_targets_added_later(self):
+        out = io.StringIO()
+        io_obfuscator = TextIOSelectiveObfuscator(out, randomize_replacment_length=False)
+        io_obfuscator.write('secret1 secret2\n')
+        io_obfuscator.add_obfuscation_targets('secret1')
+        io_obfuscator.write('secret1 secret2\n')
+        io_obfuscator.add_obfuscation_targets(['secret2', 'secret1'])
+        io_obfuscator.write('secret1 secret2\n')
+
+        self.assertEqual(
+            out.getvalue(),
+            'secret1 secret2\n******* secret2\n******* *******\n'
+        )
+
+    @staticmethod
+    def __create_buffered_obfuscator(obfuscation_targets, buffer_size=64):
+        out = io.StringIO()
+        io_obfuscator = TextIOSelectiveObfuscator(
+            out,
+            randomize_replacment_length=False,
+            buffered=True,
+            buffer_size=buffer_size
+        )
+        io_obfuscator.add_obfuscation_targets(obfuscation_targets)
+        return io_obfuscator, out
+
+    def test_buffered_target_split_across_writes(self):
+        io_obfuscator, out = self.__create_buffered_obfuscator(['supersecret'])
+        self.assertTrue(io_obfuscator.buffered)
+
+        for chunk in ['password: sup', 'ers', 'ecret', ' done\nnext line su']:
+            io_obfuscator.write(chunk)
+
+        self.assertEqual(out.getvalue(), 'password: *********** done\nnext line ')
+
+        io_obfuscator.flush()
+        self.assertEqual(out.getvalue(), 'password: *********** done\nnext line su')
+
+    def test_buffered_holds_back_possible_start_of_target(self):
+        io_obfuscator, out = self.__create_buffered_obfuscator(['supersecret'], buffer_size=16)
+
+        io_obfuscator.write('x' * 20 + ' supers')
+
+        # only the end that could be the start of the target is held back
+        self.assertEqual(out.getvalue(), 'x' * 20 + ' ')
+
+        io_obfuscator.write('ecret\n')
+        self.assertEqual(out.getvalue(), 'x' * 20 + ' ***********\n')
+
+    def test_buffered_partial_target_at_flush_not_obfuscated(self):
+        io_obfuscator, out = self.__create_buffered_obfuscator(['supersecret'])
+
+        io_obfuscator.write('trailing super')
+        self.assertEqual(out.getvalue(), '')
+
+        io_obfuscator.flush()
+        self.assertEqual(out.getvalue(), 'trailing super')
+
+    def test_buffered_multiple_word_target_split_across_lines(self):
+        io_obfuscator, out = self.__create_buffered_obfuscator(['multi word secret'])
+
+        for chunk in ['a multi\n', 'word\n', 'secret!\n']:
+            io_obfuscator.write(chunk)
+        io_obfuscator.flush()
+
+        self.assertEqual(out.getvalue(), 'a *****************!\n')
+
+    def test_buffered_no_targets_written_through(self):
+        io_obfuscator, out = self.__create_buffered_obfuscator([])
+
+        io_obfuscator.write('no new line')
+
+        self.assertEqual(out.getvalue(), 'no new line')
+
 class TestTextIOIndenter(BaseTestCase):
     def __run_test(self, inputs, expected, indent_level=0, indent_size=4, indent_char=' '):
         out = io.StringIO()
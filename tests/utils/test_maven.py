@@ -5,7 +5,7 @@ Test for the utility for maven operations.
 import re
 import xml.etree.ElementTree as ET
 from io import BytesIO
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import sh
 from testfixtures import TempDirectory
@@ -981,7 +981,8 @@ class TestMavenUtils(BaseTestCase):
         mvn_mock.assert_any_call(
             'help:effective-pom',
             f'-f={pom_file_path}',
-            f'-Doutput={effective_pom_path}'
+            f'-Doutput={effective_pom_path}',
+            _done=ANY
         )
 
     @patch('sh.mvn', create=True)
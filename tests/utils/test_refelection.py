@@ -1,11 +1,14 @@
 import os
+import sys
 
 import unittest
+from unittest.mock import patch
 from testfixtures import TempDirectory
 
 from tests.helpers.base_test_case import BaseTestCase
 
-from ploigos_step_runner.utils.reflection import import_and_get_class
+from ploigos_step_runner.utils.reflection import (import_and_get_class,
+                                                  import_classes_lazily)
 
 class TestReflectionUtils(BaseTestCase):
     def test_import_and_get_class_module_does_not_exist(self):
@@ -22,3 +25,34 @@ class TestReflectionUtils(BaseTestCase):
         self.assertIsNotNone(
             import_and_get_class('ploigos_step_runner.step_implementers.container_image_static_compliance_scan', 'OpenSCAP')
         )
+
+    def test_import_classes_lazily(self):
+        lazy_import_getattr = import_classes_lazily(
+            'ploigos_step_runner.step_implementers.generate_metadata',
+            {'Npm': 'npm'}
+        )
+
+        from ploigos_step_runner.step_implementers.generate_metadata.npm import Npm
+        self.assertIs(lazy_import_getattr('Npm'), Npm)
+
+    def test_import_classes_lazily_unknown_name(self):
+        lazy_import_getattr = import_classes_lazily(
+            'ploigos_step_runner.step_implementers.generate_metadata',
+            {'Npm': 'npm'}
+        )
+
+        with self.assertRaisesRegex(
+            AttributeError,
+            r"module 'ploigos_step_runner.step_implementers.generate_metadata' has no attribute 'Git'"
+        ):
+            lazy_import_getattr('Git')
+
+    def test_import_classes_lazily_before_python_3_7(self):
+        package_name = 'ploigos_step_runner.step_implementers.generate_metadata'
+        package = sys.modules[package_name]
+
+        with patch.object(sys, 'version_info', (3, 6, 15)), patch.dict(package.__dict__):
+            import_classes_lazily(package_name, {'Npm': 'npm'})
+
+            from ploigos_step_runner.step_implementers.generate_metadata.npm import Npm
+            self.assertIs(package.__dict__['Npm'], Npm)